@@ -13,14 +13,18 @@ Funcionalidades Enterprise v6.1:
 - ✅ Integración con sistema de memoria unificado
 - ✅ Auto-cleanup de FVGs antiguos
 - ✅ Análisis de confluencias y patrones
+- ✅ Índice fvg_id→entrada y set de activos por (símbolo, timeframe)
+- ✅ Journal write-behind (JSONL) + snapshot atómico
 
 Versión: v6.1.0-enterprise-fvg-memory
 Fecha: 4 de Septiembre 2025 - 15:10 GMT
 """
 
 from protocols.unified_logging import get_unified_logger
+import atexit
 import json
 import os
+import threading
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
@@ -56,6 +60,7 @@ class FVGMemoryManager:
             self.memory_dir = project_root / "04-DATA" / "memory_persistence" / "historical_analysis"
         
         self.fvg_file = self.memory_dir / "fvg_memory_persistent.json"
+        self.journal_file = self.memory_dir / "fvg_memory_journal.jsonl"
         
         # Asegurar directorio existe
         self.memory_dir.mkdir(parents=True, exist_ok=True)
@@ -66,9 +71,24 @@ class FVGMemoryManager:
             'max_age_days': 30,
             'cleanup_frequency_hours': 24,
             'min_gap_size_pips': 2.0,
-            'fill_tolerance_pips': 0.5
+            'fill_tolerance_pips': 0.5,
+            'journal_flush_interval_seconds': 2.0,   # Flush write-behind por tiempo
+            'journal_flush_max_ops': 100,            # ...o por tamaño del buffer
+            'snapshot_every_ops': 2000               # Compactación journal -> snapshot
         }
         
+        # === ÍNDICES Y JOURNAL WRITE-BEHIND ===
+        self._lock = threading.RLock()
+        self._fvg_index: Dict[str, dict] = {}                       # fvg_id -> entrada
+        self._active_ids: Dict[Tuple[str, str], Dict[str, None]] = {}  # (symbol, tf) -> ids activos (orden inserción)
+        self._dedup_index: Dict[tuple, str] = {}                    # clave dedup -> fvg_id
+        self._symbol_counters: Dict[str, Dict[str, float]] = {}
+        self._total_count = 0
+        self._active_count = 0
+        self._pending_ops: List[dict] = []
+        self._journal_ops_since_snapshot = 0
+        self._flush_timer: Optional[threading.Timer] = None
+        
         # === ADAPTACIÓN A CONDICIONES DE MERCADO ===
         # Sistema adaptativo que calcula condiciones en tiempo real
         self.market_conditions = self._calculate_real_market_conditions()
@@ -78,6 +98,9 @@ class FVGMemoryManager:
         
         # === CARGAR MEMORIA EXISTENTE ===
         self.fvg_data = self._load_fvg_memory()
+        self._rebuild_indexes()
+        self._replay_journal()
+        atexit.register(self.flush)
         
         self.logger.info(f"📈 FVG Memory Manager inicializado - Archivo: {self.fvg_file}", 
                          component="fvg_memory")
@@ -299,16 +322,28 @@ class FVGMemoryManager:
         return initial_data
     
     def _save_fvg_memory(self, data: Optional[dict] = None) -> bool:
-        """Guarda la memoria de FVGs en archivo."""
+        """Guarda snapshot completo de forma atómica (tmp + replace) y vacía el journal."""
         try:
-            save_data = data if data else self.fvg_data
-            
-            # Actualizar metadata
-            save_data["metadata"]["last_updated"] = datetime.now(timezone.utc).isoformat()
-            save_data["metadata"]["total_fvgs_analyzed"] = self._count_total_fvgs()
-            
-            with open(self.fvg_file, 'w', encoding='utf-8') as f:
-                json.dump(save_data, f, indent=2, default=str)
+            with self._lock:
+                save_data = data if data else self.fvg_data
+                
+                # Actualizar metadata
+                save_data["metadata"]["last_updated"] = datetime.now(timezone.utc).isoformat()
+                save_data["metadata"]["total_fvgs_analyzed"] = self._count_total_fvgs()
+                
+                tmp_file = self.fvg_file.with_suffix(self.fvg_file.suffix + ".tmp")
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(save_data, f, indent=2, default=str)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_file, self.fvg_file)
+                
+                # El snapshot ya contiene todo lo pendiente
+                self._pending_ops.clear()
+                self._journal_ops_since_snapshot = 0
+                if self.journal_file.exists():
+                    with open(self.journal_file, 'w', encoding='utf-8'):
+                        pass
             
             return True
             
@@ -316,6 +351,151 @@ class FVGMemoryManager:
             self.logger.error(f"Error guardando memoria FVG: {e}", component="fvg_memory")
             return False
     
+    # === JOURNAL WRITE-BEHIND ===
+    
+    def _record_op(self, op: dict) -> None:
+        """Encola una operación; flush al llegar al umbral o vía timer."""
+        with self._lock:
+            self._pending_ops.append(op)
+            if len(self._pending_ops) >= self.config['journal_flush_max_ops']:
+                self.flush()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.config['journal_flush_interval_seconds'], self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def flush(self) -> bool:
+        """Escribe las operaciones pendientes al journal (append) y compacta si toca."""
+        try:
+            with self._lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                if not self._pending_ops:
+                    return True
+                
+                lines = ''.join(json.dumps(op, default=str) + '\n' for op in self._pending_ops)
+                with open(self.journal_file, 'a', encoding='utf-8') as f:
+                    f.write(lines)
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._journal_ops_since_snapshot += len(self._pending_ops)
+                self._pending_ops.clear()
+                
+                if self._journal_ops_since_snapshot >= self.config['snapshot_every_ops']:
+                    return self._save_fvg_memory()
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Error escribiendo journal FVG: {e}", component="fvg_memory")
+            return False
+    
+    def _replay_journal(self) -> None:
+        """Aplica sobre el snapshot las operaciones del journal (tolera línea final truncada)."""
+        try:
+            if not self.journal_file.exists():
+                return
+            replayed = 0
+            with open(self.journal_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        op = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    if op.get('op') == 'add':
+                        self._insert_entry(op['entry'])
+                    elif op.get('op') == 'update':
+                        fvg = self._fvg_index.get(op.get('fvg_id', ''))
+                        if fvg is not None:
+                            self._apply_status_fields(fvg, op.get('fields', {}))
+                    replayed += 1
+            self._journal_ops_since_snapshot = replayed
+            if replayed:
+                self._refresh_statistics_views(None)
+                self.logger.info(f"📚 Journal FVG aplicado: {replayed} operaciones", component="fvg_memory")
+        except Exception as e:
+            self.logger.error(f"Error aplicando journal FVG: {e}", component="fvg_memory")
+    
+    # === ÍNDICES EN MEMORIA ===
+    
+    def _rebuild_indexes(self) -> None:
+        """Reconstruye índices y contadores desde fvg_database (una sola pasada al cargar)."""
+        self._fvg_index.clear()
+        self._active_ids.clear()
+        self._dedup_index.clear()
+        self._symbol_counters.clear()
+        self._total_count = 0
+        self._active_count = 0
+        for symbol, timeframes in self.fvg_data.get("fvg_database", {}).items():
+            for timeframe, fvgs in timeframes.items():
+                if isinstance(fvgs, list):
+                    for fvg in fvgs:
+                        self._index_entry(symbol, timeframe, fvg)
+    
+    def _index_entry(self, symbol: str, timeframe: str, fvg: dict) -> None:
+        fvg_id = fvg.get("fvg_id", "")
+        self._fvg_index.setdefault(fvg_id, fvg)
+        self._dedup_index.setdefault(self._compute_dedup_key_for_entry(fvg), fvg_id)
+        if fvg.get("status") in ["unfilled", "partially_filled"]:
+            self._active_ids.setdefault((symbol, timeframe), {})[fvg_id] = None
+        self._total_count += 1
+        self._count_entry(symbol, fvg, 1)
+    
+    def _unindex_entry(self, symbol: str, timeframe: str, fvg: dict) -> None:
+        fvg_id = fvg.get("fvg_id", "")
+        if self._fvg_index.get(fvg_id) is fvg:
+            del self._fvg_index[fvg_id]
+        dedup_key = self._compute_dedup_key_for_entry(fvg)
+        if self._dedup_index.get(dedup_key) == fvg_id:
+            del self._dedup_index[dedup_key]
+        self._active_ids.get((symbol, timeframe), {}).pop(fvg_id, None)
+        self._total_count -= 1
+        self._count_entry(symbol, fvg, -1)
+    
+    def _count_entry(self, symbol: str, fvg: dict, sign: int) -> None:
+        """Suma/resta la contribución de una entrada a los contadores incrementales."""
+        counters = self._symbol_counters.setdefault(symbol, {
+            "total": 0, "filled": 0, "partial": 0, "unfilled": 0, "fill_time": 0.0, "fill_count": 0
+        })
+        counters["total"] += sign
+        status = fvg.get("status", "unfilled")
+        if status == "filled":
+            counters["filled"] += sign
+            if fvg.get("fill_duration_hours"):
+                counters["fill_time"] += sign * fvg["fill_duration_hours"]
+                counters["fill_count"] += sign
+        elif status == "partially_filled":
+            counters["partial"] += sign
+        else:
+            counters["unfilled"] += sign
+        if status in ["unfilled", "partially_filled"]:
+            self._active_count += sign
+    
+    def _insert_entry(self, fvg_entry: dict) -> None:
+        symbol = fvg_entry["symbol"]
+        timeframe = fvg_entry["timeframe"]
+        if symbol not in self.fvg_data["fvg_database"]:
+            self._initialize_symbol_structure(symbol)
+        self.fvg_data["fvg_database"][symbol].setdefault(timeframe, []).append(fvg_entry)
+        self._index_entry(symbol, timeframe, fvg_entry)
+    
+    def _apply_status_fields(self, fvg: dict, fields: dict) -> None:
+        """Aplica cambios de estado manteniendo contadores y set de activos en O(1)."""
+        symbol = fvg.get("symbol", "")
+        timeframe = fvg.get("timeframe", "")
+        fvg_id = fvg.get("fvg_id", "")
+        self._count_entry(symbol, fvg, -1)
+        fvg.update(fields)
+        self._count_entry(symbol, fvg, 1)
+        active = self._active_ids.setdefault((symbol, timeframe), {})
+        if fvg.get("status") in ["unfilled", "partially_filled"]:
+            active[fvg_id] = None
+        else:
+            active.pop(fvg_id, None)
+    
     def store_fvg(self, fvg_data: dict, symbol: str, timeframe: str) -> str:
         """
         Almacena un FVG - método simplificado para compatibilidad
@@ -358,20 +538,22 @@ class FVGMemoryManager:
             # Intentar reutilizar fvg_id entrante si existe
             incoming_fvg_id = fvg_data.get('fvg_id') or None
 
-            # Determinar si ya existe un FVG equivalente (dedup)
-            timeframe_list = self.fvg_data["fvg_database"][symbol].get(timeframe)
-            if isinstance(timeframe_list, list) and timeframe_list:
-                incoming_key = self._compute_dedup_key_for_data(fvg_data, symbol, timeframe)
-                for existing in timeframe_list:
-                    # Coincidencia por fvg_id directo
-                    if incoming_fvg_id and existing.get('fvg_id') == incoming_fvg_id:
-                        return existing.get('fvg_id', '')
-                    # Coincidencia por clave derivada (tipo, precios, tiempo)
-                    if self._compute_dedup_key_for_entry(existing) == incoming_key:
-                        return existing.get('fvg_id', '')
+            # Determinar si ya existe un FVG equivalente (dedup vía índices)
+            if incoming_fvg_id:
+                existing = self._fvg_index.get(incoming_fvg_id)
+                # Coincidencia por fvg_id directo
+                if existing is not None and existing.get('symbol') == symbol and existing.get('timeframe') == timeframe:
+                    return incoming_fvg_id
+            # Coincidencia por clave derivada (tipo, precios, tiempo)
+            existing_id = self._dedup_index.get(self._compute_dedup_key_for_data(fvg_data, symbol, timeframe))
+            if existing_id is not None:
+                return existing_id
 
             # Generar ID único
             fvg_id = incoming_fvg_id or f"fvg_{symbol}_{timeframe}_{int(datetime.now().timestamp())}"
+            if not incoming_fvg_id and fvg_id in self._fvg_index:
+                # Varios FVGs en el mismo segundo: el índice requiere IDs únicos
+                fvg_id = f"{fvg_id}_{uuid.uuid4().hex[:8]}"
 
             # Crear entrada de FVG enriquecida
             fvg_entry = {
@@ -412,13 +594,14 @@ class FVGMemoryManager:
             }
             
             # Añadir a la base de datos
-            self.fvg_data["fvg_database"][symbol][timeframe].append(fvg_entry)
-            
-            # Actualizar estadísticas
-            self._update_statistics(symbol, timeframe, "added")
-            
-            # Guardar cambios
-            self._save_fvg_memory()
+            with self._lock:
+                self._insert_entry(fvg_entry)
+                
+                # Actualizar estadísticas
+                self._update_statistics(symbol, timeframe, "added")
+                
+                # Guardar cambios (write-behind)
+                self._record_op({"op": "add", "entry": fvg_entry})
             
             self.logger.info(f"📈 FVG añadido: {fvg_id} - {symbol} {timeframe}", 
                              component="fvg_memory")
@@ -494,22 +677,24 @@ class FVGMemoryManager:
                 return False
             
             old_status = fvg["status"]
-            fvg["status"] = new_status
-            fvg["fill_percentage"] = fill_percentage
+            fields: Dict[str, Any] = {"status": new_status, "fill_percentage": fill_percentage}
             
             if new_status in ["filled", "partially_filled"] and old_status == "unfilled":
-                fvg["fill_timestamp"] = datetime.now(timezone.utc).isoformat()
+                fields["fill_timestamp"] = datetime.now(timezone.utc).isoformat()
                 
                 # Calcular duración de llenado
                 creation_time = datetime.fromisoformat(fvg["creation_timestamp"].replace('Z', '+00:00'))
                 duration = datetime.now(timezone.utc) - creation_time
-                fvg["fill_duration_hours"] = duration.total_seconds() / 3600
+                fields["fill_duration_hours"] = duration.total_seconds() / 3600
             
-            # Actualizar estadísticas
-            self._update_statistics(fvg["symbol"], fvg["timeframe"], "updated")
-            
-            # Guardar cambios
-            self._save_fvg_memory()
+            with self._lock:
+                self._apply_status_fields(fvg, fields)
+                
+                # Actualizar estadísticas
+                self._update_statistics(fvg["symbol"], fvg["timeframe"], "updated")
+                
+                # Guardar cambios (write-behind)
+                self._record_op({"op": "update", "fvg_id": fvg_id, "fields": fields})
             
             self.logger.info(f"📈 FVG actualizado: {fvg_id} -> {new_status}", 
                              component="fvg_memory")
@@ -525,20 +710,17 @@ class FVGMemoryManager:
         active_fvgs = []
         
         try:
-            for sym, timeframes in self.fvg_data["fvg_database"].items():
-                if symbol and sym != symbol:
-                    continue
-                    
-                for tf, fvgs in timeframes.items():
-                    if timeframe and tf != timeframe:
-                        continue
-                    if isinstance(fvgs, list):
-                        for fvg in fvgs:
-                            try:
-                                if fvg.get("status") in ["unfilled", "partially_filled"]:
-                                    active_fvgs.append(fvg)
-                            except Exception:
-                                continue
+            with self._lock:
+                if symbol and timeframe:
+                    keys = [(symbol, timeframe)]
+                else:
+                    keys = [k for k in self._active_ids
+                            if (not symbol or k[0] == symbol) and (not timeframe or k[1] == timeframe)]
+                for key in keys:
+                    for fvg_id in self._active_ids.get(key, {}):
+                        fvg = self._fvg_index.get(fvg_id)
+                        if fvg is not None:
+                            active_fvgs.append(fvg)
             
             return active_fvgs
             
@@ -569,26 +751,30 @@ class FVGMemoryManager:
             cleaned_count = 0
             cutoff_date = datetime.now(timezone.utc) - timedelta(days=self.config['max_age_days'])
             
-            for symbol, timeframes in self.fvg_data["fvg_database"].items():
-                for timeframe, fvgs in timeframes.items():
-                    if isinstance(fvgs, list):
-                        original_count = len(fvgs)
-                        
-                        # Filtrar FVGs antiguos
-                        filtered_fvgs = []
-                        for fvg in fvgs:
-                            creation_time = datetime.fromisoformat(fvg["creation_timestamp"].replace('Z', '+00:00'))
-                            if creation_time > cutoff_date:
-                                filtered_fvgs.append(fvg)
-                            else:
-                                cleaned_count += 1
-                        
-                        # Actualizar lista
-                        timeframes[timeframe] = filtered_fvgs
-            
-            if cleaned_count > 0:
-                self.fvg_data["metadata"]["last_cleanup"] = datetime.now(timezone.utc).isoformat()
-                self._save_fvg_memory()
+            with self._lock:
+                for symbol, timeframes in self.fvg_data["fvg_database"].items():
+                    for timeframe, fvgs in timeframes.items():
+                        if isinstance(fvgs, list):
+                            original_count = len(fvgs)
+                            
+                            # Filtrar FVGs antiguos
+                            filtered_fvgs = []
+                            for fvg in fvgs:
+                                creation_time = datetime.fromisoformat(fvg["creation_timestamp"].replace('Z', '+00:00'))
+                                if creation_time > cutoff_date:
+                                    filtered_fvgs.append(fvg)
+                                else:
+                                    self._unindex_entry(symbol, timeframe, fvg)
+                                    cleaned_count += 1
+                            
+                            # Actualizar lista
+                            timeframes[timeframe] = filtered_fvgs
+                
+                if cleaned_count > 0:
+                    self.fvg_data["metadata"]["last_cleanup"] = datetime.now(timezone.utc).isoformat()
+                    self._refresh_statistics_views(None)
+                    # Cleanup no se journaliza: snapshot completo (poco frecuente)
+                    self._save_fvg_memory()
                 
                 self.logger.info(f"🧹 Cleanup completado: {cleaned_count} FVGs antiguos eliminados", 
                                  component="fvg_memory")
@@ -619,14 +805,8 @@ class FVGMemoryManager:
         }
     
     def _find_fvg_by_id(self, fvg_id: str) -> Optional[dict]:
-        """Encuentra FVG por ID."""
-        for symbol, timeframes in self.fvg_data["fvg_database"].items():
-            for timeframe, fvgs in timeframes.items():
-                if isinstance(fvgs, list):
-                    for fvg in fvgs:
-                        if fvg.get("fvg_id") == fvg_id:
-                            return fvg
-        return None
+        """Encuentra FVG por ID (O(1) vía índice)."""
+        return self._fvg_index.get(fvg_id)
     
     def _calculate_gap_size_pips(self, fvg_data: dict, symbol: str) -> float:
         """Calcula el tamaño del gap en pips."""
@@ -656,53 +836,39 @@ class FVGMemoryManager:
             return "overlap"
     
     def _update_statistics(self, symbol: str, timeframe: str, action: str):
-        """Actualiza estadísticas después de cambios."""
+        """Actualiza estadísticas después de cambios (O(1) desde contadores)."""
         try:
-            # Recalcular estadísticas del símbolo
-            if symbol in self.fvg_data["fvg_database"]:
-                stats = self._calculate_symbol_statistics(symbol)
-                self.fvg_data["fvg_database"][symbol]["statistics"] = stats
-            
-            # Actualizar estadísticas globales
-            self._update_global_statistics()
+            self._refresh_statistics_views(symbol)
             
         except Exception as e:
             self.logger.error(f"Error actualizando estadísticas: {e}", component="fvg_memory")
     
+    def _refresh_statistics_views(self, symbol: Optional[str]) -> None:
+        """Vuelca contadores a fvg_database[symbol]['statistics'] y global_statistics."""
+        symbols = [symbol] if symbol else list(self.fvg_data["fvg_database"].keys())
+        for sym in symbols:
+            if sym in self.fvg_data["fvg_database"]:
+                self.fvg_data["fvg_database"][sym]["statistics"] = self._calculate_symbol_statistics(sym)
+        
+        # Actualizar estadísticas globales
+        self._update_global_statistics()
+    
     def _calculate_symbol_statistics(self, symbol: str) -> dict:
         """Calcula estadísticas para un símbolo específico."""
         try:
-            total_fvgs = 0
-            filled_fvgs = 0
-            partially_filled = 0
-            unfilled_fvgs = 0
-            total_fill_time = 0.0
-            filled_count = 0
-            
-            for timeframe, fvgs in self.fvg_data["fvg_database"][symbol].items():
-                if isinstance(fvgs, list):
-                    for fvg in fvgs:
-                        total_fvgs += 1
-                        
-                        status = fvg.get("status", "unfilled")
-                        if status == "filled":
-                            filled_fvgs += 1
-                            if fvg.get("fill_duration_hours"):
-                                total_fill_time += fvg["fill_duration_hours"]
-                                filled_count += 1
-                        elif status == "partially_filled":
-                            partially_filled += 1
-                        else:
-                            unfilled_fvgs += 1
+            counters = self._symbol_counters.get(symbol, {})
+            total_fvgs = int(counters.get("total", 0))
+            filled_fvgs = int(counters.get("filled", 0))
+            filled_count = int(counters.get("fill_count", 0))
             
             success_rate = filled_fvgs / total_fvgs if total_fvgs > 0 else 0.0
-            avg_fill_time = total_fill_time / filled_count if filled_count > 0 else 0.0
+            avg_fill_time = counters.get("fill_time", 0.0) / filled_count if filled_count > 0 else 0.0
             
             return {
                 "total_fvgs": total_fvgs,
                 "filled_fvgs": filled_fvgs,
-                "partially_filled": partially_filled,
-                "unfilled_fvgs": unfilled_fvgs,
+                "partially_filled": int(counters.get("partial", 0)),
+                "unfilled_fvgs": int(counters.get("unfilled", 0)),
                 "avg_fill_time_hours": avg_fill_time,
                 "success_rate": success_rate
             }
@@ -714,32 +880,15 @@ class FVGMemoryManager:
     def _update_global_statistics(self):
         """Actualiza las estadísticas globales."""
         try:
-            total_fvgs = 0
-            active_fvgs = 0
-            
-            for symbol, timeframes in self.fvg_data["fvg_database"].items():
-                for timeframe, fvgs in timeframes.items():
-                    if isinstance(fvgs, list):
-                        total_fvgs += len(fvgs)
-                        active_fvgs += len([f for f in fvgs if f["status"] in ["unfilled", "partially_filled"]])
-            
-            self.fvg_data["global_statistics"]["total_fvgs_all_pairs"] = total_fvgs
-            self.fvg_data["global_statistics"]["active_fvgs"] = active_fvgs
+            self.fvg_data["global_statistics"]["total_fvgs_all_pairs"] = self._total_count
+            self.fvg_data["global_statistics"]["active_fvgs"] = self._active_count
             
         except Exception as e:
             self.logger.error(f"Error actualizando estadísticas globales: {e}", component="fvg_memory")
     
     def _count_total_fvgs(self) -> int:
         """Cuenta el total de FVGs en la base de datos."""
-        count = 0
-        try:
-            for symbol, timeframes in self.fvg_data["fvg_database"].items():
-                for timeframe, fvgs in timeframes.items():
-                    if isinstance(fvgs, list):
-                        count += len(fvgs)
-        except:
-            pass
-        return count
+        return self._total_count
 
 # === INTEGRACIÓN CON PATTERN DETECTOR ===
 
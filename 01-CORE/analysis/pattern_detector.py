@@ -23,6 +23,7 @@ if str(project_root) not in sys.path:
 
 from protocols.unified_logging import get_unified_logger
 import time
+from contextlib import nullcontext
 from datetime import datetime, timedelta, time as dt_time
 from typing import Dict, List, Optional, Tuple, Any, Union, TYPE_CHECKING
 from dataclasses import dataclass, field
@@ -212,6 +213,12 @@ except Exception as e:
     _logger.error(f"Error importando downloader: {e}", "IMPORT")
     get_advanced_candle_downloader = None
 
+# Trazas señal→fill (opcional)
+try:
+    from monitoring.order_tracing import trace_scope
+except Exception:
+    trace_scope = None
+
 # Importar Smart Money Concepts v6.0 con gestión robusta
 SmartMoneyAnalyzer = None  # Inicializar SIEMPRE
 
@@ -570,94 +577,104 @@ class PatternDetector:
         import numpy as np
         import pandas as pd
         start_time = time.time()
-        try:
-            # 🚨 VERIFICACIÓN CRÍTICA DE TRADING READINESS
-            if not self.is_trading_ready():
-                return []
-
-            # Usar datos proporcionados o descargar
-            if data is None:
-                data = self._get_market_data(symbol, timeframe, lookback_days)
-            if data is None or data.empty:
+        # Traza de la señal, activa solo durante la detección; los patrones
+        # llevan raw_data['trace_id'] para continuarla (find_trace) aguas abajo
+        scope = trace_scope('pattern_detector', symbol=symbol, timeframe=timeframe) if trace_scope else nullcontext()
+        with scope as trace:
+            try:
+                # 🚨 VERIFICACIÓN CRÍTICA DE TRADING READINESS
+                if not self.is_trading_ready():
+                    return []
+
+                # Usar datos proporcionados o descargar
+                if data is None:
+                    data = self._get_market_data(symbol, timeframe, lookback_days)
+                if data is None or data.empty:
+                    return []
+
+                # Vectorización: asegurar tipos y columnas
+                data = data.copy()
+                for col in ['open','high','low','close','volume']:
+                    if col in data.columns:
+                        data[col] = pd.to_numeric(data[col], errors='coerce')
+
+                # LIMITACIÓN CRÍTICA: Reducir datos para evitar problemas de rendimiento
+                MAX_CANDLES_FOR_ANALYSIS = 500
+                if len(data) > MAX_CANDLES_FOR_ANALYSIS:
+                    data = data.tail(MAX_CANDLES_FOR_ANALYSIS)
+
+                # Batching: procesar en bloques si es muy grande
+                batch_size = 250
+                batches = [data.iloc[i:i+batch_size] for i in range(0, len(data), batch_size)] if len(data) > batch_size else [data]
+
+                patterns = []
+                # Desactivar logging en hot paths (solo errores críticos)
+                # Detectores internos deben evitar prints/logs en bucles
+
+                # Cache: ejemplo de medias móviles para todos los detectores
+                cache = {}
+                if 'close' in data.columns:
+                    cache['ma_20'] = data['close'].rolling(window=20, min_periods=1).mean().values
+                    cache['ma_50'] = data['close'].rolling(window=50, min_periods=1).mean().values
+
+                # Procesar cada batch
+                for batch in batches:
+                    # 1. Silver Bullet
+                    if self.config.get('enable_silver_bullet', True):
+                        sb_patterns = self._detect_silver_bullet(batch, symbol, timeframe, cache=cache)
+                        patterns.extend(sb_patterns)
+                    # 2. Judas Swing
+                    if self.config.get('enable_judas_swing', True):
+                        js_patterns = self._detect_judas_swing(batch, symbol, timeframe, cache=cache)
+                        patterns.extend(js_patterns)
+                    # 3. Liquidity Grab
+                    if self.config.get('enable_liquidity_grab', True):
+                        lg_patterns = self._detect_liquidity_grab(batch, symbol, timeframe, cache=cache)
+                        patterns.extend(lg_patterns)
+                    # 4. Optimal Trade Entry
+                    if self.config.get('enable_optimal_trade_entry', True):
+                        ote_patterns = self._detect_optimal_trade_entry(batch, symbol, timeframe, cache=cache)
+                        patterns.extend(ote_patterns)
+                    # 5. Order Blocks
+                    ob_patterns = self._detect_order_blocks(batch, symbol, timeframe, cache=cache)
+                    patterns.extend(ob_patterns)
+                    # 6. Fair Value Gaps
+                    fvg_patterns = self._detect_fair_value_gaps(batch, symbol, timeframe, cache=cache)
+                    patterns.extend(fvg_patterns)
+
+                # Filtrar por confianza mínima
+                patterns = [p for p in patterns if getattr(p, 'strength', 0) >= self.config.get('min_confidence', 0)]
+
+                # SMART MONEY ENHANCEMENT v6.0
+                if patterns and getattr(self, '_smart_money_analyzer', None):
+                    patterns = self._enhance_with_smart_money_analysis(patterns, data)
+                # MULTI-TIMEFRAME ENHANCEMENT v6.0
+                if patterns:
+                    patterns = self._enhance_analysis_with_multi_tf(patterns, symbol, timeframe)
+
+                # Limitar número de patrones
+                max_patterns = self.config.get('max_patterns_per_analysis', 100)
+                if len(patterns) > max_patterns:
+                    patterns = sorted(patterns, key=lambda x: getattr(x, 'strength', 0), reverse=True)[:max_patterns]
+
+                # Actualizar métricas
+                analysis_time = time.time() - start_time
+                self._update_performance_metrics(analysis_time, len(patterns))
+                self.detected_patterns = patterns
+                self.last_analysis_time = datetime.now()
+                if trace is not None:
+                    trace.mark('patterns_detected')
+                    for pattern in patterns:
+                        raw_data = getattr(pattern, 'raw_data', None)
+                        if isinstance(raw_data, dict):
+                            raw_data.setdefault('trace_id', trace.trace_id)
+                return patterns
+            except Exception as e:
+                # Solo log crítico
+                import logging
+                logging.getLogger("PatternDetector").exception(f"Error en detección de patrones: {e}")
                 return []
 
-            # Vectorización: asegurar tipos y columnas
-            data = data.copy()
-            for col in ['open','high','low','close','volume']:
-                if col in data.columns:
-                    data[col] = pd.to_numeric(data[col], errors='coerce')
-
-            # LIMITACIÓN CRÍTICA: Reducir datos para evitar problemas de rendimiento
-            MAX_CANDLES_FOR_ANALYSIS = 500
-            if len(data) > MAX_CANDLES_FOR_ANALYSIS:
-                data = data.tail(MAX_CANDLES_FOR_ANALYSIS)
-
-            # Batching: procesar en bloques si es muy grande
-            batch_size = 250
-            batches = [data.iloc[i:i+batch_size] for i in range(0, len(data), batch_size)] if len(data) > batch_size else [data]
-
-            patterns = []
-            # Desactivar logging en hot paths (solo errores críticos)
-            # Detectores internos deben evitar prints/logs en bucles
-
-            # Cache: ejemplo de medias móviles para todos los detectores
-            cache = {}
-            if 'close' in data.columns:
-                cache['ma_20'] = data['close'].rolling(window=20, min_periods=1).mean().values
-                cache['ma_50'] = data['close'].rolling(window=50, min_periods=1).mean().values
-
-            # Procesar cada batch
-            for batch in batches:
-                # 1. Silver Bullet
-                if self.config.get('enable_silver_bullet', True):
-                    sb_patterns = self._detect_silver_bullet(batch, symbol, timeframe, cache=cache)
-                    patterns.extend(sb_patterns)
-                # 2. Judas Swing
-                if self.config.get('enable_judas_swing', True):
-                    js_patterns = self._detect_judas_swing(batch, symbol, timeframe, cache=cache)
-                    patterns.extend(js_patterns)
-                # 3. Liquidity Grab
-                if self.config.get('enable_liquidity_grab', True):
-                    lg_patterns = self._detect_liquidity_grab(batch, symbol, timeframe, cache=cache)
-                    patterns.extend(lg_patterns)
-                # 4. Optimal Trade Entry
-                if self.config.get('enable_optimal_trade_entry', True):
-                    ote_patterns = self._detect_optimal_trade_entry(batch, symbol, timeframe, cache=cache)
-                    patterns.extend(ote_patterns)
-                # 5. Order Blocks
-                ob_patterns = self._detect_order_blocks(batch, symbol, timeframe, cache=cache)
-                patterns.extend(ob_patterns)
-                # 6. Fair Value Gaps
-                fvg_patterns = self._detect_fair_value_gaps(batch, symbol, timeframe, cache=cache)
-                patterns.extend(fvg_patterns)
-
-            # Filtrar por confianza mínima
-            patterns = [p for p in patterns if getattr(p, 'strength', 0) >= self.config.get('min_confidence', 0)]
-
-            # SMART MONEY ENHANCEMENT v6.0
-            if patterns and getattr(self, '_smart_money_analyzer', None):
-                patterns = self._enhance_with_smart_money_analysis(patterns, data)
-            # MULTI-TIMEFRAME ENHANCEMENT v6.0
-            if patterns:
-                patterns = self._enhance_analysis_with_multi_tf(patterns, symbol, timeframe)
-
-            # Limitar número de patrones
-            max_patterns = self.config.get('max_patterns_per_analysis', 100)
-            if len(patterns) > max_patterns:
-                patterns = sorted(patterns, key=lambda x: getattr(x, 'strength', 0), reverse=True)[:max_patterns]
-
-            # Actualizar métricas
-            analysis_time = time.time() - start_time
-            self._update_performance_metrics(analysis_time, len(patterns))
-            self.detected_patterns = patterns
-            self.last_analysis_time = datetime.now()
-            return patterns
-        except Exception as e:
-            # Solo log crítico
-            import logging
-            logging.getLogger("PatternDetector").exception(f"Error en detección de patrones: {e}")
-            return []
-
     def detect_bos(self, market_data: Dict[str, Any], structure_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         🚀 DETECTAR BREAK OF STRUCTURE (BOS) - MIGRADO desde market_structure_v2.py
@@ -1434,7 +1451,7 @@ class PatternDetector:
             return {"alignment": "ERROR", "score": 0.0, "confluences": []}
 
     def _detect_swing_points_for_bos(self, candles: 'pandas.DataFrame', window: int = 5) -> Dict[str, List[Dict]]:
-        """🎯 Detecta swing points para análisis BOS (lógica MIGRADA)"""
+        """🎯 Detecta swing points para análisis BOS (kernel vectorizado compartido)"""
         try:
             swing_highs = []
             swing_lows = []
@@ -1442,41 +1459,24 @@ class PatternDetector:
             if len(candles) < window * 2 + 1:
                 return {'highs': swing_highs, 'lows': swing_lows}
 
-            # Detectar swing highs (lógica MIGRADA desde market_structure_v2.py)
-            for i in range(window, len(candles) - window):
-                current_high = candles.iloc[i]['high']
-
-                # Verificar que sea el máximo en la ventana
-                is_swing_high = True
-                for j in range(i - window, i + window + 1):
-                    if j != i and candles.iloc[j]['high'] >= current_high:
-                        is_swing_high = False
-                        break
+            from utils.swing_kernel import detect_swing_points
 
-                if is_swing_high:
-                    swing_highs.append({
-                        'index': i,
-                        'price': current_high,
-                        'timestamp': candles.index[i] if hasattr(candles.index[i], 'timestamp') else i
-                    })
+            swings = detect_swing_points(candles['high'].to_numpy(), candles['low'].to_numpy(), window)
+            index = candles.index
 
-            # Detectar swing lows (lógica MIGRADA desde market_structure_v2.py)
-            for i in range(window, len(candles) - window):
-                current_low = candles.iloc[i]['low']
+            for i, price in zip(swings.high_indices.tolist(), swings.high_prices.tolist()):
+                swing_highs.append({
+                    'index': i,
+                    'price': price,
+                    'timestamp': index[i] if hasattr(index[i], 'timestamp') else i
+                })
 
-                # Verificar que sea el mínimo en la ventana
-                is_swing_low = True
-                for j in range(i - window, i + window + 1):
-                    if j != i and candles.iloc[j]['low'] <= current_low:
-                        is_swing_low = False
-                        break
-
-                if is_swing_low:
-                    swing_lows.append({
-                        'index': i,
-                        'price': current_low,
-                        'timestamp': candles.index[i] if hasattr(candles.index[i], 'timestamp') else i
-                    })
+            for i, price in zip(swings.low_indices.tolist(), swings.low_prices.tolist()):
+                swing_lows.append({
+                    'index': i,
+                    'price': price,
+                    'timestamp': index[i] if hasattr(index[i], 'timestamp') else i
+                })
 
             print(f"[DEBUG] 🎯 Swing points BOS: {len(swing_highs)} highs, {len(swing_lows)} lows")
             return {'highs': swing_highs, 'lows': swing_lows}
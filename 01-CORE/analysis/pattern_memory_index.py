@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+🗂️ PATTERN MEMORY INDEX - ICT Engine v6.1.0 Enterprise
+======================================================
+
+Índice temporal de la memoria de patrones de UnifiedMemorySystem.
+
+- Timestamp de cada patrón parseado una sola vez a epoch (segundos)
+- Lista principal ordenada por (epoch, secuencia de alta)
+- Índices secundarios por símbolo, timeframe y pattern_type, también
+  ordenados por tiempo
+- Consultas de rango con bisect sobre la partición más pequeña que
+  cumple los filtros → O(log n + k) en lugar de recorrer toda la memoria
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+IndexEntry = Tuple[float, int]  # (epoch, seq)
+
+
+def pattern_epoch(timestamp: Any) -> Optional[float]:
+    """
+    Epoch de un timestamp de patrón (None si falta o no es válido).
+
+    Acepta ISO ('T', 'Z'), 'YYYY-mm-dd HH:MM:SS', datetime o número epoch.
+    Los timestamps sin zona horaria se interpretan en hora local, igual que
+    datetime.now() en las consultas originales.
+    """
+    try:
+        if isinstance(timestamp, datetime):
+            return timestamp.timestamp()
+        if isinstance(timestamp, (int, float)) and not isinstance(timestamp, bool):
+            return float(timestamp)
+        if not timestamp or not isinstance(timestamp, str):
+            return None
+        if 'T' in timestamp:
+            return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp()
+        return datetime.strptime(timestamp, '%Y-%m-%d %H:%M:%S').timestamp()
+    except (ValueError, TypeError, OverflowError, OSError):
+        return None
+
+
+class _TimeSeriesPartition:
+    """Entradas de una partición ordenadas por (epoch, seq)."""
+
+    __slots__ = ('keys',)
+
+    def __init__(self) -> None:
+        self.keys: List[IndexEntry] = []
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, entry: IndexEntry) -> None:
+        # Caso habitual: patrones llegan en orden temporal → append O(1)
+        if not self.keys or entry >= self.keys[-1]:
+            self.keys.append(entry)
+        else:
+            self.keys.insert(bisect_right(self.keys, entry), entry)
+
+    def remove(self, entry: IndexEntry) -> bool:
+        pos = bisect_left(self.keys, entry)
+        if pos < len(self.keys) and self.keys[pos] == entry:
+            del self.keys[pos]
+            return True
+        return False
+
+    def between(self, start: Optional[float], end: Optional[float]) -> List[IndexEntry]:
+        lo = 0 if start is None else bisect_left(self.keys, (start, -1))
+        hi = len(self.keys) if end is None else bisect_right(self.keys, (end, float('inf')))
+        return self.keys[lo:hi]
+
+
+class PatternMemoryIndex:
+    """Memoria de patrones ordenada por tiempo con índices por symbol/timeframe/pattern_type."""
+
+    FIELDS = ('symbol', 'timeframe', 'pattern_type')
+
+    def __init__(self) -> None:
+        self._seq = 0
+        self._timeline = _TimeSeriesPartition()
+        self._records: Dict[int, Dict[str, Any]] = {}
+        self._entries: Dict[int, IndexEntry] = {}  # id(record) -> entry
+        self._secondary: Dict[str, Dict[Any, _TimeSeriesPartition]] = {f: {} for f in self.FIELDS}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, record: Dict[str, Any]) -> bool:
+        return id(record) in self._entries
+
+    def add(self, record: Dict[str, Any]) -> bool:
+        """Indexa un patrón; sin timestamp válido no se indexa (nunca cumpliría un rango)."""
+        if id(record) in self._entries:
+            return False
+        epoch = pattern_epoch(record.get('timestamp'))
+        if epoch is None:
+            return False
+        entry = (epoch, self._seq)
+        self._seq += 1
+        self._timeline.add(entry)
+        self._records[entry[1]] = record
+        self._entries[id(record)] = entry
+        for field_name in self.FIELDS:
+            value = record.get(field_name)
+            partitions = self._secondary[field_name]
+            partition = partitions.get(value)
+            if partition is None:
+                partition = partitions[value] = _TimeSeriesPartition()
+            partition.add(entry)
+        return True
+
+    def remove(self, record: Dict[str, Any]) -> bool:
+        entry = self._entries.pop(id(record), None)
+        if entry is None:
+            return False
+        self._timeline.remove(entry)
+        del self._records[entry[1]]
+        for field_name in self.FIELDS:
+            partitions = self._secondary[field_name]
+            value = record.get(field_name)
+            partition = partitions.get(value)
+            if partition is not None:
+                partition.remove(entry)
+                if not partition:
+                    del partitions[value]
+        return True
+
+    def rebuild(self, records: Iterable[Dict[str, Any]]) -> None:
+        self.__init__()
+        for record in records:
+            self.add(record)
+
+    def query(self, start: Optional[float] = None, end: Optional[float] = None,
+              symbol: Optional[str] = None, timeframe: Optional[str] = None,
+              pattern_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Patrones con epoch en [start, end] que cumplen los filtros, en orden temporal.
+
+        Se bisecta la partición más pequeña entre los filtros dados y el resto
+        de criterios se comprueba solo sobre ese tramo.
+        """
+        filters = {name: value for name, value in
+                   (('symbol', symbol), ('timeframe', timeframe), ('pattern_type', pattern_type))
+                   if value}
+        partition = self._timeline
+        driver = None
+        for name, value in filters.items():
+            candidate = self._secondary[name].get(value)
+            if candidate is None:
+                return []
+            if driver is None or len(candidate) < len(partition):
+                partition, driver = candidate, name
+
+        results = []
+        for _, seq in partition.between(start, end):
+            record = self._records[seq]
+            if all(record.get(name) == value for name, value in filters.items() if name != driver):
+                results.append(record)
+        return results
+
+    def latest(self, count: int, start: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Los `count` patrones más recientes (desde `start`), en orden temporal."""
+        entries = self._timeline.between(start, None)
+        return [self._records[seq] for _, seq in entries[-count:]] if count > 0 else []
+
+
+__all__ = ['PatternMemoryIndex', 'pattern_epoch']
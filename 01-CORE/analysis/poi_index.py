@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+🗂️ POI PRICE INDEX - ICT Engine v6.1.0 Enterprise
+=================================================
+
+Índice de POIs ordenado por precio para consultas de proximidad sin
+recorrer todos los POIs activos.
+
+- Particiones por (símbolo, tipo de POI); cada una mantiene dos listas
+  ordenadas (bisect): por price_level y por límite inferior de zona.
+- near(): POIs con |price_level - price| <= distance → O(log n + k) por
+  partición consultada.
+- containing(): POIs cuya zona (low, high) contiene el precio; se acota la
+  búsqueda con la anchura máxima de zona de la partición.
+- ExpiryHeap: heap por expiry_time con borrado perezoso; los barridos de
+  expiración solo tocan los POIs vencidos.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+def _zone_bounds(poi: Any) -> Tuple[float, float]:
+    zone = getattr(poi, 'price_zone', None) or (poi.price_level, poi.price_level)
+    low, high = float(zone[0]), float(zone[1])
+    return (low, high) if low <= high else (high, low)
+
+
+class _Partition:
+    """POIs de un (símbolo, tipo) ordenados por nivel y por zona."""
+
+    __slots__ = ('levels', 'by_level', 'lows', 'by_low', 'max_width')
+
+    def __init__(self) -> None:
+        self.levels: List[Tuple[float, int]] = []
+        self.by_level: Dict[int, Any] = {}
+        self.lows: List[Tuple[float, int]] = []
+        self.by_low: Dict[int, Tuple[float, float]] = {}
+        self.max_width = 0.0
+
+    def add(self, poi: Any) -> None:
+        key = id(poi)
+        low, high = _zone_bounds(poi)
+        insort(self.levels, (float(poi.price_level), key))
+        insort(self.lows, (low, key))
+        self.by_level[key] = poi
+        self.by_low[key] = (low, high)
+        self.max_width = max(self.max_width, high - low)
+
+    def remove(self, poi: Any, level: float) -> None:
+        key = id(poi)
+        low, _ = self.by_low.pop(key)
+        del self.by_level[key]
+        idx = bisect_left(self.levels, (level, key))
+        if idx < len(self.levels) and self.levels[idx][1] == key:
+            del self.levels[idx]
+        idx = bisect_left(self.lows, (low, key))
+        if idx < len(self.lows) and self.lows[idx][1] == key:
+            del self.lows[idx]
+        if not self.levels:
+            self.max_width = 0.0
+
+    def near(self, price: float, distance: float) -> Iterable[Any]:
+        lo = bisect_left(self.levels, (price - distance, -1))
+        hi = bisect_right(self.levels, (price + distance, float('inf')))
+        for _, key in self.levels[lo:hi]:
+            yield self.by_level[key]
+
+    def containing(self, price: float) -> Iterable[Any]:
+        lo = bisect_left(self.lows, (price - self.max_width, -1))
+        hi = bisect_right(self.lows, (price, float('inf')))
+        for _, key in self.lows[lo:hi]:
+            if self.by_low[key][1] >= price:
+                yield self.by_level[key]
+
+
+class POIPriceIndex:
+    """Índice por precio de POIs, particionado por símbolo y tipo."""
+
+    def __init__(self) -> None:
+        self._partitions: Dict[Tuple[str, Any], _Partition] = {}
+        # id(poi) -> (clave de partición, nivel indexado)
+        self._entries: Dict[int, Tuple[Tuple[str, Any], float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, poi: Any) -> bool:
+        return id(poi) in self._entries
+
+    def add(self, poi: Any) -> None:
+        if id(poi) in self._entries:
+            return
+        key = (poi.symbol, poi.poi_type)
+        partition = self._partitions.get(key)
+        if partition is None:
+            partition = self._partitions[key] = _Partition()
+        partition.add(poi)
+        self._entries[id(poi)] = (key, float(poi.price_level))
+
+    def remove(self, poi: Any) -> bool:
+        entry = self._entries.pop(id(poi), None)
+        if entry is None:
+            return False
+        key, level = entry
+        partition = self._partitions[key]
+        partition.remove(poi, level)
+        if not partition.by_level:
+            del self._partitions[key]
+        return True
+
+    def _select(self, symbol: Optional[str], poi_type: Any) -> Iterable[_Partition]:
+        if symbol is not None and poi_type is not None:
+            partition = self._partitions.get((symbol, poi_type))
+            return [partition] if partition is not None else []
+        return [p for (sym, ptype), p in self._partitions.items()
+                if (symbol is None or sym == symbol) and (poi_type is None or ptype == poi_type)]
+
+    def near(self, price: float, distance: float, symbol: Optional[str] = None,
+             poi_type: Any = None) -> List[Any]:
+        """POIs con price_level a <= distance del precio, ordenados por proximidad."""
+        found = [poi for partition in self._select(symbol, poi_type)
+                 for poi in partition.near(price, distance)]
+        found.sort(key=lambda poi: abs(poi.price_level - price))
+        return found
+
+    def containing(self, price: float, symbol: Optional[str] = None,
+                   poi_type: Any = None) -> List[Any]:
+        """POIs cuya zona (low, high) contiene el precio."""
+        return [poi for partition in self._select(symbol, poi_type)
+                for poi in partition.containing(price)]
+
+    def clear(self) -> None:
+        self._partitions.clear()
+        self._entries.clear()
+
+
+class ExpiryHeap:
+    """Heap de expiración (expiry_time, seq, poi) con borrado perezoso."""
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[datetime, int, Any]] = []
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, poi: Any) -> None:
+        if poi.expiry_time is not None:
+            heapq.heappush(self._heap, (poi.expiry_time, next(self._seq), poi))
+
+    def next_expiry(self, alive: Any = None) -> Optional[datetime]:
+        """Próxima expiración; con alive descarta antes las entradas retiradas."""
+        heap = self._heap
+        while alive is not None and heap and heap[0][2] not in alive:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def pop_due(self, now: datetime) -> List[Any]:
+        """POIs con expiry_time < now (incluye entradas ya retiradas: filtrar fuera)."""
+        due = []
+        heap = self._heap
+        while heap and heap[0][0] < now:
+            due.append(heapq.heappop(heap)[2])
+        return due
+
+    def compact(self, alive: Any) -> None:
+        """Descarta entradas de POIs que ya no están activos."""
+        self._heap = [entry for entry in self._heap if entry[2] in alive]
+        heapq.heapify(self._heap)
+
+
+__all__ = ['POIPriceIndex', 'ExpiryHeap']
@@ -30,6 +30,8 @@ import numpy as np
 # ThreadSafe pandas import para runtime
 from data_management.advanced_candle_downloader import _pandas_manager
 
+from analysis.poi_index import POIPriceIndex, ExpiryHeap
+
 # Import pandas solo para tipado estático
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
@@ -188,6 +190,10 @@ class POISystem:
         self.historical_pois: List[POI] = []
         self.poi_cache = {}
         
+        # Índice por precio + heap de expiración de los POIs activos
+        self._poi_index = POIPriceIndex()
+        self._expiry_heap = ExpiryHeap()
+        
         # Métricas
         self.performance_metrics = {
             'total_pois_created': 0,
@@ -388,7 +394,7 @@ class POISystem:
                 detected_pois = detected_pois[:max_pois]
             
             # Añadir a POIs activos
-            self.active_pois.extend(detected_pois)
+            self._register_pois(detected_pois)
             
             # Limpiar POIs antiguos
             self._cleanup_expired_pois()
@@ -1066,47 +1072,53 @@ class POISystem:
         return pois
     
     def _remove_duplicate_pois(self, pois: List[POI]) -> List[POI]:
-        """Eliminar POIs duplicados o muy cercanos"""
+        """Eliminar POIs duplicados o muy cercanos (mismo tipo, índice por precio)"""
         if not pois:
             return pois
         
-        filtered_pois = []
         proximity_threshold = self.config['proximity_threshold']
+        index = POIPriceIndex()
+        order: Dict[int, int] = {}  # id(poi) -> orden en la lista filtrada
         
-        for poi in pois:
-            is_duplicate = False
-            
-            for existing_poi in filtered_pois:
-                distance = abs(poi.price_level - existing_poi.price_level)
-                
-                if (distance <= proximity_threshold and 
-                    poi.poi_type == existing_poi.poi_type):
-                    # Es duplicado, mantener el de mayor strength
-                    if poi.strength > existing_poi.strength:
-                        filtered_pois.remove(existing_poi)
-                        filtered_pois.append(poi)
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                filtered_pois.append(poi)
+        for seq, poi in enumerate(pois):
+            candidates = [c for c in index.near(poi.price_level, proximity_threshold, poi.symbol, poi.poi_type)
+                          if abs(poi.price_level - c.price_level) <= proximity_threshold]
+            if not candidates:
+                index.add(poi)
+                order[id(poi)] = seq
+                continue
+            # Es duplicado (del primero en la lista), mantener el de mayor strength
+            existing_poi = min(candidates, key=lambda c: order[id(c)])
+            if poi.strength > existing_poi.strength:
+                index.remove(existing_poi)
+                del order[id(existing_poi)]
+                index.add(poi)
+                order[id(poi)] = seq
         
-        return filtered_pois
+        return sorted((poi for poi in pois if id(poi) in order), key=lambda p: order[id(p)])
     
     def _calculate_confluences(self, pois: List[POI]) -> List[POI]:
-        """Calcular confluencias entre POIs"""
+        """Calcular confluencias entre POIs (ventana por precio sobre niveles ordenados)"""
+        if not pois:
+            return pois
         proximity_threshold = self.config['proximity_threshold'] * 2  # Mayor tolerancia para confluencias
         
+        # Confluencias solo entre POIs del mismo símbolo
+        by_symbol: Dict[str, List[int]] = {}
         for i, poi in enumerate(pois):
-            confluent_pois = []
-            
-            for j, other_poi in enumerate(pois):
-                if i != j:
-                    distance = abs(poi.price_level - other_poi.price_level)
-                    
-                    if distance <= proximity_threshold:
-                        confluent_pois.append(other_poi.poi_type.value)
-            
+            by_symbol.setdefault(poi.symbol, []).append(i)
+        
+        confluences: List[List[str]] = [[] for _ in pois]
+        for indices in by_symbol.values():
+            ordered = sorted(indices, key=lambda i: pois[i].price_level)
+            levels = np.array([pois[i].price_level for i in ordered], dtype=float)
+            lows = np.searchsorted(levels, levels - proximity_threshold, side='left')
+            highs = np.searchsorted(levels, levels + proximity_threshold, side='right')
+            for pos, i in enumerate(ordered):
+                confluences[i] = [pois[ordered[k]].poi_type.value
+                                  for k in range(lows[pos], highs[pos]) if k != pos]
+        
+        for poi, confluent_pois in zip(pois, confluences):
             if confluent_pois:
                 poi.confluences.extend([f"confluence_with_{t}" for t in set(confluent_pois)])
                 # Bonus de strength por confluencias
@@ -1121,26 +1133,58 @@ class POISystem:
         
         return pois
     
-    def _cleanup_expired_pois(self):
-        """Limpiar POIs expirados"""
-        current_time = datetime.now()
-        
-        # Mover POIs expirados a histórico
+    def _register_pois(self, pois: List[POI]) -> None:
+        """Añadir POIs a la lista activa, al índice por precio y al heap de expiración"""
+        for poi in pois:
+            if poi in self._poi_index:
+                continue
+            self.active_pois.append(poi)
+            self._poi_index.add(poi)
+            self._expiry_heap.push(poi)
+    
+    def _retire_pois(self, retired: List[POI]) -> None:
+        """Mover POIs ya marcados (EXPIRED/INVALIDATED) a histórico"""
+        if not retired:
+            return
+        for poi in retired:
+            self._poi_index.remove(poi)
+        retired_ids = {id(poi) for poi in retired}
+        self.active_pois = [poi for poi in self.active_pois if id(poi) not in retired_ids]
+        self.historical_pois.extend(retired)
+        # Entradas huérfanas del heap (POIs invalidados antes de expirar)
+        if len(self._expiry_heap) > 2 * len(self._poi_index) + 64:
+            self._expiry_heap.compact(self._poi_index)
+    
+    def _expire_due_pois(self, current_time: Optional[datetime] = None) -> List[POI]:
+        """Expirar solo los POIs vencidos según el heap (O(1) si no hay ninguno)"""
+        current_time = current_time or datetime.now()
         expired_pois = []
-        active_pois = []
-        
-        for poi in self.active_pois:
-            if poi.expiry_time and current_time > poi.expiry_time:
+        for poi in self._expiry_heap.pop_due(current_time):
+            if poi in self._poi_index and poi.status == POIStatus.ACTIVE:
                 poi.status = POIStatus.EXPIRED
                 expired_pois.append(poi)
-            elif poi.test_count >= poi.max_tests:
-                poi.status = POIStatus.INVALIDATED
-                expired_pois.append(poi)
-            else:
-                active_pois.append(poi)
+        self._retire_pois(expired_pois)
+        return expired_pois
+    
+    def record_poi_test(self, poi: POI, tested_at: Optional[datetime] = None) -> bool:
+        """
+        Registrar un test del precio sobre un POI; lo invalida al llegar a max_tests.
         
-        self.active_pois = active_pois
-        self.historical_pois.extend(expired_pois)
+        Returns:
+            True si el POI sigue activo
+        """
+        poi.test_count += 1
+        poi.last_tested = tested_at or datetime.now()
+        if poi.test_count >= poi.max_tests and poi in self._poi_index:
+            poi.status = POIStatus.INVALIDATED
+            self._retire_pois([poi])
+            return False
+        return poi.status == POIStatus.ACTIVE
+    
+    def _cleanup_expired_pois(self):
+        """Limpiar POIs expirados (heap de expiry_time)"""
+        # Las invalidaciones por tests se aplican en record_poi_test()
+        expired_pois = self._expire_due_pois()
         
         if expired_pois:
             print(f"[INFO] {len(expired_pois)} POIs movidos a histórico")
@@ -1169,18 +1213,18 @@ class POISystem:
             return [poi for poi in self.active_pois if poi.poi_type == poi_type]
         return self.active_pois.copy()
     
-    def get_pois_near_price(self, price: float, distance: float = 0.0020) -> List[POI]:
-        """Obtener POIs cercanos a un precio específico"""
-        nearby_pois = []
-        
-        for poi in self.active_pois:
-            if abs(poi.price_level - price) <= distance:
-                nearby_pois.append(poi)
-        
-        # Ordenar por proximidad
-        nearby_pois.sort(key=lambda x: abs(x.price_level - price))
-        
-        return nearby_pois
+    def get_pois_near_price(self, price: float, distance: float = 0.0020,
+                            symbol: Optional[str] = None,
+                            poi_type: Optional[POIType] = None) -> List[POI]:
+        """Obtener POIs cercanos a un precio específico (ordenados por proximidad)"""
+        self._expire_due_pois()
+        return self._poi_index.near(price, distance, symbol, poi_type)
+    
+    def get_pois_at_price(self, price: float, symbol: Optional[str] = None,
+                          poi_type: Optional[POIType] = None) -> List[POI]:
+        """Obtener POIs cuya zona (low, high) contiene el precio"""
+        self._expire_due_pois()
+        return self._poi_index.containing(price, symbol, poi_type)
     
     def get_poi_summary(self) -> Dict[str, Any]:
         """Obtener resumen del estado del sistema POI"""
@@ -1209,8 +1253,7 @@ class POISystem:
         avg_strength = sum(poi.strength for poi in self.active_pois) / len(self.active_pois)
         
         # Próxima expiración
-        expiry_times = [poi.expiry_time for poi in self.active_pois if poi.expiry_time]
-        next_expiry = min(expiry_times) if expiry_times else None
+        next_expiry = self._expiry_heap.next_expiry(self._poi_index)
         
         return {
             'total_active': len(self.active_pois),
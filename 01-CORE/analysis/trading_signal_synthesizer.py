@@ -50,6 +50,12 @@ try:
 except ImportError:
     ANALYSIS_ENGINES_AVAILABLE = False
 
+# Order tracing (signal→fill) - optional
+try:
+    from monitoring.order_tracing import trace_scope
+except Exception:
+    trace_scope = None
+
 
 class TradingSignal(Enum):
     """🎯 Trading signal types"""
@@ -186,7 +192,8 @@ class TradingSignalSynthesizer:
         
         self.logger.info("🎯 Trading Signal Synthesizer v6.1 initialized")
     
-    def synthesize_trading_signals(self, candles, symbol: str, timeframe: str) -> TradeSetup:
+    def synthesize_trading_signals(self, candles, symbol: str, timeframe: str,
+                                   trace: Any = None) -> TradeSetup:
         """
         🎯 Main signal synthesis method
         
@@ -194,10 +201,19 @@ class TradingSignalSynthesizer:
             candles: OHLC price data
             symbol: Trading symbol
             timeframe: Analysis timeframe
+            trace: OrderTrace to continue (e.g. find_trace(pattern.raw_data['trace_id']));
+                   defaults to the active trace for the symbol or a new one
             
         Returns:
             TradeSetup: Complete trade setup with signals
         """
+        if trace_scope is None:
+            return self._synthesize_trading_signals(candles, symbol, timeframe, None)
+        # The trace is current only while synthesizing; metadata['trace_id'] carries it on
+        with trace_scope('signal_synthesizer', symbol=symbol, trace=trace, timeframe=timeframe) as active:
+            return self._synthesize_trading_signals(candles, symbol, timeframe, active)
+
+    def _synthesize_trading_signals(self, candles, symbol: str, timeframe: str, trace: Any) -> TradeSetup:
         start_time = time.time()
         setup_id = f"TS_{symbol}_{timeframe}_{int(time.time())}"
         
@@ -271,9 +287,12 @@ class TradingSignalSynthesizer:
                 metadata={
                     'confluence_analysis_id': confluence_analysis.confluence_id if confluence_analysis else None,
                     'structure_analysis_id': structure_analysis.analysis_id if structure_analysis else None,
-                    'version': '6.1'
+                    'version': '6.1',
+                    'trace_id': trace.trace_id if trace is not None else None
                 }
             )
+            if trace is not None:
+                trace.mark('signal_synthesized')
             
             # Update session statistics
             self._update_session_stats(trade_setup, processing_time)
@@ -32,6 +32,7 @@ import statistics
 # ✅ REGLA #4: SIC v3.1 + SLUC v2.1 obligatorio
 # SICBridge existe pero no es necesario aquí - usamos componentes directos
 from smart_trading_logger import log_trading_decision_smart_v6, get_trading_decision_cache
+from analysis.pattern_memory_index import PatternMemoryIndex
 
 # ✅ REGLA #1: Usar componentes REALES del sistema con type annotations
 if TYPE_CHECKING:
@@ -131,7 +132,8 @@ class UnifiedMemorySystem:
             self.unified_memory = None
 
         # === MEMORIA DE PATRONES ===
-        self.pattern_memory = []  # Lista para almacenar patrones históricos
+        self.pattern_memory = []  # Lista para almacenar patrones históricos (orden de alta)
+        self.pattern_index = PatternMemoryIndex()  # Epochs pre-parseados + índices symbol/timeframe/tipo
         
         # === ESTADO DEL SISTEMA DINÁMICO ===
         self.system_state = {
@@ -689,6 +691,110 @@ class UnifiedMemorySystem:
             'recommendation': f"Risk managed by {experience_weight*100:.0f}% trader experience"
         }
 
+    def store_pattern_memory(self, symbol: str, pattern_data: Dict[str, Any]) -> bool:
+        """
+        💾 Almacena patrones en memoria del sistema
+        
+        Args:
+            symbol: Símbolo del instrumento
+            pattern_data: Datos del patrón a almacenar
+            
+        Returns:
+            bool: True si se almacenó correctamente
+        """
+        try:
+            # Agregar timestamp si no existe
+            if 'timestamp' not in pattern_data:
+                pattern_data['timestamp'] = datetime.now(timezone.utc).isoformat()
+            
+            # Agregar símbolo si no existe
+            if 'symbol' not in pattern_data:
+                pattern_data['symbol'] = symbol
+            
+            # Almacenar en memoria
+            self.pattern_memory.append(pattern_data)
+            self.pattern_index.add(pattern_data)
+            
+            # Mantener solo los últimos 1000 patrones para eficiencia
+            if len(self.pattern_memory) > 1000:
+                for evicted in self.pattern_memory[:-1000]:
+                    self.pattern_index.remove(evicted)
+                del self.pattern_memory[:-1000]
+            
+            log_trading_decision_smart_v6("PATTERN_STORED_MEMORY", {
+                "symbol": symbol,
+                "pattern_type": pattern_data.get("type", "unknown"),
+                "memory_size": len(self.pattern_memory)
+            })
+            
+            return True
+            
+        except Exception as e:
+            log_trading_decision_smart_v6("PATTERN_STORE_ERROR", {
+                "symbol": symbol,
+                "error": str(e)
+            })
+            return False
+
+    def get_historical_patterns(self, pattern_type: Optional[str] = None, timeframe: Optional[str] = None,
+                                symbol: Optional[str] = None, lookback_days: int = 30,
+                                session: Optional[str] = None,
+                                min_confidence: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        🔍 Patrones de memoria de los últimos lookback_days, en orden temporal
+
+        El rango temporal y los filtros symbol/timeframe/pattern_type se resuelven
+        con pattern_index.query; session y min_confidence se comprueban solo
+        sobre ese tramo.
+
+        Args:
+            pattern_type: Tipo de patrón (opcional)
+            timeframe: Marco temporal (opcional)
+            symbol: Símbolo (opcional)
+            lookback_days: Días hacia atrás
+            session: Sesión del patrón, p.ej. 'london' (opcional, sin distinguir mayúsculas)
+            min_confidence: Confianza mínima 0-1; confianzas en % se normalizan (opcional)
+
+        Returns:
+            List[Dict]: Patrones encontrados (vacía si no hay o hay error)
+        """
+        try:
+            patterns = self.pattern_index.query(
+                start=time.time() - lookback_days * 86400,
+                symbol=symbol,
+                timeframe=timeframe,
+                pattern_type=pattern_type
+            )
+            if session:
+                wanted = str(session).lower()
+                patterns = [p for p in patterns if str(p.get('session', '')).lower() == wanted]
+            if min_confidence is not None:
+                patterns = [p for p in patterns if self._pattern_confidence(p) >= min_confidence]
+
+            log_trading_decision_smart_v6("HISTORICAL_PATTERNS_RETRIEVED", {
+                "query": f"type={pattern_type}, tf={timeframe}, symbol={symbol}, session={session}",
+                "patterns_found": len(patterns),
+                "lookback_days": lookback_days,
+                "total_memory_patterns": len(self.pattern_memory)
+            })
+            return patterns
+
+        except Exception as e:
+            log_trading_decision_smart_v6("HISTORICAL_PATTERNS_ERROR", {
+                "pattern_type": pattern_type,
+                "error": str(e)
+            })
+            return []
+
+    @staticmethod
+    def _pattern_confidence(pattern: Dict[str, Any]) -> float:
+        """Confianza 0-1 del patrón (acepta porcentajes 0-100)"""
+        try:
+            confidence = float(pattern.get('confidence', 0.0))
+        except (TypeError, ValueError):
+            return 0.0
+        return confidence / 100.0 if confidence > 1.0 else confidence
+
 class MemoryPersistenceManager:
     """💾 Gestor de persistencia de memoria como trader real"""
     
@@ -764,6 +870,16 @@ class TraderConfidenceEvaluator:
         self.unified_system = unified_system
         self.base_confidence = unified_system.memory_config.get('confidence_threshold', 0.7)
     
+    @property
+    def pattern_memory(self) -> List[Dict[str, Any]]:
+        """Memoria de patrones del UnifiedMemorySystem (orden de alta)"""
+        return self.unified_system.pattern_memory
+    
+    @property
+    def pattern_index(self) -> PatternMemoryIndex:
+        """Índice temporal de la memoria de patrones"""
+        return self.unified_system.pattern_index
+    
     def evaluate_insight_confidence(self, insights: Dict[str, Any]) -> float:
         """Evalúa confianza de insight"""
         experience_factor = self.unified_system.system_state['trader_experience_level'] / 10.0
@@ -1348,6 +1464,7 @@ class TraderConfidenceEvaluator:
         🔍 Obtiene patrones históricos desde la memoria del sistema
         
         Método requerido por SmartMoneyAnalyzer para análisis institucional.
+        La consulta la resuelve UnifiedMemorySystem.get_historical_patterns.
         
         Args:
             pattern_type: Tipo de patrón a buscar (opcional)
@@ -1359,45 +1476,12 @@ class TraderConfidenceEvaluator:
             Dict con patrones históricos encontrados
         """
         try:
-            historical_data = []
-            from datetime import timedelta
-            cutoff_date = datetime.now() - timedelta(days=lookback_days)
-            
-            # Buscar en memoria de patrones
-            for stored_pattern in self.pattern_memory:
-                try:
-                    pattern_timestamp = stored_pattern.get('timestamp', '')
-                    if pattern_timestamp:
-                        # Intentar parsear timestamp
-                        if 'T' in pattern_timestamp:
-                            pattern_date = datetime.fromisoformat(pattern_timestamp.replace('Z', '+00:00'))
-                        else:
-                            pattern_date = datetime.strptime(pattern_timestamp, '%Y-%m-%d %H:%M:%S')
-                    else:
-                        continue  # Skip patterns without timestamp
-                        
-                    if pattern_date >= cutoff_date:
-                        # Filtrar por criterios
-                        if pattern_type and stored_pattern.get('pattern_type') != pattern_type:
-                            continue
-                        if timeframe and stored_pattern.get('timeframe') != timeframe:
-                            continue  
-                        if symbol and stored_pattern.get('symbol') != symbol:
-                            continue
-                            
-                        historical_data.append(stored_pattern)
-                        
-                except (ValueError, TypeError) as e:
-                    # Skip patterns with invalid timestamps
-                    continue
-            
-            # Log successful retrieval
-            log_trading_decision_smart_v6("HISTORICAL_PATTERNS_RETRIEVED", {
-                "query": f"type={pattern_type}, tf={timeframe}, symbol={symbol}",
-                "patterns_found": len(historical_data),
-                "lookback_days": lookback_days,
-                "total_memory_patterns": len(self.pattern_memory)
-            })
+            historical_data = self.unified_system.get_historical_patterns(
+                pattern_type=pattern_type,
+                timeframe=timeframe,
+                symbol=symbol,
+                lookback_days=lookback_days
+            )
             
             return {
                 'patterns': historical_data,
@@ -1547,46 +1631,8 @@ class TraderConfidenceEvaluator:
             return 'unknown'
 
     def store_pattern_memory(self, symbol: str, pattern_data: Dict[str, Any]) -> bool:
-        """
-        💾 Almacena patrones en memoria del sistema
-        
-        Args:
-            symbol: Símbolo del instrumento
-            pattern_data: Datos del patrón a almacenar
-            
-        Returns:
-            bool: True si se almacenó correctamente
-        """
-        try:
-            # Agregar timestamp si no existe
-            if 'timestamp' not in pattern_data:
-                pattern_data['timestamp'] = datetime.now(timezone.utc).isoformat()
-            
-            # Agregar símbolo si no existe
-            if 'symbol' not in pattern_data:
-                pattern_data['symbol'] = symbol
-            
-            # Almacenar en memoria
-            self.pattern_memory.append(pattern_data)
-            
-            # Mantener solo los últimos 1000 patrones para eficiencia
-            if len(self.pattern_memory) > 1000:
-                self.pattern_memory = self.pattern_memory[-1000:]
-            
-            log_trading_decision_smart_v6("PATTERN_STORED_MEMORY", {
-                "symbol": symbol,
-                "pattern_type": pattern_data.get("type", "unknown"),
-                "memory_size": len(self.pattern_memory)
-            })
-            
-            return True
-            
-        except Exception as e:
-            log_trading_decision_smart_v6("PATTERN_STORE_ERROR", {
-                "symbol": symbol,
-                "error": str(e)
-            })
-            return False
+        """💾 Almacena patrones en la memoria del UnifiedMemorySystem propietario"""
+        return self.unified_system.store_pattern_memory(symbol, pattern_data)
 
 # === INSTANCIA GLOBAL FASE 2 ===
 _unified_memory_system: Optional[UnifiedMemorySystem] = None
@@ -2,11 +2,28 @@
 """
 Event Bus - ICT Engine v6.0 Enterprise
 Thread-safe publicador/suscriptor ligero para desacoplar módulos.
+
+Modos de despacho:
+- sync (por defecto): los handlers se ejecutan en el hilo del publicador.
+- async: cola acotada por topic + pool de workers; publish() solo encola.
+  Políticas de backpressure: drop_oldest | coalesce (último por key) | block.
+
+Suscripciones con comodín resueltas vía trie (segmentos separados por '.'):
+- 'a.*.c' → '*' intermedio = exactamente un segmento
+- 'a.b.*' → '*' final = uno o más segmentos (prefijo)
+- '*'     → todos los topics
+La resolución topic → handlers se cachea (acotada a RESOLVED_CACHE_LIMIT topics)
+y se invalida al (des)suscribir.
+
+Prioridades: subscribe(..., priority=N) ordena los handlers (mayor primero);
+set_topic_priority(topic, N) hace que los workers atiendan antes ese topic.
 """
 from __future__ import annotations
 from protocols.unified_logging import get_unified_logger
-from typing import Callable, Dict, List, Any, DefaultDict
-from collections import defaultdict
+from typing import Callable, Dict, List, Any, DefaultDict, Deque, Optional, Tuple
+from collections import defaultdict, deque
+import heapq
+import itertools
 import threading
 import time
 
@@ -25,58 +42,396 @@ except Exception:  # pragma: no cover
 
 EventHandler = Callable[[str, Any], None]
 
+DISPATCH_SYNC = "sync"
+DISPATCH_ASYNC = "async"
+BACKPRESSURE_DROP_OLDEST = "drop_oldest"
+BACKPRESSURE_COALESCE = "coalesce"
+BACKPRESSURE_BLOCK = "block"
+_BACKPRESSURE_POLICIES = (BACKPRESSURE_DROP_OLDEST, BACKPRESSURE_COALESCE, BACKPRESSURE_BLOCK)
+
+WILDCARD = "*"
+RESOLVED_CACHE_LIMIT = 4096
+
+
+class _LatencyHistogram:
+    """Histograma log2 en microsegundos (memoria fija) para latencia de handlers."""
+    BUCKETS = 32  # bucket i cubre [2^(i-1), 2^i) µs; último bucket ≈ 35 min
+
+    __slots__ = ("counts", "count", "total_us", "max_us")
+
+    def __init__(self) -> None:
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.total_us = 0.0
+        self.max_us = 0.0
+
+    def record(self, elapsed_us: float) -> None:
+        idx = min(int(elapsed_us).bit_length(), self.BUCKETS - 1)
+        self.counts[idx] += 1
+        self.count += 1
+        self.total_us += elapsed_us
+        if elapsed_us > self.max_us:
+            self.max_us = elapsed_us
+
+    def percentile(self, pct: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = pct / 100.0 * self.count
+        seen = 0
+        for idx, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                # Límite superior del bucket, acotado por el máximo observado
+                return min(float(1 << idx), self.max_us)
+        return self.max_us
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'avg_us': self.total_us / self.count if self.count else 0.0,
+            'p50_us': self.percentile(50),
+            'p90_us': self.percentile(90),
+            'p99_us': self.percentile(99),
+            'max_us': self.max_us,
+        }
+
+
+class _TopicTrie:
+    """Trie de patrones de suscripción por segmentos."""
+
+    __slots__ = ("children", "handlers")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _TopicTrie] = {}
+        self.handlers: List[Tuple[int, EventHandler]] = []
+
+    def insert(self, segments: List[str], handler: EventHandler, priority: int = 0) -> None:
+        node = self
+        for seg in segments:
+            node = node.children.setdefault(seg, _TopicTrie())
+        node.handlers.append((priority, handler))
+
+    def remove(self, segments: List[str], handler: EventHandler) -> bool:
+        node = self
+        for seg in segments:
+            nxt = node.children.get(seg)
+            if nxt is None:
+                return False
+            node = nxt
+        for entry in node.handlers:
+            if entry[1] == handler:
+                node.handlers.remove(entry)
+                return True
+        return False
+
+    def match(self, segments: List[str], out: List[Tuple[int, EventHandler]]) -> None:
+        if not segments:
+            out.extend(self.handlers)
+            return
+        head, rest = segments[0], segments[1:]
+        exact = self.children.get(head)
+        if exact is not None:
+            exact.match(rest, out)
+        wild = self.children.get(WILDCARD)
+        if wild is not None:
+            # '*' final: prefijo (uno o más segmentos restantes)
+            out.extend(wild.handlers)
+            # '*' intermedio: exactamente un segmento
+            if rest:
+                wild.match(rest, out)
+
+    def count(self) -> Tuple[int, int]:
+        """(patrones con handlers, handlers) en todo el trie."""
+        patterns = 1 if self.handlers else 0
+        handlers = len(self.handlers)
+        for child in self.children.values():
+            p, h = child.count()
+            patterns += p
+            handlers += h
+        return patterns, handlers
+
+
 class EventBus:
-    def __init__(self, logger=None):
+    def __init__(self, logger=None,
+                 dispatch_mode: str = DISPATCH_SYNC,
+                 max_workers: int = 2,
+                 queue_size: int = 1000,
+                 backpressure: str = BACKPRESSURE_DROP_OLDEST,
+                 block_timeout: Optional[float] = None):
+        if dispatch_mode not in (DISPATCH_SYNC, DISPATCH_ASYNC):
+            raise ValueError(f"dispatch_mode inválido: {dispatch_mode}")
+        if backpressure not in _BACKPRESSURE_POLICIES:
+            raise ValueError(f"backpressure inválido: {backpressure}")
         self._subs: DefaultDict[str, List[EventHandler]] = defaultdict(list)
+        self._handler_priority: Dict[Tuple[str, int], int] = {}
+        self._topic_priority: Dict[str, int] = {}
+        self._trie = _TopicTrie()
+        self._resolved: Dict[str, Tuple[EventHandler, ...]] = {}
         self._lock = threading.RLock()
-        
+
         # Use external logger if provided, otherwise create one
         if logger:
             self.logger = logger
         else:
             self.logger = get_unified_logger("EventBus")
-        
+
         self._events_published = 0
         self._events_failed = 0
         self._last_publish = 0.0
+        self._latency: Dict[str, _LatencyHistogram] = {}
+        self._latency_lock = threading.Lock()
+
+        # Async dispatch state
+        self.dispatch_mode = dispatch_mode
+        self.backpressure = backpressure
+        self.queue_size = max(1, int(queue_size))
+        self.block_timeout = block_timeout
+        self._queues: Dict[str, Deque[List[Any]]] = {}     # topic -> [key, payload]
+        self._slots: Dict[str, Dict[Any, List[Any]]] = {}  # topic -> key -> slot encolado (coalesce)
+        self._scheduled: Dict[str, bool] = {}
+        self._qlock = threading.Lock()
+        self._not_full = threading.Condition(self._qlock)
+        self._idle = threading.Condition(self._qlock)
+        self._inflight = 0
+        self._ready: List[Tuple[int, int, Optional[str]]] = []  # heap (-prioridad, seq, topic)
+        self._ready_seq = itertools.count()
+        self._has_ready = threading.Condition(self._qlock)
+        self._events_dropped = 0
+        self._events_coalesced = 0
+        self._workers: List[threading.Thread] = []
+        self._running = False
+        if dispatch_mode == DISPATCH_ASYNC:
+            self._start_workers(max(1, int(max_workers)))
 
-    def subscribe(self, topic: str, handler: EventHandler) -> None:
+    # ---------- Subscriptions ----------
+    @staticmethod
+    def _is_pattern(topic: str) -> bool:
+        return WILDCARD in topic.split('.')
+
+    def subscribe(self, topic: str, handler: EventHandler, priority: int = 0) -> None:
         if not topic or not callable(handler):
             raise ValueError("topic y handler válidos requeridos")
         with self._lock:
-            self._subs[topic].append(handler)
+            if self._is_pattern(topic):
+                self._trie.insert(topic.split('.'), handler, priority)
+            else:
+                self._subs[topic].append(handler)
+                self._handler_priority[(topic, id(handler))] = priority
+            self._resolved = {}
         self.logger.debug(f"Suscrito handler a topic={topic}", "EVENTBUS")
 
     def unsubscribe(self, topic: str, handler: EventHandler) -> None:
         with self._lock:
-            handlers = self._subs.get(topic, [])
-            if handler in handlers:
-                handlers.remove(handler)
+            if self._is_pattern(topic):
+                removed = self._trie.remove(topic.split('.'), handler)
+            else:
+                handlers = self._subs.get(topic, [])
+                removed = handler in handlers
+                if removed:
+                    handlers.remove(handler)
+                    if handler not in handlers:
+                        self._handler_priority.pop((topic, id(handler)), None)
+            if removed:
+                self._resolved = {}
                 self.logger.debug(f"Desuscrito handler topic={topic}", "EVENTBUS")
 
-    def publish(self, topic: str, payload: Any) -> None:
-        now = time.time()
+    def _handlers_for(self, topic: str) -> Tuple[EventHandler, ...]:
+        handlers = self._resolved.get(topic)
+        if handlers is not None:
+            return handlers
         with self._lock:
-            handlers = list(self._subs.get(topic, []))
+            matched: List[Tuple[int, EventHandler]] = [
+                (self._handler_priority.get((topic, id(h)), 0), h) for h in self._subs.get(topic, [])
+            ]
+            self._trie.match(topic.split('.'), matched)
+            # Orden estable: mayor prioridad primero, luego orden de suscripción
+            matched.sort(key=lambda e: -e[0])
+            handlers = tuple(h for _, h in matched)
+            if len(self._resolved) >= RESOLVED_CACHE_LIMIT:
+                # Topics dinámicos sin límite: se reinicia en vez de crecer sin cota
+                self._resolved = {}
+            self._resolved[topic] = handlers
+        return handlers
+
+    def set_topic_priority(self, topic: str, priority: int) -> None:
+        """Prioridad de planificación del topic en modo async (mayor = antes)."""
+        with self._qlock:
+            self._topic_priority[topic] = priority
+
+    # ---------- Publish / dispatch ----------
+    def publish(self, topic: str, payload: Any, key: Optional[Any] = None) -> None:
+        """Publica un evento. `key` agrupa eventos para la política coalesce."""
+        handlers = self._handlers_for(topic)
         if not handlers:
             return
+        if self.dispatch_mode == DISPATCH_ASYNC and self._running:
+            self._enqueue(topic, payload, key)
+            self._last_publish = time.time()
+            return
+        self._dispatch(topic, payload, handlers)
+        self._last_publish = time.time()
+
+    def _dispatch(self, topic: str, payload: Any, handlers: Tuple[EventHandler, ...]) -> None:
         for h in handlers:
+            start = time.perf_counter()
             try:
                 h(topic, payload)
                 self._events_published += 1
             except Exception as e:
                 self._events_failed += 1
                 self.logger.error(f"Handler error topic={topic}: {e}", "EVENTBUS")
-        self._last_publish = now
+            self._record_latency(h, (time.perf_counter() - start) * 1e6)
+
+    def _record_latency(self, handler: EventHandler, elapsed_us: float) -> None:
+        name = getattr(handler, '__qualname__', None) or repr(handler)
+        hist = self._latency.get(name)
+        if hist is None:
+            with self._latency_lock:
+                hist = self._latency.setdefault(name, _LatencyHistogram())
+        hist.record(elapsed_us)
+
+    def _enqueue(self, topic: str, payload: Any, key: Optional[Any]) -> None:
+        with self._qlock:
+            q = self._queues.get(topic)
+            if q is None:
+                q = self._queues[topic] = deque()
+            coalesce = self.backpressure == BACKPRESSURE_COALESCE and key is not None
+            if coalesce:
+                slots = self._slots.setdefault(topic, {})
+                slot = slots.get(key)
+                if slot is not None:
+                    slot[1] = payload
+                    self._events_coalesced += 1
+                    return
+            if len(q) >= self.queue_size:
+                if self.backpressure == BACKPRESSURE_BLOCK:
+                    deadline = None if self.block_timeout is None else time.monotonic() + self.block_timeout
+                    while len(q) >= self.queue_size and self._running:
+                        remaining = None if deadline is None else deadline - time.monotonic()
+                        if remaining is not None and remaining <= 0:
+                            self._events_dropped += 1
+                            return
+                        self._not_full.wait(remaining)
+                else:
+                    # drop_oldest (y coalesce sin key coincidente)
+                    dropped = q.popleft()
+                    self._release_slot(topic, dropped)
+                    self._events_dropped += 1
+            item = [key, payload]
+            q.append(item)
+            if coalesce:
+                slots[key] = item
+            if not self._scheduled.get(topic):
+                self._scheduled[topic] = True
+                self._push_ready(topic)
+
+    def _release_slot(self, topic: str, item: List[Any]) -> None:
+        # Llamar con _qlock tomado
+        slots = self._slots.get(topic)
+        if slots and item[0] is not None and slots.get(item[0]) is item:
+            del slots[item[0]]
+
+    def _push_ready(self, topic: Optional[str]) -> None:
+        # Llamar con _qlock tomado
+        prio = self._topic_priority.get(topic, 0) if topic is not None else float('-inf')
+        heapq.heappush(self._ready, (-prio, next(self._ready_seq), topic))
+        self._has_ready.notify()
+
+    def _start_workers(self, n: int) -> None:
+        self._running = True
+        for i in range(n):
+            t = threading.Thread(target=self._worker_loop, name=f"EventBus-worker-{i}", daemon=True)
+            t.start()
+            self._workers.append(t)
+
+    def _worker_loop(self) -> None:
+        while True:
+            # Un único worker por topic a la vez → orden FIFO por topic
+            with self._qlock:
+                while not self._ready:
+                    self._has_ready.wait()
+                topic = heapq.heappop(self._ready)[2]
+                if topic is None:
+                    return
+                q = self._queues.get(topic)
+                batch = list(q) if q else []
+                if q:
+                    q.clear()
+                    self._slots.pop(topic, None)
+                self._inflight += 1
+                self._not_full.notify_all()
+            handlers = self._handlers_for(topic)
+            for _, payload in batch:
+                self._dispatch(topic, payload, handlers)
+            with self._qlock:
+                self._inflight -= 1
+                if self._queues.get(topic):
+                    self._push_ready(topic)
+                else:
+                    self._scheduled[topic] = False
+                    if self._inflight == 0 and not any(self._scheduled.values()):
+                        self._idle.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que las colas async se vacíen. True si quedó todo despachado."""
+        if self.dispatch_mode != DISPATCH_ASYNC:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._qlock:
+            while self._inflight or any(self._scheduled.values()):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def shutdown(self, drain: bool = True, timeout: Optional[float] = 5.0) -> None:
+        """Detiene el pool de workers (opcionalmente drenando las colas)."""
+        if not self._running:
+            return
+        if drain:
+            self.flush(timeout)
+        with self._qlock:
+            self._running = False
+            self._not_full.notify_all()
+            for _ in self._workers:
+                self._push_ready(None)
+        for t in self._workers:
+            t.join(timeout)
+        self._workers = []
 
     def stats(self) -> Dict[str, Any]:
         with self._lock:
-            return {
-                'topics': len(self._subs),
-                'handlers': sum(len(v) for v in self._subs.values()),
-                'events_published': self._events_published,
-                'events_failed': self._events_failed,
-                'last_publish': self._last_publish
-            }
-
-__all__ = ["EventBus", "EventHandler"]
+            topics = sum(1 for v in self._subs.values() if v)
+            handlers = sum(len(v) for v in self._subs.values())
+            wildcard_patterns, wildcard_handlers = self._trie.count()
+        with self._latency_lock:
+            latency = {name: h.summary() for name, h in self._latency.items()}
+        with self._qlock:
+            queued = sum(len(q) for q in self._queues.values())
+        return {
+            'topics': topics + wildcard_patterns,
+            'handlers': handlers + wildcard_handlers,
+            'wildcard_patterns': wildcard_patterns,
+            'wildcard_handlers': wildcard_handlers,
+            'resolved_cache': len(self._resolved),
+            'events_published': self._events_published,
+            'events_failed': self._events_failed,
+            'last_publish': self._last_publish,
+            'dispatch_mode': self.dispatch_mode,
+            'backpressure': self.backpressure,
+            'events_queued': queued,
+            'events_dropped': self._events_dropped,
+            'events_coalesced': self._events_coalesced,
+            'handler_latency': latency,
+        }
+
+__all__ = [
+    "EventBus",
+    "EventHandler",
+    "DISPATCH_SYNC",
+    "DISPATCH_ASYNC",
+    "BACKPRESSURE_DROP_OLDEST",
+    "BACKPRESSURE_COALESCE",
+    "BACKPRESSURE_BLOCK",
+]
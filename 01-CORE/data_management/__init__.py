@@ -168,6 +168,17 @@ except ImportError as e:
     
     MT5ConnectionManager = _MT5ConnectionManagerStub
 
+# CandleStore - Almacén binario local de velas
+try:
+    from .candle_store import CandleStore, get_candle_store
+    _CANDLE_STORE_AVAILABLE = True
+except ImportError as e:
+    _CANDLE_STORE_AVAILABLE = False
+    _IMPORT_ERRORS.append(f"CandleStore: {str(e)}")
+    _safe_log("warning", f"⚠️ CandleStore no disponible: {e}")
+    CandleStore = None
+    get_candle_store = lambda *args, **kwargs: None
+
 # Exports principales - Garantizados para funcionar con cuenta real
 __all__ = [
     # AdvancedCandleDownloader exports
@@ -182,6 +193,8 @@ __all__ = [
     'MT5DataManager',
     'ICTDataManager',
     'MT5ConnectionManager',
+    'CandleStore',
+    'get_candle_store',
     
     # Real trading components
     'RealTradingBridge',
@@ -1423,22 +1423,19 @@ class AdvancedCandleDownloader:
             return fallback_mapping.get(timeframe, 15)
 
     def _save_candles_to_file(self, data, symbol: str, timeframe: str):
-        """💾 Guarda velas en archivo"""
+        """💾 Persiste velas en el CandleStore (append incremental, dedup por timestamp)"""
         try:
-            # Crear directorio de datos si no existe
-            data_dir = Path("data/candles")
-            data_dir.mkdir(parents=True, exist_ok=True)
-
-            # Nombre del archivo - DIARIO en lugar de por ejecución
-            filename = f"{symbol}_{timeframe}_{datetime.now().strftime('%Y%m%d')}.csv"
-            filepath = data_dir / filename
-
-            # Guardar usando pandas
-            if hasattr(data, 'to_csv'):
-                data.to_csv(filepath)
-                self._log_info(f"📁 Datos guardados en: {filepath}")
-            else:
+            if not hasattr(data, 'columns'):
                 self._log_warning("Datos no son DataFrame, no se puede guardar")
+                return
+            # Las velas de fallback de desarrollo no deben mezclarse con historia real
+            if getattr(data, 'attrs', {}).get('data_source') == 'DEVELOPMENT_FALLBACK':
+                return
+
+            from data_management.candle_store import get_candle_store
+            store = get_candle_store()
+            added = store.append(symbol, timeframe, data)
+            self._log_info(f"📁 {added} velas nuevas en {store.path_for(symbol, timeframe)}")
 
         except Exception as e:
             self._log_error(f"Error guardando archivo: {e}")
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🗄️ CANDLE STORE - ICT ENGINE v6.0 ENTERPRISE
+=============================================
+
+Almacén local de velas en binario, un archivo append-only por símbolo/timeframe:
+
+    04-DATA/candles/{SYMBOL}_{TF}.candles
+
+Formato: cabecera fija de 16 bytes (magic + versión) seguida de registros
+de tamaño fijo (CANDLE_DTYPE), ordenados estrictamente por timestamp.
+
+- Deduplicado por timestamp: las velas ya almacenadas se ignoran y la última
+  vela (posiblemente en formación) se sobrescribe en sitio
+- Appends incrementales: solo se escriben las velas posteriores a la última
+- Backfill de huecos antiguos: merge + reescritura atómica (tmp + os.replace)
+- Lecturas por rango con np.searchsorted sobre el memmap (sin parsear texto)
+- read_arrays() devuelve vistas del memmap (zero-copy); read() devuelve una
+  copia escribible salvo que se pida copy=False
+- Frescura medida con el reloj del bróker (tick MT5), no con la hora local
+
+Reemplaza los volcados diarios CSV de AdvancedCandleDownloader y es leído
+por ICTDataManager.get_candles() y RealICTBacktestEngine.
+
+Autor: ICT Engine v6.0 Team
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    import pandas as pd
+except ImportError:  # pragma: no cover
+    pd = None  # type: ignore
+
+CANDLE_DTYPE = np.dtype([
+    ('time', '<i8'),      # epoch seconds (UTC)
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+])
+PRICE_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+_MAGIC = b'ICTCNDL1'
+_HEADER_SIZE = 16
+_VERSION = 1
+_FILE_SUFFIX = '.candles'
+
+TimeLike = Union[int, float, datetime, str, None]
+
+_TIMEFRAME_SECONDS = {'M': 60, 'H': 3600, 'D': 86400, 'W': 604800}
+
+_mt5: Any = None
+_mt5_checked = False
+
+
+def _load_mt5() -> Any:
+    """Módulo MetaTrader5 si está instalado (import perezoso, una sola vez)."""
+    global _mt5, _mt5_checked
+    if not _mt5_checked:
+        _mt5_checked = True
+        try:
+            import MetaTrader5 as mt5_module  # type: ignore
+            _mt5 = mt5_module
+        except Exception:
+            _mt5 = None
+    return _mt5
+
+
+def _default_root() -> Path:
+    return Path(__file__).resolve().parents[2] / '04-DATA' / 'candles'
+
+
+def _to_epoch(value: TimeLike) -> Optional[int]:
+    """Convierte datetime/ISO/epoch a segundos epoch; naive se asume UTC."""
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return int(value)
+    if pd is not None and isinstance(value, pd.Timestamp):
+        value = value.to_pydatetime()
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    raise TypeError(f"Unsupported time value: {value!r}")
+
+
+def timeframe_seconds(timeframe: str) -> int:
+    """'M15' -> 900, 'H4' -> 14400, 'D1' -> 86400 ('MN1' se aproxima a 31 días)."""
+    tf = timeframe.upper()
+    if tf.startswith('MN'):
+        return 31 * 86400 * int(tf[2:] or 1)
+    return _TIMEFRAME_SECONDS[tf[:1]] * int(tf[1:] or 1)
+
+
+def to_records(data: Any) -> np.ndarray:
+    """
+    Normaliza velas a un array estructurado CANDLE_DTYPE ordenado y único.
+
+    Acepta DataFrame (DatetimeIndex o columna time/timestamp, en segundos o
+    datetime) o lista de dicts con las mismas claves.
+    """
+    if data is None:
+        return np.empty(0, dtype=CANDLE_DTYPE)
+
+    if isinstance(data, np.ndarray) and data.dtype == CANDLE_DTYPE:
+        out = np.array(data, dtype=CANDLE_DTYPE)
+    elif pd is not None and isinstance(data, pd.DataFrame):
+        if len(data) == 0:
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        lower = {str(c).lower(): c for c in data.columns}
+        time_col = next((lower[c] for c in ('time', 'timestamp', 'datetime', 'date') if c in lower), None)
+        raw_times = data[time_col] if time_col is not None else data.index
+        if pd.api.types.is_numeric_dtype(getattr(raw_times, 'dtype', None)):
+            times = np.asarray(raw_times, dtype=np.int64)
+        else:
+            stamps = pd.DatetimeIndex(pd.to_datetime(raw_times))
+            if stamps.tz is not None:
+                stamps = stamps.tz_convert('UTC').tz_localize(None)
+            times = stamps.as_unit('s').asi8 if hasattr(stamps, 'as_unit') else stamps.asi8 // 10**9
+        out = np.empty(len(data), dtype=CANDLE_DTYPE)
+        out['time'] = times
+        for name in PRICE_FIELDS:
+            col = lower.get(name)
+            if col is None and name == 'volume':
+                col = lower.get('tick_volume')
+            out[name] = np.asarray(data[col], dtype=np.float64) if col is not None else 0.0
+    else:
+        rows = list(data)
+        out = np.empty(len(rows), dtype=CANDLE_DTYPE)
+        for i, row in enumerate(rows):
+            ts = row.get('time', row.get('timestamp'))
+            out[i] = (_to_epoch(ts), float(row.get('open', 0.0)), float(row.get('high', 0.0)),
+                      float(row.get('low', 0.0)), float(row.get('close', 0.0)),
+                      float(row.get('volume', row.get('tick_volume', 0.0)) or 0.0))
+
+    # Orden estable por tiempo; ante duplicados gana la última aparición
+    order = np.argsort(out['time'], kind='stable')
+    out = out[order]
+    if out.shape[0] > 1:
+        keep = np.ones(out.shape[0], dtype=bool)
+        keep[:-1] = out['time'][1:] != out['time'][:-1]
+        out = out[keep]
+    return out
+
+
+class CandleStore:
+    """
+    🗄️ Almacén binario append-only de velas (un archivo por símbolo/timeframe)
+    """
+
+    def __init__(self, root: Optional[Union[str, Path]] = None,
+                 broker_utc_offset_hours: float = 0.0):
+        self.root = Path(root) if root is not None else _default_root()
+        # Desfase hora bróker - UTC si no hay tick MT5 del que leer la hora del servidor
+        self.broker_utc_offset_hours = broker_utc_offset_hours
+        self._lock = threading.RLock()
+        self._maps: Dict[Path, Tuple[int, np.ndarray]] = {}  # path -> (file size, memmap)
+
+    # ------------------------------------------------------------------
+    # Paths / low level
+    # ------------------------------------------------------------------
+    def path_for(self, symbol: str, timeframe: str) -> Path:
+        return self.root / f"{symbol.upper()}_{timeframe.upper()}{_FILE_SUFFIX}"
+
+    def _header(self) -> bytes:
+        return _MAGIC + _VERSION.to_bytes(4, 'little') + CANDLE_DTYPE.itemsize.to_bytes(4, 'little')
+
+    def _records(self, path: Path) -> np.ndarray:
+        """Memmap de solo lectura de todos los registros (cacheado por tamaño)."""
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        count = max(0, (size - _HEADER_SIZE) // CANDLE_DTYPE.itemsize)
+        if count == 0:
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        cached = self._maps.get(path)
+        if cached is not None and cached[0] == size:
+            return cached[1]
+        with open(path, 'rb') as fh:
+            if fh.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"Not a candle store file: {path}")
+        mm = np.memmap(path, dtype=CANDLE_DTYPE, mode='r', offset=_HEADER_SIZE, shape=(count,))
+        self._maps[path] = (size, mm)
+        return mm
+
+    def _release_map(self, path: Path) -> None:
+        """Suelta y cierra el memmap cacheado (vistas de read_arrays vivas lo mantienen abierto)."""
+        cached = self._maps.pop(path, None)
+        if cached is None:
+            return
+        mmap_obj = getattr(cached[1], '_mmap', None)
+        cached = None
+        if mmap_obj is not None:
+            try:
+                mmap_obj.close()
+            except (BufferError, ValueError):
+                pass
+
+    def _rewrite(self, path: Path, records: np.ndarray) -> None:
+        """Reescritura atómica completa (solo para backfill de huecos antiguos)."""
+        self._release_map(path)
+        tmp = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp, 'wb') as fh:
+            fh.write(self._header())
+            fh.write(np.ascontiguousarray(records, dtype=CANDLE_DTYPE).tobytes())
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+
+    # ------------------------------------------------------------------
+    # Write path
+    # ------------------------------------------------------------------
+    def append(self, symbol: str, timeframe: str, data: Any) -> int:
+        """
+        Añade velas deduplicando por timestamp.
+
+        Returns:
+            Número de velas nuevas persistidas (las sobrescrituras de la
+            última vela no cuentan como nuevas)
+        """
+        incoming = to_records(data)
+        if incoming.shape[0] == 0:
+            return 0
+        path = self.path_for(symbol, timeframe)
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            existing = self._records(path)
+            if existing.shape[0] == 0:
+                self._rewrite(path, incoming)
+                return int(incoming.shape[0])
+
+            last_ts = int(existing['time'][-1])
+            older = incoming[incoming['time'] < last_ts]
+            if older.shape[0]:
+                pos = np.searchsorted(existing['time'], older['time'])
+                pos = np.minimum(pos, existing.shape[0] - 1)
+                missing = older[existing['time'][pos] != older['time']]
+                if missing.shape[0]:
+                    # Hueco histórico: merge ordenado y reescritura atómica
+                    merged = to_records(np.concatenate((np.asarray(existing), incoming)))
+                    added = int(merged.shape[0] - existing.shape[0])
+                    existing = None  # sin referencias al memmap antes de os.replace
+                    self._rewrite(path, merged)
+                    return added
+
+            newer = incoming[incoming['time'] > last_ts]
+            same = incoming[incoming['time'] == last_ts]
+            with open(path, 'r+b') as fh:
+                if same.shape[0]:
+                    # Vela en formación: actualizar el último registro en sitio
+                    fh.seek(_HEADER_SIZE + (existing.shape[0] - 1) * CANDLE_DTYPE.itemsize)
+                    fh.write(same[-1:].tobytes())
+                if newer.shape[0]:
+                    fh.seek(0, os.SEEK_END)
+                    fh.write(newer.tobytes())
+                fh.flush()
+            if same.shape[0] and not newer.shape[0]:
+                # El tamaño no cambia: invalidar el memmap cacheado
+                self._maps.pop(path, None)
+            return int(newer.shape[0])
+
+    # ------------------------------------------------------------------
+    # Read path
+    # ------------------------------------------------------------------
+    def read_arrays(self, symbol: str, timeframe: str,
+                    start: TimeLike = None, end: TimeLike = None,
+                    count: Optional[int] = None) -> np.ndarray:
+        """
+        Vista zero-copy (memmap) de las velas en [start, end], opcionalmente
+        limitada a las últimas `count`. Válida hasta la siguiente reescritura.
+        """
+        with self._lock:
+            records = self._records(self.path_for(symbol, timeframe))
+        if records.shape[0] == 0:
+            return records
+        times = records['time']
+        lo = 0 if start is None else int(np.searchsorted(times, _to_epoch(start), side='left'))
+        hi = records.shape[0] if end is None else int(np.searchsorted(times, _to_epoch(end), side='right'))
+        if count is not None and count >= 0:
+            lo = max(lo, hi - int(count))
+        return records[lo:hi]
+
+    def read(self, symbol: str, timeframe: str,
+             start: TimeLike = None, end: TimeLike = None,
+             count: Optional[int] = None, copy: bool = True) -> Optional[Any]:
+        """
+        DataFrame OHLCV con DatetimeIndex (naive UTC), mismo formato que el downloader.
+
+        Por defecto las columnas son copias escribibles; copy=False devuelve
+        columnas de solo lectura respaldadas por el memmap.
+        """
+        if pd is None:
+            return None
+        arr = self.read_arrays(symbol, timeframe, start, end, count)
+        if copy:
+            arr = np.array(arr)
+        index = pd.DatetimeIndex(arr['time'].astype('datetime64[s]'), name='time')
+        frame = pd.DataFrame({name: arr[name] for name in PRICE_FIELDS}, index=index, copy=False)
+        frame.attrs['data_source'] = 'CANDLE_STORE'
+        frame.attrs['symbol'] = symbol
+        frame.attrs['timeframe'] = timeframe
+        return frame
+
+    def read_rows(self, symbol: str, timeframe: str,
+                  start: TimeLike = None, end: TimeLike = None,
+                  count: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Lista de dicts con timestamp datetime UTC (formato del loader de backtest)."""
+        arr = self.read_arrays(symbol, timeframe, start, end, count)
+        times = arr['time'].tolist()
+        columns = [arr[name].tolist() for name in PRICE_FIELDS]
+        return [
+            {
+                'timestamp': datetime.fromtimestamp(ts, timezone.utc),
+                'open': o, 'high': h, 'low': l, 'close': c, 'volume': v,
+            }
+            for ts, o, h, l, c, v in zip(times, *columns)
+        ]
+
+    def count(self, symbol: str, timeframe: str) -> int:
+        with self._lock:
+            return int(self._records(self.path_for(symbol, timeframe)).shape[0])
+
+    def last_timestamp(self, symbol: str, timeframe: str) -> Optional[datetime]:
+        with self._lock:
+            records = self._records(self.path_for(symbol, timeframe))
+        if records.shape[0] == 0:
+            return None
+        return datetime.fromtimestamp(int(records['time'][-1]), timezone.utc)
+
+    def broker_now(self, symbol: str) -> datetime:
+        """
+        Hora actual del bróker en la convención de las velas (epoch del servidor
+        leído como UTC): hora del último tick MT5, o UTC local + desfase configurado.
+        """
+        mt5 = _load_mt5()
+        if mt5 is not None:
+            try:
+                tick = mt5.symbol_info_tick(symbol)
+                if tick is not None and getattr(tick, 'time', 0):
+                    return datetime.fromtimestamp(int(tick.time), timezone.utc)
+            except Exception:
+                pass
+        return datetime.now(timezone.utc) + timedelta(hours=self.broker_utc_offset_hours)
+
+    def is_fresh(self, symbol: str, timeframe: str, max_bars: int = 3,
+                 now: Optional[datetime] = None) -> bool:
+        """
+        True si la última vela tiene como mucho `max_bars` velas de antigüedad.
+
+        `now` debe estar en hora del bróker; por defecto broker_now().
+        """
+        last = self.last_timestamp(symbol, timeframe)
+        if last is None:
+            return False
+        now = now or self.broker_now(symbol)
+        if now.tzinfo is None:
+            now = now.replace(tzinfo=timezone.utc)
+        return (now - last).total_seconds() <= max_bars * timeframe_seconds(timeframe)
+
+    def exists(self, symbol: str, timeframe: str) -> bool:
+        return self.count(symbol, timeframe) > 0
+
+
+_default_store: Optional[CandleStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_candle_store(root: Optional[Union[str, Path]] = None) -> CandleStore:
+    """Instancia compartida (por defecto en 04-DATA/candles)."""
+    global _default_store
+    if root is not None:
+        return CandleStore(root)
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = CandleStore()
+        return _default_store
+
+
+__all__ = [
+    'CandleStore',
+    'CANDLE_DTYPE',
+    'get_candle_store',
+    'timeframe_seconds',
+    'to_records',
+]
@@ -906,6 +906,18 @@ class ICTDataManager:
             cache_key = f"{symbol}_{timeframe}"
             print(f"🔍 Buscando datos para {cache_key}...")
             
+            # CandleStore local: lectura memmap de las últimas `count` velas
+            stored = None
+            try:
+                from data_management.candle_store import get_candle_store
+                store = get_candle_store()
+                stored = store.read(symbol, timeframe, count=count)
+                if stored is not None and len(stored) >= count and store.is_fresh(symbol, timeframe):
+                    print(f"✅ Datos obtenidos desde CandleStore: {len(stored)} velas")
+                    return stored
+            except Exception as e:
+                print(f"⚠️ Error leyendo CandleStore: {e}")
+
             # Usar el downloader para obtener datos frescos si está disponible
             if hasattr(self, 'downloader') and self.downloader and hasattr(self.downloader, 'get_candles'):
                 try:
@@ -915,6 +927,11 @@ class ICTDataManager:
                         return data
                 except Exception as e:
                     print(f"⚠️ Error con downloader: {e}")
+
+            # Historia real almacenada (parcial o no reciente) antes que sintéticos
+            if stored is not None and len(stored) > 0:
+                print(f"⚠️ Usando CandleStore no actualizado: {len(stored)} velas")
+                return stored
             
             # Fallback: intentar generar datos sintéticos para testing
             print(f"⚠️ Generando datos sintéticos para {symbol} {timeframe}")
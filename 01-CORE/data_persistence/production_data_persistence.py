@@ -13,6 +13,11 @@ Características:
 ✅ Índices optimizados para queries frecuentes
 ✅ Sincronización multi-proceso
 ✅ Métricas de performance del storage
+✅ Proyección resumen + índice cubriente (category, timestamp) para
+   consultas por rango sin deserializar payloads; resultados paginados
+   por cursor (iter_query) con memoria constante
+✅ Group commit opcional: registros encolados y volcados por lotes a
+   segmentos JSONL append-only + un executemany por lote (SQLite en WAL)
 
 Autor: ICT Engine v6.0 Team
 """
@@ -31,9 +36,13 @@ from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union, Callable, Iterator
+from typing import Dict, List, Optional, Any, Union, Callable, Iterator, Tuple
 import hashlib
 import os
+import re
+from itertools import islice
+
+from utils.jsonl_reader import iter_lines_reverse
 
 try:
     from protocols.logging_central_protocols import create_production_logger, LogLevel
@@ -77,6 +86,40 @@ class DataRecord:
         if 'created_at' not in self.metadata:
             self.metadata['created_at'] = datetime.now().isoformat()
 
+_SEGMENT_SUFFIX = ".jsonl"
+# Timestamp de nivel superior de una línea serializada por el engine
+# (id, category, timestamp van primero; comillas internas van escapadas)
+_LINE_TIMESTAMP_RE = re.compile(r'"timestamp":"([^"]+)"')
+# Archivos por registro: {id}_{HHMMSS}_{ms}.json[.gz]
+_RECORD_FILE_TIME_RE = re.compile(r'_(\d{6})_(\d{3})\.json(?:\.gz)?$')
+_SUMMARY_MAX_FIELDS = 16
+_SUMMARY_MAX_STR = 64
+
+
+def _summarize_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Proyección resumen: campos escalares de nivel superior (acotada)"""
+    summary: Dict[str, Any] = {}
+    if not isinstance(data, dict):
+        return summary
+    for key, value in data.items():
+        if len(summary) >= _SUMMARY_MAX_FIELDS:
+            break
+        if isinstance(value, str):
+            summary[key] = value[:_SUMMARY_MAX_STR]
+        elif isinstance(value, (int, float, bool)) or value is None:
+            summary[key] = value
+    return summary
+
+
+@dataclass
+class _PendingWrite:
+    """Registro encolado para group commit (record=None: marcador de flush)"""
+    record: Optional[DataRecord]
+    enqueued_at: float
+    done: Optional[threading.Event] = None
+    success: bool = False
+
+
 @dataclass
 class StorageConfig:
     """Configuración del sistema de almacenamiento"""
@@ -90,6 +133,11 @@ class StorageConfig:
     sqlite_timeout_seconds: int = 30
     atomic_writes: bool = True
     sync_to_disk: bool = True
+    # Group commit: store_data() encola y un writer vuelca lotes
+    group_commit: bool = False
+    max_batch_latency_ms: float = 10.0
+    max_batch_size: int = 512
+    group_commit_wait: bool = False  # True: store_data() espera al commit del lote
 
 class ProductionDataPersistence:
     """
@@ -131,10 +179,19 @@ class ProductionDataPersistence:
             'errors': 0,
             'avg_write_time_ms': 0.0,
             'avg_read_time_ms': 0.0,
-            'total_storage_mb': 0.0
+            'total_storage_mb': 0.0,
+            'group_commits': 0,
+            'avg_batch_size': 0.0
         }
         self._metrics_lock = threading.Lock()
         
+        # Group commit state (solo el hilo writer toca segmentos y conexión)
+        self._pending: List[_PendingWrite] = []
+        self._pending_cond = threading.Condition()
+        self._commit_thread: Optional[threading.Thread] = None
+        self._commit_conn: Optional[sqlite3.Connection] = None
+        self._segments: Dict[Tuple[str, str], Tuple[Path, Any]] = {}
+        
         # Initialize
         self._initialize_database()
         self._start_background_tasks()
@@ -179,6 +236,12 @@ class ProductionDataPersistence:
                     ON data_records (timestamp)
                 """)
                 
+                self._migrate_summary_projection(conn)
+                
+                if self.config.group_commit:
+                    # WAL persiste en el archivo: lectores no bloquean al writer
+                    conn.execute("PRAGMA journal_mode=WAL")
+                
                 conn.commit()
                 
             logger.info("SQLite database initialized", "DATABASE")
@@ -187,6 +250,32 @@ class ProductionDataPersistence:
             logger.error(f"Database initialization failed: {e}", "DATABASE")
             self.config.enable_sqlite = False
     
+    def _migrate_summary_projection(self, conn: sqlite3.Connection) -> None:
+        """Columna summary_json + índice cubriente para consultas por rango"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(data_records)")}
+        if 'summary_json' not in columns:
+            conn.execute("ALTER TABLE data_records ADD COLUMN summary_json TEXT")
+        # Backfill de filas previas a la proyección (una sola vez, por lotes)
+        while True:
+            rows = conn.execute(
+                "SELECT id, data_json FROM data_records WHERE summary_json IS NULL LIMIT 1000"
+            ).fetchall()
+            if not rows:
+                break
+            updates = []
+            for row in rows:
+                try:
+                    summary = _summarize_data(json.loads(row[1]))
+                except Exception:
+                    summary = {}
+                updates.append((json.dumps(summary), row[0]))
+            conn.executemany("UPDATE data_records SET summary_json = ? WHERE id = ?", updates)
+        # (category, timestamp, id, summary_json): range scans index-only
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_category_timestamp_summary 
+            ON data_records (category, timestamp, id, summary_json)
+        """)
+    
     @contextmanager
     def _get_db_connection(self):
         """Context manager para conexiones SQLite thread-safe"""
@@ -216,6 +305,14 @@ class ProductionDataPersistence:
             daemon=True
         )
         self._backup_thread.start()
+        
+        if self.config.group_commit:
+            self._commit_thread = threading.Thread(
+                target=self._commit_loop,
+                name="DataGroupCommit",
+                daemon=True
+            )
+            self._commit_thread.start()
     
     def _backup_loop(self) -> None:
         """Bucle de backup automático"""
@@ -235,7 +332,8 @@ class ProductionDataPersistence:
                    record_id: str, 
                    category: DataCategory,
                    data: Dict[str, Any],
-                   metadata: Optional[Dict[str, Any]] = None) -> bool:
+                   metadata: Optional[Dict[str, Any]] = None,
+                   wait: Optional[bool] = None) -> bool:
         """
         Almacenar datos de forma atómica
         
@@ -244,9 +342,11 @@ class ProductionDataPersistence:
             category: Categoría de datos
             data: Datos a almacenar
             metadata: Metadatos opcionales
+            wait: En modo group commit, esperar al commit del lote
+                  (por defecto config.group_commit_wait)
             
         Returns:
-            bool: True si se almacenó exitosamente
+            bool: True si se almacenó (o encoló) exitosamente
         """
         start_time = time.time()
         
@@ -259,6 +359,9 @@ class ProductionDataPersistence:
                 metadata=metadata or {}
             )
             
+            if self._commit_thread is not None:
+                return self._enqueue_record(record, self.config.group_commit_wait if wait is None else wait)
+            
             # Determine storage path
             file_path = self._get_storage_path(record)
             
@@ -330,7 +433,8 @@ class ProductionDataPersistence:
                    category: DataCategory,
                    start_time: Optional[datetime] = None,
                    end_time: Optional[datetime] = None,
-                   limit: int = 100) -> List[DataRecord]:
+                   limit: int = 100,
+                   summary_only: bool = False) -> List[Any]:
         """
         Consultar datos por categoría y rango temporal
         
@@ -339,20 +443,251 @@ class ProductionDataPersistence:
             start_time: Timestamp inicial
             end_time: Timestamp final
             limit: Máximo número de registros
+            summary_only: Devolver solo la proyección resumen (dicts) sin
+                          deserializar los payloads
             
         Returns:
-            Lista de registros
+            Lista de registros (o resúmenes), más recientes primero
         """
         try:
-            if self.config.enable_sqlite:
-                return self._query_from_database(category, start_time, end_time, limit)
-            else:
-                return self._query_from_files(category, start_time, end_time, limit)
-                
+            return list(self.iter_query(category, start_time, end_time,
+                                        summary_only=summary_only, limit=limit))
         except Exception as e:
             logger.error(f"Query data error: {e}", "QUERY")
             return []
     
+    def iter_query(self,
+                   category: DataCategory,
+                   start_time: Optional[datetime] = None,
+                   end_time: Optional[datetime] = None,
+                   summary_only: bool = False,
+                   batch_size: int = 500,
+                   limit: Optional[int] = None) -> Iterator[Any]:
+        """
+        Streaming de resultados con memoria constante (más recientes primero)
+        
+        SQLite se pagina por cursor (keyset sobre (timestamp, id)); cada página
+        usa su propia conexión, así que el consumidor puede pausar sin
+        bloquear escrituras.
+        
+        Yields:
+            DataRecord, o dict {'id', 'category', 'timestamp', 'summary'} si
+            summary_only
+        """
+        if self.config.enable_sqlite:
+            rows = self._iter_from_database(category, start_time, end_time, summary_only, batch_size)
+        else:
+            rows = self._iter_from_files(category, start_time, end_time, summary_only)
+        return islice(rows, limit) if limit is not None else rows
+    
+    def query_summaries(self,
+                        category: DataCategory,
+                        start_time: Optional[datetime] = None,
+                        end_time: Optional[datetime] = None,
+                        limit: int = 100) -> List[Dict[str, Any]]:
+        """Proyección resumen de un rango (servida desde el índice cubriente)"""
+        return self.query_data(category, start_time, end_time, limit, summary_only=True)
+    
+    # Group Commit
+    def _enqueue_record(self, record: DataRecord, wait: bool) -> bool:
+        """Encolar registro para el próximo lote"""
+        pending = _PendingWrite(record=record, enqueued_at=time.time(),
+                                done=threading.Event() if wait else None)
+        with self._pending_cond:
+            self._pending.append(pending)
+            self._pending_cond.notify()
+        if pending.done is None:
+            return True
+        pending.done.wait()
+        return pending.success
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Forzar el volcado de los registros encolados
+        
+        Returns:
+            bool: True si todo lo encolado hasta ahora quedó confirmado
+        """
+        if self._commit_thread is None:
+            return True
+        done = threading.Event()
+        with self._pending_cond:
+            self._pending.append(_PendingWrite(record=None, enqueued_at=time.time(), done=done))
+            self._pending_cond.notify()
+        return done.wait(timeout)
+    
+    def _commit_loop(self) -> None:
+        """Writer de group commit: agrupa hasta max_batch_size o max_batch_latency_ms"""
+        max_latency = max(0.0, self.config.max_batch_latency_ms) / 1000.0
+        max_batch = max(1, self.config.max_batch_size)
+        while True:
+            with self._pending_cond:
+                while not self._pending and not self._shutdown_event.is_set():
+                    self._pending_cond.wait()
+                if not self._pending:
+                    break
+                deadline = self._pending[0].enqueued_at + max_latency
+                while (len(self._pending) < max_batch and not self._shutdown_event.is_set()
+                       and not any(p.record is None for p in self._pending)):
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    self._pending_cond.wait(remaining)
+                batch = self._pending[:max_batch]
+                del self._pending[:max_batch]
+            self._commit_batch(batch)
+        self._close_commit_resources()
+    
+    def _commit_batch(self, batch: List[_PendingWrite]) -> None:
+        """Un append por segmento, fsync de los segmentos tocados y un executemany"""
+        writes = [p for p in batch if p.record is not None]
+        success = True
+        if writes:
+            start_time = time.time()
+            try:
+                by_segment: Dict[Tuple[str, str], List[Tuple[_PendingWrite, str]]] = {}
+                for pending in writes:
+                    record = pending.record
+                    key = (record.category.value, record.timestamp.strftime('%Y-%m-%d'))
+                    line = json.dumps({
+                        'id': record.id,
+                        'category': record.category.value,
+                        'timestamp': record.timestamp.isoformat(),
+                        'data': record.data,
+                        'metadata': record.metadata
+                    }, ensure_ascii=False, separators=(',', ':'), default=str)
+                    by_segment.setdefault(key, []).append((pending, line))
+                
+                rows = []
+                for key, items in by_segment.items():
+                    segment_path, handle = self._get_segment(key)
+                    handle.write(''.join(line + '\n' for _, line in items))
+                    handle.flush()
+                    if self.config.sync_to_disk:
+                        os.fsync(handle.fileno())
+                    for pending, _ in items:
+                        record = pending.record
+                        rows.append((
+                            record.id,
+                            record.category.value,
+                            record.timestamp.isoformat(),
+                            json.dumps(record.data, default=str),
+                            json.dumps(record.metadata, default=str),
+                            str(segment_path),
+                            json.dumps(_summarize_data(record.data), default=str)
+                        ))
+                
+                if self.config.enable_sqlite and rows:
+                    self._executemany_index(rows)
+            except Exception as e:
+                success = False
+                logger.error(f"Group commit error: {e}", "WRITE")
+            
+            batch_ms = (time.time() - start_time) * 1000
+            with self._metrics_lock:
+                if success:
+                    self.metrics['group_commits'] += 1
+                    commits = self.metrics['group_commits']
+                    self.metrics['avg_batch_size'] += (len(writes) - self.metrics['avg_batch_size']) / commits
+                    self.metrics['total_writes'] += len(writes)
+                    total_writes = self.metrics['total_writes']
+                    # Latencia por registro = espera en cola + commit del lote
+                    now = time.time()
+                    for pending in writes:
+                        latency_ms = (now - pending.enqueued_at) * 1000
+                        self.metrics['avg_write_time_ms'] += (latency_ms - self.metrics['avg_write_time_ms']) / total_writes
+                else:
+                    self.metrics['errors'] += len(writes)
+            logger.debug(f"Group commit: {len(writes)} records in {batch_ms:.2f}ms", "WRITE")
+        
+        for pending in batch:
+            pending.success = success
+            if pending.done is not None:
+                pending.done.set()
+    
+    def _executemany_index(self, rows: List[Tuple[str, ...]]) -> None:
+        """Índice SQLite del lote en una sola transacción (conexión persistente)"""
+        if self._commit_conn is None:
+            self._commit_conn = sqlite3.connect(
+                str(self._db_path),
+                timeout=self.config.sqlite_timeout_seconds,
+                check_same_thread=False
+            )
+            self._commit_conn.execute("PRAGMA journal_mode=WAL")
+            # Durabilidad la dan los segmentos fsync'ed; el índice es reconstruible
+            self._commit_conn.execute("PRAGMA synchronous=NORMAL")
+        with self._commit_conn:
+            self._commit_conn.executemany("""
+                INSERT OR REPLACE INTO data_records 
+                (id, category, timestamp, data_json, metadata_json, file_path, summary_json)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+    
+    def _get_segment(self, key: Tuple[str, str]) -> Tuple[Path, Any]:
+        """Segmento append-only activo para (categoría, fecha); rota por tamaño"""
+        current = self._segments.get(key)
+        max_bytes = self.config.max_file_size_mb * 1024 * 1024
+        if current is not None and current[1].tell() < max_bytes:
+            return current
+        if current is not None:
+            current[1].close()
+        category, date_str = key
+        date_dir = self.config.base_path / category / date_str
+        date_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime('%H%M%S_%f')
+        segment_path = date_dir / f"segment_{stamp}_{os.getpid()}{_SEGMENT_SUFFIX}"
+        handle = open(segment_path, 'a', encoding='utf-8')
+        if self.config.sync_to_disk:
+            # Nueva entrada de directorio: fsync del directorio (POSIX)
+            try:
+                dir_fd = os.open(str(date_dir), os.O_RDONLY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
+            except Exception:
+                pass
+        # Cerrar segmentos de otras fechas de la misma categoría
+        for other in [k for k in self._segments if k[0] == category and k != key]:
+            self._segments.pop(other)[1].close()
+        self._segments[key] = (segment_path, handle)
+        return self._segments[key]
+    
+    def _close_commit_resources(self) -> None:
+        for _, handle in self._segments.values():
+            try:
+                handle.close()
+            except Exception:
+                pass
+        self._segments.clear()
+        if self._commit_conn is not None:
+            try:
+                self._commit_conn.close()
+            except Exception:
+                pass
+            self._commit_conn = None
+    
+    @staticmethod
+    def _read_file_entries(file_path: Path) -> Iterator[Dict[str, Any]]:
+        """Entradas de un archivo: JSON por registro (.json/.json.gz) o segmento JSONL"""
+        if file_path.suffix == _SEGMENT_SUFFIX:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        # Línea truncada por un corte a mitad de append
+                        continue
+        elif file_path.suffix == '.gz':
+            with gzip.open(file_path, 'rt', encoding='utf-8') as f:
+                yield json.load(f)
+        else:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                yield json.load(f)
+    
     def _get_storage_path(self, record: DataRecord) -> Path:
         """Determinar path de almacenamiento"""
         category_dir = self.config.base_path / record.category.value
@@ -444,15 +779,16 @@ class ProductionDataPersistence:
             with self._get_db_connection() as conn:
                 conn.execute("""
                     INSERT OR REPLACE INTO data_records 
-                    (id, category, timestamp, data_json, metadata_json, file_path)
-                    VALUES (?, ?, ?, ?, ?, ?)
+                    (id, category, timestamp, data_json, metadata_json, file_path, summary_json)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
                 """, (
                     record.id,
                     record.category.value,
                     record.timestamp.isoformat(),
                     json.dumps(record.data),
                     json.dumps(record.metadata),
-                    file_path
+                    file_path,
+                    json.dumps(_summarize_data(record.data), default=str)
                 ))
                 conn.commit()
                 
@@ -493,14 +829,18 @@ class ProductionDataPersistence:
         date_dirs = sorted([d for d in category_dir.iterdir() if d.is_dir()], reverse=True)
         
         for date_dir in date_dirs:
-            for file_path in date_dir.glob(f"{record_id}_*.json*"):
+            candidates = list(date_dir.glob(f"{record_id}_*.json*"))
+            # Segmentos de group commit: la última versión del id gana
+            candidates += sorted(date_dir.glob(f"segment_*{_SEGMENT_SUFFIX}"), reverse=True)
+            for file_path in candidates:
                 try:
-                    if file_path.suffix == '.gz':
-                        with gzip.open(file_path, 'rt', encoding='utf-8') as f:
-                            data = json.load(f)
-                    else:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
+                    found = None
+                    for data in self._read_file_entries(file_path):
+                        if data.get('id') == record_id:
+                            found = data
+                    if found is None:
+                        continue
+                    data = found
                     
                     return DataRecord(
                         id=data['id'],
@@ -523,40 +863,62 @@ class ProductionDataPersistence:
                            limit: int = 100) -> List[DataRecord]:
         """Consultar desde SQLite"""
         try:
+            return list(islice(self._iter_from_database(category, start_time, end_time), limit))
+        except Exception as e:
+            logger.error(f"Database query error: {e}", "QUERY")
+            return []
+    
+    def _iter_from_database(self,
+                            category: DataCategory,
+                            start_time: Optional[datetime] = None,
+                            end_time: Optional[datetime] = None,
+                            summary_only: bool = False,
+                            batch_size: int = 500) -> Iterator[Any]:
+        """Paginación keyset sobre idx_category_timestamp_summary"""
+        columns = "id, timestamp, summary_json" if summary_only else \
+            "id, category, timestamp, data_json, metadata_json"
+        base_sql = f"SELECT {columns} FROM data_records WHERE category = ?"
+        base_params: List[Any] = [category.value]
+        if start_time:
+            base_sql += " AND timestamp >= ?"
+            base_params.append(start_time.isoformat())
+        if end_time:
+            base_sql += " AND timestamp <= ?"
+            base_params.append(end_time.isoformat())
+        
+        cursor: Optional[Tuple[str, str]] = None
+        batch_size = max(1, batch_size)
+        while True:
+            sql, params = base_sql, list(base_params)
+            if cursor is not None:
+                sql += " AND (timestamp < ? OR (timestamp = ? AND id < ?))"
+                params.extend([cursor[0], cursor[0], cursor[1]])
+            sql += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+            params.append(batch_size)
+            
             with self._get_db_connection() as conn:
-                sql = "SELECT * FROM data_records WHERE category = ?"
-                params = [category.value]
-                
-                if start_time:
-                    sql += " AND timestamp >= ?"
-                    params.append(start_time.isoformat())
-                
-                if end_time:
-                    sql += " AND timestamp <= ?"
-                    params.append(end_time.isoformat())
-                
-                sql += " ORDER BY timestamp DESC LIMIT ?"
-                # Keep parameter types homogeneous (all str) for type checker; SQLite will coerce
-                params.append(str(limit))
-                
                 rows = conn.execute(sql, params).fetchall()
-                
-                records = []
-                for row in rows:
-                    record = DataRecord(
+            
+            for row in rows:
+                if summary_only:
+                    yield {
+                        'id': row['id'],
+                        'category': category.value,
+                        'timestamp': row['timestamp'],
+                        'summary': json.loads(row['summary_json']) if row['summary_json'] else {}
+                    }
+                else:
+                    yield DataRecord(
                         id=row['id'],
                         category=DataCategory(row['category']),
                         timestamp=datetime.fromisoformat(row['timestamp']),
                         data=json.loads(row['data_json']),
                         metadata=json.loads(row['metadata_json']) if row['metadata_json'] else {}
                     )
-                    records.append(record)
-                
-                return records
-                
-        except Exception as e:
-            logger.error(f"Database query error: {e}", "QUERY")
-            return []
+            
+            if len(rows) < batch_size:
+                return
+            cursor = (rows[-1]['timestamp'], rows[-1]['id'])
     
     def _query_from_files(self, 
                         category: DataCategory,
@@ -564,52 +926,100 @@ class ProductionDataPersistence:
                         end_time: Optional[datetime] = None,
                         limit: int = 100) -> List[DataRecord]:
         """Consultar desde archivos (fallback)"""
+        return list(islice(self._iter_from_files(category, start_time, end_time), limit))
+    
+    def _iter_from_files(self,
+                         category: DataCategory,
+                         start_time: Optional[datetime] = None,
+                         end_time: Optional[datetime] = None,
+                         summary_only: bool = False) -> Iterator[Any]:
+        """
+        Streaming desde archivos con pushdown del rango temporal: se podan
+        directorios de fecha y archivos por nombre, y en segmentos JSONL solo
+        se deserializan las líneas cuyo timestamp cae en el rango.
+        """
         category_dir = self.config.base_path / category.value
         
         if not category_dir.exists():
-            return []
+            return
+        
+        first_day = start_time.date() if start_time else None
+        last_day = end_time.date() if end_time else None
         
-        records = []
+        def in_range(timestamp: datetime) -> bool:
+            if start_time and timestamp < start_time:
+                return False
+            if end_time and timestamp > end_time:
+                return False
+            return True
+        
+        def emit(data: Dict[str, Any], timestamp: datetime) -> Any:
+            if summary_only:
+                return {
+                    'id': data['id'],
+                    'category': category.value,
+                    'timestamp': data['timestamp'],
+                    'summary': _summarize_data(data.get('data', {}))
+                }
+            return DataRecord(
+                id=data['id'],
+                category=category,
+                timestamp=timestamp,
+                data=data['data'],
+                metadata=data.get('metadata', {})
+            )
         
-        # Search in date directories
         for date_dir in sorted([d for d in category_dir.iterdir() if d.is_dir()], reverse=True):
-            if len(records) >= limit:
-                break
+            try:
+                day = datetime.strptime(date_dir.name, '%Y-%m-%d').date()
+            except ValueError:
+                day = None
+            if day is not None:
+                if last_day and day > last_day:
+                    continue
+                if first_day and day < first_day:
+                    break
             
             for file_path in sorted(date_dir.glob("*.json*"), reverse=True):
-                if len(records) >= limit:
-                    break
-                
                 try:
-                    if file_path.suffix == '.gz':
-                        with gzip.open(file_path, 'rt', encoding='utf-8') as f:
-                            data = json.load(f)
-                    else:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                    
-                    timestamp = datetime.fromisoformat(data['timestamp'])
-                    
-                    # Filter by time range
-                    if start_time and timestamp < start_time:
-                        continue
-                    if end_time and timestamp > end_time:
+                    if file_path.suffix == _SEGMENT_SUFFIX:
+                        for raw in iter_lines_reverse(file_path):
+                            line = raw.decode('utf-8', errors='replace')
+                            match = _LINE_TIMESTAMP_RE.search(line)
+                            if not match:
+                                continue
+                            try:
+                                timestamp = datetime.fromisoformat(match.group(1))
+                            except ValueError:
+                                continue
+                            if not in_range(timestamp):
+                                continue
+                            try:
+                                data = json.loads(line)
+                            except ValueError:
+                                continue
+                            yield emit(data, timestamp)
                         continue
                     
-                    record = DataRecord(
-                        id=data['id'],
-                        category=category,
-                        timestamp=timestamp,
-                        data=data['data'],
-                        metadata=data.get('metadata', {})
-                    )
-                    records.append(record)
+                    # Poda por nombre (precisión de ms) antes de abrir el archivo
+                    match = _RECORD_FILE_TIME_RE.search(file_path.name)
+                    if match and day is not None:
+                        file_time = datetime.strptime(
+                            f"{date_dir.name} {match.group(1)}{match.group(2)}", '%Y-%m-%d %H%M%S%f'
+                        )
+                        if end_time and file_time > end_time:
+                            continue
+                        if start_time and file_time + timedelta(milliseconds=1) < start_time:
+                            continue
+                    
+                    for data in self._read_file_entries(file_path):
+                        timestamp = datetime.fromisoformat(data['timestamp'])
+                        if in_range(timestamp):
+                            yield emit(data, timestamp)
                     
                 except Exception as e:
                     logger.warning(f"File query error {file_path}: {e}", "QUERY")
                     continue
-        
-        return records
     
     # Backup and Recovery
     def create_backup(self) -> bool:
@@ -795,6 +1205,13 @@ class ProductionDataPersistence:
         
         self._shutdown_event.set()
         
+        # Drain group commit queue
+        if self._commit_thread is not None:
+            with self._pending_cond:
+                self._pending_cond.notify_all()
+            self._commit_thread.join(timeout=30)
+            self._commit_thread = None
+        
         # Wait for backup thread
         if self._backup_thread and self._backup_thread.is_alive():
             self._backup_thread.join(timeout=10)
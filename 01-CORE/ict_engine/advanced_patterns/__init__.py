@@ -57,6 +57,9 @@ from .order_block_mitigation_enterprise import (
 JudasSwingEnterprise = JudasSwingDetectorEnterprise
 LiquidityGrabEnterprise = LiquidityGrabDetectorEnterprise
 
+# Features por vela compartidos entre detectores
+from .pattern_feature_context import PatternFeatureContext
+
 # Import para Pattern Analyzer Enterprise v6.0
 from .pattern_analyzer_enterprise import (
     PatternAnalyzerEnterprise,
@@ -94,6 +97,7 @@ __all__ = [
     'OrderBlockStrength',
     'JudasSwingEnterprise',  # Alias para compatibilidad
     'LiquidityGrabEnterprise',  # Alias para compatibilidad
+    'PatternFeatureContext',
     'PatternAnalyzerEnterprise',
     'PatternSignal',
     'AnalysisResult',
@@ -339,7 +339,8 @@ class JudasSwingDetectorEnterprise:
                                    timeframe: str,
                                    current_price: float = 0.0,
                                    detected_order_blocks: Optional[List[Dict]] = None,
-                                   market_structure_context: Optional[Dict] = None) -> List[JudasSwingSignal]:
+                                   market_structure_context: Optional[Dict] = None,
+                                   feature_context: Optional[Any] = None) -> List[JudasSwingSignal]:
         """
         🎭 DETECCIÓN PRINCIPAL JUDAS SWING ENTERPRISE
         
@@ -350,6 +351,7 @@ class JudasSwingDetectorEnterprise:
             current_price: Precio actual del mercado
             detected_order_blocks: Order Blocks detectados previamente
             market_structure_context: Contexto de estructura de mercado
+            feature_context: PatternFeatureContext compartido de la pasada (opcional)
             
         Returns:
             Lista de señales Judas Swing detectadas
@@ -382,7 +384,7 @@ class JudasSwingDetectorEnterprise:
             
             # 2. 📊 IDENTIFICAR SWING HIGHS/LOWS
             swing_score, swing_high, swing_low = self._identify_swing_levels_enterprise(
-                data, lookback=self.config['swing_lookback_periods']
+                data, lookback=self.config['swing_lookback_periods'], feature_context=feature_context
             )
             
             if swing_score < 0.5:
@@ -404,7 +406,7 @@ class JudasSwingDetectorEnterprise:
             )
             
             # 5. 📈 ANALIZAR VOLUME SPIKE (si disponible)
-            volume_spike_detected = self._analyze_volume_spike_enterprise(data)
+            volume_spike_detected = self._analyze_volume_spike_enterprise(data, feature_context)
             
             # 6. 🎯 ANALIZAR CONFLUENCIA CON POI
             poi_confluence_score, poi_present = self._analyze_poi_confluence_enterprise(
@@ -484,30 +486,38 @@ class JudasSwingDetectorEnterprise:
 
     def _identify_swing_levels_enterprise(self, 
                                          data: DataFrameType,
-                                         lookback: int = 20) -> Tuple[float, float, float]:
+                                         lookback: int = 20,
+                                         feature_context: Optional[Any] = None) -> Tuple[float, float, float]:
         """📊 Identificación de swing highs/lows enterprise"""
         try:
             if len(data) < lookback + 10:
                 return 0.3, 0.0, 0.0
             
-            # Usar datos recientes para identificar swings
-            recent_data = data.tail(lookback + 10)
-            
-            # 📈 IDENTIFICAR SWING HIGH
-            swing_high_idx = recent_data['high'].rolling(window=5, center=True).apply(
-                lambda x: x.iloc[2] == x.max(), raw=False
-            ).idxmax()
-            swing_high = recent_data.loc[swing_high_idx, 'high'] if swing_high_idx in recent_data.index else recent_data['high'].max()
-            
-            # 📉 IDENTIFICAR SWING LOW
-            swing_low_idx = recent_data['low'].rolling(window=5, center=True).apply(
-                lambda x: x.iloc[2] == x.min(), raw=False
-            ).idxmax()
-            swing_low = recent_data.loc[swing_low_idx, 'low'] if swing_low_idx in recent_data.index else recent_data['low'].min()
+            if feature_context is not None:
+                # Swing de ventana 5 centrada y rango medio desde el contexto compartido
+                swing_high = feature_context.centered_swing('high', lookback + 10)
+                swing_low = feature_context.centered_swing('low', lookback + 10)
+                avg_range = feature_context.tail_mean('range', lookback + 10)
+            else:
+                # Usar datos recientes para identificar swings
+                recent_data = data.tail(lookback + 10)
+                
+                # 📈 IDENTIFICAR SWING HIGH
+                swing_high_idx = recent_data['high'].rolling(window=5, center=True).apply(
+                    lambda x: x.iloc[2] == x.max(), raw=False
+                ).idxmax()
+                swing_high = recent_data.loc[swing_high_idx, 'high'] if swing_high_idx in recent_data.index else recent_data['high'].max()
+                
+                # 📉 IDENTIFICAR SWING LOW
+                swing_low_idx = recent_data['low'].rolling(window=5, center=True).apply(
+                    lambda x: x.iloc[2] == x.min(), raw=False
+                ).idxmax()
+                swing_low = recent_data.loc[swing_low_idx, 'low'] if swing_low_idx in recent_data.index else recent_data['low'].min()
+                
+                avg_range = recent_data['high'].subtract(recent_data['low']).mean()
             
             # 🎯 CALCULAR CALIDAD DEL SWING
             swing_range = abs(swing_high - swing_low)
-            avg_range = recent_data['high'].subtract(recent_data['low']).mean()
             
             # Score basado en significancia del swing
             swing_score = min(swing_range / (avg_range * 3), 1.0)
@@ -607,14 +617,20 @@ class JudasSwingDetectorEnterprise:
             log_error(f"Error validando reversal confirmation: {e}", "judas_swing_enterprise")
             return 0.0, False
 
-    def _analyze_volume_spike_enterprise(self, data: DataFrameType) -> bool:
+    def _analyze_volume_spike_enterprise(self, data: DataFrameType,
+                                         feature_context: Optional[Any] = None) -> bool:
         """📈 Análisis de volume spike enterprise"""
         try:
-            if 'volume' not in data.columns or data['volume'].isna().all():
+            if feature_context is not None:
+                if not feature_context.has_volume:
+                    return False  # No hay datos de volumen
+                recent_volume = feature_context.tail_mean('volume', 5)
+                avg_volume = feature_context.tail_mean('volume', 20)
+            elif 'volume' not in data.columns or data['volume'].isna().all():
                 return False  # No hay datos de volumen
-            
-            recent_volume = data['volume'].tail(5).mean()
-            avg_volume = data['volume'].tail(20).mean()
+            else:
+                recent_volume = data['volume'].tail(5).mean()
+                avg_volume = data['volume'].tail(20).mean()
             
             volume_spike = recent_volume > (avg_volume * self.config['volume_spike_threshold'])
             
@@ -370,7 +370,8 @@ class LiquidityGrabDetectorEnterprise:
                                       timeframe: str,
                                       current_price: float = 0.0,
                                       detected_order_blocks: Optional[List[Dict]] = None,
-                                      market_structure_context: Optional[Dict] = None) -> List[LiquidityGrabSignal]:
+                                      market_structure_context: Optional[Dict] = None,
+                                      feature_context: Optional[Any] = None) -> List[LiquidityGrabSignal]:
         """
         🌊 DETECCIÓN PRINCIPAL LIQUIDITY GRAB ENTERPRISE
         
@@ -381,6 +382,7 @@ class LiquidityGrabDetectorEnterprise:
             current_price: Precio actual del mercado
             detected_order_blocks: Order Blocks detectados previamente
             market_structure_context: Contexto de estructura de mercado
+            feature_context: PatternFeatureContext compartido de la pasada (opcional)
             
         Returns:
             Lista de señales Liquidity Grab detectadas
@@ -405,7 +407,7 @@ class LiquidityGrabDetectorEnterprise:
             detected_order_blocks = detected_order_blocks or []
             
             # 1. 🌊 MAPEAR NIVELES DE LIQUIDEZ
-            liquidity_map = self._map_liquidity_levels_enterprise(data)
+            liquidity_map = self._map_liquidity_levels_enterprise(data, feature_context)
             
             if not liquidity_map['levels']:
                 log_debug("🌊 No se detectaron niveles de liquidez significativos")
@@ -426,7 +428,7 @@ class LiquidityGrabDetectorEnterprise:
             )
             
             # 4. 📈 ANALIZAR VOLUME SPIKE
-            volume_score, volume_intensity = self._analyze_volume_spike_enterprise(data)
+            volume_score, volume_intensity = self._analyze_volume_spike_enterprise(data, feature_context)
             
             # 5. 🏛️ DETECTAR INSTITUTIONAL FOOTPRINT
             institutional_score, smart_money_confirmed = self._detect_institutional_footprint_enterprise(
@@ -482,7 +484,8 @@ class LiquidityGrabDetectorEnterprise:
             log_error(f"❌ Error en detección Liquidity Grab: {e}")
             return []
 
-    def _map_liquidity_levels_enterprise(self, data: DataFrameType) -> Dict[str, Any]:
+    def _map_liquidity_levels_enterprise(self, data: DataFrameType,
+                                         feature_context: Optional[Any] = None) -> Dict[str, Any]:
         """🌊 Mapear niveles de liquidez enterprise"""
         try:
             # Obtener pandas instance
@@ -494,9 +497,21 @@ class LiquidityGrabDetectorEnterprise:
             lookback = min(len(data), self.config['liquidity_density_periods'])
             recent_data = data.tail(lookback)
             
-            # Previous day high/low (más importantes)
-            daily_high = recent_data['high'].max()
-            daily_low = recent_data['low'].min()
+            if feature_context is not None:
+                # Features compartidos de la pasada (mismos valores que la ruta pandas)
+                touch_bars = min(lookback, 20)
+                daily_high = feature_context.tail_max('high', lookback)
+                daily_low = feature_context.tail_min('low', lookback)
+                all_highs, all_lows = feature_context.strict_swings(lookback)
+                swing_highs, swing_lows = all_highs[-3:], all_lows[-3:]
+                estimate_stops = lambda price: 50 + feature_context.level_touches(price, touch_bars) * 20
+            else:
+                # Previous day high/low (más importantes)
+                daily_high = recent_data['high'].max()
+                daily_low = recent_data['low'].min()
+                swing_highs = self._identify_swing_highs(recent_data)
+                swing_lows = self._identify_swing_lows(recent_data)
+                estimate_stops = lambda price: self._estimate_stops_at_level(recent_data, price)
             
             liquidity_levels.extend([
                 {
@@ -504,28 +519,25 @@ class LiquidityGrabDetectorEnterprise:
                     'type': 'previous_day_high',
                     'weight': self.liquidity_levels['previous_day_high']['weight'],
                     'liquidity_level': self.liquidity_levels['previous_day_high']['type'],
-                    'stops_estimate': self._estimate_stops_at_level(recent_data, daily_high)
+                    'stops_estimate': estimate_stops(daily_high)
                 },
                 {
                     'price': daily_low,
                     'type': 'previous_day_low',
                     'weight': self.liquidity_levels['previous_day_low']['weight'],
                     'liquidity_level': self.liquidity_levels['previous_day_low']['type'],
-                    'stops_estimate': self._estimate_stops_at_level(recent_data, daily_low)
+                    'stops_estimate': estimate_stops(daily_low)
                 }
             ])
             
             # 📈 SWING HIGHS/LOWS
-            swing_highs = self._identify_swing_highs(recent_data)
-            swing_lows = self._identify_swing_lows(recent_data)
-            
             for swing_high in swing_highs:
                 liquidity_levels.append({
                     'price': swing_high,
                     'type': 'swing_high',
                     'weight': self.liquidity_levels['swing_high']['weight'],
                     'liquidity_level': self.liquidity_levels['swing_high']['type'],
-                    'stops_estimate': self._estimate_stops_at_level(recent_data, swing_high)
+                    'stops_estimate': estimate_stops(swing_high)
                 })
             
             for swing_low in swing_lows:
@@ -534,7 +546,7 @@ class LiquidityGrabDetectorEnterprise:
                     'type': 'swing_low',
                     'weight': self.liquidity_levels['swing_low']['weight'],
                     'liquidity_level': self.liquidity_levels['swing_low']['type'],
-                    'stops_estimate': self._estimate_stops_at_level(recent_data, swing_low)
+                    'stops_estimate': estimate_stops(swing_low)
                 })
             
             # Ordenar por weight (importancia)
@@ -639,14 +651,20 @@ class LiquidityGrabDetectorEnterprise:
             log_error(f"Error validando quick reversal: {e}")
             return 0.0, 0.0
 
-    def _analyze_volume_spike_enterprise(self, data: DataFrameType) -> Tuple[float, float]:
+    def _analyze_volume_spike_enterprise(self, data: DataFrameType,
+                                         feature_context: Optional[Any] = None) -> Tuple[float, float]:
         """📈 Análisis de volume spike enterprise"""
         try:
-            if 'volume' not in data.columns or data['volume'].isna().all():
+            if feature_context is not None:
+                if not feature_context.has_volume:
+                    return 0.5, 0.0  # Score neutro si no hay volume data
+                recent_volume = feature_context.tail_mean('volume', 3)
+                avg_volume = feature_context.tail_mean('volume', 20)
+            elif 'volume' not in data.columns or data['volume'].isna().all():
                 return 0.5, 0.0  # Score neutro si no hay volume data
-            
-            recent_volume = data['volume'].tail(3).mean()
-            avg_volume = data['volume'].tail(20).mean()
+            else:
+                recent_volume = data['volume'].tail(3).mean()
+                avg_volume = data['volume'].tail(20).mean()
             
             if avg_volume == 0:
                 return 0.5, 0.0
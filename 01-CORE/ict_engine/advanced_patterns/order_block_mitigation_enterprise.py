@@ -353,7 +353,8 @@ class OrderBlockMitigationDetectorEnterprise:
                                               timeframe: str,
                                               current_price: float = 0.0,
                                               detected_liquidity_grabs: Optional[List[Dict]] = None,
-                                              market_structure_context: Optional[Dict] = None) -> List[OrderBlockMitigationSignal]:
+                                              market_structure_context: Optional[Dict] = None,
+                                              feature_context: Optional[Any] = None) -> List[OrderBlockMitigationSignal]:
         """
         🎯 DETECCIÓN PRINCIPAL ORDER BLOCK MITIGATION ENTERPRISE
         
@@ -364,6 +365,7 @@ class OrderBlockMitigationDetectorEnterprise:
             current_price: Precio actual del mercado
             detected_liquidity_grabs: Liquidity Grabs detectados previamente
             market_structure_context: Contexto de estructura de mercado
+            feature_context: PatternFeatureContext compartido de la pasada (opcional)
             
         Returns:
             Lista de señales Order Block Mitigation detectadas
@@ -407,7 +409,7 @@ class OrderBlockMitigationDetectorEnterprise:
                 
                 # 3. 📈 ANALIZAR VOLUME CONFIRMATION
                 volume_score, volume_strength = self._analyze_mitigation_volume_enterprise(
-                    data, order_block, mitigation_details
+                    data, order_block, mitigation_details, feature_context
                 )
                 
                 # 4. 🏛️ VALIDAR INSTITUTIONAL FOOTPRINT
@@ -799,15 +801,22 @@ class OrderBlockMitigationDetectorEnterprise:
     def _analyze_mitigation_volume_enterprise(self, 
                                             data: DataFrameType,
                                             order_block: Dict[str, Any],
-                                            mitigation_details: Dict[str, Any]) -> Tuple[float, float]:
+                                            mitigation_details: Dict[str, Any],
+                                            feature_context: Optional[Any] = None) -> Tuple[float, float]:
         """📈 Analizar volume durante mitigation enterprise"""
         try:
-            if 'volume' not in data.columns or data['volume'].isna().all():
+            if feature_context is not None:
+                if not feature_context.has_volume:
+                    return 0.6, 0.0  # Score neutro si no hay volume data
+                # Medias memorizadas: se calculan una vez para todos los OBs
+                recent_volume = feature_context.tail_mean('volume', 5)
+                avg_volume = feature_context.tail_mean('volume', 20)
+            elif 'volume' not in data.columns or data['volume'].isna().all():
                 return 0.6, 0.0  # Score neutro si no hay volume data
-            
-            # Analizar volume en las últimas 5 velas (mitigation period)
-            recent_volume = data['volume'].tail(5).mean()
-            avg_volume = data['volume'].tail(20).mean()
+            else:
+                # Analizar volume en las últimas 5 velas (mitigation period)
+                recent_volume = data['volume'].tail(5).mean()
+                avg_volume = data['volume'].tail(20).mean()
             
             if avg_volume == 0:
                 return 0.6, 0.0
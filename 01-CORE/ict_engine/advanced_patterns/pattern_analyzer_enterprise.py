@@ -34,6 +34,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
+from collections import OrderedDict
 
 # 🏗️ ENTERPRISE ARCHITECTURE v6.0 - IMPORTS OPTIMIZADOS
 try:
@@ -78,6 +79,7 @@ try:
     from .judas_swing_enterprise import JudasSwingDetectorEnterprise
     from .liquidity_grab_enterprise import LiquidityGrabDetectorEnterprise
     from .order_block_mitigation_enterprise import OrderBlockMitigationDetectorEnterprise
+    from .pattern_feature_context import PatternFeatureContext, last_bar_timestamp
     PATTERN_DETECTORS_AVAILABLE = True
     log_info("✅ Pattern detectors importados exitosamente", "pattern_analyzer_enterprise")
 except ImportError as e:
@@ -200,7 +202,8 @@ class PatternAnalyzerEnterprise:
             'performance_config': {
                 'parallel_detection': True,
                 'cache_enabled': True,
-                'batch_processing': True
+                'batch_processing': True,
+                'feature_context_cache_size': 64
             }
         }
         
@@ -230,6 +233,9 @@ class PatternAnalyzerEnterprise:
         self.analysis_cache = {}
         self.pattern_history = {}
         
+        # Shared per-bar feature contexts keyed by (symbol, timeframe, last bar timestamp)
+        self._feature_contexts: "OrderedDict[Tuple[str, str, Any], Any]" = OrderedDict()
+        
         # Performance tracking
         self.performance_metrics = {
             'total_patterns_detected': 0,
@@ -237,6 +243,8 @@ class PatternAnalyzerEnterprise:
             'confluence_detections': 0,
             'conflicts_resolved': 0,
             'cache_hits': 0,
+            'feature_context_builds': 0,
+            'feature_context_reuses': 0,
             'processing_time_avg': 0.0
         }
         
@@ -312,6 +320,9 @@ class PatternAnalyzerEnterprise:
             detected_patterns = []
             detection_results = {}
             
+            # Shared features computed once for all detectors in this pass
+            feature_context = self._get_feature_context(data, symbol, timeframe)
+            
             for pattern_type, detector in self.detectors.items():
                 try:
                     log_debug(f"🔍 Ejecutando detector: {pattern_type.value}", "pattern_analyzer_enterprise")
@@ -319,13 +330,13 @@ class PatternAnalyzerEnterprise:
                     
                     # Call the specific detection method for each detector
                     if pattern_type == PatternType.SILVER_BULLET:
-                        signals = detector.detect_silver_bullet_patterns(data, symbol, timeframe)
+                        signals = detector.detect_silver_bullet_patterns(data, symbol, timeframe, feature_context=feature_context)
                     elif pattern_type == PatternType.JUDAS_SWING:
-                        signals = detector.detect_judas_swing_patterns(data, symbol, timeframe)
+                        signals = detector.detect_judas_swing_patterns(data, symbol, timeframe, feature_context=feature_context)
                     elif pattern_type == PatternType.LIQUIDITY_GRAB:
-                        signals = detector.detect_liquidity_grab_patterns(data, symbol, timeframe)
+                        signals = detector.detect_liquidity_grab_patterns(data, symbol, timeframe, feature_context=feature_context)
                     elif pattern_type == PatternType.ORDER_BLOCK_MITIGATION:
-                        signals = detector.detect_order_block_mitigation_patterns(data, symbol, timeframe)
+                        signals = detector.detect_order_block_mitigation_patterns(data, symbol, timeframe, feature_context=feature_context)
                     
                     if signals:
                         for signal in signals:
@@ -354,6 +365,28 @@ class PatternAnalyzerEnterprise:
             log_error(f"❌ Error en análisis de patrones: {e}", "pattern_analyzer_enterprise")
             return self._create_empty_result()
     
+    def _get_feature_context(self, data: pd.DataFrame, symbol: str, timeframe: str) -> Optional[Any]:
+        """Feature context for (symbol, timeframe, last bar); rebuilt if the last bar changed."""
+        try:
+            if not PATTERN_DETECTORS_AVAILABLE:
+                return None
+            key = (symbol, timeframe, last_bar_timestamp(data))
+            context = self._feature_contexts.get(key)
+            if context is not None and context.matches(data):
+                self._feature_contexts.move_to_end(key)
+                self.performance_metrics['feature_context_reuses'] += 1
+                return context
+            context = PatternFeatureContext.build(data, symbol, timeframe)
+            self._feature_contexts[key] = context
+            self.performance_metrics['feature_context_builds'] += 1
+            max_size = int(self.config.get('performance_config', {}).get('feature_context_cache_size', 64))
+            while len(self._feature_contexts) > max(1, max_size):
+                self._feature_contexts.popitem(last=False)
+            return context
+        except Exception as e:
+            log_debug(f"Feature context no disponible, detectores usan su propio cálculo: {e}", "pattern_analyzer_enterprise")
+            return None
+    
     def _convert_to_unified_signal(self, signal: Any, pattern_type: PatternType) -> Optional[PatternSignal]:
         """Convert detector-specific signal to unified PatternSignal format"""
         try:
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧮 PATTERN FEATURE CONTEXT v6.0
+🏗️ ICT Engine - Features por vela compartidas entre detectores
+
+PatternAnalyzerEnterprise construye un PatternFeatureContext por pasada de
+análisis (clave: symbol, timeframe, timestamp de la última vela) y lo entrega a
+Silver Bullet, Judas Swing, Liquidity Grab y OB Mitigation. Cada feature se
+calcula una sola vez sobre arrays NumPy y se memoriza en el contexto:
+
+- Medias/máximos/mínimos de cola (volumen, rango, highs/lows)
+- Swings estrictos de 2 velas (utils.swing_kernel)
+- Swing "centrado" de ventana 5 (equivalente al rolling(center=True) de Judas)
+- Toques de nivel para la estimación de stops del mapa de liquidez
+
+Los resultados son idénticos a las rutas pandas originales, que se mantienen
+como fallback cuando un detector se llama sin contexto.
+
+Author: ICT Development Team
+Version: 6.0 Enterprise Edition
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from utils.swing_kernel import find_swing_highs, find_swing_lows
+
+
+def _readonly(values: Any) -> np.ndarray:
+    arr = np.array(values, dtype=np.float64)
+    arr.setflags(write=False)
+    return arr
+
+
+def last_bar_timestamp(data: Any) -> Any:
+    """Timestamp de la última vela: índice datetime, columna time/timestamp o posición."""
+    try:
+        if hasattr(data.index, 'dtype') and 'datetime' in str(data.index.dtype):
+            return data.index[-1]
+        for column in ('time', 'timestamp', 'datetime'):
+            if column in data.columns:
+                return data[column].iloc[-1]
+        return data.index[-1]
+    except Exception:
+        return len(data)
+
+
+@dataclass(frozen=True)
+class PatternFeatureContext:
+    """
+    🧮 Contexto inmutable de features por vela para una pasada de análisis.
+
+    Los arrays son de solo lectura; los features derivados se memorizan en
+    `_memo` con una clave por feature y parámetros.
+    """
+    symbol: str
+    timeframe: str
+    last_bar_ts: Any
+    n_bars: int
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: Optional[np.ndarray]
+    _memo: Dict[Hashable, Any] = field(default_factory=dict, compare=False, repr=False)
+
+    @classmethod
+    def build(cls, data: Any, symbol: str, timeframe: str) -> 'PatternFeatureContext':
+        volume = None
+        if 'volume' in data.columns and not data['volume'].isna().all():
+            volume = _readonly(data['volume'].to_numpy(dtype=np.float64))
+        return cls(
+            symbol=symbol,
+            timeframe=timeframe,
+            last_bar_ts=last_bar_timestamp(data),
+            n_bars=len(data),
+            open=_readonly(data['open'].to_numpy(dtype=np.float64)),
+            high=_readonly(data['high'].to_numpy(dtype=np.float64)),
+            low=_readonly(data['low'].to_numpy(dtype=np.float64)),
+            close=_readonly(data['close'].to_numpy(dtype=np.float64)),
+            volume=volume,
+        )
+
+    @property
+    def key(self) -> Tuple[str, str, Any]:
+        return (self.symbol, self.timeframe, self.last_bar_ts)
+
+    @property
+    def has_volume(self) -> bool:
+        return self.volume is not None
+
+    def fingerprint(self) -> Tuple[Any, ...]:
+        """Longitud + OHLCV de la última vela: detecta una vela en formación que cambió."""
+        last_volume = float(self.volume[-1]) if self.volume is not None else None
+        return (self.n_bars, float(self.open[-1]), float(self.high[-1]),
+                float(self.low[-1]), float(self.close[-1]), last_volume)
+
+    def matches(self, data: Any) -> bool:
+        try:
+            last = data.iloc[-1]
+            last_volume = float(last['volume']) if self.volume is not None else None
+            return (len(data), float(last['open']), float(last['high']), float(last['low']),
+                    float(last['close']), last_volume) == self.fingerprint()
+        except Exception:
+            return False
+
+    def cached(self, key: Hashable, builder: Callable[[], Any]) -> Any:
+        """Memoriza builder() bajo key (un cálculo por pasada de análisis)."""
+        if key not in self._memo:
+            self._memo[key] = builder()
+        return self._memo[key]
+
+    def _series(self, column: str) -> np.ndarray:
+        if column == 'range':
+            return self.cached('range', lambda: self.high - self.low)
+        values = getattr(self, column)
+        if values is None:
+            raise KeyError(column)
+        return values
+
+    # ===========================================
+    # 📊 FEATURES DE COLA
+    # ===========================================
+
+    def tail_mean(self, column: str, n: int) -> float:
+        """Equivale a data[column].tail(n).mean() (ignora NaN)."""
+        def _mean() -> float:
+            window = self._series(column)[-n:]
+            mask = np.isnan(window)
+            count = window.size - int(np.count_nonzero(mask))
+            if count == 0:
+                return float('nan')
+            return np.where(mask, 0.0, window).sum() / count
+        return self.cached(('tail_mean', column, n), _mean)
+
+    def tail_max(self, column: str, n: int, skip: int = 0) -> float:
+        """Máximo de las `n` velas que terminan `skip` velas antes de la última."""
+        def _max() -> float:
+            values = self._series(column)
+            end = len(values) - skip
+            return np.max(values[max(0, end - n):end])
+        return self.cached(('tail_max', column, n, skip), _max)
+
+    def tail_min(self, column: str, n: int, skip: int = 0) -> float:
+        """Mínimo de las `n` velas que terminan `skip` velas antes de la última."""
+        def _min() -> float:
+            values = self._series(column)
+            end = len(values) - skip
+            return np.min(values[max(0, end - n):end])
+        return self.cached(('tail_min', column, n, skip), _min)
+
+    # ===========================================
+    # 📈 SWINGS
+    # ===========================================
+
+    def strict_swings(self, lookback: int) -> Tuple[List[float], List[float]]:
+        """Swings estrictos de 2 velas sobre la cola `lookback` (todos, en orden)."""
+        def _swings() -> Tuple[List[float], List[float]]:
+            start = max(0, self.n_bars - lookback)
+            _, high_prices = find_swing_highs(self.high[start:], 2)
+            _, low_prices = find_swing_lows(self.low[start:], 2)
+            return list(high_prices), list(low_prices)
+        return self.cached(('strict_swings', lookback), _swings)
+
+    def centered_swing(self, column: str, n: int) -> float:
+        """
+        Swing de ventana 5 centrada sobre la cola `n`: precio en la primera vela
+        que es el extremo de su ventana (como rolling(5, center=True).idxmax()).
+        """
+        def _swing() -> float:
+            values = self._series(column)[-n:]
+            if values.size < 5:
+                raise ValueError("insufficient bars for centered swing")
+            windows = sliding_window_view(values, 5)
+            valid = ~np.isnan(windows).any(axis=1)
+            if not valid.any():
+                raise ValueError("no complete window")
+            extreme = windows.max(axis=1) if column == 'high' else windows.min(axis=1)
+            flags = valid & (windows[:, 2] == extreme)
+            pos = int(np.argmax(flags)) if flags.any() else int(np.argmax(valid))
+            return values[pos + 2]
+        return self.cached(('centered_swing', column, n), _swing)
+
+    # ===========================================
+    # 🌊 LIQUIDEZ
+    # ===========================================
+
+    def level_touches(self, price: float, n: int = 20, tolerance: float = 0.0002) -> int:
+        """Velas de la cola `n` cuyo high o low está a <= tolerance de price."""
+        def _touches() -> int:
+            highs = self.high[-n:]
+            lows = self.low[-n:]
+            hit = (np.abs(highs - price) <= tolerance) | (np.abs(lows - price) <= tolerance)
+            return int(np.count_nonzero(hit))
+        return self.cached(('level_touches', float(price), n, tolerance), _touches)
+
+
+__all__ = ['PatternFeatureContext', 'last_bar_timestamp']
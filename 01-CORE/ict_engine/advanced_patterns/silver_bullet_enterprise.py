@@ -224,7 +224,8 @@ class SilverBulletDetectorEnterprise:
                                      timeframe: str,
                                      current_price: float = 0.0,
                                      detected_order_blocks: Optional[List[Dict]] = None,
-                                     market_structure_context: Optional[Dict] = None) -> List[SilverBulletSignal]:
+                                     market_structure_context: Optional[Dict] = None,
+                                     feature_context: Optional[Any] = None) -> List[SilverBulletSignal]:
         """
         🎯 DETECCIÓN PRINCIPAL SILVER BULLET ENTERPRISE
         
@@ -235,6 +236,7 @@ class SilverBulletDetectorEnterprise:
             current_price: Precio actual del mercado
             detected_order_blocks: Order Blocks detectados previamente
             market_structure_context: Contexto de estructura de mercado
+            feature_context: PatternFeatureContext compartido de la pasada (opcional)
             
         Returns:
             Lista de señales Silver Bullet detectadas
@@ -267,7 +269,7 @@ class SilverBulletDetectorEnterprise:
             
             # 2. 📊 ANALIZAR ESTRUCTURA DE MERCADO
             structure_score, market_direction = self._analyze_market_structure_enterprise(
-                data, market_structure_context
+                data, market_structure_context, feature_context
             )
             
             # 3. 🎯 DETECTAR CONFLUENCIA CON ORDER BLOCKS
@@ -301,6 +303,7 @@ class SilverBulletDetectorEnterprise:
                         timeframe=timeframe,
                         direction=market_direction,
                         current_price=current_price,
+                        feature_context=feature_context,
                     )
                     self._log_debug(f"💾 CHoCH memory bonus aplicado: {choch_bonus:+.2f} → conf {total_confidence:.1f}%")
                 except Exception as e:
@@ -417,29 +420,38 @@ class SilverBulletDetectorEnterprise:
 
     def _analyze_market_structure_enterprise(self, 
                                            data: DataFrameType,
-                                           market_context: Optional[Dict] = None) -> Tuple[float, TradingDirection]:
+                                           market_context: Optional[Dict] = None,
+                                           feature_context: Optional[Any] = None) -> Tuple[float, TradingDirection]:
         """📊 Análisis de estructura de mercado enterprise"""
         try:
             if len(data) < 10:
                 return 0.3, TradingDirection.NEUTRAL
             
-            recent_data = data.tail(20)
             structure_score = 0.5
             direction = TradingDirection.NEUTRAL
             
-            # 📈 ANÁLISIS DE TENDENCIA
-            recent_highs = recent_data['high'].rolling(window=5).max()
-            recent_lows = recent_data['low'].rolling(window=5).min()
+            # 📈 ANÁLISIS DE TENDENCIA (máx/mín de 5 velas: actual vs 4 velas atrás)
+            if feature_context is not None:
+                high_now = feature_context.tail_max('high', 5)
+                high_prev = feature_context.tail_max('high', 5, skip=4)
+                low_now = feature_context.tail_min('low', 5)
+                low_prev = feature_context.tail_min('low', 5, skip=4)
+            else:
+                recent_data = data.tail(20)
+                recent_highs = recent_data['high'].rolling(window=5).max()
+                recent_lows = recent_data['low'].rolling(window=5).min()
+                high_now, high_prev = recent_highs.iloc[-1], recent_highs.iloc[-5]
+                low_now, low_prev = recent_lows.iloc[-1], recent_lows.iloc[-5]
             
             # Higher highs + higher lows = bullish bias
-            if (recent_highs.iloc[-1] > recent_highs.iloc[-5] and 
-                recent_lows.iloc[-1] > recent_lows.iloc[-5]):
+            if (high_now > high_prev and 
+                low_now > low_prev):
                 structure_score = 0.8
                 direction = TradingDirection.BUY
                 
             # Lower highs + lower lows = bearish bias  
-            elif (recent_highs.iloc[-1] < recent_highs.iloc[-5] and 
-                  recent_lows.iloc[-1] < recent_lows.iloc[-5]):
+            elif (high_now < high_prev and 
+                  low_now < low_prev):
                 structure_score = 0.8
                 direction = TradingDirection.SELL
             
@@ -731,11 +743,17 @@ class SilverBulletDetectorEnterprise:
     # ===========================================
     # 💾 CHoCH MEMORY INTEGRATION HELPERS
     # ===========================================
-    def _estimate_choch_break_level(self, data: Any, direction: TradingDirection) -> float:
+    def _estimate_choch_break_level(self, data: Any, direction: TradingDirection,
+                                    feature_context: Optional[Any] = None) -> float:
         """Estimación simple del nivel de ruptura CHoCH según dirección."""
         try:
+            lookback = int(self.config.get('choch_level_lookback', 20))
+            if feature_context is not None and direction in (TradingDirection.BUY, TradingDirection.SELL):
+                if direction == TradingDirection.BUY:
+                    return float(feature_context.tail_max('high', lookback))
+                return float(feature_context.tail_min('low', lookback))
             pd = _pandas_manager.get_safe_pandas_instance()
-            recent = data.tail(int(self.config.get('choch_level_lookback', 20)))
+            recent = data.tail(lookback)
             if direction == TradingDirection.BUY:
                 return float(recent['high'].max())
             elif direction == TradingDirection.SELL:
@@ -754,12 +772,13 @@ class SilverBulletDetectorEnterprise:
                              symbol: str,
                              timeframe: str,
                              direction: TradingDirection,
-                             current_price: float) -> Tuple[float, Optional[float], float]:
+                             current_price: float,
+                             feature_context: Optional[Any] = None) -> Tuple[float, Optional[float], float]:
         """Aplica ajuste de confianza y target basado en memoria CHoCH.
 
         Retorna: (confianza_ajustada, choch_target_hint, bonus_aplicado)
         """
-        break_level = self._estimate_choch_break_level(data, direction)
+        break_level = self._estimate_choch_break_level(data, direction, feature_context)
 
         # Ajustar confianza usando historial CHoCH
         adjusted = choch_adjust_confidence(base_confidence, symbol, timeframe, break_level)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+🗂️ DETECTION RESULT CACHE - ICT Engine v6.0 Enterprise
+======================================================
+
+Últimos resultados de detección por (símbolo, timeframe), publicados por el
+motor (EnhancedDetectorPoolManager) y leídos por otros consumidores (p.ej. el
+dashboard) para no repetir la detección sobre la misma vela.
+
+Cada entrada guarda la clave de la última vela analizada (timestamp + nº de
+velas), los patrones detectados, el origen y el instante de publicación.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class DetectionResult:
+    """Resultado publicado de una pasada de detección"""
+    symbol: str
+    timeframe: str
+    bar_key: Any
+    patterns: Tuple[Any, ...]
+    published_at: float
+    source: str = 'engine'
+
+    @property
+    def count(self) -> int:
+        return len(self.patterns)
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (time.time() if now is None else now) - self.published_at
+
+
+def bar_key(frame: Any) -> Tuple[str, int]:
+    """Identificador de la última vela de un DataFrame (timestamp + nº de velas)"""
+    if 'time' in frame.columns:
+        last = frame['time'].iloc[-1]
+    elif 'timestamp' in frame.columns:
+        last = frame['timestamp'].iloc[-1]
+    else:
+        last = frame.index[-1]
+    return (str(last), len(frame))
+
+
+class DetectionResultCache:
+    """Caché thread-safe del último resultado por (símbolo, timeframe)"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], DetectionResult] = {}
+
+    def publish(self, symbol: str, timeframe: str, key: Any, patterns: Optional[List[Any]],
+                source: str = 'engine') -> DetectionResult:
+        entry = DetectionResult(symbol, timeframe.upper(), key, tuple(patterns or ()),
+                                time.time(), source)
+        with self._lock:
+            self._entries[(symbol, entry.timeframe)] = entry
+        return entry
+
+    def latest(self, symbol: str, timeframe: str,
+               max_age: Optional[float] = None) -> Optional[DetectionResult]:
+        """Último resultado del par; None si no hay o es más viejo que max_age segundos"""
+        with self._lock:
+            entry = self._entries.get((symbol, timeframe.upper()))
+        if entry is None or (max_age is not None and entry.age() > max_age):
+            return None
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_result_cache: Optional[DetectionResultCache] = None
+_result_cache_lock = threading.Lock()
+
+
+def get_detection_result_cache() -> DetectionResultCache:
+    """Instancia compartida del proceso"""
+    global _result_cache
+    with _result_cache_lock:
+        if _result_cache is None:
+            _result_cache = DetectionResultCache()
+        return _result_cache
+
+
+__all__ = ['DetectionResult', 'DetectionResultCache', 'bar_key', 'get_detection_result_cache']
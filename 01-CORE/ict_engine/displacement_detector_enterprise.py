@@ -27,6 +27,8 @@ from pathlib import Path
 import json
 import logging
 
+from utils.displacement_kernel import scan_displacement_windows
+
 # 🏗️ ENTERPRISE ARCHITECTURE v6.0 - Thread-safe pandas
 try:
     from data_management.advanced_candle_downloader import _pandas_manager
@@ -235,57 +237,23 @@ class DisplacementDetectorEnterprise:
         # Análisis ventana deslizante
         window_size = min(16, len(data) // 4)  # Adaptive window
         
-        for i in range(window_size, len(data) - 1):
-            # Ventana de análisis para displacement
-            analysis_window = data.iloc[i-window_size:i+1]
-            
-            # Core displacement detection
-            displacement_signal = self._analyze_displacement_window(
-                analysis_window, symbol, timeframe, i
+        # Fase 1: métricas de todas las ventanas en una pasada + deduplicación
+        candidates = self._scan_displacement_candidates(data, symbol, timeframe, window_size)
+        candidates = self._deduplicate_displacements(candidates)
+        
+        # Fase 2: enterprise enhancements en lote, solo sobre las señales finales
+        displacement_signals = self._enrich_displacements_batch(candidates, data, symbol, timeframe, window_size)
+        
+        for displacement_signal in displacement_signals:
+            log_trading_decision_smart_v6(
+                "DISPLACEMENT_DETECTED", {
+                    "displacement_type": displacement_signal.displacement_type,
+                    "displacement_pips": displacement_signal.displacement_pips,
+                    "momentum_score": displacement_signal.momentum_score,
+                    "institutional_signature": displacement_signal.institutional_signature,
+                    "memory_enhanced": displacement_signal.memory_enhanced
+                }, symbol=symbol
             )
-            
-            if displacement_signal:
-                # Enterprise enhancements
-                displacement_signal = self._enhance_with_memory(displacement_signal, symbol)
-                displacement_signal = self._enhance_with_sic_stats(displacement_signal, analysis_window)
-                displacement_signal = self._enhance_with_market_structure(displacement_signal, analysis_window)
-
-                # ML scoring for MSS (optional)
-                try:
-                    if self._mss_scorer is not None:
-                        ml = self._mss_scorer.score(analysis_window, symbol=symbol, timeframe=timeframe)
-                        displacement_signal.ml_score = float(ml.get('prob_shift', 0.0) or 0.0)
-                        displacement_signal.ml_confidence = float(ml.get('confidence', 0.0) or 0.0)
-                        # If ML strongly indicates shift, enforce flag
-                        if displacement_signal.ml_score >= 0.8 and displacement_signal.ml_confidence >= 0.6:
-                            displacement_signal.market_structure_shift = True
-                except Exception as e:
-                    self.logger.warning(f"MSS ML scoring failed: {e}")
-
-                # Mild CHoCH-based enrichment for MSS context
-                try:
-                    if self._choch_available:
-                        bonus_info = self._compute_choch_bonus(symbol=symbol, timeframe=timeframe, break_level=float(displacement_signal.end_price))
-                        hist_bonus = float(bonus_info.get('historical_bonus', 0.0) or 0.0)
-                        # Reflect bonus by adjusting target estimation slightly and embedding stats
-                        displacement_signal.target_estimation = displacement_signal.target_estimation * (1.0 + (hist_bonus / 500.0))
-                        signal_sr = self._choch_success_rate(symbol=symbol, timeframe=timeframe)
-                        displacement_signal.sic_stats["choch_bonus"] = hist_bonus
-                        displacement_signal.sic_stats["choch_success_rate"] = signal_sr
-                except Exception as e:
-                    self.logger.warning(f"CHoCH enrichment failed: {e}")
-                
-                displacement_signals.append(displacement_signal)
-                
-                log_trading_decision_smart_v6(
-                    "DISPLACEMENT_DETECTED", {
-                        "displacement_type": displacement_signal.displacement_type,
-                        "displacement_pips": displacement_signal.displacement_pips,
-                        "momentum_score": displacement_signal.momentum_score,
-                        "institutional_signature": displacement_signal.institutional_signature,
-                        "memory_enhanced": displacement_signal.memory_enhanced
-                    }, symbol=symbol
-                )
         
         log_trading_decision_smart_v6(
             "DISPLACEMENT_DETECTION_COMPLETE", {
@@ -298,6 +266,132 @@ class DisplacementDetectorEnterprise:
         
         return displacement_signals
     
+    def _scan_displacement_candidates(self, data: pd.DataFrame, symbol: str, timeframe: str,
+                                      window_size: int) -> List[Tuple[int, DisplacementSignal]]:
+        """🔍 Candidatos (índice de la última vela, señal) de todas las ventanas deslizantes"""
+        
+        ohlc = data[['open', 'high', 'low', 'close']].to_numpy(dtype=float)
+        if not np.isfinite(ohlc).all():
+            # Fallback: ventana por ventana (dropna/NaN con semántica pandas)
+            candidates = []
+            for i in range(window_size, len(data) - 1):
+                analysis_window = data.iloc[i-window_size:i+1]
+                displacement_signal = self._analyze_displacement_window(
+                    analysis_window, symbol, timeframe, i
+                )
+                if displacement_signal:
+                    candidates.append((i, displacement_signal))
+            return candidates
+        
+        volume_col = 'tick_volume' if 'tick_volume' in data.columns else 'volume'
+        windows = scan_displacement_windows(
+            ohlc[:, 0], ohlc[:, 1], ohlc[:, 2], ohlc[:, 3],
+            volumes=data[volume_col].to_numpy(dtype=float) if volume_col in data.columns else None,
+            window_size=window_size,
+            pip=self._get_pip_value(symbol),
+            min_pips=self.min_displacement_pips,
+            momentum_threshold=self.momentum_threshold,
+            volume_threshold=self.institutional_volume_threshold,
+            confluence_volumes=data['volume'].to_numpy(dtype=float) if 'volume' in data.columns else None,
+        )
+        
+        candidates = []
+        for k in range(len(windows)):
+            index = int(windows.end_indices[k])
+            start_price = float(windows.start_prices[k])
+            end_price = float(windows.end_prices[k])
+            price_movement = end_price - start_price
+            timestamp = data.index[index]
+            
+            confluence_factors = ["displacement_momentum"]
+            if windows.institutional_volume[k]:
+                confluence_factors.append("institutional_volume")
+            if windows.institutional_candle[k]:
+                confluence_factors.append("institutional_candle")
+            if timestamp.hour in [8, 9, 15, 16]:  # London/NY killzones
+                confluence_factors.append("killzone_timing")
+            if windows.potential_gaps[k]:
+                confluence_factors.append("fair_value_gaps")
+            
+            candidates.append((index, DisplacementSignal(
+                displacement_type="BULLISH_DISPLACEMENT" if price_movement > 0 else "BEARISH_DISPLACEMENT",
+                start_price=start_price,
+                end_price=end_price,
+                displacement_pips=float(windows.displacement_pips[k]),
+                timeframe_detected=timeframe,
+                timestamp=timestamp,
+                momentum_score=float(windows.momentum_scores[k]),
+                institutional_signature=bool(windows.institutional[k]),
+                target_estimation=self._calculate_ict_target(start_price, end_price, price_movement),
+                confluence_factors=confluence_factors
+            )))
+        return candidates
+    
+    def _deduplicate_displacements(self, candidates: List[Tuple[int, DisplacementSignal]]
+                                   ) -> List[Tuple[int, DisplacementSignal]]:
+        """🧹 Una señal por displacement: ventanas consecutivas de la misma dirección
+        describen el mismo movimiento; se conserva la de más pips (la primera en empate)"""
+        
+        deduplicated: List[Tuple[int, DisplacementSignal]] = []
+        previous_index = None
+        for index, signal in candidates:
+            if (deduplicated and previous_index == index - 1 and
+                    deduplicated[-1][1].displacement_type == signal.displacement_type):
+                if signal.displacement_pips > deduplicated[-1][1].displacement_pips:
+                    deduplicated[-1] = (index, signal)
+            else:
+                deduplicated.append((index, signal))
+            previous_index = index
+        return deduplicated
+    
+    def _enrich_displacements_batch(self, candidates: List[Tuple[int, DisplacementSignal]],
+                                    data: pd.DataFrame, symbol: str, timeframe: str,
+                                    window_size: int) -> List[DisplacementSignal]:
+        """🧠 Memory, SIC, estructura, MSS ML y CHoCH sobre las señales finales.
+        Las consultas que solo dependen de símbolo/tipo se resuelven una vez por lote."""
+        
+        insight_cache: Dict[str, Any] = {}
+        choch_rate: Dict[str, float] = {}
+        displacement_signals = []
+        
+        for index, displacement_signal in candidates:
+            analysis_window = data.iloc[index-window_size:index+1]
+            
+            # Enterprise enhancements
+            displacement_signal = self._enhance_with_memory(displacement_signal, symbol, insight_cache)
+            displacement_signal = self._enhance_with_sic_stats(displacement_signal, analysis_window)
+            displacement_signal = self._enhance_with_market_structure(displacement_signal, analysis_window)
+
+            # ML scoring for MSS (optional)
+            try:
+                if self._mss_scorer is not None:
+                    ml = self._mss_scorer.score(analysis_window, symbol=symbol, timeframe=timeframe)
+                    displacement_signal.ml_score = float(ml.get('prob_shift', 0.0) or 0.0)
+                    displacement_signal.ml_confidence = float(ml.get('confidence', 0.0) or 0.0)
+                    # If ML strongly indicates shift, enforce flag
+                    if displacement_signal.ml_score >= 0.8 and displacement_signal.ml_confidence >= 0.6:
+                        displacement_signal.market_structure_shift = True
+            except Exception as e:
+                self.logger.warning(f"MSS ML scoring failed: {e}")
+
+            # Mild CHoCH-based enrichment for MSS context
+            try:
+                if self._choch_available:
+                    bonus_info = self._compute_choch_bonus(symbol=symbol, timeframe=timeframe, break_level=float(displacement_signal.end_price))
+                    hist_bonus = float(bonus_info.get('historical_bonus', 0.0) or 0.0)
+                    # Reflect bonus by adjusting target estimation slightly and embedding stats
+                    displacement_signal.target_estimation = displacement_signal.target_estimation * (1.0 + (hist_bonus / 500.0))
+                    if 'success_rate' not in choch_rate:
+                        choch_rate['success_rate'] = self._choch_success_rate(symbol=symbol, timeframe=timeframe)
+                    displacement_signal.sic_stats["choch_bonus"] = hist_bonus
+                    displacement_signal.sic_stats["choch_success_rate"] = choch_rate['success_rate']
+            except Exception as e:
+                self.logger.warning(f"CHoCH enrichment failed: {e}")
+            
+            displacement_signals.append(displacement_signal)
+        
+        return displacement_signals
+    
     def _analyze_displacement_window(self, window: pd.DataFrame, symbol: str, 
                                    timeframe: str, index: int) -> Optional[DisplacementSignal]:
         """📊 Analizar ventana para displacement ICT"""
@@ -472,8 +566,9 @@ class DisplacementDetectorEnterprise:
         
         return False
     
-    def _enhance_with_memory(self, signal: DisplacementSignal, symbol: str) -> DisplacementSignal:
-        """🧠 Enhance with UnifiedMemorySystem v6.1"""
+    def _enhance_with_memory(self, signal: DisplacementSignal, symbol: str,
+                             insight_cache: Optional[Dict[str, Any]] = None) -> DisplacementSignal:
+        """🧠 Enhance with UnifiedMemorySystem v6.1 (insight_cache: consultas ya hechas en el lote)"""
         
         if not self.memory_enabled:
             return signal
@@ -481,7 +576,12 @@ class DisplacementDetectorEnterprise:
         try:
             # Query historical success rate
             memory_key = f"displacement_{signal.displacement_type}_{symbol}"
-            historical_data = self.memory_system.get_historical_insight(memory_key, "M15")
+            if insight_cache is not None and memory_key in insight_cache:
+                historical_data = insight_cache[memory_key]
+            else:
+                historical_data = self.memory_system.get_historical_insight(memory_key, "M15")
+                if insight_cache is not None:
+                    insight_cache[memory_key] = historical_data
             
             if historical_data:
                 signal.memory_enhanced = True
@@ -556,12 +656,13 @@ class DisplacementDetectorEnterprise:
         """📊 Analyze volume profile"""
         volumes = window['volume'].astype(float)
         avg_vol = volumes.mean()
+        last_vol = volumes.iloc[-1]
         
-        if volumes[-1] > avg_vol * 2:
+        if last_vol > avg_vol * 2:
             return "EXPLOSIVE"
-        elif volumes[-1] > avg_vol * 1.5:
+        elif last_vol > avg_vol * 1.5:
             return "HIGH"
-        elif volumes[-1] > avg_vol:
+        elif last_vol > avg_vol:
             return "ABOVE_AVERAGE"
         else:
             return "NORMAL"
@@ -58,6 +58,7 @@ import gc
 # ✅ REGLA #4: Sistema SIC y SLUC obligatorio
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from smart_trading_logger import SmartTradingLogger
+from utils.swing_kernel import detect_swing_points
 
 # 🏗️ ENTERPRISE ARCHITECTURE v6.0 - Thread-safe pandas
 try:
@@ -691,14 +692,18 @@ class FractalAnalyzerEnterprise:
         min_strength = self.config['min_swing_strength']
 
         try:
-            # Analizar desde left_bars hasta len(df) - right_bars
-            for i in range(left_bars, len(df) - right_bars):
+            # Candidatos vía kernel vectorizado (desigualdad estricta a ambos lados)
+            swings = detect_swing_points(df['high'].to_numpy(), df['low'].to_numpy(), left_bars, right_bars)
+            high_candidates = set(swings.high_indices.tolist())
+            low_candidates = set(swings.low_indices.tolist())
+
+            for i in sorted(high_candidates | low_candidates):
                 current_high = df.iloc[i]['high']
                 current_low = df.iloc[i]['low']
                 current_time = df.index[i] if hasattr(df.index[i], 'to_pydatetime') else datetime.now()
 
                 # DETECTAR SWING HIGH ENTERPRISE
-                if self._is_swing_high_enterprise(df, i, left_bars, right_bars):
+                if i in high_candidates:
                     strength = self._calculate_swing_strength_enterprise(df, i, 'HIGH')
                     confidence = self._calculate_swing_confidence_enterprise(df, i, 'HIGH')
                     
@@ -718,7 +723,7 @@ class FractalAnalyzerEnterprise:
                         swing_highs.append(swing_point)
 
                 # DETECTAR SWING LOW ENTERPRISE
-                if self._is_swing_low_enterprise(df, i, left_bars, right_bars):
+                if i in low_candidates:
                     strength = self._calculate_swing_strength_enterprise(df, i, 'LOW')
                     confidence = self._calculate_swing_confidence_enterprise(df, i, 'LOW')
                     
@@ -747,38 +752,6 @@ class FractalAnalyzerEnterprise:
                                 "detect_significant_swings_enterprise")
             return [], []
 
-    def _is_swing_high_enterprise(self, df: pd.DataFrame, index: int, left_bars: int, right_bars: int) -> bool:
-        """Verifica si es swing high usando criterios enterprise"""
-        current_high = df.iloc[index]['high']
-        
-        # Verificar barras a la izquierda
-        for j in range(index - left_bars, index):
-            if df.iloc[j]['high'] >= current_high:
-                return False
-        
-        # Verificar barras a la derecha
-        for j in range(index + 1, index + right_bars + 1):
-            if df.iloc[j]['high'] >= current_high:
-                return False
-        
-        return True
-
-    def _is_swing_low_enterprise(self, df: pd.DataFrame, index: int, left_bars: int, right_bars: int) -> bool:
-        """Verifica si es swing low usando criterios enterprise"""
-        current_low = df.iloc[index]['low']
-        
-        # Verificar barras a la izquierda
-        for j in range(index - left_bars, index):
-            if df.iloc[j]['low'] <= current_low:
-                return False
-        
-        # Verificar barras a la derecha
-        for j in range(index + 1, index + right_bars + 1):
-            if df.iloc[j]['low'] <= current_low:
-                return False
-        
-        return True
-
     def _calculate_swing_strength_enterprise(self, df: pd.DataFrame, index: int, swing_type: str) -> float:
         """
         💪 Calcula fuerza enterprise del swing point
@@ -11,10 +11,12 @@ Import paths:
 - machine_learning.choch.features
 - machine_learning.choch.models
 - machine_learning.choch.retrieval
+- machine_learning.choch.cache
 """
 
 from .dataset import CHoCHDataset, load_choch_dataframe
 from .features import build_feature_matrix
+from .cache import CHoCHMemoryCache, get_choch_cache
 from .models import (
     BaselineValidityClassifier,
     BaselineDirectionClassifier,
@@ -31,6 +33,8 @@ __all__ = [
     "CHoCHDataset",
     "load_choch_dataframe",
     "build_feature_matrix",
+    "CHoCHMemoryCache",
+    "get_choch_cache",
     "BaselineValidityClassifier",
     "BaselineDirectionClassifier",
     "save_model",
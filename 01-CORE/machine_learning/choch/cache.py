@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .dataset import (
+    CHoCHDataset,
+    _default_memory_dir,
+    _extract_choch_events,
+    _iter_memory_files,
+)
+from .features import build_feature_matrix, refresh_time_features
+
+# Resident CHoCH dataset: memory files are re-parsed only when their
+# (mtime, size) signature changes, only the (symbol, timeframe) groups
+# touched by a changed file are rebuilt, and static features are kept per
+# group so predictions never rescan the whole history.
+
+_COLUMNS = [
+    "timestamp",
+    "price",
+    "direction",
+    "confidence",
+    "timeframe",
+    "break_level",
+    "target_level",
+    "symbol",
+]
+
+GroupKey = Tuple[str, str]
+
+
+def _empty_frame() -> pd.DataFrame:
+    return pd.DataFrame(columns=_COLUMNS)
+
+
+class CHoCHMemoryCache:
+    """Keeps the CHoCH dataset and per-group feature matrices warm in memory."""
+
+    def __init__(self, memory_dir: Optional[Path | str] = None, min_refresh_interval: float = 0.5):
+        self.memory_dir = Path(memory_dir) if memory_dir else _default_memory_dir()
+        self.min_refresh_interval = float(min_refresh_interval)
+        self.version = 0
+        self._lock = threading.RLock()
+        self._file_sigs: Dict[Path, Tuple[int, int]] = {}
+        self._file_records: Dict[Path, List[Dict[str, Any]]] = {}
+        self._file_groups: Dict[Path, Dict[GroupKey, List[Dict[str, Any]]]] = {}
+        self._df: Optional[pd.DataFrame] = _empty_frame()  # full dataset, built lazily
+        self._groups: Dict[GroupKey, pd.DataFrame] = {}
+        self._features: Dict[GroupKey, Tuple[Tuple[Any, ...], pd.DataFrame]] = {}
+        self._last_check = 0.0
+        self._dirty = True
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+    def invalidate(self) -> None:
+        """Explicit change event: the next access re-checks the memory files."""
+        with self._lock:
+            self._dirty = True
+
+    def refresh(self, force: bool = False) -> bool:
+        """Re-parse changed memory files. Returns True if the dataset changed."""
+        with self._lock:
+            now = time.monotonic()
+            if not (force or self._dirty) and now - self._last_check < self.min_refresh_interval:
+                return False
+            self._last_check = now
+            self._dirty = False
+
+            seen: Dict[Path, Tuple[int, int]] = {}
+            affected: set = set()
+            for path in _iter_memory_files(self.memory_dir):
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                sig = (st.st_mtime_ns, st.st_size)
+                seen[path] = sig
+                if self._file_sigs.get(path) == sig:
+                    continue
+                records = self._parse(path)
+                grouped = self._group_records(records)
+                affected.update(self._file_groups.get(path, {}))
+                affected.update(grouped)
+                self._file_records[path] = records
+                self._file_groups[path] = grouped
+            for gone in set(self._file_sigs) - set(seen):
+                self._file_records.pop(gone, None)
+                affected.update(self._file_groups.pop(gone, {}))
+            changed = bool(affected) or set(seen) != set(self._file_sigs)
+            self._file_sigs = seen
+            if changed:
+                self._rebuild(affected)
+            return changed
+
+    @staticmethod
+    def _parse(path: Path) -> List[Dict[str, Any]]:
+        import json
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return _extract_choch_events(json.load(f))
+        except Exception:
+            return []
+
+    @staticmethod
+    def _group_records(records: List[Dict[str, Any]]) -> Dict[GroupKey, List[Dict[str, Any]]]:
+        grouped: Dict[GroupKey, List[Dict[str, Any]]] = {}
+        for rec in records:
+            key = (str(rec.get("symbol")), str(rec.get("timeframe")).upper())
+            grouped.setdefault(key, []).append(rec)
+        return grouped
+
+    @staticmethod
+    def _frame(records: List[Dict[str, Any]]) -> pd.DataFrame:
+        if not records:
+            return _empty_frame()
+        df = pd.DataFrame.from_records(records, columns=_COLUMNS)
+        df.sort_values("timestamp", inplace=True, kind="stable")
+        df.reset_index(drop=True, inplace=True)
+        return df
+
+    def _rebuild(self, affected: set) -> None:
+        """Rebuild only the groups whose records changed; the full frame is rebuilt on demand."""
+        paths = sorted(self._file_groups)
+        for key in affected:
+            records = [rec for path in paths for rec in self._file_groups[path].get(key, ())]
+            if records:
+                self._groups[key] = self._frame(records)
+            else:
+                self._groups.pop(key, None)
+        # Keep feature matrices whose group did not change
+        self._features = {
+            key: cached for key, cached in self._features.items()
+            if key in self._groups and cached[0] == self._group_signature(self._groups[key])
+        }
+        self._df = None
+        self.version += 1
+
+    @staticmethod
+    def _group_signature(group: pd.DataFrame) -> Tuple[Any, ...]:
+        if group.empty:
+            return (0,)
+        return (len(group), group["timestamp"].iloc[0], group["timestamp"].iloc[-1],
+                float(group["confidence"].sum()))
+
+    # ------------------------------------------------------------------
+    # Accessors
+    # ------------------------------------------------------------------
+    def dataset(self) -> CHoCHDataset:
+        self.refresh()
+        with self._lock:
+            if self._df is None:
+                self._df = self._frame([
+                    rec for path in sorted(self._file_records) for rec in self._file_records[path]
+                ])
+            return CHoCHDataset(self._df)
+
+    def is_empty(self) -> bool:
+        """True when no CHoCH event is resident (without building the full frame)."""
+        self.refresh()
+        return not self._groups
+
+    def group(self, symbol: str, timeframe: str) -> pd.DataFrame:
+        self.refresh()
+        return self._groups.get((str(symbol), timeframe.upper()), _empty_frame())
+
+    def features(self, symbol: str, timeframe: str, limit: Optional[int] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        (rows, X) for a symbol/timeframe. Static features are built once per
+        group version; only the recency column is recomputed per call.
+        """
+        self.refresh()
+        key = (str(symbol), timeframe.upper())
+        with self._lock:
+            group = self._groups.get(key)
+            if group is None or group.empty:
+                return _empty_frame(), pd.DataFrame()
+            sig = self._group_signature(group)
+            cached = self._features.get(key)
+            if cached is None or cached[0] != sig:
+                X_static, _ = build_feature_matrix(group)
+                cached = (sig, X_static)
+                self._features[key] = cached
+            X_static = cached[1]
+        if limit is not None and limit > 0:
+            group = group.tail(limit)
+            X_static = X_static.tail(limit)
+        return group, refresh_time_features(X_static, group)
+
+
+_CACHES: Dict[str, CHoCHMemoryCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_choch_cache(memory_dir: Optional[Path | str] = None) -> CHoCHMemoryCache:
+    """Shared cache per memory directory."""
+    directory = Path(memory_dir) if memory_dir else _default_memory_dir()
+    key = str(directory.resolve())
+    with _CACHES_LOCK:
+        cache = _CACHES.get(key)
+        if cache is None:
+            cache = CHoCHMemoryCache(directory)
+            _CACHES[key] = cache
+        return cache
+
+
+__all__ = ["CHoCHMemoryCache", "get_choch_cache"]
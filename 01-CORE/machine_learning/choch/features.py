@@ -74,3 +74,15 @@ def build_feature_matrix(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, str]
     }
 
     return X.fillna(0.0), schema
+
+
+def refresh_time_features(X: pd.DataFrame, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return a copy of a cached feature matrix with wall-clock dependent
+    columns (recency_min) recomputed; every other column is time-invariant.
+    """
+    if X is None or X.empty:
+        return X
+    out = X.copy()
+    out["recency_min"] = _recency_minutes(df["timestamp"]).to_numpy()
+    return out
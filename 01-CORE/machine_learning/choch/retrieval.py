@@ -6,7 +6,7 @@ from typing import Dict, List, Optional
 
 import pandas as pd
 
-from .dataset import CHoCHDataset
+from .cache import get_choch_cache
 
 
 def get_recent_choch(
@@ -15,14 +15,19 @@ def get_recent_choch(
     within_minutes: int = 240,
     memory_dir: Optional[Path | str] = None,
 ) -> pd.DataFrame:
-    ds = CHoCHDataset.from_memory(memory_dir)
-    df = ds.df
+    cache = get_choch_cache(memory_dir)
+    if symbol and timeframe:
+        df = cache.group(symbol, timeframe)
+    else:
+        df = cache.dataset().df
+        if df.empty:
+            return df
+        if symbol:
+            df = df[df["symbol"] == symbol]
+        if timeframe:
+            df = df[df["timeframe"].str.upper() == timeframe.upper()]
     if df.empty:
         return df
-    if symbol:
-        df = df[df["symbol"] == symbol]
-    if timeframe:
-        df = df[df["timeframe"].str.upper() == timeframe.upper()]
     cutoff = pd.Timestamp(datetime.now(timezone.utc)) - pd.Timedelta(minutes=within_minutes)
     return df[df["timestamp"] >= cutoff].sort_values("timestamp")
 
@@ -33,7 +38,7 @@ def find_historical_choch(
     min_confidence: float = 60.0,
     memory_dir: Optional[Path | str] = None,
 ) -> pd.DataFrame:
-    ds = CHoCHDataset.from_memory(memory_dir)
+    ds = get_choch_cache(memory_dir).dataset()
     ds = ds.filter(symbol=symbol, timeframes=timeframes, min_confidence=min_confidence)
     return ds.df
 
@@ -44,9 +49,7 @@ def get_choch_by_symbol_timeframe(
     limit: int = 50,
     memory_dir: Optional[Path | str] = None,
 ) -> pd.DataFrame:
-    ds = CHoCHDataset.from_memory(memory_dir)
-    df = ds.df
+    df = get_choch_cache(memory_dir).group(symbol, timeframe)
     if df.empty:
         return df
-    df = df[(df["symbol"] == symbol) & (df["timeframe"].str.upper() == timeframe.upper())]
-    return df.sort_values("timestamp").tail(limit).reset_index(drop=True)
+    return df.tail(limit).reset_index(drop=True)
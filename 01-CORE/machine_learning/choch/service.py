@@ -2,17 +2,19 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
 
 # Local imports (01-CORE must be on sys.path by caller, as done in CLI)
 from analysis.unified_market_memory import get_unified_market_memory
-from .dataset import CHoCHDataset
-from .features import build_feature_matrix
+from .cache import CHoCHMemoryCache, get_choch_cache
 from .models import load_model as load_sklearn_model
 
+# Most recent events per pair scored by predict_many unless the caller asks otherwise
+DEFAULT_PREDICT_LIMIT = 500
+
 
 @dataclass
 class CHOCHModelService:
@@ -21,6 +23,11 @@ class CHOCHModelService:
     direction_model_path: Path
     _validity_model: Optional[Any] = None
     _direction_model: Optional[Any] = None
+    memory_dir: Optional[Path] = None
+    _cache: Optional[CHoCHMemoryCache] = None
+    _memory_restored: bool = False
+    _validity_sig: Optional[Tuple[int, int]] = None
+    _direction_sig: Optional[Tuple[int, int]] = None
 
     @classmethod
     def default(cls) -> "CHOCHModelService":
@@ -32,58 +39,95 @@ class CHOCHModelService:
             direction_model_path=models / "direction_lr.joblib",
         )
 
+    @staticmethod
+    def _artifact_sig(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
     def ensure_loaded(self) -> None:
-        if self._validity_model is None and self.validity_model_path.exists():
+        """Load each model artifact, reloading only the one whose file changed."""
+        sig = self._artifact_sig(self.validity_model_path)
+        if sig is not None and sig != self._validity_sig:
             self._validity_model = load_sklearn_model(str(self.validity_model_path))
-        if self._direction_model is None and self.direction_model_path.exists():
+            self._validity_sig = sig
+        sig = self._artifact_sig(self.direction_model_path)
+        if sig is not None and sig != self._direction_sig:
             self._direction_model = load_sklearn_model(str(self.direction_model_path))
+            self._direction_sig = sig
 
-    def predict_for_symbol_tf(self, symbol: str, timeframe: str) -> Dict[str, object]:
-        # Make sure memory is available
-        mem = get_unified_market_memory()
-        mem.restore_unified_memory_state()
+    def warm(self) -> None:
+        """Restore unified memory once and load models + dataset into memory."""
+        if not self._memory_restored:
+            mem = get_unified_market_memory()
+            mem.restore_unified_memory_state()
+            self._memory_restored = True
+        self.ensure_loaded()
+        self.cache().refresh(force=True)
 
-        # Load dataset
-        ds = CHoCHDataset.from_memory()
-        df = ds.df
-        if df.empty:
-            return {"status": "no-data", "message": "No CHoCH events in memory"}
+    def cache(self) -> CHoCHMemoryCache:
+        if self._cache is None:
+            self._cache = get_choch_cache(self.memory_dir)
+        return self._cache
 
-        # Filter to symbol/tf
-        sel = df[(df["symbol"] == symbol) & (df["timeframe"].str.upper() == timeframe.upper())]
-        if sel.empty:
-            return {"status": "no-data", "message": "No CHoCH for symbol/timeframe"}
+    def predict_for_symbol_tf(self, symbol: str, timeframe: str,
+                              limit: Optional[int] = DEFAULT_PREDICT_LIMIT) -> Dict[str, object]:
+        return self.predict_many([(symbol, timeframe)], limit=limit)[0]
 
-        X, _ = build_feature_matrix(sel)
-        if X.empty:
-            return {"status": "no-data", "message": "Empty features"}
+    def predict_many(self, pairs: Sequence[Tuple[str, str]],
+                     limit: Optional[int] = DEFAULT_PREDICT_LIMIT) -> List[Dict[str, object]]:
+        """
+        Batched predictions for several (symbol, timeframe) pairs.
 
+        Features come from the resident cache; each model is invoked once
+        over the concatenated rows. `limit` keeps only the most recent events
+        per pair (DEFAULT_PREDICT_LIMIT by default, None scores the whole
+        history) so latency stays bounded regardless of history size.
+        """
+        if not self._memory_restored:
+            self.warm()
+        cache = self.cache()
         self.ensure_loaded()
-        result: Dict[str, object] = {
-            "status": "ok",
-            "count": int(len(sel)),
-            "symbol": symbol,
-            "timeframe": timeframe,
-        }
-
-        # Validity
-        if self._validity_model is not None and hasattr(self._validity_model, "predict"):
-            try:
-                pred_valid = self._validity_model.predict(X)
-                result["pred_validity"] = getattr(pred_valid, "tolist", lambda: pred_valid)()
-            except Exception:
-                result["pred_validity"] = []
-        else:
-            result["pred_validity"] = []
-
-        # Direction
-        if self._direction_model is not None and hasattr(self._direction_model, "predict"):
-            try:
-                pred_dir = self._direction_model.predict(X)
-                result["pred_direction"] = getattr(pred_dir, "tolist", lambda: pred_dir)()
-            except Exception:
-                result["pred_direction"] = []
-        else:
-            result["pred_direction"] = []
-
-        return result
+
+        results: List[Dict[str, object]] = []
+        blocks: List[pd.DataFrame] = []
+        spans: List[Tuple[int, int, int]] = []  # (result idx, start, end)
+        offset = 0
+        dataset_empty = cache.is_empty()
+        for symbol, timeframe in pairs:
+            if dataset_empty:
+                results.append({"status": "no-data", "message": "No CHoCH events in memory"})
+                continue
+            sel, X = cache.features(symbol, timeframe, limit=limit)
+            if sel.empty:
+                results.append({"status": "no-data", "message": "No CHoCH for symbol/timeframe"})
+                continue
+            if X.empty:
+                results.append({"status": "no-data", "message": "Empty features"})
+                continue
+            results.append({
+                "status": "ok",
+                "count": int(len(sel)),
+                "symbol": symbol,
+                "timeframe": timeframe,
+            })
+            blocks.append(X)
+            spans.append((len(results) - 1, offset, offset + len(X)))
+            offset += len(X)
+
+        if not blocks:
+            return results
+        X_all = pd.concat(blocks, ignore_index=True)
+        for key, model in (("pred_validity", self._validity_model), ("pred_direction", self._direction_model)):
+            preds: Optional[List[Any]] = None
+            if model is not None and hasattr(model, "predict"):
+                try:
+                    out = model.predict(X_all)
+                    preds = list(getattr(out, "tolist", lambda: out)())
+                except Exception:
+                    preds = None
+            for idx, start, end in spans:
+                results[idx][key] = preds[start:end] if preds is not None else []
+        return results
@@ -1,6 +1,7 @@
 from __future__ import annotations
-import json
+import heapq
 import os
+import threading
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -16,6 +17,8 @@ try:
 except ImportError:
     _cache_available = False
 
+from memory.choch_storage import CHoCHJournalStore, CHoCHLevelIndex, COMPACT_EVERY_DEFAULT
+
 DEFAULT_STORAGE = Path(__file__).resolve().parent / 'choch_historical.json'
 DEFAULT_BACKUP = Path(__file__).resolve().parents[2] / '04-DATA' / 'cache' / 'choch_backup.json'
 
@@ -47,7 +50,8 @@ class CHoCHHistoricalMemory:
                  storage_path: Path = DEFAULT_STORAGE,
                  backup_path: Path = DEFAULT_BACKUP,
                  retention_days: int = RETENTION_DAYS_DEFAULT,
-                 max_records: int = MAX_RECORDS_DEFAULT):
+                 max_records: int = MAX_RECORDS_DEFAULT,
+                 compact_every: int = COMPACT_EVERY_DEFAULT):
         self.storage_path = Path(storage_path)
         self.backup_path = Path(backup_path)
         self.retention_days = retention_days
@@ -81,8 +85,17 @@ class CHoCHHistoricalMemory:
                 'quick_test_mode': self.quick_test_mode,
                 'disable_heavy_init': self.disable_heavy_init,
             },
-            'records': []  # List[CHoCHEvent dicts]
+            'records': []  # Only materialized for snapshots; live records in self._records
         }
+
+        # Live state: seq -> record (insertion order), id -> seq, level index, retention heap
+        self._lock = threading.RLock()
+        self._records: Dict[int, Dict[str, Any]] = {}
+        self._seq_by_id: Dict[str, int] = {}
+        self._index = CHoCHLevelIndex()
+        self._expiry_heap: List[Tuple[float, int]] = []
+        self._next_seq = 0
+        self._store = CHoCHJournalStore(self.storage_path, self.backup_path, compact_every=compact_every)
         
         # Skip loading/saving in quick test mode for speed
         if not self.quick_test_mode:
@@ -94,30 +107,104 @@ class CHoCHHistoricalMemory:
     # ---------- Core persistence ----------
     def _load(self) -> None:
         try:
-            if self.storage_path.exists():
-                with open(self.storage_path, 'r', encoding='utf-8') as f:
-                    self._db = json.load(f)
+            snapshot, ops = self._store.load()
+            if snapshot is not None:
+                self._db['metadata'] = snapshot.get('metadata', self._db['metadata'])
+                for r in snapshot.get('records', []):
+                    self._insert(r)
+            for op in ops:
+                self._apply_op(op)
         except Exception:
             # If load fails, keep empty db but ensure dirs exist
             self.storage_path.parent.mkdir(parents=True, exist_ok=True)
 
+    def _apply_op(self, op: Dict[str, Any]) -> None:
+        kind = op.get('op')
+        if kind == 'add' and isinstance(op.get('record'), dict):
+            self._insert(op['record'])
+            self._enforce_retention()
+        elif kind == 'update':
+            self._update_fields(str(op.get('id')), op.get('fields') or {})
+
+    def _journal(self, op: Dict[str, Any]) -> None:
+        """Append-only write of one op; compacts the snapshot every N ops."""
+        # Skip saving in quick test mode for speed
+        if self.quick_test_mode:
+            return
+        self._store.append(op)
+        if self._store.needs_compaction():
+            self._save()
+
     def _save(self) -> None:
+        """Compaction: atomic snapshot replace + journal truncate (+ backup)."""
         # Skip saving in quick test mode for speed
         if self.quick_test_mode:
             return
-            
-        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.storage_path, 'w', encoding='utf-8') as f:
-            json.dump(self._db, f, indent=2)
-        
+        snapshot = {'metadata': self._db['metadata'], 'records': self.all_records()}
         # best-effort backup (skip in test modes)
-        if not (self.disable_heavy_init or self.low_mem_mode):
-            try:
-                self.backup_path.parent.mkdir(parents=True, exist_ok=True)
-                with open(self.backup_path, 'w', encoding='utf-8') as b:
-                    json.dump(self._db, b, indent=2)
-            except Exception:
-                pass
+        self._store.compact(snapshot, write_backup=not (self.disable_heavy_init or self.low_mem_mode))
+
+    # ---------- Index maintenance ----------
+    def _insert(self, record: Dict[str, Any]) -> int:
+        seq = self._next_seq
+        self._next_seq += 1
+        self._records[seq] = record
+        rid = record.get('id')
+        if rid is not None:
+            self._seq_by_id.setdefault(str(rid), seq)
+        self._index.add(seq, record)
+        ts = self._parse_epoch(record)
+        if ts is not None:
+            heapq.heappush(self._expiry_heap, (ts, seq))
+        return seq
+
+    def _remove(self, seq: int) -> None:
+        record = self._records.pop(seq, None)
+        if record is None:
+            return
+        rid = record.get('id')
+        if rid is not None and self._seq_by_id.get(str(rid)) == seq:
+            del self._seq_by_id[str(rid)]
+        self._index.remove(seq, record)
+
+    def _update_fields(self, event_id: str, fields: Dict[str, Any]) -> bool:
+        seq = self._seq_by_id.get(event_id)
+        if seq is None:
+            return False
+        self._records[seq].update(fields)
+        return True
+
+    def _parse_epoch(self, d: Dict[str, Any]) -> Optional[float]:
+        # Unparseable/missing timestamps count as "now" and never expire (legacy behavior)
+        try:
+            ts = d.get('timestamp')
+            if not ts:
+                return None
+            dt = datetime.fromisoformat(str(ts).replace('Z', '+00:00'))
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            return dt.timestamp()
+        except Exception:
+            return None
+
+    def _enforce_retention(self) -> None:
+        # retention: pop expired entries off the heap (stale seqs are skipped)
+        cutoff = (self._now() - timedelta(days=self.retention_days)).timestamp()
+        heap = self._expiry_heap
+        while heap and heap[0][0] < cutoff:
+            _, seq = heapq.heappop(heap)
+            self._remove(seq)
+        # cap: drop oldest insertions
+        while len(self._records) > self.max_records:
+            self._remove(next(iter(self._records)))
+        if len(heap) > 2 * len(self._records) + 64:
+            self._expiry_heap = [(ts, seq) for ts, seq in heap if seq in self._records]
+            heapq.heapify(self._expiry_heap)
+
+    def all_records(self) -> List[Dict[str, Any]]:
+        """Live records in insertion order."""
+        with self._lock:
+            return list(self._records.values())
 
     # ---------- Helpers ----------
     def _now(self) -> datetime:
@@ -131,24 +218,12 @@ class CHoCHHistoricalMemory:
 
     # ---------- Public API ----------
     def store(self, event: CHoCHEvent) -> CHoCHEvent:
-        recs: List[Dict[str, Any]] = self._db.get('records', [])
-        recs.append(asdict(event))
-        # retention + cap
-        cutoff = self._now() - timedelta(days=self.retention_days)
-        def _parse_ts(d: Dict[str, Any]) -> datetime:
-            try:
-                ts = d.get('timestamp')
-                if not ts:
-                    return self._now()
-                return datetime.fromisoformat(str(ts).replace('Z','+00:00'))
-            except Exception:
-                return self._now()
-        recs = [r for r in recs if _parse_ts(r) >= cutoff]
-        if len(recs) > self.max_records:
-            recs = recs[-self.max_records:]
-        self._db['records'] = recs
-        self._db['metadata']['last_updated'] = self._now().isoformat()
-        self._save()
+        record = asdict(event)
+        with self._lock:
+            self._insert(record)
+            self._enforce_retention()
+            self._db['metadata']['last_updated'] = self._now().isoformat()
+            self._journal({'op': 'add', 'record': record})
         return event
 
     def store_from_detection(self,
@@ -199,11 +274,13 @@ class CHoCHHistoricalMemory:
                           volatility_band: Optional[Tuple[float,float]] = None) -> List[Dict[str, Any]]:
         pip = self._pip(symbol)
         tol = level_tolerance_pips * pip
+        level = float(break_level)
         results = []
-        for r in self._db.get('records', []):
-            if r.get('symbol') != symbol or r.get('timeframe') != timeframe:
-                continue
-            if abs(float(r.get('break_level', 0.0)) - float(break_level)) > tol:
+        with self._lock:
+            candidates = self._index.range(symbol, timeframe, level - tol, level + tol)
+        # Index is sorted by break_level; restore insertion order for callers
+        for _, r in sorted(candidates, key=lambda e: e[0]):
+            if abs(float(r.get('break_level', 0.0)) - level) > tol:
                 continue
             if session and r.get('session') and r.get('session') != session:
                 continue
@@ -267,21 +344,17 @@ class CHoCHHistoricalMemory:
     # === Smart retrieval & analysis APIs ===
     def find_similar_choch_in_history(self, symbol: str, timeframe: str, direction: Optional[str] = None,
                                       break_level_range: Optional[Tuple[float, float]] = None) -> List[Dict[str, Any]]:
-        results = []
-        for r in self._db.get('records', []):
-            if r.get('symbol') != symbol or r.get('timeframe') != timeframe:
-                continue
-            if direction and r.get('direction') != direction:
-                continue
+        with self._lock:
             if break_level_range is not None:
                 try:
-                    br = float(r.get('break_level', 0.0))
-                    if not (break_level_range[0] <= br <= break_level_range[1]):
-                        continue
+                    lo, hi = float(break_level_range[0]), float(break_level_range[1])
                 except Exception:
-                    continue
-            results.append(r)
-        return results
+                    return []
+                candidates = self._index.range(symbol, timeframe, lo, hi)
+            else:
+                candidates = self._index.all(symbol, timeframe)
+        return [r for _, r in sorted(candidates, key=lambda e: e[0])
+                if not direction or r.get('direction') == direction]
 
     def calculate_historical_success_rate(self, symbol: str, timeframe: str, direction: Optional[str] = None) -> float:
         # 🚀 Try cache first
@@ -292,7 +365,9 @@ class CHoCHHistoricalMemory:
                 return cached_rate
         
         # Compute if not cached
-        events = [r for r in self._db.get('records', []) if r.get('symbol') == symbol and r.get('timeframe') == timeframe and (direction is None or r.get('direction') == direction)]
+        with self._lock:
+            candidates = self._index.all(symbol, timeframe)
+        events = [r for _, r in candidates if direction is None or r.get('direction') == direction]
         stats = self.analyze_success_rate(events)
         success_rate = float(stats.get('success_rate', 0.0))
         
@@ -332,36 +407,24 @@ class CHoCHHistoricalMemory:
         return sum(targets) / len(targets)
 
     def update_outcome(self, event_id: str, outcome: str, pips_moved: Optional[float] = None, time_to_target: Optional[str] = None) -> bool:
-        recs = self._db.get('records', [])
-        for r in recs:
-            if r.get('id') == event_id:
-                r['outcome'] = outcome
-                if pips_moved is not None:
-                    r['pips_moved'] = float(pips_moved)
-                if time_to_target is not None:
-                    r['time_to_target'] = str(time_to_target)
-                self._db['metadata']['last_updated'] = self._now().isoformat()
-                self._save()
-                return True
-        return False
+        fields: Dict[str, Any] = {'outcome': outcome}
+        if pips_moved is not None:
+            fields['pips_moved'] = float(pips_moved)
+        if time_to_target is not None:
+            fields['time_to_target'] = str(time_to_target)
+        with self._lock:
+            if not self._update_fields(event_id, fields):
+                return False
+            self._db['metadata']['last_updated'] = self._now().isoformat()
+            self._journal({'op': 'update', 'id': event_id, 'fields': fields})
+        return True
 
     def clean(self) -> None:
-        # Enforce retention and cap
-        cutoff = self._now() - timedelta(days=self.retention_days)
-        def _parse_ts(d: Dict[str, Any]) -> datetime:
-            try:
-                ts = d.get('timestamp')
-                if not ts:
-                    return self._now()
-                return datetime.fromisoformat(str(ts).replace('Z','+00:00'))
-            except Exception:
-                return self._now()
-        recs = [r for r in self._db.get('records', []) if _parse_ts(r) >= cutoff]
-        if len(recs) > self.max_records:
-            recs = recs[-self.max_records:]
-        self._db['records'] = recs
-        self._db['metadata']['last_updated'] = self._now().isoformat()
-        self._save()
+        # Enforce retention and cap, then compact snapshot + journal
+        with self._lock:
+            self._enforce_retention()
+            self._db['metadata']['last_updated'] = self._now().isoformat()
+            self._save()
 
 # Convenience singleton
 _memory_instance: Optional[CHoCHHistoricalMemory] = None
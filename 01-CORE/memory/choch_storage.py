@@ -0,0 +1,169 @@
+from __future__ import annotations
+import json
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Storage backend for CHoCHHistoricalMemory:
+# - JSON snapshot (same schema as the legacy choch_historical.json)
+# - append-only JSONL journal with one op per line ({"op": "add"|"update", ...})
+# - periodic compaction: snapshot atomically replaced, journal truncated
+# plus an in-memory (symbol, timeframe) index sorted by break_level.
+
+COMPACT_EVERY_DEFAULT = 200
+
+IndexKey = Tuple[str, str]
+IndexEntry = Tuple[int, Dict[str, Any]]  # (seq, record)
+
+
+class CHoCHLevelIndex:
+    """(symbol, timeframe) -> records sorted by break_level, for bisect range queries."""
+
+    def __init__(self) -> None:
+        self._levels: Dict[IndexKey, List[float]] = {}
+        self._entries: Dict[IndexKey, List[IndexEntry]] = {}
+
+    @staticmethod
+    def _key(record: Dict[str, Any]) -> IndexKey:
+        return (str(record.get('symbol')), str(record.get('timeframe')))
+
+    @staticmethod
+    def _level(record: Dict[str, Any]) -> Optional[float]:
+        try:
+            return float(record.get('break_level', 0.0))
+        except (TypeError, ValueError):
+            return None
+
+    def add(self, seq: int, record: Dict[str, Any]) -> None:
+        level = self._level(record)
+        if level is None:
+            return
+        key = self._key(record)
+        levels = self._levels.setdefault(key, [])
+        entries = self._entries.setdefault(key, [])
+        pos = bisect_right(levels, level)
+        levels.insert(pos, level)
+        entries.insert(pos, (seq, record))
+
+    def remove(self, seq: int, record: Dict[str, Any]) -> None:
+        level = self._level(record)
+        key = self._key(record)
+        levels = self._levels.get(key)
+        if level is None or not levels:
+            return
+        entries = self._entries[key]
+        pos = bisect_left(levels, level)
+        while pos < len(levels) and levels[pos] == level:
+            if entries[pos][0] == seq:
+                del levels[pos]
+                del entries[pos]
+                break
+            pos += 1
+        if not levels:
+            del self._levels[key]
+            del self._entries[key]
+
+    def range(self, symbol: str, timeframe: str, low: float, high: float) -> List[IndexEntry]:
+        levels = self._levels.get((symbol, timeframe))
+        if not levels:
+            return []
+        entries = self._entries[(symbol, timeframe)]
+        return entries[bisect_left(levels, low):bisect_right(levels, high)]
+
+    def all(self, symbol: str, timeframe: str) -> List[IndexEntry]:
+        return list(self._entries.get((symbol, timeframe), []))
+
+    def clear(self) -> None:
+        self._levels.clear()
+        self._entries.clear()
+
+
+class CHoCHJournalStore:
+    """Snapshot + append-only JSONL journal with periodic compaction."""
+
+    def __init__(self,
+                 snapshot_path: Path,
+                 backup_path: Optional[Path] = None,
+                 compact_every: int = COMPACT_EVERY_DEFAULT):
+        self.snapshot_path = Path(snapshot_path)
+        self.journal_path = self.snapshot_path.with_suffix('.jsonl')
+        self.backup_path = Path(backup_path) if backup_path is not None else None
+        self.compact_every = max(1, int(compact_every))
+        self.pending_ops = 0
+        self._fh = None
+        self._lock = threading.Lock()
+
+    def load(self) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Returns (snapshot db or None, journal ops to replay in order)."""
+        snapshot: Optional[Dict[str, Any]] = None
+        try:
+            if self.snapshot_path.exists():
+                with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                    snapshot = json.load(f)
+        except Exception:
+            snapshot = None
+        ops: List[Dict[str, Any]] = []
+        try:
+            if self.journal_path.exists():
+                with open(self.journal_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            ops.append(json.loads(line))
+                        except json.JSONDecodeError:
+                            # Torn last line after a crash: everything before it is valid
+                            break
+        except Exception:
+            ops = []
+        self.pending_ops = len(ops)
+        return snapshot, ops
+
+    def append(self, op: Dict[str, Any]) -> None:
+        line = json.dumps(op, separators=(',', ':'))
+        with self._lock:
+            if self._fh is None:
+                self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+                self._fh = open(self.journal_path, 'a', encoding='utf-8')
+            self._fh.write(line + '\n')
+            self._fh.flush()
+            self.pending_ops += 1
+
+    def needs_compaction(self) -> bool:
+        return self.pending_ops >= self.compact_every
+
+    def compact(self, db: Dict[str, Any], write_backup: bool = True) -> None:
+        """Atomically replace the snapshot with `db` and truncate the journal."""
+        with self._lock:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.snapshot_path.with_suffix(self.snapshot_path.suffix + '.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(db, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.snapshot_path)
+
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            with open(self.journal_path, 'w', encoding='utf-8'):
+                pass
+            self.pending_ops = 0
+
+        # best-effort backup
+        if write_backup and self.backup_path is not None:
+            try:
+                self.backup_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.backup_path, 'w', encoding='utf-8') as b:
+                    json.dump(db, b, indent=2)
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
@@ -0,0 +1,307 @@
+"""LatencyHistogram
+Histogramas de latencia de memoria fija, combinables (estilo DDSketch).
+
+- Buckets logarítmicos con error relativo acotado (relative_accuracy, 1% por
+  defecto) sobre un rango fijo [min_value, max_value]; los valores fuera de
+  rango se recortan a los extremos (min/max exactos se guardan aparte).
+- merge() suma buckets: los histogramas de distintos hilos/ventanas se
+  combinan sin perder precisión.
+- RollingLatencyHistogram cubre las últimas ~N muestras (ventana por conteo,
+  ring de slots) para percentiles "rolling" con memoria fija.
+- WindowedLatencyHistogram registra por hilo (un shard por hilo, sin lock en
+  el camino de escritura) en una ventana deslizante de slots + total
+  acumulado; la lectura combina shards bajo lock.
+"""
+from __future__ import annotations
+import math
+import threading
+import time
+from typing import Dict, Any, List, Optional, Iterable
+
+DEFAULT_PERCENTILES = (0.50, 0.90, 0.99)
+
+
+class LatencyHistogram:
+    """Histograma logarítmico de memoria fija (valores en ms)."""
+
+    __slots__ = ('relative_accuracy', 'min_value', 'max_value', '_gamma_log',
+                 '_offset', 'counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self, relative_accuracy: float = 0.01,
+                 min_value: float = 1e-4, max_value: float = 3.6e6):
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.max_value = max_value
+        gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._gamma_log = math.log(gamma)
+        self._offset = self._raw_index(min_value)
+        # bucket 0 = valores <= min_value; último = valores >= max_value
+        self.counts: List[int] = [0] * (self._raw_index(max_value) - self._offset + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _raw_index(self, value: float) -> int:
+        return int(math.ceil(math.log(value) / self._gamma_log))
+
+    def _bucket_value(self, idx: int) -> float:
+        # Punto medio (en error relativo) del bucket idx
+        raw = idx + self._offset
+        return 2.0 * math.exp(raw * self._gamma_log) / (1.0 + math.exp(self._gamma_log))
+
+    def record(self, value: float) -> None:
+        if value != value:  # NaN
+            return
+        if value <= self.min_value:
+            idx = 0
+        elif value >= self.max_value:
+            idx = len(self.counts) - 1
+        else:
+            idx = self._raw_index(value) - self._offset
+        self.counts[idx] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def compatible(self, other: 'LatencyHistogram') -> bool:
+        return (self.relative_accuracy == other.relative_accuracy
+                and self.min_value == other.min_value
+                and self.max_value == other.max_value)
+
+    def merge(self, other: 'LatencyHistogram') -> 'LatencyHistogram':
+        """Suma los buckets de other en este histograma (in-place)."""
+        if not self.compatible(other):
+            raise ValueError("Histogramas con parámetros distintos no son combinables")
+        if other.count == 0:
+            return self
+        counts = self.counts
+        for idx, c in enumerate(list(other.counts)):
+            if c:
+                counts[idx] += c
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def copy(self) -> 'LatencyHistogram':
+        clone = LatencyHistogram(self.relative_accuracy, self.min_value, self.max_value)
+        return clone.merge(self)
+
+    def reset(self) -> None:
+        self.counts = [0] * len(self.counts)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        if q <= 0:
+            return float(self.min)
+        if q >= 1:
+            return float(self.max)
+        rank = q * (self.count - 1)
+        seen = 0
+        for idx, c in enumerate(self.counts):
+            seen += c
+            if seen > rank:
+                value = self._bucket_value(idx)
+                # El bucket aproxima; min/max son exactos
+                return float(min(max(value, self.min), self.max))
+        return float(self.max)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentiles(self, quantiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[str, float]:
+        return {f"p{int(round(q * 100))}": self.quantile(q) for q in quantiles}
+
+    def to_dict(self, quantiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[str, Any]:
+        out: Dict[str, Any] = {'count': self.count, 'avg': self.mean}
+        out.update(self.percentiles(quantiles))
+        out['max'] = float(self.max) if self.count else 0.0
+        return out
+
+
+class RollingLatencyHistogram:
+    """
+    Histograma de las últimas ~window_samples muestras (ventana por conteo).
+
+    Ring de n_slots histogramas de window_samples / n_slots muestras: al
+    llenarse el slot actual se reinicia el más antiguo, así la ventana cubre
+    entre window_samples - slot y window_samples muestras con memoria fija.
+    Lectura con la misma interfaz que LatencyHistogram (sobre la ventana);
+    cumulative() devuelve el total desde el arranque.
+    """
+
+    def __init__(self, window_samples: int = 500, n_slots: int = 5,
+                 relative_accuracy: float = 0.01, min_value: float = 1e-4, max_value: float = 3.6e6):
+        self.window_samples = max(1, int(window_samples))
+        self.n_slots = max(1, min(int(n_slots), self.window_samples))
+        self.slot_capacity = -(-self.window_samples // self.n_slots)
+        self._params = (relative_accuracy, min_value, max_value)
+        self._slots: List[LatencyHistogram] = [LatencyHistogram(*self._params) for _ in range(self.n_slots)]
+        self._pos = 0
+        self._total = LatencyHistogram(*self._params)
+        self._window: Optional[LatencyHistogram] = None
+
+    def record(self, value: float) -> None:
+        if value != value:  # NaN
+            return
+        slot = self._slots[self._pos]
+        if slot.count >= self.slot_capacity:
+            self._pos = (self._pos + 1) % self.n_slots
+            slot = self._slots[self._pos]
+            slot.reset()
+        slot.record(value)
+        self._total.record(value)
+        self._window = None
+
+    def window(self) -> LatencyHistogram:
+        """Histograma combinado de la ventana (cacheado hasta el siguiente record)."""
+        merged = self._window
+        if merged is None:
+            merged = LatencyHistogram(*self._params)
+            for slot in self._slots:
+                merged.merge(slot)
+            self._window = merged
+        return merged
+
+    def cumulative(self) -> LatencyHistogram:
+        return self._total.copy()
+
+    def reset(self) -> None:
+        for slot in self._slots:
+            slot.reset()
+        self._pos = 0
+        self._total.reset()
+        self._window = None
+
+    @property
+    def count(self) -> int:
+        return self.window().count
+
+    @property
+    def mean(self) -> float:
+        return self.window().mean
+
+    @property
+    def min(self) -> float:
+        return self.window().min
+
+    @property
+    def max(self) -> float:
+        return self.window().max
+
+    def quantile(self, q: float) -> float:
+        return self.window().quantile(q)
+
+    def percentiles(self, quantiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[str, float]:
+        return self.window().percentiles(quantiles)
+
+    def to_dict(self, quantiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[str, Any]:
+        out = self.window().to_dict(quantiles)
+        out['window_samples'] = self.window_samples
+        return out
+
+
+class _Shard:
+    """Histogramas de un solo hilo: ring de slots de ventana + total."""
+
+    __slots__ = ('epochs', 'slots', 'total')
+
+    def __init__(self, n_slots: int, factory):
+        self.epochs: List[int] = [-1] * n_slots
+        self.slots: List[LatencyHistogram] = [factory() for _ in range(n_slots)]
+        self.total: LatencyHistogram = factory()
+
+
+class WindowedLatencyHistogram:
+    """
+    Histograma con ventana deslizante y registro por hilo.
+
+    La ventana (window_seconds) se divide en n_slots; record() solo toca el
+    shard del hilo llamante, así que no hay contención entre hilos.
+    """
+
+    def __init__(self, window_seconds: float = 60.0, n_slots: int = 6,
+                 relative_accuracy: float = 0.01, min_value: float = 1e-4, max_value: float = 3.6e6):
+        self.window_seconds = float(window_seconds)
+        self.n_slots = max(1, int(n_slots))
+        self.slot_seconds = self.window_seconds / self.n_slots
+        self._params = (relative_accuracy, min_value, max_value)
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._owners: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def _new_histogram(self) -> LatencyHistogram:
+        return LatencyHistogram(*self._params)
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            current = threading.current_thread()
+            with self._lock:
+                # Reutilizar el shard de un hilo terminado: nº de shards acotado
+                # por los hilos concurrentes, no por los hilos históricos
+                for idx, owner in enumerate(self._owners):
+                    if not owner.is_alive():
+                        self._owners[idx] = current
+                        shard = self._shards[idx]
+                        break
+                else:
+                    shard = _Shard(self.n_slots, self._new_histogram)
+                    self._shards.append(shard)
+                    self._owners.append(current)
+            self._local.shard = shard
+        return shard
+
+    def record(self, value: float, now: Optional[float] = None) -> None:
+        shard = self._shard()
+        epoch = int((time.time() if now is None else now) // self.slot_seconds)
+        pos = epoch % self.n_slots
+        if shard.epochs[pos] != epoch:
+            shard.slots[pos] = self._new_histogram()
+            shard.epochs[pos] = epoch
+        shard.slots[pos].record(value)
+        shard.total.record(value)
+
+    def window(self, now: Optional[float] = None) -> LatencyHistogram:
+        """Histograma combinado de la ventana actual."""
+        current = int((time.time() if now is None else now) // self.slot_seconds)
+        oldest = current - self.n_slots + 1
+        merged = self._new_histogram()
+        with self._lock:
+            shards = list(self._shards)
+        for shard in shards:
+            for pos in range(self.n_slots):
+                epoch = shard.epochs[pos]
+                hist = shard.slots[pos]
+                if oldest <= epoch <= current:
+                    merged.merge(hist)
+        return merged
+
+    def cumulative(self) -> LatencyHistogram:
+        merged = self._new_histogram()
+        with self._lock:
+            shards = list(self._shards)
+        for shard in shards:
+            merged.merge(shard.total)
+        return merged
+
+    def snapshot(self, now: Optional[float] = None,
+                 quantiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[str, Any]:
+        window = self.window(now).to_dict(quantiles)
+        window['window_seconds'] = self.window_seconds
+        return {'window': window, 'total': self.cumulative().to_dict(quantiles)}
+
+
+__all__ = ["LatencyHistogram", "RollingLatencyHistogram", "WindowedLatencyHistogram", "DEFAULT_PERCENTILES"]
@@ -4,6 +4,7 @@ Bridges simple recording APIs into PerformanceMetricsAggregator without duplicat
 Usage:
 - record_counter("orders.executed")
 - record_gauge("latency.ms", 12.3)
+- record_latency("order.send", 12.3)  # histograma p50/p90/p99/max
 - with time_operation("analysis"): ...
 
 Internals:
@@ -53,6 +54,7 @@ def _get_aggregator() -> Any:
     class _NullAgg:
         def incr(self, *_: Any, **__: Any) -> None: ...
         def set_gauge(self, *_: Any, **__: Any) -> None: ...
+        def observe(self, *_: Any, **__: Any) -> None: ...
         def snapshot(self) -> dict: return {'timestamp': datetime.now(timezone.utc).isoformat()}
         def get_live_metrics(self) -> dict: return {}
         def get_summary_metrics(self) -> dict: return {}
@@ -81,10 +83,24 @@ def record_gauge(name: str, value: float) -> None:
         pass
 
 
+def record_latency(name: str, value_ms: float) -> None:
+    """Record a latency sample into the aggregator histogram `name`."""
+    agg = _get_aggregator()
+    try:
+        if hasattr(agg, 'observe'):
+            agg.observe(name, float(value_ms))
+        else:
+            agg.set_gauge(name, float(value_ms))
+    except Exception:
+        pass
+
+
 def record_metric(name: str, value: float, kind: str = 'gauge') -> None:
-    """Generic record helper. kind in {'gauge','counter'}"""
+    """Generic record helper. kind in {'gauge','counter','histogram'}"""
     if kind == 'counter':
         record_counter(name, int(value))
+    elif kind == 'histogram':
+        record_latency(name, value)
     else:
         record_gauge(name, value)
 
@@ -94,8 +110,9 @@ def time_operation(name: str) -> Iterator[None]:
     """Context manager to time a block and record latency + count.
 
     Records:
-    - counter: f"ops.{name}"
-    - gauge:   f"latency.{name}_ms"
+    - counter:   f"ops.{name}"
+    - histogram: f"latency.{name}_ms" (p50/p90/p99/max por ventana)
+    - gauge:     f"latency.{name}_ms" (última muestra, compatibilidad)
     """
     import time
     start = time.perf_counter()
@@ -104,6 +121,7 @@ def time_operation(name: str) -> Iterator[None]:
     finally:
         elapsed_ms = (time.perf_counter() - start) * 1000.0
         record_counter(f"ops.{name}", 1)
+    record_latency(f"latency.{name}_ms", elapsed_ms)
     record_gauge(f"latency.{name}_ms", elapsed_ms)
 
 
@@ -120,6 +138,7 @@ __all__ = [
     'set_aggregator',
     'record_counter',
     'record_gauge',
+    'record_latency',
     'record_metric',
     'time_operation',
     'export_snapshot',
@@ -0,0 +1,239 @@
+"""OrderTracing
+Trazas ligeras por orden a lo largo del camino señal → fill.
+
+- OrderTrace: span con timestamps monotónicos (perf_counter_ns) por etapa.
+  Se crea en la detección/síntesis de la señal y viaja por RiskPipeline,
+  ExecutionRouter, el broker executor y ExecutionAuditLogger.
+- Propagación: explícita (signal_ctx['trace'], argumento trace=, o trace_id
+  resuelto con find_trace()) o implícita vía contextvars (current_trace())
+  solo dentro de un bloque trace_scope()/use_trace(), que restauran la traza
+  previa al salir. Una traza de otro símbolo nunca se hereda.
+- TraceRecorder: ring buffer de trazas cerradas + histogramas por etapa
+  (tiempo desde la etapa anterior) para exportar el desglose de latencias.
+
+Uso:
+    with trace_scope("pattern_detector", symbol="EURUSD") as trace:
+        mark_stage("risk_done")
+    ...
+    trace.mark("broker_ack"); get_trace_recorder().record(trace, "ok")
+"""
+from __future__ import annotations
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from weakref import WeakValueDictionary
+
+from monitoring.latency_histogram import LatencyHistogram
+
+_ids = itertools.count(1)
+_current: ContextVar[Optional['OrderTrace']] = ContextVar('ict_order_trace', default=None)
+_open_traces: 'WeakValueDictionary[str, OrderTrace]' = WeakValueDictionary()
+_open_lock = threading.Lock()
+
+
+class OrderTrace:
+    """Span de una señal/orden: etapas con timestamps monotónicos (ns)."""
+
+    __slots__ = ('trace_id', 'origin', 'symbol', 'attrs', 'stages', 'status', '_lock', '__weakref__')
+
+    def __init__(self, origin: str, symbol: Optional[str] = None, **attrs: Any):
+        self.trace_id = f"{os.getpid():x}-{next(_ids):x}"
+        self.origin = origin
+        self.symbol = symbol
+        self.attrs: Dict[str, Any] = attrs
+        self.stages: List[Tuple[str, int]] = [(origin, time.perf_counter_ns())]
+        self.status: Optional[str] = None
+        self._lock = threading.Lock()
+        with _open_lock:
+            _open_traces[self.trace_id] = self
+
+    @property
+    def finished(self) -> bool:
+        return self.status is not None
+
+    def mark(self, stage: str) -> None:
+        ts = time.perf_counter_ns()
+        with self._lock:
+            if self.status is None:
+                self.stages.append((stage, ts))
+
+    def finish(self, status: str) -> bool:
+        """Cierra la traza; False si ya estaba cerrada."""
+        with self._lock:
+            if self.status is not None:
+                return False
+            self.stages.append(('done', time.perf_counter_ns()))
+            self.status = status
+        with _open_lock:
+            _open_traces.pop(self.trace_id, None)
+        return True
+
+    def matches(self, symbol: Optional[str]) -> bool:
+        """True si la traza puede seguir una orden de `symbol` (sin símbolo = comodín)."""
+        return symbol is None or self.symbol is None or self.symbol == symbol
+
+    def elapsed_ms(self) -> float:
+        with self._lock:
+            return (self.stages[-1][1] - self.stages[0][1]) / 1e6
+
+    def breakdown(self) -> List[Tuple[str, float]]:
+        """[(etapa, ms desde la etapa anterior)]"""
+        with self._lock:
+            stages = list(self.stages)
+        return [(name, (ts - stages[i - 1][1]) / 1e6) for i, (name, ts) in enumerate(stages) if i > 0]
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = list(self.stages)
+        t0 = stages[0][1]
+        return {
+            'trace_id': self.trace_id,
+            'origin': self.origin,
+            'symbol': self.symbol,
+            'status': self.status,
+            'total_ms': (stages[-1][1] - t0) / 1e6,
+            'stages': [(name, round((ts - t0) / 1e6, 4)) for name, ts in stages],
+            'attrs': dict(self.attrs),
+        }
+
+
+def start_trace(origin: str, symbol: Optional[str] = None, **attrs: Any) -> OrderTrace:
+    """
+    Crea una traza y la fija como traza actual del contexto sin restaurarla
+    después (raíz de un hilo/tarea propio). En código compartido usar
+    trace_scope().
+    """
+    trace = OrderTrace(origin, symbol, **attrs)
+    _current.set(trace)
+    return trace
+
+
+def current_trace(symbol: Optional[str] = None) -> Optional[OrderTrace]:
+    """Traza activa (no cerrada) del contexto actual; con `symbol`, solo si coincide."""
+    trace = _current.get()
+    if trace is None or trace.finished or not trace.matches(symbol):
+        return None
+    return trace
+
+
+def find_trace(trace_id: Optional[str]) -> Optional[OrderTrace]:
+    """Traza abierta por id (p.ej. metadata['trace_id'] de una señal); None si cerró."""
+    if not trace_id:
+        return None
+    with _open_lock:
+        return _open_traces.get(trace_id)
+
+
+@contextmanager
+def trace_scope(origin: str, symbol: Optional[str] = None,
+                trace: Optional[OrderTrace] = None, **attrs: Any) -> Iterator[OrderTrace]:
+    """
+    Traza actual durante el bloque: la dada, la activa del mismo símbolo o una
+    nueva. Al salir se restaura la traza previa del contexto.
+    """
+    if trace is None or trace.finished or not trace.matches(symbol):
+        trace = current_trace(symbol) or OrderTrace(origin, symbol, **attrs)
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+
+
+def mark_stage(stage: str, trace: Optional[OrderTrace] = None) -> None:
+    """Marca una etapa en la traza dada o la actual; no-op si no hay traza."""
+    trace = trace or current_trace()
+    if trace is not None:
+        trace.mark(stage)
+
+
+@contextmanager
+def use_trace(trace: Optional[OrderTrace]) -> Iterator[Optional[OrderTrace]]:
+    """Fija trace como actual durante el bloque (p.ej. en un hilo worker)."""
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+
+
+class TraceRecorder:
+    """Ring buffer de trazas cerradas + histogramas de latencia por etapa."""
+
+    def __init__(self, capacity: int = 2048):
+        self._ring: deque = deque(maxlen=capacity)
+        self._stage_hists: Dict[str, LatencyHistogram] = {}
+        self._total_hist = LatencyHistogram()
+        self._lock = threading.Lock()
+
+    def record(self, trace: OrderTrace, status: str = 'ok') -> None:
+        """Cierra (si hace falta) y registra la traza."""
+        trace.finish(status)
+        data = trace.to_dict()
+        deltas = trace.breakdown()
+        with self._lock:
+            self._ring.append(data)
+            self._total_hist.record(data['total_ms'])
+            for name, ms in deltas:
+                hist = self._stage_hists.get(name)
+                if hist is None:
+                    hist = LatencyHistogram()
+                    self._stage_hists[name] = hist
+                hist.record(ms)
+
+    def recent(self, n: int = 50) -> List[Dict[str, Any]]:
+        with self._lock:
+            items = list(self._ring)
+        return items[-n:]
+
+    def get(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            for item in reversed(self._ring):
+                if item['trace_id'] == trace_id:
+                    return item
+        return None
+
+    def stage_breakdown(self) -> Dict[str, Any]:
+        """{etapa: {count, avg, p50, p90, p99, max}} (ms desde la etapa previa)"""
+        with self._lock:
+            stages = {name: hist.to_dict() for name, hist in self._stage_hists.items()}
+            total = self._total_hist.to_dict()
+        return {'stages': stages, 'total': total}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._ring.clear()
+            self._stage_hists.clear()
+            self._total_hist.reset()
+
+
+_recorder: Optional[TraceRecorder] = None
+_recorder_lock = threading.Lock()
+
+
+def get_trace_recorder() -> TraceRecorder:
+    """Recorder global de trazas de órdenes."""
+    global _recorder
+    if _recorder is None:
+        with _recorder_lock:
+            if _recorder is None:
+                _recorder = TraceRecorder()
+    return _recorder
+
+
+__all__ = [
+    'OrderTrace',
+    'TraceRecorder',
+    'start_trace',
+    'trace_scope',
+    'current_trace',
+    'find_trace',
+    'mark_stage',
+    'use_trace',
+    'get_trace_recorder',
+]
@@ -1,21 +1,31 @@
 """PerformanceMetricsAggregator
 Agrega métricas en memoria de diferentes componentes.
 Fuente prevista: risk pipeline, ordenes, validadores, latencia.
+
+Tipos de métrica: counters, gauges (último valor) e histogramas de latencia
+(memoria fija, por hilo, p50/p90/p99/max por ventana y acumulado).
+
+Los consumidores en proceso (p.ej. metrics_api) pueden registrarse con
+add_snapshot_listener() para recibir cada snapshot sin pasar por disco.
 """
 from __future__ import annotations
-from typing import Dict, Any
+from typing import Dict, Any, Callable, List
 from threading import RLock
 from datetime import datetime, timezone
 
 from protocols.unified_logging import get_unified_logger
+from monitoring.latency_histogram import WindowedLatencyHistogram
 
 class PerformanceMetricsAggregator:
-    def __init__(self):
+    def __init__(self, histogram_window_seconds: float = 60.0):
         self.logger = get_unified_logger("PerformanceMetricsAggregator")
         self._lock = RLock()
         self._counters: Dict[str, int] = {}
         self._gauges: Dict[str, float] = {}
+        self._histograms: Dict[str, WindowedLatencyHistogram] = {}
+        self.histogram_window_seconds = histogram_window_seconds
         self._last_snapshot: Dict[str, Any] = {}
+        self._snapshot_listeners: List[Callable[[Dict[str, Any]], None]] = []
         self.last_update: datetime | None = None
 
     def incr(self, key: str, value: int = 1) -> None:
@@ -26,16 +36,59 @@ class PerformanceMetricsAggregator:
         with self._lock:
             self._gauges[key] = float(value)
 
+    def observe(self, key: str, value: float) -> None:
+        """Registra una muestra (ms) en el histograma key; sin lock global."""
+        hist = self._histograms.get(key)
+        if hist is None:
+            with self._lock:
+                hist = self._histograms.get(key)
+                if hist is None:
+                    hist = WindowedLatencyHistogram(window_seconds=self.histogram_window_seconds)
+                    self._histograms[key] = hist
+        hist.record(float(value))
+
+    def get_histogram(self, key: str) -> WindowedLatencyHistogram | None:
+        return self._histograms.get(key)
+
+    def histogram_snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {key: hist.snapshot() for key, hist in histograms.items()}
+
+    def counters_and_gauges(self) -> Dict[str, Dict[str, float]]:
+        """Copia barata de counters/gauges (sin histogramas ni listeners) para sondeo."""
+        with self._lock:
+            return {'counters': dict(self._counters), 'gauges': dict(self._gauges)}
+
     def snapshot(self) -> Dict[str, Any]:
+        histograms = self.histogram_snapshot()
         with self._lock:
             snap = {
                 'timestamp': datetime.now(timezone.utc).isoformat(),
                 'counters': dict(self._counters),
-                'gauges': dict(self._gauges)
+                'gauges': dict(self._gauges),
+                'histograms': histograms
             }
             self._last_snapshot = snap
             self.last_update = datetime.now(timezone.utc)
-            return snap
+            listeners = list(self._snapshot_listeners)
+        for listener in listeners:
+            try:
+                listener(snap)
+            except Exception as e:
+                self.logger.warning(f"Snapshot listener failed: {e}", "Metrics")
+        return snap
+
+    def add_snapshot_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """Registra un callback invocado (fuera del lock) con cada snapshot nuevo."""
+        with self._lock:
+            if listener not in self._snapshot_listeners:
+                self._snapshot_listeners.append(listener)
+
+    def remove_snapshot_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        with self._lock:
+            if listener in self._snapshot_listeners:
+                self._snapshot_listeners.remove(listener)
 
     def last_snapshot(self) -> Dict[str, Any]:
         with self._lock:
@@ -49,6 +102,7 @@ class PerformanceMetricsAggregator:
             'timestamp': snap['timestamp'],
             'counters': snap.get('counters', {}),
             'gauges': snap.get('gauges', {}),
+            'histograms': snap.get('histograms', {}),
         }
 
     def get_summary_metrics(self) -> Dict[str, Any]:
@@ -6,6 +6,7 @@ Incluye herramientas avanzadas para optimización paralela, gestión de memoria
 from .rate_limiter import *
 
 from .detector_pool_manager import EnhancedDetectorPoolManager, AnalysisTask, AnalysisResult
+from .process_detector_pool import ProcessDetectorPool
 from .shared_memory_optimizer import SharedMemoryOptimizer
 from .work_distribution_engine import WorkDistributionEngine
 
@@ -13,6 +14,7 @@ __all__ = [
     'EnhancedDetectorPoolManager',
     'AnalysisTask', 
     'AnalysisResult',
+    'ProcessDetectorPool',
     'SharedMemoryOptimizer',
     'WorkDistributionEngine'
 ]
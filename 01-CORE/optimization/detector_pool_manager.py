@@ -2,6 +2,11 @@
 """
 🚀 ENHANCED DETECTOR POOL MANAGER
 Optimización avanzada para procesamiento paralelo eficiente
+
+Modos de ejecución:
+- 'thread': ThreadPoolExecutor persistente sobre detectores compartidos
+- 'process': ProcessDetectorPool persistente (un detector pre-calentado por
+  proceso, velas vía shared_memory, resultados como registros compactos)
 """
 
 from protocols.unified_logging import get_unified_logger
@@ -16,7 +21,12 @@ import pandas as pd
 
 # Imports del sistema
 from ict_engine.pattern_detector import ICTPatternDetector
+from ict_engine.detection_results import bar_key, get_detection_result_cache
 from analysis.unified_memory_system import get_unified_memory_system
+from optimization.process_detector_pool import ProcessDetectorPool
+
+EXECUTION_MODE_THREAD = "thread"
+EXECUTION_MODE_PROCESS = "process"
 
 
 @dataclass
@@ -56,7 +66,7 @@ class AnalysisTask:
 
 @dataclass
 class AnalysisResult:
-    """Resultado de análisis del pool"""
+    """Resultado de análisis del pool (en modo 'process', patterns son dicts compactos)"""
     task_id: str
     symbol: str
     timeframe: str
@@ -70,7 +80,9 @@ class AnalysisResult:
 class EnhancedDetectorPoolManager:
     """Pool optimizado de detectores para análisis paralelo enterprise"""
     
-    def __init__(self, pool_size: Optional[int] = None):
+    def __init__(self, pool_size: Optional[int] = None, execution_mode: str = EXECUTION_MODE_THREAD):
+        if execution_mode not in (EXECUTION_MODE_THREAD, EXECUTION_MODE_PROCESS):
+            raise ValueError(f"execution_mode inválido: {execution_mode}")
         # Garantizar que siempre tengamos un valor entero válido para el pool size
         cpu_count = os.cpu_count() or 4  # Fallback a 4 cores si os.cpu_count() retorna None
         effective_pool_size = pool_size or cpu_count
@@ -88,9 +100,12 @@ class EnhancedDetectorPoolManager:
         }
         self._lock = threading.RLock()
         self._initialized = False
+        self.execution_mode = execution_mode
+        self._thread_executor: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessDetectorPool] = None
         
         print(f"🏭 Enhanced Detector Pool Manager inicializado")
-        print(f"   📊 Pool size: {self.pool_size} detectores")
+        print(f"   📊 Pool size: {self.pool_size} detectores ({self.execution_mode})")
         print(f"   🖥️  CPU cores disponibles: {os.cpu_count()}")
         
     def initialize_pool(self) -> bool:
@@ -162,8 +177,27 @@ class EnhancedDetectorPoolManager:
                 self.detector_pool[detector_id]['busy'] = False
                 self.detector_pool[detector_id]['tasks_completed'] += 1
     
-    def process_parallel_analysis(self, tasks: List[AnalysisTask]) -> List[AnalysisResult]:
-        """Análisis paralelo optimizado con pool de detectores"""
+    def _get_thread_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._thread_executor is None:
+                self._thread_executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="ICT_Detector")
+            return self._thread_executor
+
+    def _get_process_pool(self) -> ProcessDetectorPool:
+        with self._lock:
+            if self._process_pool is None:
+                self._process_pool = ProcessDetectorPool(self.pool_size)
+            if not self._process_pool.started:
+                print(f"   🔧 Arrancando {self.pool_size} procesos detectores pre-calentados...")
+                self._process_pool.start()
+            return self._process_pool
+
+    def process_parallel_analysis(self, tasks: List[AnalysisTask], mode: Optional[str] = None) -> List[AnalysisResult]:
+        """Análisis paralelo optimizado con pool de detectores (mode: 'thread' | 'process')"""
+        mode = mode or self.execution_mode
+        if mode == EXECUTION_MODE_PROCESS:
+            return self._process_parallel_analysis_processes(tasks)
+
         if not self._initialized:
             if not self.initialize_pool():
                 raise RuntimeError("Failed to initialize detector pool")
@@ -175,39 +209,39 @@ class EnhancedDetectorPoolManager:
         # Ordenar tareas por prioridad
         sorted_tasks = sorted(tasks, key=lambda t: t.priority)
         
-        with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
-            # Enviar tareas al pool
-            future_to_task = {}
-            for task in sorted_tasks:
-                future = executor.submit(self._process_single_task, task)
-                future_to_task[future] = task
-            
-            # Recoger resultados conforme se completan
-            for future in as_completed(future_to_task):
-                task = future_to_task[future]
-                try:
-                    result = future.result()
-                    results.append(result)
+        executor = self._get_thread_executor()
+        # Enviar tareas al pool
+        future_to_task = {}
+        for task in sorted_tasks:
+            future = executor.submit(self._process_single_task, task)
+            future_to_task[future] = task
+        
+        # Recoger resultados conforme se completan
+        for future in as_completed(future_to_task):
+            task = future_to_task[future]
+            try:
+                result = future.result()
+                results.append(result)
+                
+                # Actualizar estadísticas
+                with self._lock:
+                    self.statistics['tasks_completed'] += 1
+                    self.statistics['total_processing_time'] += result.processing_time
                     
-                    # Actualizar estadísticas
-                    with self._lock:
-                        self.statistics['tasks_completed'] += 1
-                        self.statistics['total_processing_time'] += result.processing_time
-                        
-                except Exception as e:
-                    # Crear resultado de error
-                    error_result = AnalysisResult(
-                        task_id=task.task_id,
-                        symbol=task.symbol,
-                        timeframe=task.timeframe,
-                        patterns=[],
-                        processing_time=0.0,
-                        detector_id=-1,
-                        success=False,
-                        error_msg=str(e)
-                    )
-                    results.append(error_result)
-                    print(f"   ❌ Error procesando tarea {task.task_id}: {e}")
+            except Exception as e:
+                # Crear resultado de error
+                error_result = AnalysisResult(
+                    task_id=task.task_id,
+                    symbol=task.symbol,
+                    timeframe=task.timeframe,
+                    patterns=[],
+                    processing_time=0.0,
+                    detector_id=-1,
+                    success=False,
+                    error_msg=str(e)
+                )
+                results.append(error_result)
+                print(f"   ❌ Error procesando tarea {task.task_id}: {e}")
         
         total_time = time.time() - start_time
         
@@ -229,6 +263,52 @@ class EnhancedDetectorPoolManager:
         
         return results
     
+    def _process_parallel_analysis_processes(self, tasks: List[AnalysisTask]) -> List[AnalysisResult]:
+        """Análisis en procesos: velas por shared memory, resultados compactos"""
+        pool = self._get_process_pool()
+        sorted_tasks = sorted(tasks, key=lambda t: t.priority)
+        
+        print(f"🚀 Procesando {len(tasks)} tareas en {pool.workers} procesos...")
+        start_time = time.time()
+        records = pool.run([(t.task_id, t.symbol, t.timeframe, t.data) for t in sorted_tasks])
+        worker_ids = {pid: idx for idx, pid in enumerate(pool.worker_pids)}
+        
+        results = []
+        for task, record in zip(sorted_tasks, records):
+            error = record.get('error')
+            results.append(AnalysisResult(
+                task_id=task.task_id,
+                symbol=task.symbol,
+                timeframe=task.timeframe,
+                patterns=record['patterns'],
+                processing_time=record['processing_time'],
+                detector_id=worker_ids.get(record['worker_pid'], -1),
+                success=error is None,
+                error_msg=error
+            ))
+            if error is not None:
+                print(f"   ❌ Error procesando tarea {task.task_id}: {error}")
+            else:
+                self._publish_result(task, record['patterns'])
+        
+        total_time = time.time() - start_time
+        successful = [r for r in results if r.success]
+        with self._lock:
+            self.statistics['tasks_completed'] += len(successful)
+            self.statistics['total_processing_time'] += sum(r.processing_time for r in successful)
+            if self.statistics['tasks_completed'] > 0:
+                self.statistics['avg_task_time'] = (
+                    self.statistics['total_processing_time'] /
+                    self.statistics['tasks_completed']
+                )
+            if total_time > 0:
+                self.statistics['pool_utilization'] = (
+                    sum(r.processing_time for r in successful) / (pool.workers * total_time)
+                )
+        
+        print(f"   ✅ Procesamiento completado en {total_time:.3f}s")
+        return results
+    
     def _process_single_task(self, task: AnalysisTask) -> AnalysisResult:
         """Procesar una tarea individual usando detector del pool"""
         task_start = time.time()
@@ -250,6 +330,7 @@ class EnhancedDetectorPoolManager:
             # Procesar usando detector del pool
             detector = detector_info['detector']
             patterns = detector.detect_patterns(task.data, task.timeframe)
+            self._publish_result(task, patterns)
             
             processing_time = time.time() - task_start
             
@@ -282,12 +363,13 @@ class EnhancedDetectorPoolManager:
             # Liberar detector de vuelta al pool
             self.release_detector(detector_info['id'])
     
-    def process_batch(self, tasks: List[AnalysisTask]) -> List[AnalysisResult]:
+    def process_batch(self, tasks: List[AnalysisTask], mode: Optional[str] = None) -> List[AnalysisResult]:
         """
         Procesar lote de tareas de análisis en paralelo - OPTIMIZADO PARA TRADING
         
         Args:
             tasks: Lista de tareas de análisis validadas
+            mode: 'thread' | 'process' (por defecto el execution_mode del pool)
             
         Returns:
             Lista de resultados de análisis
@@ -295,6 +377,9 @@ class EnhancedDetectorPoolManager:
         if not tasks:
             print("⚠️ TRADING WARNING: Lista de tareas vacía")
             return []
+
+        if (mode or self.execution_mode) == EXECUTION_MODE_PROCESS:
+            return self._process_parallel_analysis_processes(tasks)
             
         if not self._initialized:
             print("🔧 Pool no inicializado, inicializando...")
@@ -308,40 +393,40 @@ class EnhancedDetectorPoolManager:
         results = []
         batch_start = time.time()
         
-        # Usar ThreadPoolExecutor para gestionar el paralelismo de forma eficiente
-        with ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="ICT_Detector") as executor:
-            # Mapear tareas a futuros
-            future_to_task = {
-                executor.submit(self._process_single_task_batch, task): task 
-                for task in tasks
-            }
-            
-            # Recopilar resultados conforme se completan
-            for future in as_completed(future_to_task):
-                try:
-                    result = future.result(timeout=30)  # Timeout de 30s por tarea
-                    results.append(result)
+        # ThreadPoolExecutor persistente (se reutiliza entre lotes)
+        executor = self._get_thread_executor()
+        # Mapear tareas a futuros
+        future_to_task = {
+            executor.submit(self._process_single_task_batch, task): task 
+            for task in tasks
+        }
+        
+        # Recopilar resultados conforme se completan
+        for future in as_completed(future_to_task):
+            try:
+                result = future.result(timeout=30)  # Timeout de 30s por tarea
+                results.append(result)
+                
+                if result.success:
+                    print(f"   ✅ {result.task_id}: {len(result.patterns)} patrones en {result.processing_time:.3f}s")
+                else:
+                    print(f"   ❌ {result.task_id}: Error - {result.error_msg}")
                     
-                    if result.success:
-                        print(f"   ✅ {result.task_id}: {len(result.patterns)} patrones en {result.processing_time:.3f}s")
-                    else:
-                        print(f"   ❌ {result.task_id}: Error - {result.error_msg}")
-                        
-                except Exception as e:
-                    task = future_to_task[future]
-                    print(f"   💥 {task.task_id}: Exception - {e}")
-                    # Crear resultado de error
-                    error_result = AnalysisResult(
-                        task_id=task.task_id,
-                        symbol=task.symbol,
-                        timeframe=task.timeframe,
-                        patterns=[],
-                        processing_time=0.0,
-                        detector_id=-1,
-                        success=False,
-                        error_msg=f"Batch processing error: {e}"
-                    )
-                    results.append(error_result)
+            except Exception as e:
+                task = future_to_task[future]
+                print(f"   💥 {task.task_id}: Exception - {e}")
+                # Crear resultado de error
+                error_result = AnalysisResult(
+                    task_id=task.task_id,
+                    symbol=task.symbol,
+                    timeframe=task.timeframe,
+                    patterns=[],
+                    processing_time=0.0,
+                    detector_id=-1,
+                    success=False,
+                    error_msg=f"Batch processing error: {e}"
+                )
+                results.append(error_result)
         
         batch_time = time.time() - batch_start
         successful_tasks = len([r for r in results if r.success])
@@ -391,6 +476,7 @@ class EnhancedDetectorPoolManager:
             # Procesar con el detector del pool
             detector = detector_info['detector']
             patterns = detector.detect_patterns(task.data, task.timeframe)
+            self._publish_result(task, patterns)
             
             # Actualizar estadísticas del detector
             detector_info['tasks_completed'] += 1
@@ -426,6 +512,13 @@ class EnhancedDetectorPoolManager:
             # Liberar detector de vuelta al pool
             self.release_detector(detector_info['id'])
     
+    def _publish_result(self, task: AnalysisTask, patterns: List[Any]) -> None:
+        """Publica el último resultado del símbolo/timeframe para otros lectores (dashboard)"""
+        try:
+            get_detection_result_cache().publish(task.symbol, task.timeframe, bar_key(task.data), patterns)
+        except Exception:
+            pass
+    
     def get_pool_statistics(self) -> Dict[str, Any]:
         """Obtener estadísticas del pool"""
         with self._lock:
@@ -433,6 +526,8 @@ class EnhancedDetectorPoolManager:
             
             return {
                 'pool_size': self.pool_size,
+                'execution_mode': self.execution_mode,
+                'process_workers': len(self._process_pool.worker_pids) if self._process_pool else 0,
                 'busy_detectors': busy_detectors,
                 'available_detectors': self.pool_size - busy_detectors,
                 'utilization_percent': (busy_detectors / self.pool_size) * 100,
@@ -445,6 +540,12 @@ class EnhancedDetectorPoolManager:
         """Shutdown del pool manager"""
         print("🔄 Cerrando Enhanced Detector Pool Manager...")
         with self._lock:
+            if self._thread_executor is not None:
+                self._thread_executor.shutdown(wait=True)
+                self._thread_executor = None
+            if self._process_pool is not None:
+                self._process_pool.shutdown()
+                self._process_pool = None
             self.detector_pool.clear()
             self._initialized = False
         print("   ✅ Pool cerrado exitosamente")
@@ -455,13 +556,14 @@ _pool_manager_instance = None
 _pool_manager_lock = threading.Lock()
 
 
-def get_detector_pool_manager(pool_size: Optional[int] = None) -> EnhancedDetectorPoolManager:
+def get_detector_pool_manager(pool_size: Optional[int] = None,
+                              execution_mode: str = EXECUTION_MODE_THREAD) -> EnhancedDetectorPoolManager:
     """Obtener instancia singleton del pool manager"""
     global _pool_manager_instance
     
     with _pool_manager_lock:
         if _pool_manager_instance is None:
-            _pool_manager_instance = EnhancedDetectorPoolManager(pool_size)
+            _pool_manager_instance = EnhancedDetectorPoolManager(pool_size, execution_mode)
         return _pool_manager_instance
 
 
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+🧮 PROCESS DETECTOR POOL
+Pool persistente de procesos para detección de patrones CPU-bound (sin GIL).
+
+- Cada proceso worker crea y pre-calienta su propio ICTPatternDetector una vez
+- Las velas de un lote se copian una sola vez a un bloque
+  multiprocessing.shared_memory (matriz float64); los workers adjuntan el
+  bloque y leen su rango de filas sin deserializar DataFrames
+- Los resultados vuelven como registros compactos (dicts de escalares)
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import get_context
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Columnas transferidas por shared memory; la columna 0 es el timestamp (epoch s)
+SHM_COLUMNS: Tuple[str, ...] = ('time', 'open', 'high', 'low', 'close', 'volume')
+
+_CORE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Estado por proceso worker
+_WORKER_DETECTOR: Any = None
+_WORKER_TASKS = 0
+
+
+def _prewarm_frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=10, freq='15min'),
+        'open': [1.0500] * 10,
+        'high': [1.0510] * 10,
+        'low': [1.0490] * 10,
+        'close': [1.0500] * 10,
+        'volume': [1000] * 10
+    })
+
+
+def _worker_init(core_path: str, quiet: bool) -> None:
+    """Initializer del proceso: detector pre-calentado residente."""
+    global _WORKER_DETECTOR
+    if core_path not in sys.path:
+        sys.path.insert(0, core_path)
+    if quiet:
+        sys.stdout = open(os.devnull, 'w')
+    from ict_engine.pattern_detector import ICTPatternDetector
+    _WORKER_DETECTOR = ICTPatternDetector()
+    try:
+        _WORKER_DETECTOR.detect_patterns(_prewarm_frame(), 'M15')
+    except Exception:
+        pass
+
+
+def _worker_ping(_: int) -> int:
+    """Fuerza el arranque (y pre-warm) del worker; devuelve su pid."""
+    return os.getpid()
+
+
+def _scalar_metadata(metadata: Any) -> Dict[str, Any]:
+    if not isinstance(metadata, dict):
+        return {}
+    return {k: v for k, v in metadata.items() if isinstance(v, (str, int, float, bool)) or v is None}
+
+
+def _compact_pattern(pattern: Any, symbol: str) -> Dict[str, Any]:
+    ts = getattr(pattern, 'timestamp', None)
+    return {
+        'pattern_type': str(getattr(pattern, 'pattern_type', '')),
+        'timeframe': str(getattr(pattern, 'timeframe', '')),
+        'symbol': symbol,
+        'entry_price': float(getattr(pattern, 'entry_price', 0.0) or 0.0),
+        'confidence': float(getattr(pattern, 'confidence', 0.0) or 0.0),
+        'timestamp': ts.isoformat() if hasattr(ts, 'isoformat') else ts,
+        'metadata': _scalar_metadata(getattr(pattern, 'metadata', None)),
+    }
+
+
+def _worker_detect(shm_name: str, total_rows: int, start: int, stop: int,
+                   task_id: str, symbol: str, timeframe: str) -> Dict[str, Any]:
+    """Detecta patrones sobre las filas [start, stop) del bloque compartido."""
+    global _WORKER_TASKS
+    t0 = time.perf_counter()
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        block = np.ndarray((total_rows, len(SHM_COLUMNS)), dtype=np.float64, buffer=shm.buf)
+        rows = block[start:stop]
+        index = pd.to_datetime(rows[:, 0], unit='s')
+        # copy=True desacopla el DataFrame del buffer antes de cerrarlo
+        frame = pd.DataFrame(rows[:, 1:], columns=list(SHM_COLUMNS[1:]), index=index, copy=True)
+        del block, rows
+    finally:
+        shm.close()
+
+    detector = _WORKER_DETECTOR
+    if isinstance(getattr(detector, 'config', None), dict):
+        detector.config['symbol'] = symbol
+    patterns = detector.detect_patterns(frame, timeframe)
+    _WORKER_TASKS += 1
+    return {
+        'task_id': task_id,
+        'patterns': [_compact_pattern(p, symbol) for p in patterns],
+        'processing_time': time.perf_counter() - t0,
+        'worker_pid': os.getpid(),
+    }
+
+
+def pack_candles(frames: Sequence[pd.DataFrame]) -> Tuple[shared_memory.SharedMemory, int, List[Tuple[int, int]]]:
+    """
+    Copia todas las velas de un lote a un único bloque de shared memory.
+
+    Returns:
+        (bloque, filas totales, [(inicio, fin) por frame])
+    """
+    spans: List[Tuple[int, int]] = []
+    total = 0
+    for frame in frames:
+        spans.append((total, total + len(frame)))
+        total += len(frame)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, total * len(SHM_COLUMNS) * 8))
+    block = np.ndarray((total, len(SHM_COLUMNS)), dtype=np.float64, buffer=shm.buf)
+    for frame, (lo, hi) in zip(frames, spans):
+        if 'timestamp' in frame.columns:
+            times = pd.to_datetime(frame['timestamp'])
+        else:
+            times = frame.index
+        if pd.api.types.is_datetime64_any_dtype(times):
+            stamps = pd.DatetimeIndex(times)
+            if stamps.tz is not None:
+                stamps = stamps.tz_convert('UTC').tz_localize(None)
+            block[lo:hi, 0] = ((stamps - pd.Timestamp(0)) / pd.Timedelta(1, 's')).to_numpy(dtype=np.float64)
+        else:
+            block[lo:hi, 0] = np.arange(hi - lo, dtype=np.float64)
+        for col_idx, name in enumerate(SHM_COLUMNS[1:], start=1):
+            block[lo:hi, col_idx] = frame[name].to_numpy(dtype=np.float64) if name in frame.columns else 0.0
+    del block
+    return shm, total, spans
+
+
+class ProcessDetectorPool:
+    """Pool persistente de procesos con un ICTPatternDetector residente por worker."""
+
+    def __init__(self, workers: int, start_method: str = 'spawn', quiet: bool = True):
+        self.workers = max(1, int(workers))
+        self.start_method = start_method
+        self.quiet = quiet
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.worker_pids: List[int] = []
+
+    def start(self) -> None:
+        if self._executor is not None:
+            return
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=get_context(self.start_method),
+            initializer=_worker_init,
+            initargs=(_CORE_PATH, self.quiet),
+        )
+        # Arrancar todos los workers ahora para no pagar el pre-warm en la primera tarea
+        self.worker_pids = sorted(set(self._executor.map(_worker_ping, range(self.workers * 2))))
+
+    @property
+    def started(self) -> bool:
+        return self._executor is not None
+
+    def run(self, jobs: Sequence[Tuple[str, str, str, pd.DataFrame]]) -> List[Dict[str, Any]]:
+        """
+        Ejecuta un lote de (task_id, symbol, timeframe, data).
+
+        Returns:
+            Un registro por job, en el mismo orden; los fallos llevan 'error'
+        """
+        if not jobs:
+            return []
+        self.start()
+        assert self._executor is not None
+        shm, total, spans = pack_candles([job[3] for job in jobs])
+        try:
+            futures: List[Future] = [
+                self._executor.submit(_worker_detect, shm.name, total, lo, hi, task_id, symbol, timeframe)
+                for (task_id, symbol, timeframe, _), (lo, hi) in zip(jobs, spans)
+            ]
+            out: List[Dict[str, Any]] = []
+            for (task_id, _, _, _), future in zip(jobs, futures):
+                try:
+                    out.append(future.result())
+                except Exception as e:
+                    out.append({'task_id': task_id, 'patterns': [], 'processing_time': 0.0,
+                                'worker_pid': -1, 'error': str(e)})
+            return out
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            self.worker_pids = []
+
+
+__all__ = ['ProcessDetectorPool', 'pack_candles', 'SHM_COLUMNS']
@@ -14,6 +14,7 @@ Features:
 - Cache management for performance
 - Tick data processing for scalping
 - Historical data integration
+- Streaming O(1) per-tick bar builder with M1 -> M5/M15/H1/H4 roll-ups
 - Pattern recognition data feeds
 - Risk metrics calculation
 
@@ -123,6 +124,159 @@ class MarketState:
     is_active: bool = False
 
 
+def timeframe_to_minutes(timeframe: str) -> int:
+    """Convert 'M5' / 'H1' / 'D1' to minutes (must divide a day)."""
+    unit, value = timeframe[:1].upper(), int(timeframe[1:])
+    minutes = value * {"M": 1, "H": 60, "D": 1440}[unit]
+    if minutes <= 0 or 1440 % minutes != 0:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return minutes
+
+
+def _bucket_start(ts: datetime, minutes: int) -> datetime:
+    """Floor a timestamp to the start of its bar (aligned to midnight)."""
+    day_minutes = ts.hour * 60 + ts.minute
+    floored = day_minutes - (day_minutes % minutes)
+    return ts.replace(hour=floored // 60, minute=floored % 60, second=0, microsecond=0)
+
+
+class StreamingBarBuilder:
+    """
+    Incremental per-symbol bar builder.
+
+    M1 bars are updated in O(1) per tick (open/high/low/close/volume/spread);
+    higher timeframes are rolled up from closed M1 bars, also in O(1).
+    A candle is emitted only when its bar closes, either because a tick of
+    a later bucket arrives or through close_stale() on a timer.
+
+    Emitted bars are final: the end of the latest closed bucket of every
+    timeframe is tracked and ticks stamped before it are dropped as late.
+    Stale-closing runs on the broker clock (last tick time plus the time
+    elapsed since it was received), never on the local wall clock.
+    """
+
+    BASE_TIMEFRAME = "M1"
+
+    def __init__(self, symbol: str, timeframes: Optional[List[str]] = None):
+        self.symbol = symbol
+        requested = timeframes or ["M1", "M5", "M15", "H1", "H4"]
+        self.timeframes: List[str] = [self.BASE_TIMEFRAME] + [
+            tf for tf in requested if tf != self.BASE_TIMEFRAME and timeframe_to_minutes(tf) > 1
+        ]
+        self._minutes: Dict[str, int] = {tf: timeframe_to_minutes(tf) for tf in self.timeframes}
+        self._current: Dict[str, Optional[CandleData]] = {tf: None for tf in self.timeframes}
+        self._spread_sum: Dict[str, float] = {tf: 0.0 for tf in self.timeframes}
+        self._last_closed: Dict[str, datetime] = {}   # timeframe -> last emitted bucket
+        self._closed_until: Optional[datetime] = None  # end of the latest emitted bucket
+        self._last_tick_time: Optional[datetime] = None
+        self._last_tick_mono = 0.0
+        self.late_ticks = 0
+
+    def current(self, timeframe: str = BASE_TIMEFRAME) -> Optional[CandleData]:
+        """Bar still forming for the timeframe (None before the first tick)."""
+        return self._current.get(timeframe)
+
+    def last_closed(self, timeframe: str = BASE_TIMEFRAME) -> Optional[datetime]:
+        """Bucket start of the last bar emitted for the timeframe."""
+        return self._last_closed.get(timeframe)
+
+    def broker_now(self) -> Optional[datetime]:
+        """Broker clock estimate: last tick time plus elapsed time since it arrived."""
+        if self._last_tick_time is None:
+            return None
+        return self._last_tick_time + timedelta(seconds=time.monotonic() - self._last_tick_mono)
+
+    def update(self, tick: TickData) -> List[CandleData]:
+        """Fold one tick in; returns the candles closed by it (lowest timeframe first)."""
+        closed: List[CandleData] = []
+        base = self._current[self.BASE_TIMEFRAME]
+        bucket = _bucket_start(tick.timestamp, 1)
+        if (self._closed_until is not None and tick.timestamp < self._closed_until) or \
+                (base is not None and bucket < base.timestamp):
+            # Tick inside an emitted bar or older than the forming one: emitted bars stay immutable
+            self.late_ticks += 1
+            return closed
+        if self._last_tick_time is None or tick.timestamp >= self._last_tick_time:
+            self._last_tick_time = tick.timestamp
+            self._last_tick_mono = time.monotonic()
+        if base is not None and bucket > base.timestamp:
+            closed.extend(self._close_base(tick.timestamp))
+            base = None
+
+        if base is None:
+            self._current[self.BASE_TIMEFRAME] = CandleData(
+                symbol=self.symbol, timeframe=self.BASE_TIMEFRAME, timestamp=bucket,
+                open=tick.bid, high=tick.bid, low=tick.bid, close=tick.bid,
+                volume=tick.volume, tick_volume=1, spread=tick.spread,
+            )
+            self._spread_sum[self.BASE_TIMEFRAME] = tick.spread
+            return closed
+
+        base.high = max(base.high, tick.bid)
+        base.low = min(base.low, tick.bid)
+        base.close = tick.bid
+        base.volume += tick.volume
+        base.tick_volume += 1
+        self._spread_sum[self.BASE_TIMEFRAME] += tick.spread
+        base.spread = self._spread_sum[self.BASE_TIMEFRAME] / base.tick_volume
+        return closed
+
+    def close_stale(self, now: Optional[datetime] = None) -> List[CandleData]:
+        """
+        Close bars whose bucket has ended by `now` even if no new tick arrived.
+
+        `now` must be on the broker clock; by default broker_now() is used.
+        """
+        if now is None:
+            now = self.broker_now()
+        base = self._current[self.BASE_TIMEFRAME]
+        if now is None or base is None or _bucket_start(now, 1) <= base.timestamp:
+            return []
+        return self._close_base(now)
+
+    def _close_base(self, now: datetime) -> List[CandleData]:
+        base = self._current[self.BASE_TIMEFRAME]
+        self._current[self.BASE_TIMEFRAME] = None
+        closed: List[CandleData] = []
+        if base is None:
+            return closed
+        closed.append(base)
+        self._mark_closed(base)
+        for tf in self.timeframes[1:]:
+            self._roll_up(tf, base)
+            bar = self._current[tf]
+            if bar is not None and _bucket_start(now, self._minutes[tf]) > bar.timestamp:
+                closed.append(bar)
+                self._current[tf] = None
+                self._mark_closed(bar)
+        return closed
+
+    def _mark_closed(self, bar: CandleData) -> None:
+        self._last_closed[bar.timeframe] = bar.timestamp
+        end = bar.timestamp + timedelta(minutes=self._minutes[bar.timeframe])
+        if self._closed_until is None or end > self._closed_until:
+            self._closed_until = end
+
+    def _roll_up(self, timeframe: str, m1: CandleData) -> None:
+        bucket = _bucket_start(m1.timestamp, self._minutes[timeframe])
+        bar = self._current[timeframe]
+        if bar is None or bar.timestamp != bucket:
+            self._current[timeframe] = CandleData(
+                symbol=self.symbol, timeframe=timeframe, timestamp=bucket,
+                open=m1.open, high=m1.high, low=m1.low, close=m1.close,
+                volume=m1.volume, tick_volume=m1.tick_volume, spread=m1.spread,
+            )
+            self._spread_sum[timeframe] = m1.spread * m1.tick_volume
+            return
+        bar.high = max(bar.high, m1.high)
+        bar.low = min(bar.low, m1.low)
+        bar.close = m1.close
+        bar.volume += m1.volume
+        bar.tick_volume += m1.tick_volume
+        self._spread_sum[timeframe] += m1.spread * m1.tick_volume
+        bar.spread = self._spread_sum[timeframe] / bar.tick_volume if bar.tick_volume else 0.0
+
+
 class RealTimeDataProcessor:
     """
     Real-time data processor for production trading
@@ -169,7 +323,10 @@ class RealTimeDataProcessor:
         # Data storage
         self.market_states: Dict[str, MarketState] = {}
         self.tick_buffers: Dict[str, deque] = {}
-        self.candle_buffers: Dict[str, deque] = {}
+        self.candle_buffers: Dict[str, deque] = {}  # closed M1 candles
+        self.timeframe_candle_buffers: Dict[str, Dict[str, deque]] = {}  # closed M5+ candles
+        self.bar_builders: Dict[str, StreamingBarBuilder] = {}
+        self.bar_callbacks: List[Callable[[str, str, CandleData], None]] = []
         
         # Threading
         self._lock = threading.RLock()
@@ -232,6 +389,23 @@ class RealTimeDataProcessor:
             
             self.tick_buffers[symbol] = deque(maxlen=buffer_size)
             self.candle_buffers[symbol] = deque(maxlen=buffer_size)
+            
+            builder = StreamingBarBuilder(symbol, self._bar_timeframes())
+            self.bar_builders[symbol] = builder
+            self.timeframe_candle_buffers[symbol] = {
+                tf: deque(maxlen=buffer_size) for tf in builder.timeframes[1:]
+            }
+    
+    def _bar_timeframes(self) -> List[str]:
+        """Intraday timeframes from config supported by the streaming bar builder"""
+        timeframes = []
+        for tf in self.config.get("timeframes", ["M1"]):
+            try:
+                if timeframe_to_minutes(tf) < 1440:
+                    timeframes.append(tf)
+            except (ValueError, KeyError, IndexError):
+                continue
+        return timeframes
     
     def initialize_mt5_connection(self) -> bool:
         """Initialize MT5 connection for real data"""
@@ -422,6 +596,11 @@ class RealTimeDataProcessor:
             # Store in buffer
             self.tick_buffers[symbol].append(tick_data)
             
+            # Fold into the streaming bars (O(1) per tick)
+            builder = self.bar_builders.get(symbol)
+            if builder is not None:
+                self._publish_closed_candles(symbol, builder.update(tick_data))
+            
             # Update market state
             if symbol in self.market_states:
                 self.market_states[symbol].current_tick = tick_data
@@ -452,64 +631,37 @@ class RealTimeDataProcessor:
         return True
     
     def _update_candle_data(self, symbol: str):
-        """Update candle data from tick data"""
+        """Close bars that ended without a new tick and expose the forming M1 bar"""
         try:
-            current_time = datetime.now()
-            
-            # Get recent ticks for candle formation
-            ticks = list(self.tick_buffers[symbol])
-            if len(ticks) < 2:
+            builder = self.bar_builders.get(symbol)
+            if builder is None:
                 return
             
-            # Create 1-minute candle from recent ticks
-            minute_start = current_time.replace(second=0, microsecond=0)
-            minute_ticks = [tick for tick in ticks 
-                          if tick.timestamp >= minute_start 
-                          and tick.timestamp < minute_start + timedelta(minutes=1)]
-            
-            if len(minute_ticks) >= 2:
-                candle = self._create_candle_from_ticks(symbol, "M1", minute_ticks)
-                if candle:
-                    self.candle_buffers[symbol].append(candle)
-                    
-                    # Update market state
-                    if symbol in self.market_states:
-                        self.market_states[symbol].current_candle = candle
+            with self._lock:
+                # Broker clock (last tick time + elapsed): local time may be in another zone
+                self._publish_closed_candles(symbol, builder.close_stale())
+                
+                # Update market state
+                if symbol in self.market_states:
+                    self.market_states[symbol].current_candle = builder.current(StreamingBarBuilder.BASE_TIMEFRAME)
                         
         except Exception as e:
             self.logger.debug(f"Candle update error for {symbol}: {e}")
     
-    def _create_candle_from_ticks(self, symbol: str, timeframe: str, 
-                                 ticks: List[TickData]) -> Optional[CandleData]:
-        """Create candle data from tick data"""
-        if not ticks:
-            return None
-        
-        # Sort by timestamp
-        sorted_ticks = sorted(ticks, key=lambda t: t.timestamp)
-        
-        # Calculate OHLC
-        open_price = sorted_ticks[0].bid
-        close_price = sorted_ticks[-1].bid
-        high_price = max(tick.bid for tick in sorted_ticks)
-        low_price = min(tick.bid for tick in sorted_ticks)
-        
-        # Calculate volume
-        total_volume = sum(tick.volume for tick in sorted_ticks)
-        tick_volume = len(sorted_ticks)
-        
-        return CandleData(
-            symbol=symbol,
-            timeframe=timeframe,
-            timestamp=sorted_ticks[0].timestamp,
-            open=open_price,
-            high=high_price,
-            low=low_price,
-            close=close_price,
-            volume=total_volume,
-            tick_volume=tick_volume,
-            spread=sum(tick.spread for tick in sorted_ticks) / len(sorted_ticks)
-        )
+    def _publish_closed_candles(self, symbol: str, candles: List[CandleData]):
+        """Store closed candles and notify bar callbacks"""
+        for candle in candles:
+            if candle.timeframe == StreamingBarBuilder.BASE_TIMEFRAME:
+                self.candle_buffers[symbol].append(candle)
+            else:
+                tf_buffers = self.timeframe_candle_buffers.get(symbol, {})
+                if candle.timeframe in tf_buffers:
+                    tf_buffers[candle.timeframe].append(candle)
+            for callback in self.bar_callbacks:
+                try:
+                    callback(symbol, candle.timeframe, candle)
+                except Exception as e:
+                    self.logger.error(f"Bar callback error: {e}")
     
     def _update_market_state(self, symbol: str):
         """Update comprehensive market state"""
@@ -688,6 +840,11 @@ class RealTimeDataProcessor:
         self.data_callbacks.append(callback)
         self.logger.info(f"Data callback registered: {len(self.data_callbacks)} total")
 
+    def register_bar_callback(self, callback: Callable[[str, str, CandleData], None]):
+        """Register callback invoked as (symbol, timeframe, candle) when a bar closes"""
+        self.bar_callbacks.append(callback)
+        self.logger.info(f"Bar callback registered: {len(self.bar_callbacks)} total")
+
     # ---- Minimal interface expected by main.py ----
     def start(self) -> bool:
         """Alias to start_processing (expected by main.py)"""
@@ -737,12 +894,14 @@ class RealTimeDataProcessor:
         ticks = list(self.tick_buffers[symbol])
         return ticks[-count:] if len(ticks) > count else ticks
     
-    def get_recent_candles(self, symbol: str, count: int = 50) -> List[CandleData]:
-        """Get recent candle data"""
-        if symbol not in self.candle_buffers:
+    def get_recent_candles(self, symbol: str, count: int = 50, timeframe: str = "M1") -> List[CandleData]:
+        """Get recent closed candles (M1 by default, or any rolled-up timeframe)"""
+        buffers = self.timeframe_candle_buffers.get(symbol, {})
+        buffer = self.candle_buffers.get(symbol) if timeframe == "M1" else buffers.get(timeframe)
+        if buffer is None:
             return []
         
-        candles = list(self.candle_buffers[symbol])
+        candles = list(buffer)
         return candles[-count:] if len(candles) > count else candles
     
     def get_historical_data(self, symbol: str, timeframe: str, count: int = 500) -> Optional[pd.DataFrame]:
@@ -23,6 +23,11 @@ from pathlib import Path
 from typing import Any, Dict, Optional
 import json, datetime
 
+try:
+    from monitoring.order_tracing import current_trace
+except Exception:
+    current_trace = None  # type: ignore
+
 def _fallback_logger_factory(component_name: str) -> Any:
     class _FallbackLogger:
         def info(self, message: str, component: str) -> None: print(f"[INFO][{component}] {message}")
@@ -61,9 +66,14 @@ class ExecutionAuditLogger:
             pass
 
     def log_event(self, event_type: str, order_id: Optional[str] = None, symbol: Optional[str] = None,
-                  status: Optional[str] = None, latency_ms: Optional[float] = None, extra: Optional[Dict[str, Any]] = None) -> None:
+                  status: Optional[str] = None, latency_ms: Optional[float] = None, extra: Optional[Dict[str, Any]] = None,
+                  trace: Any = None) -> None:
+        """trace: OrderTrace de la orden (por defecto la activa del contexto);
+        añade trace_id y las etapas (ms desde el origen) al registro."""
         if not event_type:
             return
+        if trace is None and current_trace is not None:
+            trace = current_trace(symbol)
         record = {
             "ts": datetime.datetime.now(timezone.utc).isoformat(),
             "event": event_type.upper(),
@@ -75,6 +85,13 @@ class ExecutionAuditLogger:
         }
         # saneo simple
         record["extra"] = {k:v for k,v in record["extra"].items() if isinstance(k,str)}
+        if trace is not None:
+            try:
+                trace_data = trace.to_dict()
+                record["trace_id"] = trace_data["trace_id"]
+                record["stages"] = trace_data["stages"]
+            except Exception:
+                pass
         try:
             with open(self.file_path, "a", encoding="utf-8") as f:
                 f.write(json.dumps(record, ensure_ascii=False) + "\n")
@@ -6,14 +6,15 @@ Puede reutilizarse fuera de ExecutionRouter y facilita test unitarios.
 
 Responsabilidades:
 - Registrar tiempos de inicio/fin y computar latencias.
-- Mantener contadores (total, ok, fail) y muestras de latencia con límite.
+- Mantener contadores (total, ok, fail) y un histograma de latencia rolling
+  (últimas ~latency_samples_limit órdenes) más el total de la sesión.
 - Persistir archivos live / summary / cumulative siguiendo convención.
-- Calcular percentiles sin depender de numpy (interpolación lineal).
+- Calcular percentiles desde el histograma (sin ordenar listas de muestras).
 
 Diseño eficiente:
-- Operaciones O(1) sobre contadores.
+- Operaciones O(1) sobre contadores e histograma.
 - Percentiles calculados solo en persistencia (no en cada muestra).
-- Límite de muestras configurable para controlar memoria.
+- Memoria fija: RollingLatencyHistogram con error relativo acotado.
 """
 from __future__ import annotations
 from protocols.unified_logging import get_unified_logger
@@ -23,6 +24,8 @@ from pathlib import Path
 import json, time, os
 from datetime import datetime, timezone
 
+from monitoring.latency_histogram import RollingLatencyHistogram
+
 @runtime_checkable
 class _LoggerProto(Protocol):
     def info(self, message: str, category: str) -> None: ...
@@ -45,7 +48,7 @@ except Exception:  # fallback reducido
 class ExecutionMetricsConfig:
     metrics_dir: str
     history_limit: int = 100
-    latency_samples_limit: int = 500
+    latency_samples_limit: int = 500  # ventana (en órdenes) de los percentiles de latencia
     cumulative_filename: str = "metrics_cumulative.json"
     live_filename: str = "metrics_live.json"
     summary_filename: str = "metrics_summary.json"
@@ -54,7 +57,7 @@ class ExecutionMetricsConfig:
 class ExecutionMetricsRecorder:
     config: ExecutionMetricsConfig
     logger: Any = field(init=False)
-    _latency_samples: List[float] = field(default_factory=list)
+    _latency_hist: RollingLatencyHistogram = field(init=False)
     _history: List[Dict[str, Any]] = field(default_factory=list)
     _orders_total: int = 0
     _orders_ok: int = 0
@@ -64,6 +67,7 @@ class ExecutionMetricsRecorder:
 
     def __post_init__(self) -> None:
         Path(self.config.metrics_dir).mkdir(parents=True, exist_ok=True)
+        self._latency_hist = RollingLatencyHistogram(self.config.latency_samples_limit)
         self.logger = create_enterprise_logger("ExecMetrics")
         self._load_cumulative()
 
@@ -75,9 +79,7 @@ class ExecutionMetricsRecorder:
         else:
             self._orders_failed += 1
         if latency_ms >= 0:
-            self._latency_samples.append(latency_ms)
-            if len(self._latency_samples) > self.config.latency_samples_limit:
-                self._latency_samples.pop(0)
+            self._latency_hist.record(latency_ms)
 
     # ------------- Persistencia -------------
     def maybe_persist(self, interval_seconds: float = 30.0) -> None:
@@ -117,25 +119,12 @@ class ExecutionMetricsRecorder:
         self._cumulative["sessions"] = int(self._cumulative.get("sessions",0)) + 1
 
     # ------------- Percentiles -------------
-    def _percentile(self, sorted_list: List[float], p: float) -> float:
-        if not sorted_list:
-            return 0.0
-        k = (len(sorted_list)-1) * p
-        f = int(k)
-        c = min(f+1, len(sorted_list)-1)
-        if f == c:
-            return float(sorted_list[f])
-        d0 = sorted_list[f] * (c - k)
-        d1 = sorted_list[c] * (k - f)
-        return float(d0 + d1)
-
     def _compute_stats(self) -> Dict[str, Any]:
-        lat = list(self._latency_samples)
-        lat_sorted = sorted(lat)
-        avg = sum(lat_sorted)/len(lat_sorted) if lat_sorted else 0.0
-        pct = {k:self._percentile(lat_sorted, v) for k,v in {
-            'p50':0.50,'p75':0.75,'p90':0.90,'p95':0.95,'p99':0.99}.items()}
-        return {"avg": avg, "percentiles": pct, "count": len(lat_sorted)}
+        hist = self._latency_hist
+        pct = hist.percentiles((0.50, 0.75, 0.90, 0.95, 0.99))
+        pct['max'] = float(hist.max) if hist.count else 0.0
+        total = hist.cumulative().to_dict((0.50, 0.90, 0.99))
+        return {"avg": hist.mean, "percentiles": pct, "count": hist.count, "total": total}
 
     def _persist_live_and_summary(self) -> None:
         stats = self._compute_stats()
@@ -147,6 +136,7 @@ class ExecutionMetricsRecorder:
             "avg_latency_ms": stats["avg"],
             "latency_samples_count": stats["count"],
             "latency_percentiles": stats["percentiles"],
+            "latency_total": stats["total"],
         }
         summary = {
             "generated": live["timestamp"],
@@ -21,6 +21,22 @@ import threading
 import time
 import json
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+
+from monitoring.latency_histogram import LatencyHistogram, RollingLatencyHistogram
+from .order_pipeline import RetryScheduler, SideEffectSink
+try:
+    from monitoring.metrics_collector import record_latency
+except Exception:
+    record_latency = None  # type: ignore
+try:
+    from monitoring.order_tracing import OrderTrace, current_trace, get_trace_recorder, use_trace
+except Exception:
+    OrderTrace = None  # type: ignore
+    current_trace = None  # type: ignore
+    get_trace_recorder = None  # type: ignore
+    use_trace = None  # type: ignore
 try:
     from .rate_limiter import RateLimiter, RateLimiterConfig
 except Exception:
@@ -114,6 +130,27 @@ class ExecutionResult:
     retries: int = 0
     placed_at: Optional[datetime] = None
     extra: Dict[str, Any] = field(default_factory=dict)
+    latency_ms: Optional[float] = None  # señal→acuse del broker
+
+@dataclass
+class _OrderContext:
+    """Estado de una orden a lo largo de sus intentos"""
+    symbol: str
+    action: str
+    volume: float
+    price: Optional[float]
+    sl: Optional[float]
+    tp: Optional[float]
+    signal_time: float
+    async_mode: bool = False
+    future: Optional[Future] = None
+    last_error: Optional[str] = None
+    trace: Any = None  # OrderTrace (señal→fill)
+    broker_latency_ms: Optional[float] = None  # ida y vuelta del último envío
+
+    def mark(self, stage: str) -> None:
+        if self.trace is not None:
+            self.trace.mark(stage)
 
 @dataclass
 class ExecutionRouterConfig:
@@ -145,6 +182,13 @@ class ExecutionRouterConfig:
     compliance_blacklist: list[str] | None = None
     compliance_restricted_hours: list[int] | None = None
     compliance_loss_cooldown_sec: int = 0
+    # modo asíncrono (submit_order)
+    async_workers: int = 2
+    async_side_effects: bool = False  # True: también place_order delega efectos al sink
+
+@contextmanager
+def _null_context():
+    yield None
 
 class CircuitBreaker:
     def __init__(self, threshold: int, window_sec: int, cooldown_sec: int):
@@ -269,7 +313,6 @@ class ExecutionRouter:
             'orders_ok': 0,
             'orders_failed': 0,
             'last_log_ts': time.time(),
-            'latency_samples': [],
             'created': datetime.now(timezone.utc).isoformat(),
             'history': [],  # lista de snapshots resumidos
             'blocked_reasons': {
@@ -280,6 +323,15 @@ class ExecutionRouter:
                 'hook_blocked': 0
             }
         }
+        # latencia: histograma rolling de las últimas ~100 muestras (memoria fija)
+        self._latency_hist = RollingLatencyHistogram(100)
+        self._signal_latency_hist = LatencyHistogram()
+        # pipeline asíncrono
+        self._async_lock = threading.Lock()
+        self._async_closed = False  # tras shutdown_async no se aceptan más envíos
+        self._submit_pool: Optional[ThreadPoolExecutor] = None
+        self._retry_scheduler = RetryScheduler()
+        self._sink = SideEffectSink(logger=self.logger)
         self._load_cumulative()
         # slippage tracker opcional
         self.slippage_tracker = None  # type: ignore[assignment]
@@ -417,9 +469,148 @@ class ExecutionRouter:
                 return self._md_last_reason or 'market_data_invalid'
         return None
 
+    # ----------------------------- PIPELINE DE ÓRDENES --------------------
     def place_order(self, symbol: str, action: str, volume: float, price: Optional[float] = None,
-                    sl: Optional[float] = None, tp: Optional[float] = None) -> ExecutionResult:
-        start = datetime.now(timezone.utc)
+                    sl: Optional[float] = None, tp: Optional[float] = None,
+                    signal_time: Optional[float] = None, trace: Any = None) -> ExecutionResult:
+        """Envío síncrono (reintentos con sleep en el hilo llamante)."""
+        order = _OrderContext(symbol, action, volume, price, sl, tp,
+                              signal_time if signal_time is not None else time.time(),
+                              trace=self._resolve_trace(trace, symbol))
+        order.mark('router_received')
+        blocked = self._prepare_order(order)
+        if blocked is not None:
+            return blocked
+        for attempt in range(self.config.max_retries + 1):
+            result = self._attempt_order(order, attempt)
+            if result is not None:
+                return result
+            if attempt < self.config.max_retries:
+                order.mark('retry_wait')
+                time.sleep(self.config.retry_delay_seconds)
+        return self._final_failure(order)
+
+    @staticmethod
+    def _resolve_trace(trace: Any, symbol: str) -> Any:
+        """
+        Traza recibida, la activa del contexto, o una nueva con origen router.
+
+        Una traza de otro símbolo se descarta: nunca se mezclan las etapas de
+        dos órdenes distintas.
+        """
+        if OrderTrace is None:
+            return trace
+        if trace is not None and not trace.matches(symbol):
+            trace = None
+        if trace is None and current_trace is not None:
+            trace = current_trace(symbol)
+        return trace if trace is not None else OrderTrace('execution_router', symbol=symbol)
+
+    def submit_order(self, symbol: str, action: str, volume: float, price: Optional[float] = None,
+                     sl: Optional[float] = None, tp: Optional[float] = None,
+                     signal_time: Optional[float] = None, trace: Any = None) -> "Future[ExecutionResult]":
+        """
+        Envío asíncrono: retorna un Future inmediatamente.
+
+        Checks y llamada al broker corren en el pool de envío; los reintentos
+        se programan en el RetryScheduler (sin sleep) y auditoría, métricas y
+        persistencia van al SideEffectSink.
+
+        Args:
+            signal_time: epoch (time.time()) de la señal de origen, para medir
+                         la latencia señal→orden extremo a extremo
+            trace: OrderTrace de la señal (por defecto la activa del contexto)
+
+        Tras shutdown_async() el Future se resuelve con error 'router_shutdown'.
+        """
+        order = _OrderContext(symbol, action, volume, price, sl, tp,
+                              signal_time if signal_time is not None else time.time(),
+                              async_mode=True, future=Future(),
+                              trace=self._resolve_trace(trace, symbol))
+        order.mark('order_queued')
+        future = order.future
+        assert future is not None
+        try:
+            pool = self._get_submit_pool()
+            if pool is None:
+                future.set_result(ExecutionResult(False, error='router_shutdown'))
+                return future
+            pool.submit(self._run_async_attempt, order, 0)
+        except Exception as e:
+            future.set_result(ExecutionResult(False, error=f"submit_failed:{e}"))
+        return future
+
+    def _get_submit_pool(self) -> Optional[ThreadPoolExecutor]:
+        """Pool de envío (creado bajo demanda); None tras shutdown_async()."""
+        with self._async_lock:
+            if self._async_closed:
+                return None
+            if self._submit_pool is None:
+                self._submit_pool = ThreadPoolExecutor(
+                    max_workers=max(1, self.config.async_workers), thread_name_prefix="OrderSubmit")
+            return self._submit_pool
+
+    def _run_async_attempt(self, order: "_OrderContext", attempt: int) -> None:
+        future = order.future
+        assert future is not None
+        try:
+            order.mark('worker_dequeued')
+            if attempt == 0:
+                blocked = self._prepare_order(order)
+                if blocked is not None:
+                    future.set_result(blocked)
+                    return
+            result = self._attempt_order(order, attempt)
+            if result is not None:
+                future.set_result(result)
+                return
+            if attempt < self.config.max_retries and self._schedule_retry(order, attempt + 1):
+                return
+            future.set_result(self._final_failure(order))
+        except Exception as e:
+            if not future.done():
+                future.set_result(ExecutionResult(False, error=f"exception:{e}", retries=attempt))
+
+    def _schedule_retry(self, order: "_OrderContext", attempt: int) -> bool:
+        """Programa el siguiente intento; False si el router ya está cerrando."""
+        pool = self._get_submit_pool()
+        if pool is None:
+            return False
+        order.mark('retry_scheduled')
+        try:
+            self._retry_scheduler.schedule(
+                self.config.retry_delay_seconds,
+                lambda: self._resubmit(pool, order, attempt),
+                on_cancel=lambda: self._resolve_failure(order))
+        except RuntimeError:
+            return False
+        return True
+
+    def _resubmit(self, pool: ThreadPoolExecutor, order: "_OrderContext", attempt: int) -> None:
+        try:
+            pool.submit(self._run_async_attempt, order, attempt)
+        except RuntimeError:  # pool ya cerrado
+            self._resolve_failure(order)
+
+    def _resolve_failure(self, order: "_OrderContext") -> None:
+        """Resuelve el Future de una orden cuyo reintento no llegará a ejecutarse."""
+        future = order.future
+        if future is not None and not future.done():
+            future.set_result(self._final_failure(order))
+
+    def _side_effect(self, order: "_OrderContext", fn: Callable[..., Any], *args: Any) -> None:
+        """Inline en modo síncrono; SideEffectSink en modo asíncrono."""
+        if order.async_mode or self.config.async_side_effects:
+            self._sink.submit(fn, *args)
+            return
+        try:
+            fn(*args)
+        except Exception as e:  # efectos secundarios nunca rompen la orden
+            self.logger.warning(f"Side effect error: {e}", "EXECUTION")
+
+    def _prepare_order(self, order: "_OrderContext") -> Optional[ExecutionResult]:
+        """Sizing + compliance + pre-checks. Retorna ExecutionResult si se bloquea."""
+        symbol, action, price, sl = order.symbol, order.action, order.price, order.sl
         # --- POSITION SIZING (override volume si habilitado) ---
         if self._position_sizer and getattr(self.config, 'enable_position_sizer', False):
             try:
@@ -428,8 +619,8 @@ class ExecutionRouter:
                     stop_distance = abs(price - sl)
                     sizing_res = self._position_sizer.fixed_risk(symbol, price, stop_distance, risk_pct=getattr(self.config, 'position_sizer_risk_pct', 0.01))
                     if sizing_res.valid and sizing_res.volume > 0:
-                        volume = sizing_res.volume
-                        self.logger.info(f"Sizing aplicado volume={volume:.2f} basis={sizing_res.basis}", "EXECUTION")
+                        order.volume = sizing_res.volume
+                        self.logger.info(f"Sizing aplicado volume={order.volume:.2f} basis={sizing_res.basis}", "EXECUTION")
                 # Futuro: fallback a volatility_adjusted si no hay SL
             except Exception as e:  # pragma: no cover
                 self.logger.warning(f"PositionSizer error: {e}", "EXECUTION")
@@ -452,46 +643,40 @@ class ExecutionRouter:
                     reason = "compliance_block:" + ",".join(comp_res.violations)
                     self.logger.warning(f"Compliance bloquea orden {reason}", "EXECUTION")
                     # métrica bloqueos
-                    self._metrics['blocked_reasons']['hook_blocked'] = self._metrics['blocked_reasons'].get('hook_blocked', 0) + 1
+                    self._side_effect(order, self._record_blocked, 'hook_blocked', order)
+                    self._finish_trace(order, 'blocked')
                     return ExecutionResult(False, error=reason)
             except Exception as e:  # pragma: no cover
                 self.logger.warning(f"Compliance checker exception ignorada: {e}", "EXECUTION")
 
-        pre_issue = self._pre_checks(symbol, volume, action, price)
+        pre_issue = self._pre_checks(symbol, order.volume, action, price)
         if pre_issue:
             self.logger.warning(f"Order blocked pre-check: {pre_issue}", "EXECUTION")
-            # Emit alerts for specific blocking reasons
-            if self.alert_dispatcher and AlertCategory and AlertSeverity:
-                try:
-                    if pre_issue == "circuit_open":
-                        self.alert_dispatcher.dispatch_circuit_breaker(symbol, self.breaker.failures)
-                    elif pre_issue == "risk_validation_failed":
-                        self.alert_dispatcher.dispatch_risk_block(symbol, "risk validation failed", 
-                                                                 {"volume": volume, "action": action, "price": price})
-                    elif pre_issue.startswith("latency_too_high"):
-                        latency_str = pre_issue.split(":")[1] if ":" in pre_issue else "unknown"
-                        self.alert_dispatcher.dispatch_system_health("latency_monitor", "high_latency", 
-                                                                   {"latency": latency_str, "threshold": self.config.max_latency_ms})
-                    elif pre_issue == "system_unhealthy":
-                        self.alert_dispatcher.dispatch_system_health("health_monitor", "unhealthy", {})
-                except Exception:
-                    pass  # no fallar por alertas
+            self._side_effect(order, self._dispatch_block_alert, order, pre_issue)
             # métricas de bloqueo
             key = pre_issue.split(':')[0]
             if key.startswith('latency_too_high'):
                 key = 'latency_too_high'
             if key not in self._metrics['blocked_reasons']:
                 key = 'hook_blocked'
-            self._metrics['blocked_reasons'][key] += 1
+            self._side_effect(order, self._record_blocked, key, order)
+            self._finish_trace(order, 'blocked')
             return ExecutionResult(False, error=pre_issue)
+        order.mark('prechecks_done')
+        return None
 
+    def _attempt_order(self, order: "_OrderContext", attempt: int) -> Optional[ExecutionResult]:
+        """Un intento sobre primary/backup. Retorna el resultado si tuvo éxito."""
+        symbol, action, volume = order.symbol, order.action, order.volume
         executor_sequence = [self.primary] + ([self.backup] if self.backup else [])
-        last_error = None
-        for attempt in range(self.config.max_retries + 1):
-            for idx, executor in enumerate(executor_sequence):
-                try:
-                    def _send_once():
-                        return executor.send_order(symbol, action, volume, price, sl, tp)
+        for idx, executor in enumerate(executor_sequence):
+            try:
+                def _send_once():
+                    return executor.send_order(symbol, action, volume, order.price, order.sl, order.tp)
+                order.mark('broker_send')
+                send_start = time.perf_counter()
+                # la traza viaja al executor (marcas internas del broker)
+                with (use_trace(order.trace) if use_trace and order.trace is not None else _null_context()):
                     if self._retry_policy and getattr(self.config, 'enable_retry_policy', False):
                         try:
                             result = self._retry_policy.run(_send_once)
@@ -499,119 +684,195 @@ class ExecutionRouter:
                             result = {'success': False, 'error': f'retry_policy_failed:{e}'}
                     else:
                         result = _send_once()
-                    if result.get('success'):
-                        ticket = result.get('ticket')
-                        self.logger.info(f"Order executed via {'primary' if idx == 0 else 'backup'} ticket={ticket}", "EXECUTION")
-                        self._metrics['orders_total'] += 1
-                        self._metrics['orders_ok'] += 1
-                        if self.slippage_tracker:
-                            try:
-                                exp_px = price if price is not None else result.get('expected_price')
-                                exec_px = result.get('executed_price') or result.get('fill_price') or price
-                                if exp_px is not None and exec_px is not None:
-                                    self.slippage_tracker.record(symbol, float(exp_px), float(exec_px))
-                            except Exception:
-                                pass
-                        if self._metrics_recorder:
-                            try:
-                                self._metrics_recorder.record_order(True, self.latency_monitor.get_current_latency_ms() if self.latency_monitor else 0.0)
-                            except Exception:
-                                pass
-                        if self._audit_logger:
-                            try:
-                                self._audit_logger.log_event(
-                                    event_type="ORDER_OK",
-                                    order_id=str(ticket), symbol=symbol, status="OK",
-                                    latency_ms=(self.latency_monitor.get_current_latency_ms() if self.latency_monitor else None),
-                                    extra={'action': action, 'volume': volume}
-                                )
-                            except Exception:
-                                pass
-                        if self._session_state and isinstance(ticket, int):
-                            try:
-                                self._session_state.record_success(ticket, symbol, action, volume, result)
-                            except Exception:
-                                pass
-                        now = time.time()
-                        if self.latency_monitor:
-                            try:
-                                self._metrics['latency_samples'].append(self.latency_monitor.get_current_latency_ms())
-                                if len(self._metrics['latency_samples']) > 100:
-                                    self._metrics['latency_samples'].pop(0)
-                            except Exception:
-                                pass
-                        if (now - self._metrics['last_log_ts']) > 30:
-                            self._emit_metrics(now)
-                        # actualizar exposición de portafolio
-                        if self._exposure_tracker and getattr(self.config, 'enable_portfolio_exposure_tracker', False):
-                            try:
-                                self._exposure_tracker.apply_execution(symbol, volume, action)
-                            except Exception:
-                                pass
-                        return ExecutionResult(True, ticket=ticket, retries=attempt,
-                                               placed_at=datetime.now(timezone.utc), extra=result)
-                    last_error = result.get('error', 'unknown_error')
-                    self.logger.warning(f"Executor returned failure: {last_error}", "EXECUTION")
-                    if self._metrics_recorder:
-                        try:
-                            self._metrics_recorder.record_order(False, self.latency_monitor.get_current_latency_ms() if self.latency_monitor else 0.0)
-                        except Exception:
-                            pass
-                    if self.slippage_tracker:
-                        try:
-                            self.slippage_tracker.persist_snapshot()
-                        except Exception:
-                            pass
-                    if self._audit_logger:
-                        try:
-                            self._audit_logger.log_event(
-                                event_type="ORDER_FAIL",
-                                order_id=str(result.get('ticket','')), symbol=symbol, status="FAIL",
-                                latency_ms=(self.latency_monitor.get_current_latency_ms() if self.latency_monitor else None),
-                                extra={'error': last_error, 'action': action}
-                            )
-                        except Exception:
-                            pass
-                except Exception as e:  # ejecución robusta
-                    last_error = f"exception:{e}"
-                    self.logger.error(f"Execution exception attempt {attempt+1}: {e}", "EXECUTION")
-                    self.breaker.record_failure()
-                    # Alert on execution exception that could trigger circuit breaker
-                    if self.alert_dispatcher and AlertCategory and AlertSeverity:
-                        try:
-                            self.alert_dispatcher.dispatch_order_failure(symbol, f"execution_exception: {e}",
-                                                                       {"attempt": attempt+1, "action": action})
-                        except Exception:
-                            pass
-                    if self._metrics_recorder:
-                        try:
-                            self._metrics_recorder.record_order(False, 0.0)
-                        except Exception:
-                            pass
-                    if self._audit_logger:
-                        try:
-                            self._audit_logger.log_event(
-                                event_type="ORDER_EXCEPTION",
-                                order_id=None, symbol=symbol, status="EXCEPTION",
-                                latency_ms=None, extra={'exc': str(e)}
-                            )
-                        except Exception:
-                            pass
-            if attempt < self.config.max_retries:
-                time.sleep(self.config.retry_delay_seconds)
-        # fracaso total
-        if last_error:
+                order.broker_latency_ms = (time.perf_counter() - send_start) * 1000.0
+                if result.get('success'):
+                    order.mark('broker_ack')
+                    ticket = result.get('ticket')
+                    # latencia señal→orden (acuse del broker)
+                    signal_latency_ms = (time.time() - order.signal_time) * 1000.0
+                    self._finish_trace(order, 'filled', record=False)
+                    self._side_effect(order, self._record_success, order, idx, ticket, result, signal_latency_ms)
+                    return ExecutionResult(True, ticket=ticket, retries=attempt,
+                                           placed_at=datetime.now(timezone.utc), extra=result,
+                                           latency_ms=signal_latency_ms)
+                order.mark('broker_reject')
+                order.last_error = result.get('error', 'unknown_error')
+                self._side_effect(order, self._record_failure, order, result)
+            except Exception as e:  # ejecución robusta
+                order.mark('broker_exception')
+                order.last_error = f"exception:{e}"
+                self.logger.error(f"Execution exception attempt {attempt+1}: {e}", "EXECUTION")
+                # el breaker condiciona el siguiente pre-check: se actualiza inline
+                self.breaker.record_failure()
+                self._side_effect(order, self._record_exception, order, attempt, str(e))
+        return None
+
+    def _final_failure(self, order: "_OrderContext") -> ExecutionResult:
+        if order.last_error:
             self.breaker.record_failure()
-            # Alert on final failure
-            if self.alert_dispatcher and AlertCategory and AlertSeverity:
-                try:
-                    self.alert_dispatcher.dispatch_order_failure(symbol, last_error, 
-                                                               {"retries": self.config.max_retries, 
-                                                                "action": action, "volume": volume})
-                except Exception:
-                    pass
+        self._finish_trace(order, 'failed', record=False)
+        self._side_effect(order, self._record_final_failure, order)
+        return ExecutionResult(False, error=order.last_error or 'execution_failed', retries=self.config.max_retries)
+
+    def _finish_trace(self, order: "_OrderContext", status: str, record: bool = True) -> None:
+        """Cierra la traza inline (timestamp exacto); el registro puede ir al sink."""
+        if order.trace is None:
+            return
+        order.trace.finish(status)
+        if record:
+            self._side_effect(order, self._record_trace, order)
+
+    def _record_trace(self, order: "_OrderContext") -> None:
+        if order.trace is not None and get_trace_recorder is not None:
+            get_trace_recorder().record(order.trace, order.trace.status or 'unknown')
+
+    # ----------------------------- EFECTOS SECUNDARIOS --------------------
+    def _current_latency_ms(self) -> Optional[float]:
+        return self.latency_monitor.get_current_latency_ms() if self.latency_monitor else None
+
+    def _order_latency_ms(self, order: "_OrderContext") -> Optional[float]:
+        """Latencia de esta orden (envío→respuesta del broker), no la lectura global."""
+        return order.broker_latency_ms if order.broker_latency_ms is not None else self._current_latency_ms()
+
+    def _record_blocked(self, key: str, order: Optional["_OrderContext"] = None) -> None:
+        self._metrics['blocked_reasons'][key] = self._metrics['blocked_reasons'].get(key, 0) + 1
+
+    def _dispatch_block_alert(self, order: "_OrderContext", pre_issue: str) -> None:
+        # Emit alerts for specific blocking reasons
+        if not (self.alert_dispatcher and AlertCategory and AlertSeverity):
+            return
+        try:
+            symbol = order.symbol
+            if pre_issue == "circuit_open":
+                self.alert_dispatcher.dispatch_circuit_breaker(symbol, self.breaker.failures)
+            elif pre_issue == "risk_validation_failed":
+                self.alert_dispatcher.dispatch_risk_block(symbol, "risk validation failed", 
+                                                         {"volume": order.volume, "action": order.action, "price": order.price})
+            elif pre_issue.startswith("latency_too_high"):
+                latency_str = pre_issue.split(":")[1] if ":" in pre_issue else "unknown"
+                self.alert_dispatcher.dispatch_system_health("latency_monitor", "high_latency", 
+                                                           {"latency": latency_str, "threshold": self.config.max_latency_ms})
+            elif pre_issue == "system_unhealthy":
+                self.alert_dispatcher.dispatch_system_health("health_monitor", "unhealthy", {})
+        except Exception:
+            pass  # no fallar por alertas
+
+    def _record_success(self, order: "_OrderContext", idx: int, ticket: Any,
+                        result: Dict[str, Any], signal_latency_ms: float) -> None:
+        symbol, action, volume, price = order.symbol, order.action, order.volume, order.price
+        self.logger.info(f"Order executed via {'primary' if idx == 0 else 'backup'} ticket={ticket}", "EXECUTION")
+        self._metrics['orders_total'] += 1
+        self._metrics['orders_ok'] += 1
+        self._signal_latency_hist.record(signal_latency_ms)
+        self._record_trace(order)
+        if record_latency is not None:
+            try:
+                record_latency("latency.signal_to_order_ms", signal_latency_ms)
+            except Exception:
+                pass
+        if self.slippage_tracker:
+            try:
+                exp_px = price if price is not None else result.get('expected_price')
+                exec_px = result.get('executed_price') or result.get('fill_price') or price
+                if exp_px is not None and exec_px is not None:
+                    self.slippage_tracker.record(symbol, float(exp_px), float(exec_px))
+            except Exception:
+                pass
+        if self._metrics_recorder:
+            try:
+                self._metrics_recorder.record_order(True, self._order_latency_ms(order) or 0.0)
+            except Exception:
+                pass
+        if self._audit_logger:
+            try:
+                self._audit_logger.log_event(
+                    event_type="ORDER_OK",
+                    order_id=str(ticket), symbol=symbol, status="OK",
+                    latency_ms=self._order_latency_ms(order),
+                    extra={'action': action, 'volume': volume, 'signal_to_order_ms': signal_latency_ms},
+                    trace=order.trace
+                )
+            except Exception:
+                pass
+        if self._session_state and isinstance(ticket, int):
+            try:
+                self._session_state.record_success(ticket, symbol, action, volume, result)
+            except Exception:
+                pass
+        now = time.time()
+        # latencia propia de la orden (broker_send→broker_ack), no la lectura global del monitor
+        if order.broker_latency_ms is not None:
+            self._latency_hist.record(order.broker_latency_ms)
+        if (now - self._metrics['last_log_ts']) > 30:
+            self._emit_metrics(now)
+        # actualizar exposición de portafolio
+        if self._exposure_tracker and getattr(self.config, 'enable_portfolio_exposure_tracker', False):
+            try:
+                self._exposure_tracker.apply_execution(symbol, volume, action)
+            except Exception:
+                pass
+
+    def _record_failure(self, order: "_OrderContext", result: Dict[str, Any]) -> None:
+        last_error = result.get('error', 'unknown_error')
+        self.logger.warning(f"Executor returned failure: {last_error}", "EXECUTION")
+        if self._metrics_recorder:
+            try:
+                self._metrics_recorder.record_order(False, self._order_latency_ms(order) or 0.0)
+            except Exception:
+                pass
+        if self.slippage_tracker:
+            try:
+                self.slippage_tracker.persist_snapshot()
+            except Exception:
+                pass
+        if self._audit_logger:
+            try:
+                self._audit_logger.log_event(
+                    event_type="ORDER_FAIL",
+                    order_id=str(result.get('ticket','')), symbol=order.symbol, status="FAIL",
+                    latency_ms=self._order_latency_ms(order),
+                    extra={'error': last_error, 'action': order.action},
+                    trace=order.trace
+                )
+            except Exception:
+                pass
+
+    def _record_exception(self, order: "_OrderContext", attempt: int, error: str) -> None:
+        # Alert on execution exception that could trigger circuit breaker
+        if self.alert_dispatcher and AlertCategory and AlertSeverity:
+            try:
+                self.alert_dispatcher.dispatch_order_failure(order.symbol, f"execution_exception: {error}",
+                                                           {"attempt": attempt+1, "action": order.action})
+            except Exception:
+                pass
+        if self._metrics_recorder:
+            try:
+                self._metrics_recorder.record_order(False, 0.0)
+            except Exception:
+                pass
+        if self._audit_logger:
+            try:
+                self._audit_logger.log_event(
+                    event_type="ORDER_EXCEPTION",
+                    order_id=None, symbol=order.symbol, status="EXCEPTION",
+                    latency_ms=None, extra={'exc': error}, trace=order.trace
+                )
+            except Exception:
+                pass
+
+    def _record_final_failure(self, order: "_OrderContext") -> None:
+        symbol, action, volume, last_error = order.symbol, order.action, order.volume, order.last_error
+        # Alert on final failure
+        if last_error and self.alert_dispatcher and AlertCategory and AlertSeverity:
+            try:
+                self.alert_dispatcher.dispatch_order_failure(symbol, last_error, 
+                                                           {"retries": self.config.max_retries, 
+                                                            "action": action, "volume": volume})
+            except Exception:
+                pass
         self._metrics['orders_total'] += 1
         self._metrics['orders_failed'] += 1
+        self._record_trace(order)
         if self._metrics_recorder:
             try:
                 self._metrics_recorder.maybe_persist()
@@ -621,7 +882,8 @@ class ExecutionRouter:
             try:
                 self._audit_logger.log_event(
                     event_type="ORDER_FINAL_FAIL", order_id=None, symbol=symbol, status="FINAL_FAIL",
-                    latency_ms=None, extra={'last_error': last_error, 'action': action}
+                    latency_ms=None, extra={'last_error': last_error, 'action': action},
+                    trace=order.trace
                 )
             except Exception:
                 pass
@@ -633,11 +895,47 @@ class ExecutionRouter:
         now = time.time()
         if (now - self._metrics['last_log_ts']) > 30:
             self._emit_metrics(now)
-        return ExecutionResult(False, error=last_error or 'execution_failed', retries=self.config.max_retries)
+
+    def flush_side_effects(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que el SideEffectSink consuma los eventos pendientes."""
+        return self._sink.flush(timeout)
+
+    def get_signal_latency_report(self) -> Dict[str, Any]:
+        """Latencia señal→orden (ms): count, avg, p50, p90, p99, max."""
+        return self._signal_latency_hist.to_dict()
+
+    @staticmethod
+    def _stage_breakdown() -> Dict[str, Any]:
+        """Desglose por etapa de las trazas de órdenes (ms desde la etapa previa)."""
+        if get_trace_recorder is None:
+            return {}
+        try:
+            return get_trace_recorder().stage_breakdown()
+        except Exception:
+            return {}
+
+    def shutdown_async(self, wait: bool = True) -> None:
+        """
+        Detiene scheduler de reintentos, pool de envío y sink de efectos.
+
+        wait=True ejecuta ya los reintentos pendientes (sin más reintentos
+        después); wait=False los resuelve como fallo final. En ambos casos
+        todos los Futures quedan resueltos y submit_order() posteriores se
+        rechazan con 'router_shutdown'.
+        """
+        with self._async_lock:
+            self._async_closed = True
+        self._retry_scheduler.stop(run_pending=wait)
+        with self._async_lock:
+            pool, self._submit_pool = self._submit_pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+        if wait:
+            self._sink.flush(timeout=10)
+        self._sink.stop()
 
     def _emit_metrics(self, now: float) -> None:
-        lat_list = self._metrics.get('latency_samples', [])
-        lat_avg = sum(lat_list)/len(lat_list) if lat_list else 0.0
+        lat_avg = self._latency_hist.mean
         self.logger.info(
             f"METRICS total={self._metrics['orders_total']} ok={self._metrics['orders_ok']} fail={self._metrics['orders_failed']} avg_latency_ms={lat_avg:.1f}",
             "EXECUTION"
@@ -703,40 +1001,26 @@ class ExecutionRouter:
         # last_update puede ser str|None, no forzar tipo
         self._cumulative['sessions'] = int(self._cumulative.get('sessions', 0)) + 1
 
+    def _latency_percentiles(self) -> Dict[str, float]:
+        pct = self._latency_hist.percentiles((0.50, 0.75, 0.90, 0.95, 0.99))
+        pct['max'] = float(self._latency_hist.max) if self._latency_hist.count else 0.0
+        return pct
+
     def _persist_live(self, avg_latency: float):
         lf = self._live_file()
         if not lf:
             return
-        # calcular percentiles si hay suficientes muestras
-        lat_list = list(self._metrics.get('latency_samples', []))
-        lat_list_sorted = sorted(lat_list)
-        def _pct(p: float) -> float:
-            if not lat_list_sorted:
-                return 0.0
-            k = (len(lat_list_sorted)-1) * p
-            f = int(k)
-            c = min(f+1, len(lat_list_sorted)-1)
-            if f == c:
-                return float(lat_list_sorted[f])
-            d0 = lat_list_sorted[f] * (c - k)
-            d1 = lat_list_sorted[c] * (k - f)
-            return float(d0 + d1)
-
-        percentiles = {
-            'p50': _pct(0.50),
-            'p75': _pct(0.75),
-            'p90': _pct(0.90),
-            'p95': _pct(0.95),
-            'p99': _pct(0.99)
-        }
+        percentiles = self._latency_percentiles()
         data = {
             'timestamp': datetime.now(timezone.utc).isoformat(),
             'orders_total': self._metrics['orders_total'],
             'orders_ok': self._metrics['orders_ok'],
             'orders_failed': self._metrics['orders_failed'],
             'avg_latency_ms': avg_latency,
-            'latency_samples_count': len(lat_list),
+            'latency_samples_count': self._latency_hist.count,
             'latency_percentiles': percentiles,
+            'signal_to_order_ms': self._signal_latency_hist.to_dict(),
+            'order_stage_latency_ms': self._stage_breakdown(),
             'blocked_reasons': self._metrics.get('blocked_reasons', {})
         }
         if self.slippage_tracker:
@@ -768,27 +1052,8 @@ class ExecutionRouter:
         sf = self._summary_file()
         if not sf:
             return
-        lat_list = self._metrics.get('latency_samples', [])
-        avg_latency = sum(lat_list)/len(lat_list) if lat_list else 0.0
-        lat_list_sorted = sorted(lat_list)
-        def _pct(p: float) -> float:
-            if not lat_list_sorted:
-                return 0.0
-            k = (len(lat_list_sorted)-1) * p
-            f = int(k)
-            c = min(f+1, len(lat_list_sorted)-1)
-            if f == c:
-                return float(lat_list_sorted[f])
-            d0 = lat_list_sorted[f] * (c - k)
-            d1 = lat_list_sorted[c] * (k - f)
-            return float(d0 + d1)
-        latency_percentiles = {
-            'p50': _pct(0.50),
-            'p75': _pct(0.75),
-            'p90': _pct(0.90),
-            'p95': _pct(0.95),
-            'p99': _pct(0.99)
-        }
+        avg_latency = self._latency_hist.mean
+        latency_percentiles = self._latency_percentiles()
         summary = {
             'generated': datetime.now(timezone.utc).isoformat(),
             'orders_total': self._metrics['orders_total'],
@@ -796,6 +1061,7 @@ class ExecutionRouter:
             'orders_failed': self._metrics['orders_failed'],
             'latency_avg_ms': avg_latency,
             'latency_percentiles': latency_percentiles,
+            'signal_to_order_ms': self._signal_latency_hist.to_dict(),
             'history': self._metrics['history'][-50:],  # recorte
             'blocked_reasons': self._metrics.get('blocked_reasons', {})
         }
@@ -811,6 +1077,8 @@ class ExecutionRouter:
             pass
 
     def persist_on_shutdown(self):
+        # efectos secundarios pendientes (modo asíncrono) antes de sumar
+        self._sink.flush(timeout=10)
         # combinar en cumulativo
         path = self._cumulative_file()
         if not path:
@@ -29,6 +29,11 @@ except Exception:
     mt5_initialize = None  # type: ignore
     _MT5_AVAILABLE = False
 
+try:
+    from monitoring.order_tracing import mark_stage
+except Exception:
+    mark_stage = None  # type: ignore
+
 try:
     from protocols.logging_central_protocols import create_safe_logger  # type: ignore
 except ImportError:  # fallback
@@ -101,7 +106,10 @@ class MT5BrokerExecutor:
             return {'success': False, 'error': 'invalid_action'}
 
         if self.simulated or not self.connected:
-            return self._simulate_order(symbol, action, volume, price, sl, tp)
+            result = self._simulate_order(symbol, action, volume, price, sl, tp)
+            if mark_stage:
+                mark_stage('broker_simulated')
+            return result
 
         # Ruta real (placeholder simplificado)
         try:
@@ -129,7 +137,11 @@ class MT5BrokerExecutor:
                 'magic': self.config.magic_number,
                 'comment': 'ICT-EXEC'
             }
+            if mark_stage:
+                mark_stage('mt5_request_ready')
             result = mt5.order_send(request)  # type: ignore
+            if mark_stage:
+                mark_stage('mt5_order_send')
             if result is None:
                 return {'success': False, 'error': 'order_send_none'}
             if result.retcode != mt5.TRADE_RETCODE_DONE:  # type: ignore
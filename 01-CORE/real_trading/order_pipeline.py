@@ -0,0 +1,159 @@
+"""Order Pipeline helpers
+=======================
+
+Piezas de soporte para el modo asíncrono de ExecutionRouter:
+
+- RetryScheduler: un único hilo con heap de vencimientos; los reintentos se
+  programan en lugar de dormir el hilo que envía órdenes. Al detenerlo cada
+  entrada pendiente se ejecuta o se cancela (on_cancel), nunca se pierde.
+- SideEffectSink: cola FIFO + hilo de fondo para efectos secundarios
+  (auditoría, métricas, persistencia, exposición). Un solo consumidor
+  preserva el orden de los eventos de cada orden.
+"""
+from __future__ import annotations
+from typing import Any, Callable, List, Optional, Tuple
+import heapq
+import itertools
+import queue
+import threading
+import time
+
+
+class RetryScheduler:
+    """Ejecuta callbacks tras un retardo sin bloquear al llamante."""
+
+    def __init__(self, name: str = "OrderRetryScheduler") -> None:
+        self._name = name
+        self._heap: List[Tuple[float, int, Callable[[], Any], Optional[Callable[[], Any]]]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    @property
+    def stopped(self) -> bool:
+        return self._stopped
+
+    def schedule(self, delay_seconds: float, callback: Callable[[], Any],
+                 on_cancel: Optional[Callable[[], Any]] = None) -> None:
+        """
+        Programa callback tras delay_seconds.
+
+        on_cancel se invoca en su lugar si el scheduler se detiene sin
+        ejecutar los pendientes. Lanza RuntimeError si ya está detenido.
+        """
+        due = time.monotonic() + max(0.0, delay_seconds)
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError("RetryScheduler detenido")
+            heapq.heappush(self._heap, (due, next(self._seq), callback, on_cancel))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._heap)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    wait = self._heap[0][0] - time.monotonic()
+                    if wait <= 0:
+                        break
+                    self._cond.wait(wait)
+                if self._stopped:
+                    return
+                callback = heapq.heappop(self._heap)[2]
+            self._invoke(callback)
+
+    @staticmethod
+    def _invoke(callback: Optional[Callable[[], Any]]) -> None:
+        if callback is None:
+            return
+        try:
+            callback()
+        except Exception:
+            pass
+
+    def stop(self, run_pending: bool = False) -> None:
+        """
+        Detiene el scheduler. Los pendientes se ejecutan ya (run_pending) o se
+        cancelan llamando a su on_cancel; schedule() posterior lanza RuntimeError.
+        """
+        with self._cond:
+            self._stopped = True
+            pending = sorted(self._heap, key=lambda entry: entry[:2])
+            self._heap.clear()
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        for _, _, callback, on_cancel in pending:
+            self._invoke(callback if run_pending else on_cancel)
+
+
+class SideEffectSink:
+    """Cola de efectos secundarios consumida por un hilo de fondo."""
+
+    def __init__(self, name: str = "OrderSideEffects", logger: Any = None) -> None:
+        self._name = name
+        self._logger = logger
+        self._queue: "queue.Queue[Optional[Tuple[Callable[..., Any], tuple]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.processed = 0
+        self.errors = 0
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                    self._thread.start()
+        self._queue.put((fn, args))
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                fn, args = item
+                try:
+                    fn(*args)
+                    self.processed += 1
+                except Exception as e:
+                    self.errors += 1
+                    if self._logger:
+                        try:
+                            self._logger.warning(f"Side effect error: {e}", "EXECUTION")
+                        except Exception:
+                            pass
+            finally:
+                self._queue.task_done()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que se consuma lo encolado hasta ahora."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put((done.set, ()))
+        return done.wait(timeout)
+
+    def backlog(self) -> int:
+        return self._queue.qsize()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+
+__all__ = ["RetryScheduler", "SideEffectSink"]
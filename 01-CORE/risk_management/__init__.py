@@ -10,12 +10,14 @@ Componentes:
 - ICTRiskConfig: Configuración específica ICT
 - RiskAlert: Sistema de alertas de riesgo
 - RiskMetrics: Métricas de riesgo
+- RollingCorrelationEngine: Correlaciones rolling incrementales multi-símbolo
 
 Autor: ICT Engine v6.0 Enterprise Team
 Fecha: 14 Agosto 2025
 """
 
 from .risk_manager import RiskManager, ICTRiskConfig, RiskAlert, RiskMetrics
+from .correlation_engine import RollingCorrelationEngine
 
 # Nuevo módulo de cálculo de posiciones
 try:
@@ -49,6 +51,7 @@ __all__ = [
     'ICTRiskConfig', 
     'RiskAlert',
     'RiskMetrics',
+    'RollingCorrelationEngine',
     
     # Nuevo módulo PositionSizing
     'PositionSizingCalculator',
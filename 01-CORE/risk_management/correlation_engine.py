@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+📈 ROLLING CORRELATION ENGINE - ICT Engine v6.0 Enterprise
+==========================================================
+
+Matriz de correlación multi-símbolo sobre log-returns alineados por vela,
+actualizada de forma incremental al cierre de cada barra.
+
+- Ventana acotada (ring buffer window × símbolos) de returns alineados por
+  timestamp; una fila se confirma cuando todos los símbolos activos han
+  cerrado esa vela (o tras max_pending filas abiertas: símbolo sin feed).
+  Los símbolos sin vela en una fila quedan marcados como ausentes.
+- Estadísticos por par: sumas, cuadrados, productos cruzados y conteos se
+  acumulan solo sobre filas donde ambos símbolos están presentes, de modo
+  que un símbolo incorporado tarde o con huecos no diluye la correlación;
+  min_periods se aplica al solapamiento del par.
+- Modo 'window': cada fila nueva suma sus outer products y la expulsada los
+  resta (O(N²) por barra, resync exacto cada `window` filas para acotar el
+  drift numérico).
+- Modo 'ewma' (ewma_halflife): los mismos acumuladores por par con
+  decaimiento exponencial.
+- matrix() calcula la correlación completa en una sola operación vectorizada
+  y la cachea hasta la siguiente fila; correlation(a, b) es O(1).
+- load_history() precarga desde el CandleStore/downloader (arrays de
+  timestamps + cierres) reconstruyendo la ventana alineada.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import pandas as pd
+except ImportError:  # pragma: no cover
+    pd = None  # type: ignore
+
+
+def _to_epoch(value: Any) -> float:
+    """Timestamp de vela → segundos epoch (naive se asume UTC)."""
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    if isinstance(value, np.datetime64):
+        return float(value.astype('datetime64[s]').astype(np.int64))
+    if pd is not None and isinstance(value, pd.Timestamp):
+        value = value.to_pydatetime()
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    raise TypeError(f"Unsupported bar time: {value!r}")
+
+
+class RollingCorrelationEngine:
+    """Correlaciones rolling de log-returns con actualización incremental."""
+
+    def __init__(self, window: int = 100, min_periods: int = 20,
+                 ewma_halflife: Optional[float] = None, max_pending: int = 3):
+        self.window = max(2, int(window))
+        self.min_periods = max(2, int(min_periods))
+        self.ewma_alpha = (1.0 - 0.5 ** (1.0 / ewma_halflife)) if ewma_halflife else None
+        self.max_pending = max(1, int(max_pending))
+
+        self._lock = threading.RLock()
+        self._index: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._capacity = 0
+        # Ring de filas confirmadas
+        self._returns = np.zeros((self.window, 0))
+        self._present = np.zeros((self.window, 0), dtype=bool)
+        self._row_ts = np.zeros(self.window)
+        self._head = 0
+        self._rows = 0
+        self._since_resync = 0
+        # Estadísticos incrementales por par (fila i: símbolo, columna j: pareja)
+        #   _pair_n[i, j]   filas con ambos presentes
+        #   _pair_sum[i, j] Σ r_i sobre esas filas; _pair_sq[i, j] Σ r_i²
+        #   _cross[i, j]    Σ r_i·r_j (los ausentes valen 0 en el ring)
+        self._pair_n = np.zeros((0, 0), dtype=np.int64)
+        self._pair_sum = np.zeros((0, 0))
+        self._pair_sq = np.zeros((0, 0))
+        self._cross = np.zeros((0, 0))
+        # Equivalentes exponenciales (modo ewma): pesos, sumas, cuadrados, cruces
+        self._ew_w = np.zeros((0, 0))
+        self._ew_sum = np.zeros((0, 0))
+        self._ew_sq = np.zeros((0, 0))
+        self._ew_cross = np.zeros((0, 0))
+        # Estado por símbolo y filas abiertas {ts: {col: ret}}
+        self._last_close: Dict[str, float] = {}
+        self._last_ts: Dict[str, float] = {}
+        self._pending: Dict[float, Dict[int, float]] = {}
+        self._last_committed_ts = -math.inf
+        # Caché de la matriz
+        self._version = 0
+        self._cached_version = -1
+        self._cached_corr = np.zeros((0, 0))
+
+    # ------------------------------------------------------------------
+    # Símbolos
+    # ------------------------------------------------------------------
+    @property
+    def symbols(self) -> List[str]:
+        with self._lock:
+            return list(self._symbols)
+
+    def track(self, symbols: Iterable[str]) -> None:
+        with self._lock:
+            for symbol in symbols:
+                self._column(symbol)
+
+    def _column(self, symbol: str) -> int:
+        col = self._index.get(symbol)
+        if col is not None:
+            return col
+        col = len(self._symbols)
+        if col >= self._capacity:
+            self._grow(max(4, self._capacity * 2))
+        self._symbols.append(symbol)
+        self._index[symbol] = col
+        return col
+
+    def _grow(self, capacity: int) -> None:
+        n = self._capacity
+
+        def widen(arr: np.ndarray, square: bool = False) -> np.ndarray:
+            if square:
+                out = np.zeros((capacity, capacity), dtype=arr.dtype)
+                out[:n, :n] = arr
+            elif arr.ndim == 2:
+                out = np.zeros((arr.shape[0], capacity), dtype=arr.dtype)
+                out[:, :n] = arr
+            else:
+                out = np.zeros(capacity, dtype=arr.dtype)
+                out[:n] = arr
+            return out
+
+        self._returns = widen(self._returns)
+        self._present = widen(self._present)
+        self._pair_n = widen(self._pair_n, square=True)
+        self._pair_sum = widen(self._pair_sum, square=True)
+        self._pair_sq = widen(self._pair_sq, square=True)
+        self._cross = widen(self._cross, square=True)
+        self._ew_w = widen(self._ew_w, square=True)
+        self._ew_sum = widen(self._ew_sum, square=True)
+        self._ew_sq = widen(self._ew_sq, square=True)
+        self._ew_cross = widen(self._ew_cross, square=True)
+        self._capacity = capacity
+
+    # ------------------------------------------------------------------
+    # Actualización por cierre de vela
+    # ------------------------------------------------------------------
+    def update(self, symbol: str, timestamp: Any, close: float) -> int:
+        """
+        Registra el cierre de una vela.
+
+        Returns:
+            Número de filas confirmadas en la ventana tras esta actualización
+        """
+        close = float(close)
+        if not close > 0:
+            return 0
+        ts = _to_epoch(timestamp)
+        with self._lock:
+            col = self._column(symbol)
+            last_ts = self._last_ts.get(symbol)
+            if last_ts is not None and ts <= last_ts:
+                return 0  # duplicada o fuera de orden
+            prev = self._last_close.get(symbol)
+            self._last_close[symbol] = close
+            self._last_ts[symbol] = ts
+            if prev is not None and ts > self._last_committed_ts:
+                self._pending.setdefault(ts, {})[col] = math.log(close / prev)
+            return self._commit_ready()
+
+    def _commit_ready(self) -> int:
+        if not self._pending:
+            return 0
+        # Una fila está completa cuando todos los símbolos activos la superaron
+        horizon = min(self._last_ts.values()) if self._last_ts else -math.inf
+        committed = 0
+        for ts in sorted(self._pending):
+            if ts > horizon and len(self._pending) <= self.max_pending:
+                break
+            self._commit_row(ts, self._pending.pop(ts))
+            committed += 1
+        return committed
+
+    def _commit_row(self, ts: float, values: Mapping[int, float]) -> None:
+        row = np.zeros(self._capacity)
+        mask = np.zeros(self._capacity, dtype=bool)
+        for col, ret in values.items():
+            row[col] = ret
+            mask[col] = True
+        pos = self._head
+        if self._rows == self.window:
+            self._accumulate(self._returns[pos], self._present[pos], -1)
+        else:
+            self._rows += 1
+        self._returns[pos] = row
+        self._present[pos] = mask
+        self._row_ts[pos] = ts
+        self._head = (pos + 1) % self.window
+        self._accumulate(row, mask, 1)
+        if self.ewma_alpha is not None:
+            self._ewma_step(row, mask)
+        self._last_committed_ts = ts
+        self._since_resync += 1
+        if self._since_resync >= self.window:
+            self._resync()
+        self._version += 1
+
+    def _accumulate(self, row: np.ndarray, mask: np.ndarray, sign: int) -> None:
+        """Suma (sign=1) o resta (sign=-1) una fila de los acumuladores por par."""
+        m = mask.astype(float)
+        self._pair_n += sign * np.outer(mask, mask).astype(np.int64)
+        self._pair_sum += sign * np.outer(row, m)
+        self._pair_sq += sign * np.outer(row * row, m)
+        self._cross += sign * np.outer(row, row)
+
+    def _ewma_step(self, row: np.ndarray, mask: np.ndarray) -> None:
+        decay = 1.0 - (self.ewma_alpha or 0.0)
+        m = mask.astype(float)
+        self._ew_w = decay * self._ew_w + np.outer(m, m)
+        self._ew_sum = decay * self._ew_sum + np.outer(row, m)
+        self._ew_sq = decay * self._ew_sq + np.outer(row * row, m)
+        self._ew_cross = decay * self._ew_cross + np.outer(row, row)
+
+    def _ordered_rows(self) -> np.ndarray:
+        """Índices del ring en orden cronológico."""
+        if self._rows < self.window:
+            return np.arange(self._rows)
+        return (np.arange(self.window) + self._head) % self.window
+
+    def _resync(self) -> None:
+        """Recalcula sumas exactas desde el ring (elimina drift acumulado)."""
+        order = self._ordered_rows()
+        rows = self._returns[order]
+        present = self._present[order]
+        m = present.astype(float)
+        self._pair_n = (present.T.astype(np.int64) @ present.astype(np.int64))
+        self._pair_sum = rows.T @ m
+        self._pair_sq = (rows * rows).T @ m
+        self._cross = rows.T @ rows
+        self._since_resync = 0
+
+    # ------------------------------------------------------------------
+    # Precarga histórica
+    # ------------------------------------------------------------------
+    def load_history(self, history: Mapping[str, Tuple[Sequence[Any], Sequence[float]]]) -> int:
+        """
+        Precarga cierres históricos {symbol: (timestamps, closes)} (orden
+        cronológico) y reconstruye la ventana alineada con las filas ya
+        existentes.
+
+        Returns:
+            Filas en la ventana tras la precarga
+        """
+        with self._lock:
+            per_symbol: Dict[int, Dict[float, float]] = {}
+            for symbol, (times, closes) in history.items():
+                ts = np.asarray([_to_epoch(t) for t in times], dtype=float)
+                px = np.asarray(closes, dtype=float)
+                keep = np.isfinite(px) & (px > 0)
+                ts, px = ts[keep], px[keep]
+                if px.shape[0] == 0:
+                    continue
+                col = self._column(symbol)
+                rets = np.log(px[1:] / px[:-1])
+                per_symbol[col] = dict(zip(ts[1:].tolist(), rets.tolist()))
+                if ts[-1] > self._last_ts.get(symbol, -math.inf):
+                    self._last_ts[symbol] = float(ts[-1])
+                    self._last_close[symbol] = float(px[-1])
+
+            # Filas: unión de timestamps existentes y nuevos (últimas `window`)
+            order = self._ordered_rows()
+            existing = {float(self._row_ts[i]): i for i in order}
+            stamps = set(existing)
+            for values in per_symbol.values():
+                stamps.update(values)
+            stamps_sorted = sorted(stamps)[-self.window:]
+
+            returns = np.zeros((self.window, self._capacity))
+            present = np.zeros((self.window, self._capacity), dtype=bool)
+            row_ts = np.zeros(self.window)
+            for pos, ts in enumerate(stamps_sorted):
+                src = existing.get(ts)
+                if src is not None:
+                    returns[pos] = self._returns[src]
+                    present[pos] = self._present[src]
+                for col, values in per_symbol.items():
+                    ret = values.get(ts)
+                    if ret is not None:
+                        returns[pos, col] = ret
+                        present[pos, col] = True
+                row_ts[pos] = ts
+            self._returns, self._present, self._row_ts = returns, present, row_ts
+            self._rows = len(stamps_sorted)
+            self._head = self._rows % self.window
+            if stamps_sorted:
+                self._last_committed_ts = max(self._last_committed_ts, stamps_sorted[-1])
+            self._pending = {ts: v for ts, v in self._pending.items() if ts > self._last_committed_ts}
+            self._resync()
+            if self.ewma_alpha is not None:
+                self._rebuild_ewma()
+            self._version += 1
+            return self._rows
+
+    def _rebuild_ewma(self) -> None:
+        shape = (self._capacity, self._capacity)
+        self._ew_w = np.zeros(shape)
+        self._ew_sum = np.zeros(shape)
+        self._ew_sq = np.zeros(shape)
+        self._ew_cross = np.zeros(shape)
+        for pos in self._ordered_rows():
+            self._ewma_step(self._returns[pos], self._present[pos])
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+    def _correlation_matrix(self) -> np.ndarray:
+        if self._cached_version == self._version:
+            return self._cached_corr
+        n = len(self._symbols)
+        if self._rows < 2 or n == 0:
+            corr = np.full((n, n), np.nan)
+        else:
+            if self.ewma_alpha is not None:
+                weight, sums = self._ew_w[:n, :n], self._ew_sum[:n, :n]
+                squares, cross = self._ew_sq[:n, :n], self._ew_cross[:n, :n]
+            else:
+                weight = self._pair_n[:n, :n].astype(float)
+                sums, squares, cross = self._pair_sum[:n, :n], self._pair_sq[:n, :n], self._cross[:n, :n]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                mean_i = sums / weight
+                mean_j = sums.T / weight
+                cov = cross / weight - mean_i * mean_j
+                var_i = np.clip(squares / weight - mean_i * mean_i, 0.0, None)
+                var_j = np.clip(squares.T / weight - mean_j * mean_j, 0.0, None)
+                corr = cov / np.sqrt(var_i * var_j)
+            corr = np.clip(corr, -1.0, 1.0)
+            # Sin varianza o sin solapamiento suficiente del par → desconocido
+            unknown = ((var_i <= 1e-30) | (var_j <= 1e-30)
+                       | (self._pair_n[:n, :n] < self.min_periods))
+            corr[unknown] = np.nan
+            np.fill_diagonal(corr, 1.0)
+        self._cached_corr = corr
+        self._cached_version = self._version
+        return corr
+
+    def matrix(self, symbols: Optional[Sequence[str]] = None) -> Tuple[List[str], np.ndarray]:
+        """(símbolos, matriz de correlación); NaN donde no hay datos suficientes."""
+        with self._lock:
+            corr = self._correlation_matrix()
+            if symbols is None:
+                return list(self._symbols), corr.copy()
+            out = np.full((len(symbols), len(symbols)), np.nan)
+            np.fill_diagonal(out, 1.0)
+            cols = [self._index.get(s) for s in symbols]
+            known = [i for i, c in enumerate(cols) if c is not None]
+            if known:
+                idx = np.asarray([cols[i] for i in known])
+                out[np.ix_(known, known)] = corr[np.ix_(idx, idx)]
+            return list(symbols), out
+
+    def correlation(self, symbol1: str, symbol2: str) -> Optional[float]:
+        """Correlación actual del par; None si no hay datos suficientes."""
+        if symbol1 == symbol2:
+            return 1.0
+        with self._lock:
+            i = self._index.get(symbol1)
+            j = self._index.get(symbol2)
+            if i is None or j is None:
+                return None
+            value = self._correlation_matrix()[i, j]
+        return None if np.isnan(value) else float(value)
+
+    def observations(self, symbol: str) -> int:
+        """Returns reales del símbolo dentro de la ventana."""
+        with self._lock:
+            col = self._index.get(symbol)
+            return int(self._pair_n[col, col]) if col is not None else 0
+
+    def is_ready(self, symbol: str) -> bool:
+        return self.observations(symbol) >= self.min_periods
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'symbols': len(self._symbols),
+                'rows': self._rows,
+                'window': self.window,
+                'pending_rows': len(self._pending),
+                'mode': 'ewma' if self.ewma_alpha is not None else 'window',
+                'last_bar_ts': None if self._last_committed_ts == -math.inf else self._last_committed_ts,
+            }
+
+
+__all__ = ['RollingCorrelationEngine']
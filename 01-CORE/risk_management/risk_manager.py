@@ -45,6 +45,8 @@ except ImportError:
     print("⚠️ Thread-safe pandas manager no disponible - usando fallback")
     _pandas_manager = None
 
+from .correlation_engine import RollingCorrelationEngine
+
 
 @dataclass
 class RiskMetrics:
@@ -66,6 +68,9 @@ class ICTRiskConfig:
     session_risk_multiplier: Optional[Dict[str, float]] = None  # Multiplicador por sesión
     news_impact_reduction: float = 0.5  # Reducción durante noticias
     correlation_threshold: float = 0.7  # Umbral de correlación
+    correlation_timeframe: str = 'H1'  # Timeframe del motor de correlaciones
+    correlation_window: int = 100  # Velas en la ventana rolling
+    correlation_min_periods: int = 20  # Returns mínimos para confiar en un par
     
     def __post_init__(self):
         if self.session_risk_multiplier is None:
@@ -139,6 +144,11 @@ class RiskManager:
         self.alerts: List[RiskAlert] = []
         self.alert_callbacks: List[Callable] = []
         
+        # Rolling correlations (un motor por timeframe, alimentado por cierre de vela)
+        self._correlation_engines: Dict[str, RollingCorrelationEngine] = {}
+        # Símbolos ya precargados por timeframe (la precarga se intenta una vez)
+        self._correlation_warmed: Dict[str, set] = {}
+        
         # Initialize MT5 availability check
         self.mt5_available = self._check_mt5_availability()
         
@@ -313,18 +323,115 @@ class RiskManager:
         if not positions:
             return 0.0
         
-        # Simplified correlation calculation
-        # In a real implementation, this would use historical correlation data
-        correlation_risk = 0.0
+        position_symbols = [position.get('symbol', '') for position in positions]
+        return self._correlation_risk_score(new_position_symbol, position_symbols, fallback_step=0.3)
+    
+    def _correlation_risk_score(self, symbol: str, position_symbols: List[str],
+                                fallback_step: float) -> float:
+        """
+        Score de correlación de `symbol` contra las posiciones abiertas.
         
-        for position in positions:
-            symbol = position.get('symbol', '')
-            
-            # Check for obvious correlations
-            if self._symbols_are_correlated(symbol, new_position_symbol):
-                correlation_risk += 0.3
+        Con correlaciones rolling disponibles: max |ρ| + 0.1 por cada posición
+        adicional por encima de correlation_threshold. Los pares sin historia
+        suficiente usan la heurística de divisas compartidas (fallback_step).
+        """
+        engine = self.get_correlation_engine()
+        self.warm_up_correlations([symbol] + [s for s in position_symbols if s])
+        threshold = self.ict_config.correlation_threshold
+        strongest = 0.0
+        correlated = 0
+        fallback_risk = 0.0
+        for position_symbol in position_symbols:
+            if not position_symbol:
+                continue
+            rho = engine.correlation(symbol, position_symbol)
+            if rho is None:
+                if self._symbols_are_correlated(symbol, position_symbol):
+                    fallback_risk += fallback_step
+                continue
+            strength = abs(rho)
+            strongest = max(strongest, strength)
+            if strength >= threshold:
+                correlated += 1
+        risk = strongest + 0.1 * max(0, correlated - 1) + fallback_risk
+        return min(1.0, risk)
+    
+    # ---------------- ROLLING CORRELATIONS ----------------
+    
+    def get_correlation_engine(self, timeframe: Optional[str] = None) -> RollingCorrelationEngine:
+        """Motor de correlaciones rolling del timeframe (por defecto el de ICTRiskConfig)"""
+        tf = (timeframe or self.ict_config.correlation_timeframe).upper()
+        engine = self._correlation_engines.get(tf)
+        if engine is None:
+            engine = self._correlation_engines.setdefault(tf, RollingCorrelationEngine(
+                window=self.ict_config.correlation_window,
+                min_periods=self.ict_config.correlation_min_periods,
+            ))
+        return engine
+    
+    def on_bar_close(self, symbol: str, timestamp: Any, close: float,
+                     timeframe: Optional[str] = None) -> None:
+        """Hook del feed de velas: actualiza las correlaciones al cierre de cada barra"""
+        try:
+            self.get_correlation_engine(timeframe).update(symbol, timestamp, close)
+        except Exception as e:
+            self.logger.debug(f"Correlation update skipped for {symbol}: {e}", "CORRELATION")
+    
+    def attach_bar_feed(self, data_processor: Any) -> bool:
+        """
+        Registra on_bar_close en el feed de velas (RealTimeDataProcessor.register_bar_callback).
         
-        return min(1.0, correlation_risk)
+        Returns:
+            bool: True si el callback quedó registrado
+        """
+        register = getattr(data_processor, 'register_bar_callback', None)
+        if register is None:
+            return False
+        register(self._on_processor_bar)
+        return True
+    
+    def _on_processor_bar(self, symbol: str, timeframe: str, candle: Any) -> None:
+        """Callback (symbol, timeframe, candle) del procesador: solo timeframes con motor"""
+        tf = (timeframe or '').upper()
+        if tf != self.ict_config.correlation_timeframe.upper() and tf not in self._correlation_engines:
+            return
+        self.on_bar_close(symbol, candle.timestamp, candle.close, tf)
+    
+    def warm_up_correlations(self, symbols: List[str], timeframe: Optional[str] = None,
+                             periods: Optional[int] = None) -> int:
+        """
+        Precarga el motor desde el CandleStore para los símbolos sin historia
+        suficiente; el resto sigue actualizándose vía on_bar_close. Cada
+        símbolo se precarga una sola vez por timeframe.
+        
+        Returns:
+            int: Símbolos precargados
+        """
+        tf = (timeframe or self.ict_config.correlation_timeframe).upper()
+        engine = self.get_correlation_engine(tf)
+        warmed = self._correlation_warmed.setdefault(tf, set())
+        missing = [s for s in dict.fromkeys(symbols) if s not in warmed and not engine.is_ready(s)]
+        if not missing:
+            return 0
+        warmed.update(missing)
+        try:
+            from data_management.candle_store import get_candle_store
+            store = get_candle_store()
+        except Exception as e:
+            self.logger.debug(f"Candle store not available for correlations: {e}", "CORRELATION")
+            return 0
+        count = (periods or engine.window) + 1
+        history = {}
+        for symbol in missing:
+            try:
+                records = store.read_arrays(symbol, tf, count=count)
+            except Exception:
+                continue
+            if records.shape[0] > 1:
+                history[symbol] = (records['time'], records['close'])
+        if history:
+            engine.load_history(history)
+        return len(history)
     
     def update_daily_pnl(self, daily_pnl: float) -> None:
         """
@@ -999,14 +1106,8 @@ class RiskManager:
             if not open_positions:
                 return 0.0  # Sin riesgo si no hay posiciones
             
-            correlation_risk = 0.0
-            
-            for position in open_positions:
-                position_symbol = position.get('symbol', '')
-                if self._symbols_are_correlated(symbol, position_symbol):
-                    correlation_risk += 0.2  # Incrementar riesgo por cada correlación
-            
-            return min(correlation_risk, 1.0)  # Máximo 1.0
+            position_symbols = [position.get('symbol', '') for position in open_positions]
+            return self._correlation_risk_score(symbol, position_symbols, fallback_step=0.2)
             
         except Exception as e:
             logging.error(f"Error checking correlation risk: {e}")
@@ -1073,79 +1174,28 @@ class RiskManager:
             Dict with correlation matrix between symbols
         """
         try:
-            correlations = {}
-            pd = self._get_pandas_manager()
-            
-            # Initialize correlation matrix
-            for symbol in symbols:
-                correlations[symbol] = {}
-                
             self.logger.info(f"Analyzing correlations for {len(symbols)} symbols over {periods} {timeframe} periods", "CORRELATION")
             
-            if self.mt5_available:
-                # Get price data for all symbols
-                price_data = {}
-                for symbol in symbols:
-                    try:
-                        # In real implementation, use MT5 to get OHLC data
-                        # For now, simulate correlation data
-                        
-                        # Generate realistic correlation patterns
-                        base_returns = np.random.normal(0, 0.01, periods)
-                        if 'EUR' in symbol and 'USD' in symbol:
-                            # EUR/USD related pairs tend to be correlated
-                            base_factor = 0.8
-                        elif 'JPY' in symbol:
-                            # JPY pairs often have different behavior
-                            base_factor = -0.3
-                        elif 'GBP' in symbol:
-                            # GBP pairs correlation with EUR
-                            base_factor = 0.6
-                        else:
-                            base_factor = np.random.uniform(-0.5, 0.5)
-                        
-                        price_data[symbol] = base_returns * base_factor + np.random.normal(0, 0.005, periods)
-                        
-                    except Exception as e:
-                        self.logger.warning(f"Could not get data for {symbol}: {e}", "CORRELATION")
-                        price_data[symbol] = np.random.normal(0, 0.01, periods)
-                
-                # Calculate correlations between all pairs
-                for i, symbol1 in enumerate(symbols):
-                    for j, symbol2 in enumerate(symbols):
-                        if i <= j:  # Only calculate upper triangle + diagonal
-                            if symbol1 == symbol2:
-                                correlation = 1.0
-                            else:
-                                try:
-                                    correlation = np.corrcoef(price_data[symbol1], price_data[symbol2])[0, 1]
-                                    if np.isnan(correlation):
-                                        correlation = 0.0
-                                except Exception:
-                                    correlation = 0.0
-                            
-                            correlations[symbol1][symbol2] = round(correlation, 4)
-                            correlations[symbol2][symbol1] = round(correlation, 4)
-                
-                self.logger.info(f"Correlation analysis completed successfully", "CORRELATION")
-                
+            # Rolling engine: precarga desde el CandleStore si falta historia
+            engine = self.get_correlation_engine(timeframe)
+            self.warm_up_correlations(symbols, timeframe, periods)
+            _, matrix = engine.matrix(symbols)
+            
+            correlations: Dict[str, Dict[str, float]] = {symbol: {} for symbol in symbols}
+            fallback_pairs = 0
+            for i, symbol1 in enumerate(symbols):
+                for j, symbol2 in enumerate(symbols):
+                    value = matrix[i, j]
+                    if np.isnan(value):
+                        # Sin historia suficiente: correlación típica del par
+                        value = self._get_typical_correlation(symbol1, symbol2)
+                        fallback_pairs += 1
+                    correlations[symbol1][symbol2] = round(float(value), 4)
+            
+            if fallback_pairs:
+                self.logger.info(f"Correlation analysis: {fallback_pairs} pairs without history use typical correlations", "CORRELATION")
             else:
-                # Simulation mode - generate realistic correlations
-                self.logger.info("Generating simulated correlations (MT5 not available)", "CORRELATION")
-                for i, symbol1 in enumerate(symbols):
-                    for j, symbol2 in enumerate(symbols):
-                        if symbol1 == symbol2:
-                            correlations[symbol1][symbol2] = 1.0
-                        else:
-                            # Generate realistic correlations based on currency pairs
-                            if symbol1 not in correlations or symbol2 not in correlations[symbol1]:
-                                base_correlation = self._get_typical_correlation(symbol1, symbol2)
-                                noise = np.random.uniform(-0.1, 0.1)
-                                correlation = np.clip(base_correlation + noise, -1.0, 1.0)
-                                
-                                correlations[symbol1][symbol2] = round(correlation, 4)
-                                correlations[symbol2][symbol1] = round(correlation, 4)
-            
+                self.logger.info(f"Correlation analysis completed successfully", "CORRELATION")
             return correlations
             
         except Exception as e:
@@ -82,6 +82,12 @@ else:
                     reasons: List[str] = []
                 return _Res()
 
+try:
+    from monitoring.order_tracing import current_trace, get_trace_recorder
+except Exception:  # pragma: no cover
+    current_trace = None  # type: ignore
+    get_trace_recorder = None  # type: ignore
+
 @runtime_checkable
 class AlertEmitter(Protocol):  # minimal subset
     def emit(self, **kwargs: Any) -> None: ...
@@ -98,6 +104,7 @@ class RiskPipelineDecision:
     ict_factors: Dict[str, Any] = field(default_factory=dict)
     sizing_metadata: Dict[str, Any] = field(default_factory=dict)
     timestamp: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    trace_id: Optional[str] = None
 
 class RiskPipeline:
     def __init__(self,
@@ -134,6 +141,29 @@ class RiskPipeline:
             pass
 
     def evaluate_and_size(self, signal_ctx: Dict[str, Any]) -> RiskPipelineDecision:
+        """Evalúa la señal; si trae traza (signal_ctx['trace'] o la del contexto
+        para el mismo símbolo) marca las etapas de riesgo y cierra la traza
+        cuando se rechaza."""
+        symbol = signal_ctx.get('symbol')
+        trace = signal_ctx.get('trace')
+        if trace is not None and not trace.matches(symbol):
+            trace = None  # traza de otra orden
+        if trace is None and current_trace is not None:
+            trace = current_trace(symbol)
+        if trace is None:
+            return self._evaluate_and_size(signal_ctx)
+        trace.mark('risk_start')
+        decision = self._evaluate_and_size(signal_ctx)
+        decision.trace_id = trace.trace_id
+        if decision.approved:
+            trace.mark('risk_approved')
+        else:
+            trace.mark(f"risk_rejected_{decision.stage}")
+            if get_trace_recorder is not None:
+                get_trace_recorder().record(trace, 'risk_rejected')
+        return decision
+
+    def _evaluate_and_size(self, signal_ctx: Dict[str, Any]) -> RiskPipelineDecision:
         self._metrics['decisions_total'] += 1
         decision = RiskPipelineDecision(approved=False)
 
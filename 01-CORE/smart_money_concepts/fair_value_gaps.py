@@ -30,6 +30,11 @@ from dataclasses import dataclass, field
 from enum import Enum
 import logging
 
+import numpy as np
+
+from utils.fvg_kernel import find_fair_value_gaps
+from utils.mitigation_tracker import ZoneMitigationTracker, candle_arrays, candle_time
+
 # Performance tracking
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -153,6 +158,9 @@ class FairValueGap:
     fill_percentage: float = 0.0
     mitigation_timestamp: Optional[datetime] = None
     mitigation_speed_ms: Optional[float] = None
+    touch_count: int = 0          # velas que alcanzaron el gap (high/low intrabar)
+    invalidated: bool = False     # cierre más allá del borde lejano
+    formed_at: Any = None         # tiempo de la tercera vela (gap completo)
     
     # Multi-timeframe confluence
     h4_confluence: bool = False
@@ -169,6 +177,11 @@ class FairValueGap:
     confluences: List[str] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+    @property
+    def midpoint(self) -> float:
+        """Consequent encroachment (50% del gap)"""
+        return (self.high_price + self.low_price) / 2.0
+
 
 class FairValueGapDetector:
     """
@@ -242,6 +255,9 @@ class FairValueGapDetector:
         
         # Enterprise tracking (global and per-symbol)
         self.detected_fvgs: Dict[str, List[FairValueGap]] = {}  # Per symbol
+        self.mitigation_tracker = ZoneMitigationTracker(
+            max_zones_per_symbol=self.config['max_historical_fvgs'] * 10
+        )
         self.session_stats = {
             'total_fvgs': 0,
             'bullish_fvgs': 0,
@@ -301,83 +317,53 @@ class FairValueGapDetector:
             bullish_count = 0
             bearish_count = 0
             
-            # Scan for FVGs using legacy algorithm
-            for i in range(1, len(candles) - 1):
-                prev_candle = candles.iloc[i-1]
-                current_candle = candles.iloc[i]
-                next_candle = candles.iloc[i+1]
+            # Scan for FVGs: vectorized three-candle kernel (one array pass),
+            # objects are only built for the gaps that pass the size filter
+            gaps = find_fair_value_gaps(
+                candles['high'].to_numpy(dtype=np.float64),
+                candles['low'].to_numpy(dtype=np.float64),
+                min_gap_pips=self.config['min_gap_size_pips']
+            )
+            
+            for k in range(len(gaps)):
+                is_bullish = bool(gaps.bullish[k])
+                gap_size = gaps.gap_sizes[k]
+                gap_pips = gaps.gap_pips[k]
                 
-                # === BULLISH FVG DETECTION (Legacy Migration) ===
-                # Condition: next_low > prev_high (gap exists)
-                if next_candle['low'] > prev_candle['high']:
-                    gap_size = next_candle['low'] - prev_candle['high']
-                    gap_pips = gap_size * 10000  # Convert to pips
-                    
-                    # Minimum gap validation (legacy)
-                    if gap_pips >= self.config['min_gap_size_pips']:
-                        # Legacy scoring migration
-                        score = self._calculate_fvg_score_legacy(prev_candle, current_candle, next_candle, "BULLISH")
-                        confidence = self._calculate_fvg_confidence_legacy(prev_candle, next_candle)
-                        
-                        # Create enterprise FVG
-                        fvg = self._create_fvg_enterprise(
-                            direction=FVGDirection.BULLISH,
-                            high_price=next_candle['low'],
-                            low_price=prev_candle['high'],
-                            gap_size=gap_size,
-                            gap_pips=gap_pips,
-                            score=score,
-                            confidence=confidence,
-                            symbol=symbol,
-                            timeframe=timeframe,
-                            candle_index=i,
-                            candles=candles
-                        )
-                        
-                        detected_fvgs.append(fvg)
-                        bullish_count += 1
-                        
-                        self.logger.info(
-                            f"📈 BULLISH FVG detected: {symbol} | "
-                            f"Gap: {gap_pips:.1f} pips | Score: {score} | "
-                            f"Confidence: {confidence:.2f}"
-                        )
+                # Legacy scoring migration
+                score = self._score_from_gap_pips(gap_pips)
+                confidence = self._confidence_from_gap_pips(gap_pips)
                 
-                # === BEARISH FVG DETECTION (Legacy Migration) ===
-                # Condition: next_high < prev_low (gap exists)
-                elif next_candle['high'] < prev_candle['low']:
-                    gap_size = prev_candle['low'] - next_candle['high']
-                    gap_pips = gap_size * 10000  # Convert to pips
-                    
-                    # Minimum gap validation (legacy)
-                    if gap_pips >= self.config['min_gap_size_pips']:
-                        # Legacy scoring migration
-                        score = self._calculate_fvg_score_legacy(prev_candle, current_candle, next_candle, "BEARISH")
-                        confidence = self._calculate_fvg_confidence_legacy(prev_candle, next_candle)
-                        
-                        # Create enterprise FVG
-                        fvg = self._create_fvg_enterprise(
-                            direction=FVGDirection.BEARISH,
-                            high_price=prev_candle['low'],
-                            low_price=next_candle['high'],
-                            gap_size=gap_size,
-                            gap_pips=gap_pips,
-                            score=score,
-                            confidence=confidence,
-                            symbol=symbol,
-                            timeframe=timeframe,
-                            candle_index=i,
-                            candles=candles
-                        )
-                        
-                        detected_fvgs.append(fvg)
-                        bearish_count += 1
-                        
-                        self.logger.info(
-                            f"📉 BEARISH FVG detected: {symbol} | "
-                            f"Gap: {gap_pips:.1f} pips | Score: {score} | "
-                            f"Confidence: {confidence:.2f}"
-                        )
+                # Create enterprise FVG
+                fvg = self._create_fvg_enterprise(
+                    direction=FVGDirection.BULLISH if is_bullish else FVGDirection.BEARISH,
+                    high_price=gaps.high_prices[k],
+                    low_price=gaps.low_prices[k],
+                    gap_size=gap_size,
+                    gap_pips=gap_pips,
+                    score=score,
+                    confidence=confidence,
+                    symbol=symbol,
+                    timeframe=timeframe,
+                    candle_index=int(gaps.indices[k]),
+                    candles=candles
+                )
+                
+                detected_fvgs.append(fvg)
+                if is_bullish:
+                    bullish_count += 1
+                    self.logger.info(
+                        f"📈 BULLISH FVG detected: {symbol} | "
+                        f"Gap: {gap_pips:.1f} pips | Score: {score} | "
+                        f"Confidence: {confidence:.2f}"
+                    )
+                else:
+                    bearish_count += 1
+                    self.logger.info(
+                        f"📉 BEARISH FVG detected: {symbol} | "
+                        f"Gap: {gap_pips:.1f} pips | Score: {score} | "
+                        f"Confidence: {confidence:.2f}"
+                    )
             
             # === ENTERPRISE ENHANCEMENTS ===
             # Apply enterprise features to detected FVGs
@@ -438,8 +424,6 @@ class FairValueGapDetector:
         🔄 MIGRATED: _calcular_score_fvg() from poi_detector_adapted.py
         Legacy scoring algorithm: base_score + gap_bonus
         """
-        base_score = self.config['base_score']  # 55
-        
         # Calculate gap size based on direction
         if direction == "BULLISH":
             gap_size = next_candle['low'] - prev_candle['high']
@@ -447,11 +431,12 @@ class FairValueGapDetector:
             gap_size = prev_candle['low'] - next_candle['high']
         
         # Convert to pips and calculate bonus
-        gap_pips = gap_size * 10000
+        return self._score_from_gap_pips(gap_size * 10000)
+    
+    def _score_from_gap_pips(self, gap_pips: float) -> int:
+        """Legacy score: base_score + min(gap_pips * 2, max_gap_bonus)"""
         gap_bonus = min(gap_pips * 2, self.config['max_gap_bonus'])  # Max 25 points
-        
-        final_score = int(base_score + gap_bonus)
-        return final_score
+        return int(self.config['base_score'] + gap_bonus)
     
     def _calculate_fvg_confidence_legacy(self, prev_candle, next_candle) -> float:
         """
@@ -464,9 +449,10 @@ class FairValueGapDetector:
         else:
             gap_size = prev_candle['low'] - next_candle['high']
         
-        gap_pips = gap_size * 10000
-        
-        # Legacy confidence formula
+        return self._confidence_from_gap_pips(gap_size * 10000)
+    
+    def _confidence_from_gap_pips(self, gap_pips: float) -> float:
+        """Legacy confidence: base + min(gap_pips * multiplier, 0.4), capped at max_confidence"""
         confidence = self.config['base_confidence'] + min(gap_pips * self.config['confidence_multiplier'], 0.4)
         
         # Cap at maximum confidence
@@ -503,6 +489,7 @@ class FairValueGapDetector:
             symbol=symbol,
             timeframe=timeframe,
             candle_index=candle_index,
+            formed_at=candle_time(candles, candle_index + 1),
             health_weighted_score=health_weighted_score,
             narrative=f"{direction.value} FVG: {gap_pips:.1f} pip gap with {confidence:.1%} confidence",
             confluences=["price_imbalance", "gap_fill_probability"]
@@ -979,43 +966,46 @@ class FairValueGapDetector:
     def update_fvg_mitigation(self, fvgs: List[FairValueGap], current_candles) -> List[FairValueGap]:
         """
         🔄 PHASE 4: Real-time FVG mitigation tracking
-        Update fill percentages and mitigation status
+        Update fill percentages and mitigation status from every candle since
+        the previous call (intrabar: a wick through the gap mitigates it; only
+        a close beyond the far edge invalidates it)
         """
-        updated_fvgs = []
+        try:
+            highs, lows, closes, bar_times = candle_arrays(current_candles)
+        except Exception as e:
+            self.logger.error(f"❌ Error updating FVG mitigation: {e}")
+            return list(fvgs)
         
+        # Registrar gaps abiertos y aplicar las velas por (símbolo, timeframe)
+        open_by_book: Dict[Tuple[str, str], List[FairValueGap]] = {}
         for fvg in fvgs:
-            if fvg.status == FVGStatus.FULLY_MITIGATED:
-                updated_fvgs.append(fvg)
+            if fvg.status in (FVGStatus.FULLY_MITIGATED, FVGStatus.EXPIRED):
+                self.mitigation_tracker.remove_zone(fvg.symbol, fvg.fvg_id, fvg.timeframe)
+                continue
+            open_by_book.setdefault((fvg.symbol, fvg.timeframe), []).append(fvg)
+        
+        states = {}
+        for (symbol, timeframe), book_fvgs in open_by_book.items():
+            zones = [
+                (f.fvg_id, f.low_price, f.high_price, f.direction == FVGDirection.BULLISH,
+                 f.fill_percentage, f.touch_count, f.formed_at)
+                for f in book_fvgs
+            ]
+            states.update(self.mitigation_tracker.apply_candles(
+                symbol, zones, highs, lows, closes, bar_times, timeframe
+            ))
+        
+        for fvg in fvgs:
+            state = states.get(fvg.fvg_id)
+            if state is None:
                 continue
-            
             try:
-                # Get current price
-                current_price = current_candles['close'].iloc[-1]
-                
-                # Calculate fill percentage
-                if fvg.direction == FVGDirection.BULLISH:
-                    # Bullish FVG fills from top to bottom
-                    if current_price <= fvg.low_price:
-                        fill_percentage = 100.0
-                    elif current_price >= fvg.high_price:
-                        fill_percentage = 0.0
-                    else:
-                        fill_percentage = ((fvg.high_price - current_price) / fvg.gap_size) * 100
-                else:  # BEARISH
-                    # Bearish FVG fills from bottom to top
-                    if current_price >= fvg.high_price:
-                        fill_percentage = 100.0
-                    elif current_price <= fvg.low_price:
-                        fill_percentage = 0.0
-                    else:
-                        fill_percentage = ((current_price - fvg.low_price) / fvg.gap_size) * 100
-                
-                # Update FVG status
-                previous_fill = fvg.fill_percentage
-                fvg.fill_percentage = max(0.0, min(100.0, fill_percentage))
+                fvg.fill_percentage = state.fill_percentage
+                fvg.touch_count = state.touch_count
+                fvg.invalidated = fvg.invalidated or state.invalidated
                 
                 # Status lifecycle management
-                if fvg.fill_percentage >= 100.0 and fvg.status != FVGStatus.FULLY_MITIGATED:
+                if state.mitigated and fvg.status != FVGStatus.FULLY_MITIGATED:
                     fvg.status = FVGStatus.FULLY_MITIGATED
                     fvg.mitigation_timestamp = datetime.now()
                     
@@ -1024,19 +1014,17 @@ class FairValueGapDetector:
                         time_diff = fvg.mitigation_timestamp - fvg.timestamp
                         fvg.mitigation_speed_ms = time_diff.total_seconds() * 1000
                     
-                    self.logger.info(f"✅ FVG fully mitigated: {fvg.fvg_id} in {fvg.mitigation_speed_ms:.0f}ms")
+                    kind = "invalidated" if state.invalidated else "wick mitigated"
+                    self.logger.info(f"✅ FVG fully mitigated ({kind}): {fvg.fvg_id} in {fvg.mitigation_speed_ms:.0f}ms")
                 
                 elif fvg.fill_percentage > 25.0 and fvg.status == FVGStatus.ACTIVE:
                     fvg.status = FVGStatus.PARTIAL_MITIGATION
                     self.logger.info(f"⚠️ FVG partial mitigation: {fvg.fvg_id} ({fvg.fill_percentage:.1f}%)")
                 
-                updated_fvgs.append(fvg)
-                
             except Exception as e:
                 self.logger.error(f"❌ Error updating FVG mitigation: {e}")
-                updated_fvgs.append(fvg)
         
-        return updated_fvgs
+        return list(fvgs)
     
     def analyze_fvg_orderblock_confluence(self, fvgs: List[FairValueGap], order_blocks: List[Any]) -> Dict[str, Any]:
         """
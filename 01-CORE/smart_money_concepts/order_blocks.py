@@ -32,6 +32,8 @@ import json
 import time
 from pathlib import Path
 
+from utils.mitigation_tracker import ZoneMitigationTracker, candle_arrays, candle_time
+
 # Importar el sistema de logging central con dynamic import
 BLACK_BOX_AVAILABLE = False
 try:
@@ -121,6 +123,13 @@ class EnhancedOrderBlock:
     timeframe_validation: Dict[str, bool] = field(default_factory=dict)
     mitigation_zones: List[Tuple[float, float]] = field(default_factory=list)
     
+    # Mitigación intrabar (ZoneMitigationTracker)
+    fill_percentage: float = 0.0
+    touch_count: int = 0
+    mitigated: bool = False    # zona recorrida por completo (mecha o cierre)
+    invalidated: bool = False  # cierre más allá de la zona
+    formed_at: Any = None      # tiempo de la vela que confirma el swing del bloque
+    
     # Metadatos
     symbol: str = "UNKNOWN"
     timeframe: str = "UNKNOWN"
@@ -129,6 +138,22 @@ class EnhancedOrderBlock:
     # Performance tracking
     detection_latency_ms: float = 0.0
     data_reliability: float = 1.0
+    
+    @property
+    def zone_bounds(self) -> Tuple[float, float]:
+        """(low, high) de la vela del order block"""
+        return (min(self.price, self.entry_price), max(self.price, self.entry_price))
+    
+    @property
+    def zone_id(self) -> str:
+        """Id estable: el mismo bloque re-detectado conserva su estado de mitigación"""
+        low, high = self.zone_bounds
+        return f"OB_{self.symbol}_{self.timeframe}_{self.type.value}_{low:.5f}_{high:.5f}"
+
+
+# Velas a cada lado que confirman el swing de un order block (lookback de _is_enhanced_swing_*)
+SWING_CONFIRMATION_BARS = 4
+
 
 class EnhancedOrderBlockDetector:
     """
@@ -187,6 +212,11 @@ class EnhancedOrderBlockDetector:
             'volume_profile_enhanced': 0
         }
         
+        # Mitigación intrabar de zonas abiertas (por símbolo)
+        self.mitigation_tracker = ZoneMitigationTracker(
+            max_zones_per_symbol=self.config.get('max_tracked_zones', 2000)
+        )
+        
         # Configurar rutas
         self.project_root = Path(__file__).parent.parent.parent
         self.logs_dir = self.project_root / "05-LOGS" / "enhanced_order_blocks"
@@ -262,6 +292,9 @@ class EnhancedOrderBlockDetector:
         # 🎯 MITIGATION ZONE ANALYSIS
         if self.mitigation_analysis:
             enhanced_blocks = self._analyze_mitigation_zones(enhanced_blocks, data)
+            # Mitigación intrabar: los bloques cerrados más allá de la zona ya no son válidos
+            enhanced_blocks = self.update_order_block_mitigation(enhanced_blocks, data)
+            enhanced_blocks = [b for b in enhanced_blocks if not b.invalidated]
         
         # 📊 QUALITY SCORING
         enhanced_blocks = self._assign_quality_scores(enhanced_blocks, health_score)
@@ -299,7 +332,7 @@ class EnhancedOrderBlockDetector:
             log_warning(f"Could not get health score: {e}")
             return 0.8  # Score conservador si hay error
     
-    def _is_enhanced_swing_low(self, data: Any, idx: int, lookback: int = 4) -> bool:
+    def _is_enhanced_swing_low(self, data: Any, idx: int, lookback: int = SWING_CONFIRMATION_BARS) -> bool:
         """Detectar swing low mejorado con validación adicional"""
         if idx < lookback or idx >= len(data) - lookback:
             return False
@@ -320,7 +353,7 @@ class EnhancedOrderBlockDetector:
         
         return True
     
-    def _is_enhanced_swing_high(self, data: Any, idx: int, lookback: int = 4) -> bool:
+    def _is_enhanced_swing_high(self, data: Any, idx: int, lookback: int = SWING_CONFIRMATION_BARS) -> bool:
         """Detectar swing high mejorado con validación adicional"""
         if idx < lookback or idx >= len(data) - lookback:
             return False
@@ -380,7 +413,8 @@ class EnhancedOrderBlockDetector:
                 timeframe=timeframe,
                 timestamp=datetime.now(),
                 detection_latency_ms=0.0,  # Se actualizará después
-                data_reliability=health_score
+                data_reliability=health_score,
+                formed_at=candle_time(data, min(idx + SWING_CONFIRMATION_BARS, len(data) - 1))
             )
             
         except Exception as e:
@@ -426,7 +460,8 @@ class EnhancedOrderBlockDetector:
                 timeframe=timeframe,
                 timestamp=datetime.now(),
                 detection_latency_ms=0.0,  # Se actualizará después
-                data_reliability=health_score
+                data_reliability=health_score,
+                formed_at=candle_time(data, min(idx + SWING_CONFIRMATION_BARS, len(data) - 1))
             )
             
         except Exception as e:
@@ -568,6 +603,49 @@ class EnhancedOrderBlockDetector:
         
         return blocks
     
+    def update_order_block_mitigation(self, blocks: List[EnhancedOrderBlock],
+                                      current_candles: Any) -> List[EnhancedOrderBlock]:
+        """
+        🔄 Mitigación intrabar de order blocks con las velas desde la llamada anterior
+        
+        Demand zones se mitigan con el low de la vela, supply zones con el high;
+        una mecha a través de la zona la mitiga y solo un cierre más allá la invalida.
+        """
+        try:
+            highs, lows, closes, bar_times = candle_arrays(current_candles)
+        except Exception as e:
+            log_warning(f"Error updating order block mitigation: {e}")
+            return blocks
+        
+        open_by_book: Dict[Tuple[str, str], List[EnhancedOrderBlock]] = {}
+        for block in blocks:
+            if block.mitigated or block.invalidated:
+                self.mitigation_tracker.remove_zone(block.symbol, block.zone_id, block.timeframe)
+                continue
+            open_by_book.setdefault((block.symbol, block.timeframe), []).append(block)
+        
+        states = {}
+        for (symbol, timeframe), book_blocks in open_by_book.items():
+            zones = [
+                (b.zone_id, *b.zone_bounds, b.type == OrderBlockType.DEMAND_ZONE,
+                 b.fill_percentage, b.touch_count, b.formed_at)
+                for b in book_blocks
+            ]
+            states.update(self.mitigation_tracker.apply_candles(
+                symbol, zones, highs, lows, closes, bar_times, timeframe
+            ))
+        
+        for block in blocks:
+            state = states.get(block.zone_id)
+            if state is None:
+                continue
+            block.fill_percentage = state.fill_percentage
+            block.touch_count = state.touch_count
+            block.mitigated = state.mitigated
+            block.invalidated = state.invalidated
+        
+        return blocks
+    
     def _assign_quality_scores(self, blocks: List[EnhancedOrderBlock], 
                              health_score: float) -> List[EnhancedOrderBlock]:
         """Asignar scores de calidad basados en health y otros factores"""
@@ -3047,50 +3047,24 @@ class SmartMoneyAnalyzer:
             return []
 
     def _find_swing_highs(self, data: 'DataFrameType', window: int = 5) -> List[Tuple[int, float]]:
-        """Encuentra swing highs en los datos"""
+        """Encuentra swing highs en los datos (kernel vectorizado compartido)"""
         try:
-            swing_highs = []
-            highs = data['high'].values
-            
-            for i in range(window, len(highs) - window):
-                is_swing_high = True
-                current_high = highs[i]
-                
-                # Verificar que sea mayor que las velas anteriores y posteriores
-                for j in range(i - window, i + window + 1):
-                    if j != i and highs[j] >= current_high:
-                        is_swing_high = False
-                        break
-                
-                if is_swing_high:
-                    swing_highs.append((i, current_high))
-            
-            return swing_highs
+            from utils.swing_kernel import find_swing_highs
+
+            indices, prices = find_swing_highs(data['high'].to_numpy(), window)
+            return list(zip(indices.tolist(), prices.tolist()))
             
         except Exception as e:
             self.logger.error(f"Error encontrando swing highs: {e}")
             return []
 
     def _find_swing_lows(self, data: 'DataFrameType', window: int = 5) -> List[Tuple[int, float]]:
-        """Encuentra swing lows en los datos"""
+        """Encuentra swing lows en los datos (kernel vectorizado compartido)"""
         try:
-            swing_lows = []
-            lows = data['low'].values
-            
-            for i in range(window, len(lows) - window):
-                is_swing_low = True
-                current_low = lows[i]
-                
-                # Verificar que sea menor que las velas anteriores y posteriores
-                for j in range(i - window, i + window + 1):
-                    if j != i and lows[j] <= current_low:
-                        is_swing_low = False
-                        break
-                
-                if is_swing_low:
-                    swing_lows.append((i, current_low))
-            
-            return swing_lows
+            from utils.swing_kernel import find_swing_lows
+
+            indices, prices = find_swing_lows(data['low'].to_numpy(), window)
+            return list(zip(indices.tolist(), prices.tolist()))
             
         except Exception as e:
             self.logger.error(f"Error encontrando swing lows: {e}")
@@ -91,6 +91,9 @@ def _register_handlers_with_global_queue(*handlers: Optional[logging.Handler]) -
         for h in handlers:
             if h is None:
                 continue
+            if not any(isinstance(f, _OnlySinkRecords) for f in h.filters):
+                # Los registros de sinks JSONL no deben llegar a handlers de texto
+                h.addFilter(_EXCLUDE_SINK_RECORDS)
             if any(h is eh for eh in new_handlers):
                 continue
             tgt = _handler_target_id(h)
@@ -144,6 +147,152 @@ class JSONLineFormatter(logging.Formatter):
                 ts, record.levelname, record.name, json.dumps(component) if component else 'null', clean_msg.replace('"','\\"')
             )
 
+# ================ STRUCTURED JSONL SINKS ======================
+_SINK_RECORD_ATTR = 'ict_jsonl_sink'
+
+
+class _ExcludeSinkRecords(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        return not hasattr(record, _SINK_RECORD_ATTR)
+
+
+class _OnlySinkRecords(logging.Filter):
+    def __init__(self, key: str):
+        super().__init__()
+        self.key = key
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return getattr(record, _SINK_RECORD_ATTR, None) == self.key
+
+
+_EXCLUDE_SINK_RECORDS = _ExcludeSinkRecords()
+
+
+class JSONLRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler con rotación adicional por tiempo.
+
+    Rota al superar maxBytes o al cruzar un límite de `rollover_seconds`
+    (alineado a UTC; 86400 = medianoche UTC). Backups: file.1, file.2, ...
+    """
+
+    def __init__(self, filename: Union[str, Path], max_bytes: int, backup_count: int,
+                 rollover_seconds: int = 86400):
+        super().__init__(str(filename), mode='a', maxBytes=max_bytes, backupCount=backup_count,
+                         encoding='utf-8', delay=True)
+        self.rollover_seconds = max(0, int(rollover_seconds))
+        try:
+            started = os.stat(self.baseFilename).st_mtime
+        except OSError:
+            started = time.time()
+        self.rollover_at = self._next_boundary(started)
+
+    def _next_boundary(self, ts: float) -> float:
+        if self.rollover_seconds <= 0:
+            return float('inf')
+        return (int(ts) // self.rollover_seconds + 1) * self.rollover_seconds
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if record.created >= self.rollover_at:
+            try:
+                has_data = os.path.getsize(self.baseFilename) > 0
+            except OSError:
+                has_data = False
+            if has_data:
+                return True
+            self.rollover_at = self._next_boundary(record.created)
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self) -> None:
+        super().doRollover()
+        self.rollover_at = self._next_boundary(time.time())
+
+
+class StructuredJSONLSink:
+    """
+    📝 Sink JSONL append-only para entradas estructuradas.
+
+    Cada write() serializa la entrada a una línea y la encola en el
+    QueueListener global: el hilo que llama no toca el disco. La vista
+    "últimas N entradas" se reconstruye con tail() leyendo desde el final.
+    """
+
+    _LOGGER_NAME = "ICT.StructuredSink"
+
+    def __init__(self, path: Union[str, Path], max_bytes: Optional[int] = None,
+                 backup_count: Optional[int] = None, rollover_seconds: Optional[int] = None,
+                 use_queue: Optional[bool] = None):
+        self.path = Path(path)
+        self.key = os.path.abspath(str(self.path))
+        self._index = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        handler = JSONLRotatingFileHandler(
+            self.path,
+            max_bytes=max_bytes if max_bytes is not None else _get_env_int('ICT_JSONL_MAX_BYTES', 10 * 1024 * 1024),
+            backup_count=backup_count if backup_count is not None else _get_env_int('ICT_JSONL_BACKUP_COUNT', 5),
+            rollover_seconds=rollover_seconds if rollover_seconds is not None else _get_env_int('ICT_JSONL_ROLLOVER_SECONDS', 86400),
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        handler.addFilter(_OnlySinkRecords(self.key))
+        handler.setLevel(logging.INFO)
+
+        self._logger = logging.getLogger(self._LOGGER_NAME)
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        if use_queue if use_queue is not None else _get_env_bool('ICT_LOG_USE_QUEUE', True):
+            qh = _register_handlers_with_global_queue(handler)
+            if not any(isinstance(h, QueueHandler) for h in self._logger.handlers):
+                self._logger.addHandler(qh)
+        else:
+            self._logger.addHandler(handler)
+
+    def write(self, entry: Dict[str, Any]) -> None:
+        line = json.dumps(entry, ensure_ascii=False, default=str)
+        self._logger.info(line, extra={_SINK_RECORD_ATTR: self.key})
+
+    def _offset_index(self):
+        """Índice lateral de offsets (ICT_JSONL_OFFSET_INDEX=1); None si está desactivado."""
+        if not _get_env_bool('ICT_JSONL_OFFSET_INDEX', False):
+            return None
+        if self._index is None:
+            from utils.jsonl_reader import JsonlOffsetIndex
+            self._index = JsonlOffsetIndex(self.path)
+        return self._index
+
+    def tail(self, n: int = 1000) -> List[Dict[str, Any]]:
+        """Últimas `n` entradas en orden cronológico (incluye backups rotados)."""
+        from utils.jsonl_reader import tail_jsonl
+        index = self._offset_index()
+        if index is not None:
+            entries = index.last(n)
+            if len(entries) >= n:
+                return entries
+        return tail_jsonl(self.path, n)
+
+    def since(self, since_epoch: float) -> List[Dict[str, Any]]:
+        """Entradas con timestamp >= `since_epoch`, en orden cronológico."""
+        from utils.jsonl_reader import records_since
+        index = self._offset_index()
+        if index is not None and index.covers(since_epoch):
+            return index.since(since_epoch)
+        return records_since(self.path, since_epoch)
+
+
+_JSONL_SINKS: Dict[str, StructuredJSONLSink] = {}
+_JSONL_SINKS_LOCK = threading.Lock()
+
+
+def get_jsonl_sink(path: Union[str, Path]) -> StructuredJSONLSink:
+    """Sink compartido por ruta (un único handler por archivo)."""
+    key = os.path.abspath(str(path))
+    with _JSONL_SINKS_LOCK:
+        sink = _JSONL_SINKS.get(key)
+        if sink is None:
+            sink = StructuredJSONLSink(path)
+            _JSONL_SINKS[key] = sink
+        return sink
+
+
 # Protocolo para configuración de logging mode
 @runtime_checkable
 class LoggingModeConfigProtocol(Protocol):
@@ -360,6 +509,13 @@ class SmartTradingLogger:
             self.log_dir = log_dir
             self.daily_log_file = daily_log_file
             self.component_name = component_name
+            # Sinks JSONL estructurados (patrones, order blocks, resúmenes): opt-in
+            self.log_categories = {}
+            if _get_env_bool('ICT_LOG_STRUCTURED_SINKS', False):
+                self.log_categories = {
+                    'ict': project_root / "05-LOGS" / "ict",
+                    'daily': project_root / "05-LOGS" / "daily",
+                }
 
             return file_handler
 
@@ -523,8 +679,8 @@ class SmartTradingLogger:
         """📊 Log específico para patrones ICT con archivo diario estructurado"""
         try:
             if hasattr(self, 'log_categories') and 'ict' in self.log_categories:
-                # Archivo JSON diario para patrones ICT
-                ict_file = self.log_categories['ict'] / f"patterns_{self.date_str}.json"
+                # Sink JSONL para patrones ICT (append encolado, rotación diaria)
+                ict_file = self.log_categories['ict'] / "patterns.jsonl"
                 
                 pattern_entry = {
                     'timestamp': datetime.now().isoformat(),
@@ -533,21 +689,7 @@ class SmartTradingLogger:
                     'data': pattern_data
                 }
                 
-                # Leer archivo existente o crear nuevo
-                patterns_data = []
-                if ict_file.exists():
-                    try:
-                        with open(ict_file, 'r', encoding='utf-8') as f:
-                            patterns_data = json.load(f)
-                    except:
-                        patterns_data = []
-                
-                # Agregar nuevo patrón
-                patterns_data.append(pattern_entry)
-                
-                # Guardar archivo actualizado
-                with open(ict_file, 'w', encoding='utf-8') as f:
-                    json.dump(patterns_data, f, indent=2, ensure_ascii=False)
+                self._append_to_json_file(ict_file, pattern_entry)
             
             # Log también en consola/archivo principal
             self.info(f"ICT Pattern Detected: {pattern_type} for {symbol}", "ICT_PATTERNS")
@@ -560,7 +702,7 @@ class SmartTradingLogger:
         try:
             if hasattr(self, 'log_categories') and 'ict' in self.log_categories:
                 # Archivo específico para Order Blocks
-                ob_file = self.log_categories['ict'] / f"order_blocks_{self.date_str}.json"
+                ob_file = self.log_categories['ict'] / "order_blocks.jsonl"
                 
                 ob_entry = {
                     'timestamp': datetime.now().isoformat(),
@@ -573,7 +715,6 @@ class SmartTradingLogger:
                     'confidence_score': blocks_data.get('confidence', 0.0)
                 }
                 
-                # Manejar archivo JSON acumulativo
                 self._append_to_json_file(ob_file, ob_entry)
             
             # Log resumen en consola
@@ -588,7 +729,7 @@ class SmartTradingLogger:
         try:
             if hasattr(self, 'log_categories') and 'daily' in self.log_categories:
                 # Archivo de resumen diario
-                summary_file = self.log_categories['daily'] / f"session_summary_{self.date_str}.json"
+                summary_file = self.log_categories['daily'] / "session_summary.jsonl"
                 
                 summary_entry = {
                     'session_timestamp': datetime.now().isoformat(),
@@ -610,33 +751,23 @@ class SmartTradingLogger:
             self.error(f"Error logging session summary: {str(e)}", "SESSION_LOGGER")
     
     def _append_to_json_file(self, file_path: Path, new_entry: Dict[str, Any]):
-        """🔧 Helper para agregar entradas a archivos JSON"""
+        """🔧 Helper para agregar una entrada a un sink JSONL (una línea, sin reescritura)"""
         try:
-            # Leer archivo existente
-            data = []
-            if file_path.exists():
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    if not isinstance(data, list):
-                        data = [data]
-                except:
-                    data = []
-            
-            # Agregar nueva entrada
-            data.append(new_entry)
-            
-            # Mantener solo últimas 1000 entradas para eficiencia
-            if len(data) > 1000:
-                data = data[-1000:]
-            
-            # Guardar archivo
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-                
+            get_jsonl_sink(file_path).write(new_entry)
         except Exception as e:
             self.error(f"Error appending to JSON file: {str(e)}", "JSON_HELPER")
 
+    def get_recent_entries(self, category: str, name: str, n: int = 1000) -> List[Dict[str, Any]]:
+        """📜 Últimas `n` entradas de un sink JSONL, p.ej. ('ict', 'patterns')"""
+        try:
+            base = getattr(self, 'log_categories', {}).get(category)
+            if base is None:
+                return []
+            from utils.jsonl_reader import tail_jsonl
+            return tail_jsonl(base / f"{name}.jsonl", n)
+        except Exception:
+            return []
+
     def get_optimization_stats(self) -> Dict[str, Any]:
         """📊 Obtener estadísticas de optimización de logging"""
         try:
@@ -770,22 +901,20 @@ def _count_patterns_in_files(log_categories: Dict[str, Path], date_str: str) ->
     total_patterns = 0
     
     try:
-        # Contar desde archivo de patrones ICT
+        from utils.jsonl_reader import records_since
+        # Solo se leen las entradas del día, desde el final de cada sink
+        day_start = datetime.strptime(date_str, '%Y-%m-%d').timestamp()
+        # Contar desde sink de patrones ICT
         if 'ict' in log_categories:
-            patterns_file = log_categories['ict'] / f"patterns_{date_str}.json"
-            if patterns_file.exists():
-                with open(patterns_file, 'r', encoding='utf-8') as f:
-                    patterns_data = json.load(f)
-                    total_patterns += len(patterns_data) if isinstance(patterns_data, list) else 1
+            for entry in records_since(log_categories['ict'] / "patterns.jsonl", day_start):
+                if str(entry.get('timestamp', '')).startswith(date_str):
+                    total_patterns += 1
         
-        # Contar desde archivo de Order Blocks
+        # Contar desde sink de Order Blocks
         if 'ict' in log_categories:
-            ob_file = log_categories['ict'] / f"order_blocks_{date_str}.json"
-            if ob_file.exists():
-                with open(ob_file, 'r', encoding='utf-8') as f:
-                    ob_data = json.load(f)
-                    if isinstance(ob_data, list):
-                        total_patterns += sum(entry.get('blocks_detected', 0) for entry in ob_data)
+            for entry in records_since(log_categories['ict'] / "order_blocks.jsonl", day_start):
+                if str(entry.get('timestamp', '')).startswith(date_str):
+                    total_patterns += entry.get('blocks_detected', 0)
     
     except Exception:
         pass
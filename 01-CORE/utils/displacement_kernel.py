@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+📐 DISPLACEMENT KERNEL - ICT ENGINE v6.0 ENTERPRISE
+====================================================
+Kernel vectorizado (NumPy) de ventanas deslizantes para Displacement.
+
+- Todas las ventanas de `window_size + 1` velas en una sola pasada
+  (sliding_window_view), sin slicing iloc por vela
+- Movimiento open→close y pips, momentum (velocity, volumen, consistencia)
+- Institutional signature (spike de volumen + vela grande o mecha significativa)
+- Flags de confluencia: volumen institucional, vela institucional, gaps
+- Medias/máximos de volumen ignoran NaN (semántica pandas)
+
+Usado por DisplacementDetectorEnterprise.detect_displacement.
+
+Autor: ICT Engine v6.0 Team
+"""
+
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+@dataclass(frozen=True)
+class DisplacementWindows:
+    """📍 Ventanas que superan pips mínimos y momentum; arrays alineados"""
+    end_indices: np.ndarray      # índice de la última vela de la ventana
+    start_prices: np.ndarray     # open de la primera vela
+    end_prices: np.ndarray       # close de la última vela
+    displacement_pips: np.ndarray
+    momentum_scores: np.ndarray
+    institutional: np.ndarray    # institutional signature
+    institutional_volume: np.ndarray
+    institutional_candle: np.ndarray
+    potential_gaps: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.end_indices.shape[0])
+
+
+def _as_float_array(values) -> np.ndarray:
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def _rolling_volume(volumes: np.ndarray, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Media y máximo por ventana ignorando NaN (NaN si la ventana no tiene datos)"""
+    windows = sliding_window_view(volumes, size)
+    missing = np.isnan(windows)
+    count = size - missing.sum(axis=1)
+    total = np.where(missing, 0.0, windows).sum(axis=1)
+    peak = np.where(missing, -np.inf, windows).max(axis=1)
+    empty = count == 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg = np.where(empty, np.nan, total / np.maximum(count, 1))
+    peak = np.where(empty, np.nan, peak)
+    return avg, peak
+
+
+def _rolling_any(flags: np.ndarray, size: int) -> np.ndarray:
+    return sliding_window_view(flags, size).any(axis=1)
+
+
+def scan_displacement_windows(opens, highs, lows, closes, volumes=None,
+                              window_size: int = 16, pip: float = 0.0001,
+                              min_pips: float = 50.0, momentum_threshold: float = 0.7,
+                              volume_threshold: float = 1.5,
+                              confluence_volumes=None) -> DisplacementWindows:
+    """
+    🔍 Evalúa todas las ventanas [i - window_size, i] con i ∈ [window_size, n - 2].
+
+    Args:
+        opens, highs, lows, closes: OHLC finitos (cualquier array-like)
+        volumes: volumen para momentum/signature (None → valores por defecto legacy)
+        window_size: velas previas a la vela final de cada ventana
+        pip: valor de un pip del símbolo
+        min_pips: displacement mínimo (inclusive)
+        momentum_threshold: momentum mínimo (inclusive)
+        volume_threshold: multiplicador de spike para la signature
+        confluence_volumes: volumen para el factor institutional_volume
+            (columna 'volume'); por defecto el mismo que `volumes`
+
+    Returns:
+        DisplacementWindows solo con las ventanas que pasan ambos filtros
+    """
+    open_ = _as_float_array(opens)
+    high = _as_float_array(highs)
+    low = _as_float_array(lows)
+    close = _as_float_array(closes)
+    n = close.shape[0]
+    size = window_size + 1
+    count = n - 1 - window_size
+    if window_size < 4 or count <= 0:
+        empty_f = np.empty(0, dtype=np.float64)
+        empty_b = np.empty(0, dtype=bool)
+        return DisplacementWindows(np.empty(0, dtype=np.int64), empty_f, empty_f, empty_f,
+                                   empty_f, empty_b, empty_b, empty_b, empty_b)
+
+    # Ventanas sobre [0, n - 1): la última vela nunca cierra una ventana
+    span = slice(0, n - 1)
+    start_prices = open_[:count]
+    end_prices = close[window_size:n - 1]
+    movement = end_prices - start_prices
+    displacement_pips = np.abs(movement) / max(pip, 1e-9)
+
+    # Momentum: velocity
+    close_windows = sliding_window_view(close[span], size)
+    diff_windows = sliding_window_view(np.diff(close[span]), window_size)
+    std = close_windows.std(axis=1, ddof=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        velocity = np.where(std > 0, np.abs(diff_windows.mean(axis=1)) / np.where(std > 0, std, 1.0), 0.0)
+
+    # Momentum: volumen
+    if volumes is not None:
+        vol_avg, vol_max = _rolling_volume(_as_float_array(volumes)[span], size)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            volume_score = np.where(vol_avg > 0, np.minimum(1.0, vol_max / np.where(vol_avg > 0, vol_avg, 1.0)), 0.5)
+            volume_spike = vol_max > vol_avg * volume_threshold
+    else:
+        volume_score = np.full(count, 0.5)
+        volume_spike = np.ones(count, dtype=bool)
+
+    # Momentum: consistencia direccional
+    bullish_window = end_prices > start_prices
+    up_moves = (diff_windows > 0).sum(axis=1)
+    down_moves = (diff_windows < 0).sum(axis=1)
+    consistency = np.where(bullish_window, up_moves, down_moves) / window_size
+
+    momentum = np.minimum(1.0, velocity * 0.4 + volume_score * 0.3 + consistency * 0.3)
+
+    keep = (displacement_pips >= min_pips) & (momentum >= momentum_threshold)
+    pos = np.flatnonzero(keep)
+
+    # Institutional signature: vela grande o mecha mayor que el cuerpo
+    bodies = np.abs(close[span] - open_[span])
+    body_windows = sliding_window_view(bodies, size)
+    large_candle = body_windows.max(axis=1) > body_windows.mean(axis=1) * 2.0
+    upper_wicks = high[span] - np.maximum(open_[span], close[span])
+    lower_wicks = np.minimum(open_[span], close[span]) - low[span]
+    significant_wicks = _rolling_any((upper_wicks > bodies) | (lower_wicks > bodies), size)
+    institutional = volume_spike & (large_candle | significant_wicks)
+
+    # Confluencia: volumen institucional (1.5x fijo, columna 'volume')
+    confluence_source = volumes if confluence_volumes is None else confluence_volumes
+    if confluence_source is not None:
+        conf_avg, conf_max = _rolling_volume(_as_float_array(confluence_source)[span], size)
+        institutional_volume = conf_max > conf_avg * 1.5
+    else:
+        institutional_volume = np.zeros(count, dtype=bool)
+
+    # Gaps potenciales: vela central (1..n-3) aislada por encima/debajo de sus vecinas;
+    # cada ventana evalúa sus centros internos (sin primera ni última vela)
+    center_low, center_high = low[1:n - 2], high[1:n - 2]
+    gap_flags = (
+        ((center_low > high[0:n - 3]) & (center_low > high[2:n - 1])) |
+        ((center_high < low[0:n - 3]) & (center_high < low[2:n - 1]))
+    )
+    potential_gaps = _rolling_any(gap_flags, window_size - 1)
+
+    return DisplacementWindows(
+        end_indices=(pos + window_size).astype(np.int64),
+        start_prices=start_prices[pos],
+        end_prices=end_prices[pos],
+        displacement_pips=displacement_pips[pos],
+        momentum_scores=momentum[pos],
+        institutional=institutional[pos],
+        institutional_volume=institutional_volume[pos],
+        institutional_candle=large_candle[pos],
+        potential_gaps=potential_gaps[pos],
+    )
+
+
+__all__ = ['DisplacementWindows', 'scan_displacement_windows']
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+📐 FVG KERNEL - ICT ENGINE v6.0 ENTERPRISE
+===========================================
+Kernel vectorizado (NumPy) de tres velas para Fair Value Gaps.
+
+- Alcista: low[i+1] > high[i-1]  → gap [high[i-1], low[i+1]]
+- Bajista: high[i+1] < low[i-1]  → gap [high[i+1], low[i-1]]
+  (solo si no hay condición alcista en la misma vela, como el elif legacy)
+- Tamaño, pips y punto medio de todos los gaps en una sola pasada
+- Filtro opcional de tamaño mínimo en pips
+
+Usado por FairValueGapDetector.detect_fair_value_gaps.
+
+Autor: ICT Engine v6.0 Team
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class FVGCandidates:
+    """📍 Gaps encontrados; arrays alineados y ordenados por vela central"""
+    indices: np.ndarray      # índice de la vela central (i)
+    bullish: np.ndarray      # True alcista / False bajista
+    high_prices: np.ndarray  # límite superior del gap
+    low_prices: np.ndarray   # límite inferior del gap
+    gap_sizes: np.ndarray
+    gap_pips: np.ndarray
+    midpoints: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.indices.shape[0])
+
+
+def find_fair_value_gaps(highs, lows, min_gap_pips: float = 0.0,
+                         pip_factor: float = 10000.0) -> FVGCandidates:
+    """
+    🔍 Detecta todos los FVG de tres velas.
+
+    Args:
+        highs, lows: series de precios (cualquier array-like)
+        min_gap_pips: tamaño mínimo del gap en pips (inclusive)
+        pip_factor: multiplicador precio → pips
+
+    Returns:
+        FVGCandidates con un gap como máximo por vela central
+    """
+    high = np.ascontiguousarray(highs, dtype=np.float64)
+    low = np.ascontiguousarray(lows, dtype=np.float64)
+    n = high.shape[0]
+    if n < 3:
+        empty = np.empty(0, dtype=np.float64)
+        return FVGCandidates(np.empty(0, dtype=np.int64), np.empty(0, dtype=bool),
+                             empty, empty, empty, empty, empty)
+
+    prev_high, prev_low = high[:-2], low[:-2]
+    next_high, next_low = high[2:], low[2:]
+
+    bull = next_low > prev_high
+    bear = (next_high < prev_low) & ~bull
+
+    top = np.where(bull, next_low, prev_low)
+    bottom = np.where(bull, prev_high, next_high)
+    gap_size = top - bottom
+    gap_pips = gap_size * pip_factor
+
+    keep = (bull | bear) & (gap_pips >= min_gap_pips)
+    pos = np.flatnonzero(keep)
+
+    return FVGCandidates(
+        indices=(pos + 1).astype(np.int64),
+        bullish=bull[pos],
+        high_prices=top[pos],
+        low_prices=bottom[pos],
+        gap_sizes=gap_size[pos],
+        gap_pips=gap_pips[pos],
+        midpoints=(top[pos] + bottom[pos]) / 2.0,
+    )
+
+
+__all__ = ['FVGCandidates', 'find_fair_value_gaps']
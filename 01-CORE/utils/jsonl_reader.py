@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+📜 JSONL READER - ICT ENGINE v6.0 ENTERPRISE
+=============================================
+Lectura eficiente de archivos JSONL append-only (sinks estructurados).
+
+- tail_jsonl(): últimas N entradas leyendo bloques desde el final del
+  archivo (coste proporcional a N, no al tamaño del archivo)
+- Recorre también los backups rotados (file.1, file.2, ...) si hacen
+  falta más entradas que las del archivo activo
+- Líneas corruptas/truncadas (p.ej. escritura interrumpida) se ignoran
+- records_since(): entradas con timestamp >= t, leyendo hacia atrás hasta
+  la primera más vieja (sinks append-only, orden temporal)
+- JsonlOffsetIndex: índice lateral (<archivo>.idx) con offset y epoch por
+  registro; "últimas N" en O(1) y "desde t" por bisección, actualizado de
+  forma incremental a medida que el archivo crece
+
+Autor: ICT Engine v6.0 Team
+"""
+
+import bisect
+import json
+import os
+import struct
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+_BLOCK_SIZE = 64 * 1024
+
+
+def rotated_files(path: Union[str, Path]) -> List[Path]:
+    """Archivo activo seguido de sus backups rotados, del más nuevo al más viejo."""
+    base = Path(path)
+    files = [base] if base.exists() else []
+    idx = 1
+    while True:
+        backup = base.with_name(f"{base.name}.{idx}")
+        if not backup.exists():
+            break
+        files.append(backup)
+        idx += 1
+    return files
+
+
+def iter_lines_reverse(path: Path) -> Iterator[bytes]:
+    """Líneas completas del archivo en orden inverso, leyendo por bloques."""
+    with open(path, 'rb') as fh:
+        fh.seek(0, os.SEEK_END)
+        pos = fh.tell()
+        remainder = b''
+        while pos > 0:
+            step = min(_BLOCK_SIZE, pos)
+            pos -= step
+            fh.seek(pos)
+            chunk = fh.read(step) + remainder
+            lines = chunk.split(b'\n')
+            remainder = lines[0]
+            for line in reversed(lines[1:]):
+                if line.strip():
+                    yield line
+        if remainder.strip():
+            yield remainder
+
+
+def tail_jsonl(path: Union[str, Path], n: int, include_rotated: bool = True) -> List[Dict[str, Any]]:
+    """
+    Reconstruye la vista "últimas N entradas" de un sink JSONL.
+
+    Returns:
+        Lista en orden cronológico (la más antigua primero)
+    """
+    if n <= 0:
+        return []
+    files = rotated_files(path) if include_rotated else [p for p in [Path(path)] if p.exists()]
+    out: List[Dict[str, Any]] = []
+    for file_path in files:
+        try:
+            for raw in iter_lines_reverse(file_path):
+                try:
+                    out.append(json.loads(raw))
+                except (ValueError, UnicodeDecodeError):
+                    continue
+                if len(out) >= n:
+                    out.reverse()
+                    return out
+        except OSError:
+            continue
+    out.reverse()
+    return out
+
+
+def read_last_json(path: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    """
+    Último documento JSON de un archivo que puede ser JSONL o JSON normal.
+
+    La última línea se intenta primero (JSONL o JSON en una sola línea); solo
+    si no parsea (JSON con indentación) se carga el archivo completo.
+    """
+    path = Path(path)
+    last = next(iter_lines_reverse(path), None)
+    if last is None:
+        return {}
+    try:
+        return json.loads(last)
+    except (ValueError, UnicodeDecodeError):
+        pass
+    try:
+        with open(path, 'r', encoding='utf-8') as fh:
+            return json.load(fh)
+    except ValueError:
+        for raw in iter_lines_reverse(path):
+            try:
+                return json.loads(raw)
+            except (ValueError, UnicodeDecodeError):
+                continue
+    return None
+
+
+def entry_epoch(value: Any) -> Optional[float]:
+    """Epoch (s) de un campo timestamp: número o ISO-8601 (naive = hora local)."""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+def records_since(path: Union[str, Path], since: float, ts_field: str = 'timestamp',
+                  include_rotated: bool = True) -> List[Dict[str, Any]]:
+    """
+    Entradas con `ts_field` >= `since` (epoch), en orden cronológico.
+
+    Lee desde el final y se detiene en la primera entrada más vieja, por lo que
+    el coste depende de cuántas entradas caen en el rango y no del tamaño total.
+    """
+    files = rotated_files(path) if include_rotated else [p for p in [Path(path)] if p.exists()]
+    out: List[Dict[str, Any]] = []
+    for file_path in files:
+        try:
+            for raw in iter_lines_reverse(file_path):
+                try:
+                    entry = json.loads(raw)
+                except (ValueError, UnicodeDecodeError):
+                    continue
+                ts = entry_epoch(entry.get(ts_field)) if isinstance(entry, dict) else None
+                if ts is not None and ts < since:
+                    out.reverse()
+                    return out
+                out.append(entry)
+        except OSError:
+            continue
+    out.reverse()
+    return out
+
+
+class JsonlOffsetIndex:
+    """
+    Índice lateral de offsets para un archivo JSONL append-only.
+
+    El archivo `<path>.idx` guarda una cabecera (inode, bytes indexados,
+    registros) y un par (offset, epoch) de 16 bytes por registro. refresh()
+    indexa solo lo añadido desde la última vez; si el archivo rotó o se
+    truncó (inode distinto o tamaño menor) el índice se reconstruye. Los
+    epochs se guardan como máximo acumulado para que la bisección sea válida
+    aunque haya entradas ligeramente desordenadas.
+    """
+
+    _MAGIC = b'ICTJIDX1'
+    _HEADER = struct.Struct('<8sQQQ')
+    _ENTRY = struct.Struct('<Qd')
+
+    def __init__(self, path: Union[str, Path], ts_field: str = 'timestamp',
+                 index_path: Optional[Union[str, Path]] = None):
+        self.path = Path(path)
+        self.index_path = Path(index_path) if index_path else self.path.with_name(self.path.name + '.idx')
+        self.ts_field = ts_field
+        self._lock = threading.Lock()
+        self._offsets: List[int] = []
+        self._epochs: List[float] = []
+        self._indexed_size = 0
+        self._inode = 0
+        self._loaded = False
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._offsets)
+
+    def _load(self) -> None:
+        self._loaded = True
+        try:
+            with open(self.index_path, 'rb') as fh:
+                header = fh.read(self._HEADER.size)
+                if len(header) < self._HEADER.size:
+                    return
+                magic, inode, indexed_size, count = self._HEADER.unpack(header)
+                if magic != self._MAGIC:
+                    return
+                body = fh.read(count * self._ENTRY.size)
+        except OSError:
+            return
+        count = len(body) // self._ENTRY.size
+        offsets: List[int] = []
+        epochs: List[float] = []
+        for off, ts in self._ENTRY.iter_unpack(body[:count * self._ENTRY.size]):
+            offsets.append(off)
+            epochs.append(ts)
+        self._offsets, self._epochs = offsets, epochs
+        self._inode, self._indexed_size = inode, indexed_size
+
+    def _reset(self) -> None:
+        self._offsets, self._epochs = [], []
+        self._indexed_size = 0
+
+    def _persist(self, start: int) -> None:
+        """Escribe entradas [start:] y después la cabecera (el índice nunca apunta a basura)."""
+        mode = 'r+b' if start and self.index_path.exists() else 'wb'
+        try:
+            with open(self.index_path, mode) as fh:
+                fh.seek(self._HEADER.size + start * self._ENTRY.size)
+                fh.write(b''.join(self._ENTRY.pack(o, t) for o, t in
+                                  zip(self._offsets[start:], self._epochs[start:])))
+                fh.truncate()
+                fh.seek(0)
+                fh.write(self._HEADER.pack(self._MAGIC, self._inode, self._indexed_size, len(self._offsets)))
+        except OSError:
+            pass
+
+    def refresh(self) -> int:
+        """Indexa los registros completos añadidos desde la última llamada."""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            try:
+                st = os.stat(self.path)
+            except OSError:
+                self._reset()
+                return 0
+            start = len(self._offsets)
+            rebuilt = st.st_ino != self._inode or st.st_size < self._indexed_size
+            if rebuilt:
+                self._reset()
+                self._inode = st.st_ino
+                start = 0
+            if st.st_size == self._indexed_size and not rebuilt:
+                return 0
+            last_ts = self._epochs[-1] if self._epochs else 0.0
+            pos = self._indexed_size
+            with open(self.path, 'rb') as fh:
+                fh.seek(pos)
+                for line in fh:
+                    if not line.endswith(b'\n'):
+                        break  # línea en escritura: se indexa en el próximo refresh
+                    if line.strip():
+                        try:
+                            entry = json.loads(line)
+                            ts = entry_epoch(entry.get(self.ts_field)) if isinstance(entry, dict) else None
+                        except (ValueError, UnicodeDecodeError):
+                            ts = None
+                        if ts is not None and ts > last_ts:
+                            last_ts = ts
+                        self._offsets.append(pos)
+                        self._epochs.append(last_ts)
+                    pos += len(line)
+            self._indexed_size = pos
+            added = len(self._offsets) - start
+            if added or rebuilt:
+                self._persist(start)
+            return added
+
+    def _read_from(self, offset: int) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        with open(self.path, 'rb') as fh:
+            fh.seek(offset)
+            remaining = self._indexed_size - offset
+            for line in fh:
+                if remaining <= 0:
+                    break
+                remaining -= len(line)
+                try:
+                    out.append(json.loads(line))
+                except (ValueError, UnicodeDecodeError):
+                    continue
+        return out
+
+    def last(self, n: int) -> List[Dict[str, Any]]:
+        """Últimas `n` entradas del archivo activo, en orden cronológico."""
+        self.refresh()
+        if n <= 0 or not self._offsets:
+            return []
+        return self._read_from(self._offsets[max(0, len(self._offsets) - n)])
+
+    def covers(self, since: float) -> bool:
+        """True si el archivo activo ya contiene todo lo posterior a `since` (no hace falta leer backups)."""
+        self.refresh()
+        return bool(self._epochs) and self._epochs[0] < since
+
+    def since(self, since: float) -> List[Dict[str, Any]]:
+        """Entradas del archivo activo con timestamp >= `since` (epoch)."""
+        self.refresh()
+        idx = bisect.bisect_left(self._epochs, since)
+        if idx >= len(self._offsets):
+            return []
+        out: List[Dict[str, Any]] = []
+        for entry in self._read_from(self._offsets[idx]):
+            ts = entry_epoch(entry.get(self.ts_field)) if isinstance(entry, dict) else None
+            if ts is None or ts >= since:
+                out.append(entry)
+        return out
+
+
+def iter_jsonl(path: Union[str, Path], include_rotated: bool = True) -> Iterator[Dict[str, Any]]:
+    """Todas las entradas en orden cronológico (backups más viejos primero)."""
+    files = rotated_files(path) if include_rotated else [p for p in [Path(path)] if p.exists()]
+    for file_path in reversed(files):
+        try:
+            with open(file_path, 'r', encoding='utf-8') as fh:
+                for line in fh:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        except OSError:
+            continue
+
+
+__all__ = ['tail_jsonl', 'iter_jsonl', 'iter_lines_reverse', 'rotated_files', 'read_last_json',
+           'records_since', 'entry_epoch', 'JsonlOffsetIndex']
@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+📐 MITIGATION TRACKER - ICT ENGINE v6.0 ENTERPRISE
+===================================================
+Seguimiento intrabar (NumPy) de mitigación de zonas: FVGs y Order Blocks.
+
+- Zonas abiertas por (símbolo, timeframe) en arrays de intervalos ordenados:
+  alcistas por borde superior, bajistas por borde inferior
+- Cada vela actualiza en un solo paso vectorizado todas las zonas alcanzadas
+  por su high/low (searchsorted acota el tramo afectado)
+- Fill % monótono desde el extremo de la vela (una mecha también mitiga)
+- Touch count por vela (una vela en formación no cuenta dos veces)
+- Invalidación solo con cierre más allá del borde lejano
+- Zonas 100% mitigadas o invalidadas salen del conjunto abierto; su estado
+  final se recuerda (acotado) para que una zona re-detectada no se reabra
+- apply_candles aplica todas las velas posteriores a la última vista; las
+  zonas nuevas reproducen las velas posteriores a su vela de formación
+
+Usado por FairValueGapDetector.update_fvg_mitigation y
+EnhancedOrderBlockDetector.update_order_block_mitigation.
+
+Autor: ICT Engine v6.0 Team
+"""
+
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# (zone_id, low, high, bullish[, fill_percentage, touch_count[, formed_at]])
+ZoneSpec = Tuple[Any, ...]
+BookKey = Tuple[str, str]  # (symbol, timeframe)
+
+
+@dataclass(frozen=True)
+class ZoneState:
+    """📍 Estado de una zona tras una vela"""
+    zone_id: str
+    fill_percentage: float
+    touch_count: int
+    mitigated: bool     # fill 100% (mecha o cierre a través del borde lejano)
+    invalidated: bool   # cierre más allá del borde lejano
+
+
+class _ZoneSide:
+    """Zonas abiertas de una dirección, ordenadas por el borde que mira al precio"""
+
+    def __init__(self, bullish: bool):
+        self.bullish = bullish
+        self.ids: List[str] = []
+        self.lows = np.empty(0, dtype=np.float64)
+        self.highs = np.empty(0, dtype=np.float64)
+        self.fills = np.empty(0, dtype=np.float64)
+        self.touches = np.empty(0, dtype=np.int64)
+        self.seq = np.empty(0, dtype=np.int64)        # orden de alta (para el límite de zonas)
+        self.touched_bar = np.empty(0, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, ids: List[str], lows, highs, fills, touches, seq) -> None:
+        order_ids = self.ids + ids
+        lows = np.concatenate([self.lows, lows])
+        highs = np.concatenate([self.highs, highs])
+        order = np.argsort(highs if self.bullish else lows, kind='stable')
+        self.ids = [order_ids[i] for i in order]
+        self.lows = lows[order]
+        self.highs = highs[order]
+        self.fills = np.concatenate([self.fills, fills])[order]
+        self.touches = np.concatenate([self.touches, touches])[order]
+        self.seq = np.concatenate([self.seq, seq])[order]
+        self.touched_bar = np.concatenate([self.touched_bar, np.zeros(len(ids), dtype=bool)])[order]
+
+    def keep(self, mask: np.ndarray) -> None:
+        self.ids = [zone_id for zone_id, kept in zip(self.ids, mask) if kept]
+        self.lows = self.lows[mask]
+        self.highs = self.highs[mask]
+        self.fills = self.fills[mask]
+        self.touches = self.touches[mask]
+        self.seq = self.seq[mask]
+        self.touched_bar = self.touched_bar[mask]
+
+    def state(self, pos: int) -> ZoneState:
+        return ZoneState(self.ids[pos], float(self.fills[pos]), int(self.touches[pos]), False, False)
+
+    def affected(self, bar_high: float, bar_low: float) -> slice:
+        """Tramo alcanzado por la vela: alcistas con high > low de la vela,
+        bajistas con low < high de la vela (incluye zonas saltadas por gap;
+        rozar el borde cercano no cuenta como toque)"""
+        if self.bullish:
+            return slice(int(np.searchsorted(self.highs, bar_low, side='right')), len(self.ids))
+        return slice(0, int(np.searchsorted(self.lows, bar_high, side='left')))
+
+    def apply_bar(self, bar_high: float, bar_low: float, close: float) -> List[ZoneState]:
+        span = self.affected(bar_high, bar_low)
+        if span.start >= span.stop:
+            return []
+
+        lows = self.lows[span]
+        highs = self.highs[span]
+        size = highs - lows
+        if self.bullish:
+            depth = highs - bar_low
+            invalid = close < lows
+        else:
+            depth = bar_high - lows
+            invalid = close > highs
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fill = np.where(size > 0, np.clip(depth / np.where(size > 0, size, 1.0), 0.0, 1.0), 1.0) * 100.0
+
+        fills = np.maximum(self.fills[span], fill)
+        self.fills[span] = fills
+        self.touches[span] += ~self.touched_bar[span]
+        self.touched_bar[span] = True
+
+        mitigated = fills >= 100.0
+        ids = self.ids[span]
+        touches = self.touches[span]
+        states = [
+            ZoneState(ids[k], float(fills[k]), int(touches[k]), bool(mitigated[k]), bool(invalid[k]))
+            for k in range(len(ids))
+        ]
+
+        closed = mitigated | invalid
+        if closed.any():
+            mask = np.ones(len(self.ids), dtype=bool)
+            mask[span] = ~closed
+            self.keep(mask)
+        return states
+
+
+class _ZoneBook:
+    """Zonas abiertas de un (símbolo, timeframe)"""
+
+    def __init__(self):
+        self.bullish = _ZoneSide(True)
+        self.bearish = _ZoneSide(False)
+        self.zone_ids: set = set()
+        self.closed: "OrderedDict[str, ZoneState]" = OrderedDict()
+        self.last_bar: Any = None
+
+    def __len__(self) -> int:
+        return len(self.bullish) + len(self.bearish)
+
+
+class ZoneMitigationTracker:
+    """
+    🎯 Tracker de mitigación intrabar para zonas de precio (FVG / Order Block).
+
+    Las zonas alcistas (FVG alcista, demand zone) se llenan desde arriba con el
+    low de la vela; las bajistas (FVG bajista, supply zone) desde abajo con el
+    high. Cada (símbolo, timeframe) tiene su propio libro: una vela solo toca
+    las zonas de su timeframe. Thread-safe.
+    """
+
+    def __init__(self, max_zones_per_symbol: int = 5000):
+        self.max_zones_per_symbol = max_zones_per_symbol  # por libro (símbolo, timeframe)
+        self._books: Dict[BookKey, _ZoneBook] = {}
+        self._seq = 0
+        self._lock = threading.RLock()
+
+    def _book(self, symbol: str, timeframe: str) -> _ZoneBook:
+        key = (symbol, timeframe)
+        book = self._books.get(key)
+        if book is None:
+            book = self._books[key] = _ZoneBook()
+        return book
+
+    def add_zones(self, symbol: str, zones: Iterable[ZoneSpec], timeframe: str = '') -> int:
+        """
+        Registra zonas abiertas; ids ya registrados (o ya cerrados) se ignoran.
+
+        Args:
+            zones: (zone_id, low, high, bullish[, fill_percentage, touch_count])
+
+        Returns:
+            Número de zonas nuevas
+        """
+        with self._lock:
+            book = self._book(symbol, timeframe)
+            new: Dict[bool, List[ZoneSpec]] = {True: [], False: []}
+            for spec in zones:
+                zone_id = spec[0]
+                if zone_id in book.zone_ids or zone_id in book.closed:
+                    continue
+                low, high = sorted((float(spec[1]), float(spec[2])))
+                fill = float(spec[4]) if len(spec) > 4 else 0.0
+                touches = int(spec[5]) if len(spec) > 5 else 0
+                new[bool(spec[3])].append((zone_id, low, high, fill, touches, self._seq))
+                book.zone_ids.add(zone_id)
+                self._seq += 1
+
+            added = 0
+            for bullish, specs in new.items():
+                if not specs:
+                    continue
+                side = book.bullish if bullish else book.bearish
+                side.add(
+                    [s[0] for s in specs],
+                    np.array([s[1] for s in specs], dtype=np.float64),
+                    np.array([s[2] for s in specs], dtype=np.float64),
+                    np.array([s[3] for s in specs], dtype=np.float64),
+                    np.array([s[4] for s in specs], dtype=np.int64),
+                    np.array([s[5] for s in specs], dtype=np.int64),
+                )
+                added += len(specs)
+
+            self._enforce_limit(book)
+            return added
+
+    def add_zone(self, symbol: str, zone_id: str, low: float, high: float, bullish: bool,
+                 fill_percentage: float = 0.0, touch_count: int = 0, timeframe: str = '') -> bool:
+        spec = (zone_id, low, high, bullish, fill_percentage, touch_count)
+        return self.add_zones(symbol, [spec], timeframe=timeframe) == 1
+
+    def _enforce_limit(self, book: _ZoneBook) -> None:
+        excess = len(book) - self.max_zones_per_symbol
+        if excess <= 0:
+            return
+        # Descartar las zonas más antiguas (menor secuencia de alta)
+        cutoff = np.sort(np.concatenate([book.bullish.seq, book.bearish.seq]))[excess - 1]
+        for side in (book.bullish, book.bearish):
+            mask = side.seq > cutoff
+            book.zone_ids.difference_update(z for z, kept in zip(side.ids, mask) if not kept)
+            side.keep(mask)
+
+    def remove_zone(self, symbol: str, zone_id: str, timeframe: str = '') -> bool:
+        with self._lock:
+            book = self._books.get((symbol, timeframe))
+            if book is None or zone_id not in book.zone_ids:
+                return False
+            book.zone_ids.discard(zone_id)
+            for side in (book.bullish, book.bearish):
+                if zone_id in side.ids:
+                    mask = np.ones(len(side), dtype=bool)
+                    mask[side.ids.index(zone_id)] = False
+                    side.keep(mask)
+            return True
+
+    def update(self, symbol: str, high: float, low: float, close: float,
+               bar_time: Any = None, timeframe: str = '') -> List[ZoneState]:
+        """
+        🔄 Aplica una vela a todas las zonas abiertas del (símbolo, timeframe).
+
+        Args:
+            high, low, close: OHLC de la vela
+            bar_time: identificador de la vela; repetirlo (vela en formación)
+                actualiza fill/invalidación sin contar un nuevo toque
+
+        Returns:
+            Estados de las zonas alcanzadas por la vela (las cerradas salen del tracker)
+        """
+        with self._lock:
+            book = self._books.get((symbol, timeframe))
+            if book is None:
+                return []
+            new_bar = bar_time is None or bar_time != book.last_bar
+            book.last_bar = bar_time
+            if not len(book):
+                return []
+            if new_bar:
+                book.bullish.touched_bar[:] = False
+                book.bearish.touched_bar[:] = False
+
+            states = (book.bullish.apply_bar(float(high), float(low), float(close)) +
+                      book.bearish.apply_bar(float(high), float(low), float(close)))
+            for state in states:
+                if state.mitigated or state.invalidated:
+                    book.zone_ids.discard(state.zone_id)
+                    book.closed[state.zone_id] = state
+            while len(book.closed) > self.max_zones_per_symbol:
+                book.closed.popitem(last=False)
+            return states
+
+    def update_bars(self, symbol: str, highs, lows, closes, bar_times=None,
+                    timeframe: str = '') -> Dict[str, ZoneState]:
+        """Aplica varias velas en orden; devuelve el último estado de cada zona alcanzada"""
+        latest: Dict[str, ZoneState] = {}
+        times = list(bar_times) if bar_times is not None else [None] * len(closes)
+        with self._lock:
+            for high, low, close, bar_time in zip(highs, lows, closes, times):
+                for state in self.update(symbol, high, low, close, bar_time, timeframe):
+                    latest[state.zone_id] = state
+        return latest
+
+    def apply_candles(self, symbol: str, zones: Iterable[ZoneSpec], highs, lows, closes,
+                      bar_times: Optional[Sequence[Any]] = None,
+                      timeframe: str = '') -> Dict[str, ZoneState]:
+        """
+        🔄 Aplica las velas aún no vistas por el libro y registra `zones`.
+
+        Las velas desde la última aplicada (incluida, si seguía en formación)
+        hasta la penúltima tocan las zonas ya seguidas. Una zona nueva con
+        formed_at (tiempo de su vela de formación) reproduce antes las velas
+        de la ventana posteriores a esa vela, así una mecha o un cierre
+        intermedios no se pierden. La última vela se aplica a todas. Sin
+        tiempos de vela solo se aplica la última.
+
+        Returns:
+            Estado de cada zona de `zones` (abierta o ya cerrada) y último
+            estado de cada zona alcanzada
+        """
+        zones = list(zones)
+        count = len(closes)
+        if count == 0:
+            return {}
+        with self._lock:
+            book = self._books.get((symbol, timeframe))
+            start = self._pending_start(book, bar_times, count)
+            times = list(bar_times) if bar_times is not None else [None] * count
+            latest = self.update_bars(symbol, highs[start:count - 1], lows[start:count - 1],
+                                      closes[start:count - 1], times[start:count - 1], timeframe)
+            closed = {zone_id for zone_id, state in latest.items() if state.mitigated or state.invalidated}
+            book = self._book(symbol, timeframe)
+            fresh = [spec for spec in zones if spec[0] not in closed
+                     and spec[0] not in book.zone_ids and spec[0] not in book.closed]
+            replayed = self._replay_formation(fresh, highs, lows, closes, times, count)
+            for spec in fresh:
+                state = replayed.get(spec[0])
+                if state is not None and (state.mitigated or state.invalidated):
+                    book.closed[spec[0]] = state
+            while len(book.closed) > self.max_zones_per_symbol:
+                book.closed.popitem(last=False)
+            latest.update(replayed)
+            self.add_zones(symbol, [
+                self._replayed_spec(spec, replayed.get(spec[0])) for spec in zones
+                if spec[0] not in closed and spec[0] not in book.closed
+            ], timeframe)
+            for state in self.update(symbol, highs[-1], lows[-1], closes[-1], times[-1], timeframe):
+                latest[state.zone_id] = state
+            unreached = [spec[0] for spec in zones if spec[0] not in latest]
+            latest.update(self._states(self._book(symbol, timeframe), unreached))
+            return latest
+
+    def _replay_formation(self, specs: List[ZoneSpec], highs, lows, closes,
+                          times: List[Any], count: int) -> Dict[str, ZoneState]:
+        """Velas posteriores a la formación de cada zona nueva (sin la última), en un libro aparte"""
+        starts: Dict[int, List[ZoneSpec]] = {}
+        for spec in specs:
+            start = self._formation_start(spec, times, count)
+            if start < count - 1:
+                starts.setdefault(start, []).append(spec)
+        if not starts:
+            return {}
+        scratch = ZoneMitigationTracker(self.max_zones_per_symbol)
+        latest: Dict[str, ZoneState] = {}
+        for i in range(min(starts), count - 1):
+            if i in starts:
+                scratch.add_zones('', starts[i])
+            for state in scratch.update('', highs[i], lows[i], closes[i], times[i]):
+                latest[state.zone_id] = state
+        return latest
+
+    @staticmethod
+    def _formation_start(spec: ZoneSpec, times: List[Any], count: int) -> int:
+        """Índice de la primera vela posterior a formed_at (count - 1 si no se conoce)"""
+        formed_at = spec[6] if len(spec) > 6 else None
+        if formed_at is None or times[-1] is None:
+            return count - 1
+        try:
+            return bisect_right(times, formed_at)
+        except TypeError:
+            return count - 1
+
+    @staticmethod
+    def _replayed_spec(spec: ZoneSpec, state: Optional[ZoneState]) -> ZoneSpec:
+        if state is None:
+            return spec
+        return (spec[0], spec[1], spec[2], spec[3], state.fill_percentage, state.touch_count)
+
+    @staticmethod
+    def _states(book: _ZoneBook, zone_ids: List[Any]) -> Dict[str, ZoneState]:
+        """Estado actual de zonas no alcanzadas por la última vela"""
+        if not zone_ids:
+            return {}
+        positions = {zone_id: (side, pos) for side in (book.bullish, book.bearish)
+                     for pos, zone_id in enumerate(side.ids)}
+        states: Dict[str, ZoneState] = {}
+        for zone_id in zone_ids:
+            closed = book.closed.get(zone_id)
+            if closed is not None:
+                states[zone_id] = closed
+            elif zone_id in positions:
+                side, pos = positions[zone_id]
+                states[zone_id] = side.state(pos)
+        return states
+
+    @staticmethod
+    def _pending_start(book: Optional[_ZoneBook], bar_times: Optional[Sequence[Any]], count: int) -> int:
+        """Índice de la primera vela posterior (o igual) a la última aplicada al libro"""
+        last = book.last_bar if book is not None else None
+        start = count - 1
+        if last is None or bar_times is None:
+            return start
+        try:
+            while start > 0 and bar_times[start - 1] >= last:
+                start -= 1
+        except TypeError:  # tiempos no comparables con los de la llamada anterior
+            return count - 1
+        return start
+
+    def open_zones(self, symbol: str, timeframe: str = '') -> int:
+        with self._lock:
+            book = self._books.get((symbol, timeframe))
+            return len(book) if book is not None else 0
+
+    def is_tracking(self, symbol: str, zone_id: str, timeframe: str = '') -> bool:
+        with self._lock:
+            book = self._books.get((symbol, timeframe))
+            return book is not None and zone_id in book.zone_ids
+
+
+def candle_time(candles: Any, position: int) -> Any:
+    """Tiempo de la vela en `position` (mismo origen que candle_arrays; None si no hay tiempo)"""
+    try:
+        if 'datetime' in str(getattr(candles.index, 'dtype', '')):
+            return candles.index[position]
+        for column in ('time', 'timestamp', 'datetime'):
+            if column in candles.columns:
+                return candles[column].iloc[position]
+    except (IndexError, KeyError):
+        pass
+    return None
+
+
+def candle_arrays(candles: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Optional[List[Any]]]:
+    """
+    (highs, lows, closes, bar_times) de un DataFrame OHLC.
+
+    bar_times sale del índice datetime o de una columna time/timestamp/datetime;
+    None si no hay tiempo (cada llamada cuenta como una vela nueva).
+    """
+    highs = candles['high'].to_numpy(dtype=np.float64)
+    lows = candles['low'].to_numpy(dtype=np.float64)
+    closes = candles['close'].to_numpy(dtype=np.float64)
+    bar_times: Optional[List[Any]] = None
+    if 'datetime' in str(getattr(candles.index, 'dtype', '')):
+        bar_times = list(candles.index)
+    else:
+        for column in ('time', 'timestamp', 'datetime'):
+            if column in candles.columns:
+                bar_times = candles[column].tolist()
+                break
+    return highs, lows, closes, bar_times
+
+
+__all__ = ['ZoneMitigationTracker', 'ZoneState', 'candle_arrays', 'candle_time']
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+📐 SWING KERNEL - ICT ENGINE v6.0 ENTERPRISE
+=============================================
+Kernel vectorizado (NumPy) compartido para detección de swing points/fractales.
+
+- Máximos/mínimos rodantes con ventanas deslizantes (sin bucles anidados)
+- Desigualdad estricta: un empate con cualquier vela vecina invalida el swing
+- Devuelve arrays de índices y precios
+- Modo incremental: con el resultado previo y solo las velas nuevas,
+  recalcula únicamente la ventana de cola
+
+Usado por SmartMoneyAnalyzer, PatternDetector (BOS) y FractalAnalyzerEnterprise.
+
+Autor: ICT Engine v6.0 Team
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+@dataclass(frozen=True)
+class SwingPoints:
+    """📍 Resultado del kernel: swings confirmados + cola para modo incremental"""
+    high_indices: np.ndarray
+    high_prices: np.ndarray
+    low_indices: np.ndarray
+    low_prices: np.ndarray
+    n_bars: int
+    left_bars: int
+    right_bars: int
+    tail_highs: np.ndarray
+    tail_lows: np.ndarray
+
+
+def _as_float_array(values) -> np.ndarray:
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def _window_extreme(values: np.ndarray, start: int, size: int, count: int, use_max: bool) -> np.ndarray:
+    """Máximo/mínimo de `count` ventanas de `size` velas empezando en `start`"""
+    if size <= 0:
+        fill = -np.inf if use_max else np.inf
+        return np.full(count, fill)
+    windows = sliding_window_view(values[start:start + count + size - 1], size)
+    return windows.max(axis=1) if use_max else windows.min(axis=1)
+
+
+def _find_extremes(values, left_bars: int, right_bars: int, find_highs: bool) -> Tuple[np.ndarray, np.ndarray]:
+    arr = _as_float_array(values)
+    n = arr.shape[0]
+    count = n - left_bars - right_bars
+    if count <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+    # Candidatos i ∈ [left_bars, n - right_bars)
+    center = arr[left_bars:n - right_bars]
+    left_ext = _window_extreme(arr, 0, left_bars, count, find_highs)
+    right_ext = _window_extreme(arr, left_bars + 1, right_bars, count, find_highs)
+
+    if find_highs:
+        mask = (center > left_ext) & (center > right_ext)
+    else:
+        mask = (center < left_ext) & (center < right_ext)
+
+    indices = np.flatnonzero(mask).astype(np.int64) + left_bars
+    return indices, arr[indices]
+
+
+def find_swing_highs(highs, left_bars: int, right_bars: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Swing highs: high estrictamente mayor que los `left_bars` anteriores
+    y los `right_bars` posteriores.
+
+    Returns:
+        (índices, precios) como arrays NumPy
+    """
+    right = left_bars if right_bars is None else right_bars
+    return _find_extremes(highs, left_bars, right, True)
+
+
+def find_swing_lows(lows, left_bars: int, right_bars: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Swing lows: low estrictamente menor que los `left_bars` anteriores
+    y los `right_bars` posteriores.
+
+    Returns:
+        (índices, precios) como arrays NumPy
+    """
+    right = left_bars if right_bars is None else right_bars
+    return _find_extremes(lows, left_bars, right, False)
+
+
+def detect_swing_points(highs, lows, left_bars: int, right_bars: Optional[int] = None) -> SwingPoints:
+    """🔍 Detecta swing highs y lows sobre la serie completa"""
+    right = left_bars if right_bars is None else right_bars
+    highs_arr = _as_float_array(highs)
+    lows_arr = _as_float_array(lows)
+
+    high_idx, high_px = _find_extremes(highs_arr, left_bars, right, True)
+    low_idx, low_px = _find_extremes(lows_arr, left_bars, right, False)
+
+    tail = left_bars + right
+    return SwingPoints(
+        high_indices=high_idx,
+        high_prices=high_px,
+        low_indices=low_idx,
+        low_prices=low_px,
+        n_bars=highs_arr.shape[0],
+        left_bars=left_bars,
+        right_bars=right,
+        tail_highs=highs_arr[-tail:].copy() if tail else highs_arr[:0].copy(),
+        tail_lows=lows_arr[-tail:].copy() if tail else lows_arr[:0].copy(),
+    )
+
+
+def update_swing_points(previous: SwingPoints, new_highs, new_lows) -> SwingPoints:
+    """
+    ⚡ Modo incremental: añade solo las velas nuevas al resultado previo.
+
+    Los swings con índice < n_bars - right_bars ya tenían su ventana completa
+    y no cambian; únicamente se re-evalúa la cola (left + right velas previas
+    más las nuevas).
+    """
+    new_highs_arr = _as_float_array(new_highs)
+    new_lows_arr = _as_float_array(new_lows)
+    if new_highs_arr.shape[0] != new_lows_arr.shape[0]:
+        raise ValueError("new_highs y new_lows deben tener la misma longitud")
+    if new_highs_arr.shape[0] == 0:
+        return previous
+
+    left, right = previous.left_bars, previous.right_bars
+    combined_highs = np.concatenate((previous.tail_highs, new_highs_arr))
+    combined_lows = np.concatenate((previous.tail_lows, new_lows_arr))
+    offset = previous.n_bars - previous.tail_highs.shape[0]
+
+    # Frontera: swings previos por debajo de este índice son definitivos
+    boundary = max(left, previous.n_bars - right)
+
+    tail_high_idx, tail_high_px = _find_extremes(combined_highs, left, right, True)
+    tail_low_idx, tail_low_px = _find_extremes(combined_lows, left, right, False)
+    tail_high_idx = tail_high_idx + offset
+    tail_low_idx = tail_low_idx + offset
+    keep_new_high = tail_high_idx >= boundary
+    keep_new_low = tail_low_idx >= boundary
+
+    keep_old_high = previous.high_indices < boundary
+    keep_old_low = previous.low_indices < boundary
+
+    tail = left + right
+    return SwingPoints(
+        high_indices=np.concatenate((previous.high_indices[keep_old_high], tail_high_idx[keep_new_high])),
+        high_prices=np.concatenate((previous.high_prices[keep_old_high], tail_high_px[keep_new_high])),
+        low_indices=np.concatenate((previous.low_indices[keep_old_low], tail_low_idx[keep_new_low])),
+        low_prices=np.concatenate((previous.low_prices[keep_old_low], tail_low_px[keep_new_low])),
+        n_bars=previous.n_bars + new_highs_arr.shape[0],
+        left_bars=left,
+        right_bars=right,
+        tail_highs=combined_highs[-tail:].copy() if tail else combined_highs[:0].copy(),
+        tail_lows=combined_lows[-tail:].copy() if tail else combined_lows[:0].copy(),
+    )
+
+
+__all__ = [
+    'SwingPoints',
+    'find_swing_highs',
+    'find_swing_lows',
+    'detect_swing_points',
+    'update_swing_points',
+]
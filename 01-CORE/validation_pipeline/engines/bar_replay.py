@@ -0,0 +1,444 @@
+"""
+Bar Replay Simulator
+====================
+
+Replay vela a vela (event-driven) para RealICTBacktestEngine.
+
+Por cada vela cerrada:
+1. Se ejecutan las órdenes pendientes al open de la vela (fill simulado)
+2. Se evalúan SL/TP de la posición abierta contra high/low de la vela
+   (si ambos se tocan en la misma vela se asume SL primero: conservador)
+3. Se corre la detección (PatternDetector + SmartMoneyAnalyzer) sobre la
+   ventana que termina en esa vela, midiendo latencia real por vela
+4. Las señales nuevas pasan por RiskPipeline.evaluate_and_size y, si se
+   aprueban, quedan como orden de mercado para el open de la siguiente vela
+
+Los resultados de trades/PnL son deterministas para unos datos y una
+configuración dados: no se usa aleatoriedad ni reloj de pared salvo para
+medir latencias.
+"""
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+REPLAY_DEFAULTS: Dict[str, Any] = {
+    'warmup_bars': 50,
+    'window_bars': 200,
+    'detect_every': 1,
+    'account_balance': 10000.0,
+    'risk_percent': 1.0,
+    'default_lots': 0.1,
+    'pip_value_per_lot': 10.0,
+    'pip_size': None,  # None -> inferido del símbolo
+    'max_open_positions': 1,
+    'min_signal_strength': 0.0,
+    'smart_money_tail': 10,
+    'quiet': True,
+}
+
+
+@dataclass
+class ReplayTrade:
+    trade_id: int
+    direction: str  # 'buy' | 'sell'
+    pattern: str
+    signal_bar: int
+    entry_bar: int
+    entry_price: float
+    stop_loss: float
+    take_profit: float
+    lots: float
+    exit_bar: Optional[int] = None
+    exit_price: Optional[float] = None
+    exit_reason: str = ""
+    pnl_pips: float = 0.0
+    pnl: float = 0.0
+
+
+@dataclass
+class ReplayMetrics:
+    bars_total: int = 0
+    bars_evaluated: int = 0
+    elapsed_seconds: float = 0.0
+    bars_per_second: float = 0.0
+    detection_latency_ms: Dict[str, float] = field(default_factory=dict)
+    risk_latency_ms: Dict[str, float] = field(default_factory=dict)
+    signals_total: int = 0
+    signals_new: int = 0
+    orders_submitted: int = 0
+    orders_rejected: int = 0
+    orders_cancelled: int = 0
+    trades_closed: int = 0
+    wins: int = 0
+    losses: int = 0
+    win_rate: float = 0.0
+    total_pips: float = 0.0
+    net_pnl: float = 0.0
+    profit_factor: Optional[float] = 0.0  # None si no hay pérdidas
+    max_drawdown: float = 0.0
+    max_drawdown_pct: float = 0.0
+    final_balance: float = 0.0
+
+
+def _percentiles(samples_ms: List[float]) -> Dict[str, float]:
+    if not samples_ms:
+        return {'count': 0, 'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+    ordered = sorted(samples_ms)
+    n = len(ordered)
+
+    def pick(q: float) -> float:
+        return ordered[min(n - 1, int(q * (n - 1) + 0.5))]
+
+    return {
+        'count': n,
+        'mean': round(sum(ordered) / n, 4),
+        'p50': round(pick(0.50), 4),
+        'p95': round(pick(0.95), 4),
+        'p99': round(pick(0.99), 4),
+        'max': round(ordered[-1], 4),
+    }
+
+
+def _infer_pip_size(symbol: str) -> float:
+    s = symbol.upper()
+    if 'JPY' in s:
+        return 0.01
+    if s.startswith(('XAU', 'GOLD')):
+        return 0.1
+    return 0.0001
+
+
+def _component_loggers(components: Tuple[Any, ...]) -> List[logging.Logger]:
+    """logging.Logger de cada componente (directo o envuelto por su adaptador)."""
+    found: Dict[int, logging.Logger] = {}
+    for component in components:
+        pending = [getattr(component, 'logger', None)]
+        for _ in range(3):
+            nxt = []
+            for obj in pending:
+                if isinstance(obj, logging.Logger):
+                    found[id(obj)] = obj
+                elif obj is not None:
+                    nxt.extend(getattr(obj, attr, None) for attr in ('logger', '_logger'))
+            pending = nxt
+    return list(found.values())
+
+
+@contextlib.contextmanager
+def _quiet_output(components: Tuple[Any, ...]):
+    """
+    Silencia el ruido de los detectores durante el replay: sus loggers suben a
+    WARNING y los print() de hot paths van a os.devnull (sin buffer en memoria).
+    """
+    loggers = _component_loggers(components)
+    levels = [(lg, lg.level) for lg in loggers]
+    for lg in loggers:
+        if lg.getEffectiveLevel() < logging.WARNING:
+            lg.setLevel(logging.WARNING)
+    try:
+        with open(os.devnull, 'w') as sink, contextlib.redirect_stdout(sink):
+            yield
+    finally:
+        for lg, level in levels:
+            lg.setLevel(level)
+
+
+def _direction_of(signal: Any) -> str:
+    raw = getattr(signal, 'direction', None)
+    raw = getattr(raw, 'value', raw)
+    return str(raw).lower() if raw is not None else 'neutral'
+
+
+class BarReplaySimulator:
+    """Recorre la serie vela a vela con detección, riesgo y fills simulados."""
+
+    def __init__(self,
+                 symbol: str,
+                 timeframe: str,
+                 pattern_detector: Any = None,
+                 smart_money_analyzer: Any = None,
+                 risk_pipeline: Any = None,
+                 config: Optional[Dict[str, Any]] = None,
+                 logger: Any = None) -> None:
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.pattern_detector = pattern_detector
+        self.smart_money_analyzer = smart_money_analyzer
+        self.risk_pipeline = risk_pipeline
+        self.logger = logger
+        self.config = dict(REPLAY_DEFAULTS)
+        if config:
+            self.config.update({k: v for k, v in config.items() if k in REPLAY_DEFAULTS})
+        self.pip_size = float(self.config['pip_size'] or _infer_pip_size(symbol))
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def run(self, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        frame = self._to_frame(rows)
+        if self.config['quiet']:
+            # Los detectores loguean/imprimen en hot paths; se silencian durante el replay
+            with _quiet_output((self.pattern_detector, self.smart_money_analyzer, self.risk_pipeline)):
+                return self._replay(rows, frame)
+        return self._replay(rows, frame)
+
+    # ------------------------------------------------------------------
+    # Replay loop
+    # ------------------------------------------------------------------
+    def _replay(self, rows: List[Dict[str, Any]], frame: Any) -> Dict[str, Any]:
+        cfg = self.config
+        warmup = max(1, int(cfg['warmup_bars']))
+        window = max(warmup, int(cfg['window_bars']))
+        detect_every = max(1, int(cfg['detect_every']))
+        max_open = max(1, int(cfg['max_open_positions']))
+
+        metrics = ReplayMetrics(bars_total=len(rows))
+        balance = float(cfg['account_balance'])
+        peak = balance
+        detection_ms: List[float] = []
+        risk_ms: List[float] = []
+        open_trades: List[ReplayTrade] = []
+        closed: List[ReplayTrade] = []
+        pending: List[Tuple[int, Any, float]] = []  # (signal_bar, signal, lots)
+        seen: set = set()
+        next_id = 1
+
+        started = time.perf_counter()
+        for i, bar in enumerate(rows):
+            o, h, l, c = (float(bar['open']), float(bar['high']),
+                          float(bar['low']), float(bar['close']))
+
+            # 1. Fills de órdenes emitidas en la vela anterior
+            for signal_bar, signal, lots in pending:
+                trade = self._fill(next_id, signal_bar, i, o, signal, lots)
+                if trade is None:
+                    metrics.orders_cancelled += 1
+                    continue
+                next_id += 1
+                open_trades.append(trade)
+            pending = []
+
+            # 2. SL/TP intrabar
+            still_open: List[ReplayTrade] = []
+            for trade in open_trades:
+                exit_px, reason = self._check_exit(trade, h, l)
+                if exit_px is None:
+                    still_open.append(trade)
+                    continue
+                balance += self._close(trade, i, exit_px, reason)
+                closed.append(trade)
+                peak = max(peak, balance)
+                metrics.max_drawdown = max(metrics.max_drawdown, peak - balance)
+            open_trades = still_open
+
+            # 3. Detección sobre la ventana que termina en esta vela
+            if i + 1 < warmup or (i + 1 - warmup) % detect_every:
+                continue
+            metrics.bars_evaluated += 1
+            t0 = time.perf_counter()
+            signals, smart_ctx = self._detect(rows, frame, i, window)
+            detection_ms.append((time.perf_counter() - t0) * 1000.0)
+            metrics.signals_total += len(signals)
+
+            # 4. Riesgo y emisión de órdenes
+            for signal in self._new_signals(signals, seen):
+                metrics.signals_new += 1
+                if len(open_trades) + len(pending) >= max_open:
+                    continue
+                t1 = time.perf_counter()
+                approved, lots = self._evaluate_risk(signal, c, balance, open_trades, smart_ctx)
+                risk_ms.append((time.perf_counter() - t1) * 1000.0)
+                if not approved:
+                    metrics.orders_rejected += 1
+                    continue
+                metrics.orders_submitted += 1
+                pending.append((i, signal, lots))
+
+        # Posiciones abiertas al final de los datos se cierran al último close
+        if rows:
+            last_close = float(rows[-1]['close'])
+            for trade in open_trades:
+                balance += self._close(trade, len(rows) - 1, last_close, 'end_of_data')
+                closed.append(trade)
+                peak = max(peak, balance)
+                metrics.max_drawdown = max(metrics.max_drawdown, peak - balance)
+        metrics.orders_cancelled += len(pending)
+
+        metrics.elapsed_seconds = round(time.perf_counter() - started, 6)
+        metrics.bars_per_second = round(len(rows) / metrics.elapsed_seconds, 2) if metrics.elapsed_seconds > 0 else 0.0
+        metrics.detection_latency_ms = _percentiles(detection_ms)
+        metrics.risk_latency_ms = _percentiles(risk_ms)
+        self._finalize_trade_metrics(metrics, closed, balance, peak)
+        return {
+            'metrics': asdict(metrics),
+            'trades': [asdict(t) for t in closed],
+            'config': dict(cfg, pip_size=self.pip_size),
+        }
+
+    # ------------------------------------------------------------------
+    # Steps
+    # ------------------------------------------------------------------
+    def _detect(self, rows: List[Dict[str, Any]], frame: Any, i: int, window: int) -> Tuple[List[Any], Dict[str, Any]]:
+        start = max(0, i + 1 - window)
+        signals: List[Any] = []
+        if self.pattern_detector is not None and frame is not None:
+            try:
+                signals = list(self.pattern_detector.detect_patterns(
+                    frame.iloc[start:i + 1], symbol=self.symbol, timeframe=self.timeframe) or [])
+            except Exception as e:
+                if self.logger:
+                    self.logger.warning(f"[BarReplay] detect_patterns failed at bar {i}: {e}")
+        smart_ctx: Dict[str, Any] = {}
+        if self.smart_money_analyzer is not None:
+            tail = max(1, int(self.config['smart_money_tail']))
+            try:
+                smart_ctx = self.smart_money_analyzer.analyze_market_data(rows[max(0, i + 1 - tail):i + 1]) or {}
+            except Exception as e:
+                if self.logger:
+                    self.logger.warning(f"[BarReplay] smart money analysis failed at bar {i}: {e}")
+        return signals, smart_ctx
+
+    def _new_signals(self, signals: List[Any], seen: set) -> List[Any]:
+        """Filtra señales operables que no se hayan visto en ventanas anteriores.
+
+        Las ventanas se solapan, así que el mismo patrón se re-detecta en
+        varias velas consecutivas; se identifica por tipo, dirección y zona.
+        """
+        min_strength = float(self.config['min_signal_strength'])
+        fresh: List[Any] = []
+        for signal in signals:
+            direction = _direction_of(signal)
+            if direction not in ('buy', 'sell'):
+                continue
+            if float(getattr(signal, 'strength', 0.0) or 0.0) < min_strength:
+                continue
+            zone = getattr(signal, 'entry_zone', None) or (0.0, 0.0)
+            ptype = getattr(signal, 'pattern_type', 'unknown')
+            key = (str(getattr(ptype, 'value', ptype)), direction,
+                   round(float(zone[0]) / self.pip_size), round(float(zone[1]) / self.pip_size))
+            if key in seen:
+                continue
+            seen.add(key)
+            fresh.append(signal)
+        fresh.sort(key=lambda s: float(getattr(s, 'strength', 0.0) or 0.0), reverse=True)
+        return fresh
+
+    def _evaluate_risk(self, signal: Any, price: float, balance: float,
+                       open_trades: List[ReplayTrade], smart_ctx: Dict[str, Any]) -> Tuple[bool, float]:
+        default_lots = float(self.config['default_lots'])
+        if self.risk_pipeline is None:
+            return True, default_lots
+        flows = (smart_ctx.get('analysis') or {}).get('institutional_flows') or []
+        session = getattr(signal, 'session', None)
+        signal_ctx = {
+            'symbol': self.symbol,
+            'entry_price': price,
+            'stop_loss': float(getattr(signal, 'stop_loss', 0.0) or 0.0),
+            'account_balance': balance,
+            'account_equity': balance,
+            'risk_percent': float(self.config['risk_percent']),
+            'open_positions': [{'symbol': self.symbol, 'direction': t.direction, 'lots': t.lots} for t in open_trades],
+            'smart_money_signal': bool(flows and flows[0].get('direction') != 'neutral'),
+            'session': str(getattr(session, 'value', session or 'london')).lower(),
+        }
+        try:
+            decision = self.risk_pipeline.evaluate_and_size(signal_ctx)
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"[BarReplay] risk pipeline error: {e}")
+            return False, 0.0
+        if not getattr(decision, 'approved', False):
+            return False, 0.0
+        lots = float(getattr(decision, 'lots', 0.0) or 0.0)
+        return True, lots if lots > 0 else default_lots
+
+    def _fill(self, trade_id: int, signal_bar: int, bar_index: int, open_price: float,
+              signal: Any, lots: float) -> Optional[ReplayTrade]:
+        direction = _direction_of(signal)
+        sl = float(getattr(signal, 'stop_loss', 0.0) or 0.0)
+        tp = float(getattr(signal, 'take_profit_1', 0.0) or 0.0)
+        # Orden de mercado al open: se cancela si el gap ya invalidó SL/TP
+        if direction == 'buy' and not (sl < open_price < tp):
+            return None
+        if direction == 'sell' and not (tp < open_price < sl):
+            return None
+        ptype = getattr(signal, 'pattern_type', 'unknown')
+        return ReplayTrade(
+            trade_id=trade_id,
+            direction=direction,
+            pattern=str(getattr(ptype, 'value', ptype)),
+            signal_bar=signal_bar,
+            entry_bar=bar_index,
+            entry_price=open_price,
+            stop_loss=sl,
+            take_profit=tp,
+            lots=lots,
+        )
+
+    @staticmethod
+    def _check_exit(trade: ReplayTrade, high: float, low: float) -> Tuple[Optional[float], str]:
+        if trade.direction == 'buy':
+            if low <= trade.stop_loss:
+                return trade.stop_loss, 'stop_loss'
+            if high >= trade.take_profit:
+                return trade.take_profit, 'take_profit'
+        else:
+            if high >= trade.stop_loss:
+                return trade.stop_loss, 'stop_loss'
+            if low <= trade.take_profit:
+                return trade.take_profit, 'take_profit'
+        return None, ''
+
+    def _close(self, trade: ReplayTrade, bar_index: int, price: float, reason: str) -> float:
+        sign = 1.0 if trade.direction == 'buy' else -1.0
+        trade.exit_bar = bar_index
+        trade.exit_price = price
+        trade.exit_reason = reason
+        trade.pnl_pips = round(sign * (price - trade.entry_price) / self.pip_size, 2)
+        trade.pnl = round(trade.pnl_pips * trade.lots * float(self.config['pip_value_per_lot']), 2)
+        return trade.pnl
+
+    def _finalize_trade_metrics(self, metrics: ReplayMetrics, closed: List[ReplayTrade],
+                                balance: float, peak: float) -> None:
+        gross_win = sum(t.pnl for t in closed if t.pnl > 0)
+        gross_loss = -sum(t.pnl for t in closed if t.pnl < 0)
+        metrics.trades_closed = len(closed)
+        metrics.wins = sum(1 for t in closed if t.pnl > 0)
+        metrics.losses = sum(1 for t in closed if t.pnl < 0)
+        metrics.win_rate = round(metrics.wins / len(closed), 4) if closed else 0.0
+        metrics.total_pips = round(sum(t.pnl_pips for t in closed), 2)
+        metrics.net_pnl = round(sum(t.pnl for t in closed), 2)
+        if gross_loss > 0:
+            metrics.profit_factor = round(gross_win / gross_loss, 4)
+        else:
+            metrics.profit_factor = None if gross_win > 0 else 0.0
+        metrics.max_drawdown = round(metrics.max_drawdown, 2)
+        metrics.max_drawdown_pct = round(metrics.max_drawdown / peak * 100.0, 4) if peak > 0 else 0.0
+        metrics.final_balance = round(balance, 2)
+
+    def _to_frame(self, rows: List[Dict[str, Any]]) -> Any:
+        try:
+            import pandas as pd
+        except Exception:
+            return None
+        if not rows:
+            return None
+        frame = pd.DataFrame.from_records(rows, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+        try:
+            frame.index = pd.DatetimeIndex(frame.pop('timestamp'))
+        except Exception:
+            pass
+        return frame
+
+
+__all__ = [
+    'BarReplaySimulator',
+    'ReplayTrade',
+    'ReplayMetrics',
+    'REPLAY_DEFAULTS',
+]
@@ -7,6 +7,11 @@
 Recolector de datos conectado directamente al sistema ICT Engine v6.0.
 Usa los mismos componentes que run_complete_system.py y run_real_market_system.py
 
+Refresco en segundo plano: un hilo productor recolecta los símbolos en
+paralelo (reutilizando velas del CandleStore y resultados de patrones ya
+calculados para la última vela) y publica snapshots inmutables; el
+dashboard solo lee el último snapshot publicado.
+
 Versión: v6.1.0-enterprise-real-system-async
 """
 
@@ -15,6 +20,8 @@ import os
 import time
 import asyncio
 import importlib.util
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional, List, Union
 from pathlib import Path
@@ -65,13 +72,15 @@ else:
     print(f"⚠️ [RealDataCollector] import_center.py no encontrado en {utils_path}")
     _ic = None
 
+from ict_engine.detection_results import DetectionResult, bar_key, get_detection_result_cache
+
 print(f"🔧 [RealDataCollector] Core path: {core_path}")
 print(f"🔧 [RealDataCollector] Data path: {data_path}")
 print(f"🔧 [RealDataCollector] Project root: {project_root}")
 
-@dataclass
+@dataclass(frozen=True)
 class DashboardData:
-    """Estructura de datos del dashboard con datos reales"""
+    """Snapshot inmutable de datos del dashboard con datos reales"""
     timestamp: datetime
     fvg_stats: Dict[str, Any]
     pattern_stats: Dict[str, Any]
@@ -84,6 +93,9 @@ class DashboardData:
 class RealICTDataCollector:
     """📡 Recolector de datos conectado al sistema ICT Engine real"""
     
+    # Origen de los resultados que el dashboard publica al detectar por su cuenta
+    DETECTION_SOURCE = 'dashboard'
+    
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.start_time = time.time()
@@ -95,6 +107,26 @@ class RealICTDataCollector:
         # Símbolos y timeframes
         self.symbols = config.get('data', {}).get('symbols', ['EURUSD', 'GBPUSD', 'USDJPY'])
         self.timeframes = config.get('data', {}).get('timeframes', ['H1', 'H4', 'D1'])
+        self.get_real_market_data = None
+        
+        # Productor de snapshots en segundo plano
+        data_config = config.get('data', {})
+        self.refresh_interval = float(data_config.get('refresh_interval', 5.0))
+        self.collector_workers = int(data_config.get('collector_workers', min(8, max(1, len(self.symbols)))))
+        self.background_refresh = bool(data_config.get('background_refresh', True))
+        self._latest_snapshot: Optional[DashboardData] = None
+        self._snapshot_ready = threading.Event()
+        self._producer_stop = threading.Event()
+        self._producer_thread: Optional[threading.Thread] = None
+        self._producer_lock = threading.Lock()
+        self._symbol_pool: Optional[ThreadPoolExecutor] = None
+        # Detector compartido: una detección a la vez (CPU-bound bajo el GIL)
+        self._detector_lock = threading.Lock()
+        # Resultados publicados por el motor; la detección local es solo fallback
+        self.engine_results_max_age = float(data_config.get('engine_results_max_age', 900.0))
+        self._detection_results = get_detection_result_cache()
+        # {symbol: clave de la última vela M15 ya contada} para no contar dos veces
+        self._pattern_cache: Dict[str, Any] = {}
         
         # Solo inicializar componentes mock si no hay componentes reales
         if not config.get('real_components'):
@@ -197,6 +229,9 @@ class RealICTDataCollector:
             if not self.components:
                 self._initialize_ict_components()
             
+            if self.background_refresh:
+                self.start_producer()
+            
             print("✅ [RealDataCollector] Recolección iniciada exitosamente")
             return True
         except Exception as e:
@@ -207,6 +242,7 @@ class RealICTDataCollector:
         """Detener el recolector de datos"""
         print("🛑 [RealDataCollector] Deteniendo recolección...")
         try:
+            self.stop_producer()
             # Limpiar componentes si es necesario
             self.components.clear()
             print("✅ [RealDataCollector] Recolección detenida")
@@ -311,35 +347,56 @@ class RealICTDataCollector:
                 'error': str(e)
             }
     
-    def _get_real_pattern_statistics(self) -> Dict[str, Any]:
+    def _detect_symbol_patterns(self, symbol: str) -> int:
+        """
+        Patrones M15 de un símbolo: usa el último resultado publicado por el
+        motor en la caché compartida y solo detecta localmente si no hay uno
+        reciente. Cada vela se cuenta una sola vez.
+        
+        Returns:
+            Nº de patrones de la vela nueva (0 si ya se había contado)
+        """
+        try:
+            entry = self._detection_results.latest(symbol, 'M15', self.engine_results_max_age)
+            if entry is None or entry.source == self.DETECTION_SOURCE:
+                entry = self._detect_symbol_patterns_locally(symbol)
+            if entry is None or self._pattern_cache.get(symbol) == entry.bar_key:
+                return 0
+            self._pattern_cache[symbol] = entry.bar_key
+            if entry.count:
+                print(f"🎯 [ICT_SIGNALS] {entry.count} patrones detectados en {symbol}")
+            return entry.count
+        except Exception as e:
+            print(f"⚠️ Error detectando patrones en {symbol}: {e}")
+            return 0
+    
+    def _detect_symbol_patterns_locally(self, symbol: str) -> Optional[DetectionResult]:
+        """Fallback sin resultados del motor: detecta y publica en la caché compartida"""
+        detector = self.components.get('detector')
+        if detector is None or not hasattr(detector, 'detect_patterns'):
+            return None
+        market_data = self._fetch_candles(symbol, 'M15', 100, self._get_internal_market_data)
+        if market_data is None or len(market_data) == 0:
+            return None
+        key = bar_key(market_data)
+        previous = self._detection_results.latest(symbol, 'M15')
+        if previous is not None and previous.bar_key == key:
+            return previous
+        
+        # ⚡ Detectar patrones ICT reales (se loggean en ICT_SIGNALS por el detector)
+        with self._detector_lock:
+            new_patterns = detector.detect_patterns(market_data, 'M15')
+        return self._detection_results.publish(symbol, 'M15', key, new_patterns, source=self.DETECTION_SOURCE)
+    
+    def _get_real_pattern_statistics(self, patterns_detected_now: Optional[int] = None) -> Dict[str, Any]:
         """Obtener estadísticas de patrones reales del sistema"""
         try:
             if 'detector' in self.components:
                 detector = self.components['detector']
                 
-                # 🎯 EJECUTAR DETECCIÓN DE PATRONES EN TIEMPO REAL
-                # Esta es la línea crítica que faltaba para generar señales ICT
-                patterns_detected_now = 0
-                
-                # Procesar cada símbolo para detectar patrones nuevos
-                for symbol in self.symbols:
-                    try:
-                        # Obtener datos de mercado para este símbolo
-                        market_data = self._get_internal_market_data(symbol, 'M15', 100)
-                        
-                        if market_data is not None and hasattr(detector, 'detect_patterns'):
-                            # ⚡ LLAMADA CRÍTICA: Detectar patrones ICT reales
-                            new_patterns = detector.detect_patterns(market_data, 'M15')
-                            
-                            if new_patterns and len(new_patterns) > 0:
-                                patterns_detected_now += len(new_patterns)
-                                print(f"🎯 [ICT_SIGNALS] {len(new_patterns)} patrones detectados en {symbol}")
-                                
-                                # Los patrones se loggean automáticamente en ICT_SIGNALS por el detector
-                                
-                    except Exception as e:
-                        print(f"⚠️ Error detectando patrones en {symbol}: {e}")
-                        continue
+                # 🎯 Detección por símbolo (el productor la ejecuta en paralelo y pasa el total)
+                if patterns_detected_now is None:
+                    patterns_detected_now = sum(self._detect_symbol_patterns(symbol) for symbol in self.symbols)
                 
                 # Obtener estadísticas después de la detección
                 if hasattr(detector, 'get_pattern_statistics'):
@@ -420,78 +477,92 @@ class RealICTDataCollector:
                 'error': str(e)
             }
     
-    def _get_real_market_data(self) -> Dict[str, Any]:
+    def _get_real_market_data(self, symbols: Optional[List[str]] = None) -> Dict[str, Any]:
         """Obtener datos de mercado reales"""
-        market_data = {}
-        
-        for symbol in self.symbols:
-            try:
-                if self.get_real_market_data:
-                    # Usar función real de obtención de datos
-                    real_data = self.get_real_market_data(symbol, 'H1')
+        return {symbol: self._get_symbol_market_data(symbol) for symbol in (symbols or self.symbols)}
+    
+    def _fetch_candles(self, symbol: str, timeframe: str, count: int, fallback):
+        """Velas ya persistidas por el motor (CandleStore) si están frescas; si no, fallback"""
+        try:
+            from data_management.candle_store import get_candle_store
+            store = get_candle_store()
+            if store.is_fresh(symbol, timeframe):
+                stored = store.read(symbol, timeframe, count=count)
+                if stored is not None and len(stored) >= min(count, 2):
+                    return stored
+        except Exception:
+            pass
+        return fallback(symbol, timeframe, count)
+    
+    def _get_symbol_market_data(self, symbol: str) -> Dict[str, Any]:
+        """Datos de mercado H1 de un símbolo"""
+        try:
+            get_real_market_data = getattr(self, 'get_real_market_data', None)
+            if get_real_market_data:
+                # Usar velas del motor o la función real de obtención de datos
+                real_data = self._fetch_candles(symbol, 'H1', 500, get_real_market_data)
+                
+                if real_data is not None and len(real_data) > 0:
+                    current_price = real_data['close'].iloc[-1]
+                    prev_price = real_data['close'].iloc[-2] if len(real_data) > 1 else current_price
+                    change_pips = (current_price - prev_price) * 10000
                     
-                    if real_data is not None and len(real_data) > 0:
-                        current_price = real_data['close'].iloc[-1]
-                        prev_price = real_data['close'].iloc[-2] if len(real_data) > 1 else current_price
-                        change_pips = (current_price - prev_price) * 10000
-                        
-                        # Calcular volatilidad (rango promedio de las últimas 10 velas)
-                        if len(real_data) >= 10:
-                            recent_data = real_data.tail(10)
-                            volatility = ((recent_data['high'] - recent_data['low']) * 10000).mean()
-                        else:
-                            volatility = 5.0
-                        
-                        # Determinar tendencia
-                        if change_pips > 1.0:
-                            trend = 'bullish'
-                        elif change_pips < -1.0:
-                            trend = 'bearish'
-                        else:
-                            trend = 'sideways'
-                        
-                        market_data[symbol] = {
-                            'price': current_price,
-                            'change_pips': change_pips,
-                            'volatility': volatility,
-                            'trend': trend,
-                            'data_source': real_data.get('data_source', ['REAL_DATA'])[0] if 'data_source' in real_data.columns else 'REAL_DATA',
-                            'last_update': datetime.now().strftime('%H:%M:%S')
-                        }
+                    # Calcular volatilidad (rango promedio de las últimas 10 velas)
+                    if len(real_data) >= 10:
+                        recent_data = real_data.tail(10)
+                        volatility = ((recent_data['high'] - recent_data['low']) * 10000).mean()
                     else:
-                        # Datos no disponibles
-                        market_data[symbol] = {
-                            'price': 0.0,
-                            'change_pips': 0.0,
-                            'volatility': 0.0,
-                            'trend': 'no_data',
-                            'data_source': 'NO_DATA',
-                            'last_update': datetime.now().strftime('%H:%M:%S')
-                        }
-                else:
-                    # Sin datos reales disponibles
-                    market_data[symbol] = {
-                        'price': 0.0,
-                        'change_pips': 0.0,
-                        'volatility': 0.0,
-                        'trend': 'no_data',
-                        'data_source': 'NO_REAL_DATA',
+                        volatility = 5.0
+                    
+                    # Determinar tendencia
+                    if change_pips > 1.0:
+                        trend = 'bullish'
+                    elif change_pips < -1.0:
+                        trend = 'bearish'
+                    else:
+                        trend = 'sideways'
+                    
+                    if 'data_source' in real_data.columns:
+                        data_source = real_data['data_source'].iloc[0]
+                    else:
+                        data_source = getattr(real_data, 'attrs', {}).get('data_source', 'REAL_DATA')
+                    return {
+                        'price': current_price,
+                        'change_pips': change_pips,
+                        'volatility': volatility,
+                        'trend': trend,
+                        'data_source': data_source,
                         'last_update': datetime.now().strftime('%H:%M:%S')
                     }
-                    
-            except Exception as e:
-                print(f"⚠️ Error obteniendo datos para {symbol}: {e}")
-                market_data[symbol] = {
+                # Datos no disponibles
+                return {
                     'price': 0.0,
                     'change_pips': 0.0,
                     'volatility': 0.0,
-                    'trend': 'error',
-                    'data_source': 'ERROR',
-                    'last_update': datetime.now().strftime('%H:%M:%S'),
-                    'error': str(e)
+                    'trend': 'no_data',
+                    'data_source': 'NO_DATA',
+                    'last_update': datetime.now().strftime('%H:%M:%S')
                 }
-        
-        return market_data
+            # Sin datos reales disponibles
+            return {
+                'price': 0.0,
+                'change_pips': 0.0,
+                'volatility': 0.0,
+                'trend': 'no_data',
+                'data_source': 'NO_REAL_DATA',
+                'last_update': datetime.now().strftime('%H:%M:%S')
+            }
+        except Exception as e:
+            print(f"⚠️ Error obteniendo datos para {symbol}: {e}")
+            return {
+                'price': 0.0,
+                'change_pips': 0.0,
+                'volatility': 0.0,
+                'trend': 'error',
+                'data_source': 'ERROR',
+                'last_update': datetime.now().strftime('%H:%M:%S'),
+                'error': str(e)
+            }
     
     def _get_internal_market_data(self, symbol: str, timeframe: str = 'H1', count: int = 500):
         """Método interno fallback para obtener datos de mercado"""
@@ -699,18 +770,100 @@ class RealICTDataCollector:
             return False
     
     def get_latest_data(self) -> Optional[DashboardData]:
-        """Obtener datos más recientes del sistema ICT real"""
+        """
+        Último snapshot publicado (lectura O(1) para el refresco de la UI).
+        
+        Arranca el productor en segundo plano si no está activo; la primera
+        llamada espera el primer snapshot. Con background_refresh=False
+        recolecta de forma síncrona.
+        """
+        if not self.background_refresh:
+            return self.collect_snapshot()
+        self.start_producer()
+        if self._latest_snapshot is None:
+            self._snapshot_ready.wait(timeout=max(30.0, self.refresh_interval * 2))
+        return self._latest_snapshot
+    
+    # ------------------------------------------------------------------
+    # Productor de snapshots
+    # ------------------------------------------------------------------
+    def start_producer(self) -> None:
+        """Arrancar el hilo productor de snapshots (idempotente)"""
+        with self._producer_lock:
+            if self._producer_thread is not None and self._producer_thread.is_alive():
+                return
+            self._producer_stop.clear()
+            self._producer_thread = threading.Thread(
+                target=self._producer_loop, name="DashboardSnapshotProducer", daemon=True
+            )
+            self._producer_thread.start()
+    
+    def stop_producer(self, timeout: float = 5.0) -> None:
+        """Detener el productor y el pool de símbolos"""
+        with self._producer_lock:
+            thread = self._producer_thread
+            self._producer_thread = None
+            self._producer_stop.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+        pool = self._symbol_pool
+        self._symbol_pool = None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    def _producer_loop(self) -> None:
+        while not self._producer_stop.is_set():
+            started = time.time()
+            self.collect_snapshot()
+            elapsed = time.time() - started
+            self._producer_stop.wait(max(0.0, self.refresh_interval - elapsed))
+    
+    def _collect_symbols(self) -> Dict[str, Dict[str, Any]]:
+        """Trabajo por símbolo (velas H1 + detección M15) en paralelo"""
+        def work(symbol: str) -> Dict[str, Any]:
+            return {
+                'market': self._get_symbol_market_data(symbol),
+                'patterns_now': self._detect_symbol_patterns(symbol),
+            }
+        
+        symbols = list(self.symbols)
+        if len(symbols) <= 1 or self.collector_workers <= 1:
+            return {symbol: work(symbol) for symbol in symbols}
+        if self._symbol_pool is None:
+            self._symbol_pool = ThreadPoolExecutor(max_workers=self.collector_workers,
+                                                   thread_name_prefix="DashboardSymbol")
+        futures = {symbol: self._symbol_pool.submit(work, symbol) for symbol in symbols}
+        results = {}
+        for symbol, future in futures.items():
+            try:
+                results[symbol] = future.result()
+            except Exception as e:
+                print(f"⚠️ Error recolectando {symbol}: {e}")
+                results[symbol] = {'market': {'price': 0.0, 'change_pips': 0.0, 'volatility': 0.0,
+                                              'trend': 'error', 'data_source': 'ERROR',
+                                              'last_update': datetime.now().strftime('%H:%M:%S'),
+                                              'error': str(e)},
+                                   'patterns_now': 0}
+        return results
+    
+    def collect_snapshot(self) -> Optional[DashboardData]:
+        """Recolectar y publicar un snapshot nuevo del sistema ICT real"""
         try:
             print("🔄 [RealDataCollector] Recopilando datos del sistema ICT...")
             
+            # 0. Trabajo por símbolo en paralelo (mercado + detección)
+            per_symbol = self._collect_symbols()
+            
             # 1. Estadísticas FVG reales
             fvg_stats = self._get_real_fvg_statistics()
             
             # 2. Estadísticas de patrones reales
-            pattern_stats = self._get_real_pattern_statistics()
+            pattern_stats = self._get_real_pattern_statistics(
+                sum(result['patterns_now'] for result in per_symbol.values())
+            )
             
             # 3. Datos de mercado reales
-            market_data = self._get_real_market_data()
+            market_data = {symbol: result['market'] for symbol, result in per_symbol.items()}
             
             # 4. Análisis de coherencia real
             coherence_analysis = self._get_real_coherence_analysis(market_data)
@@ -751,12 +904,12 @@ class RealICTDataCollector:
                 real_data_status=real_data_status
             )
             
-            # Guardar en historial
-            self.data_history.append(data)
+            # Publicar snapshot (reemplazo atómico de la referencia)
+            self._latest_snapshot = data
+            self._snapshot_ready.set()
             
-            # Mantener solo los últimos 100 registros
-            if len(self.data_history) > 100:
-                self.data_history = self.data_history[-100:]
+            # Guardar en historial (lista nueva: los lectores nunca ven una mutación)
+            self.data_history = (self.data_history + [data])[-100:]
             
             # Notificar callbacks
             for callback in self.callbacks:
@@ -942,6 +1095,8 @@ class RealICTDataCollector:
         start_time = time.time()
         
         try:
+            await asyncio.to_thread(self.stop_producer)
+            
             # === SHUTDOWN OPTIMIZADO PARALELO ===
             shutdown_tasks = []
             
@@ -1010,6 +1165,8 @@ class RealICTDataCollector:
         start_time = time.time()
         
         try:
+            self.stop_producer(timeout=min(timeout, 3.0))
+            
             # Cleanup síncrono rápido
             mt5_manager = self.components.get('mt5_data_manager')
             if mt5_manager and hasattr(mt5_manager, 'shutdown'):
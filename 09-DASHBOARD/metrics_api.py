@@ -8,17 +8,22 @@ Endpoints:
 - GET /metrics/summary
 - GET /metrics/cumulative
 - GET /metrics/all  (agregado de los tres)
+- GET /metrics/latency  (histogramas p50/p90/p99/max por ventana del agregador)
+- GET /metrics/stream   (server-sent events: solo counters/gauges que cambiaron)
 
 Uso rápido:
 > uvicorn metrics_api:app --reload --port 8090
 
-Lee los archivos JSON generados por ExecutionRouter. No mantiene estado en memoria
-más allá de lecturas puntuales.
+Lee los archivos JSON generados por ExecutionRouter a través de una caché de
+snapshots invalidada por mtime/tamaño del archivo (o alimentada directamente por el
+PerformanceMetricsAggregator vía attach_aggregator). Un único broadcaster lee las
+fuentes a ICT_METRICS_STREAM_INTERVAL segundos y reparte deltas a todos los
+clientes de /metrics/stream, así N dashboards no multiplican lecturas de disco.
 """
 from __future__ import annotations
 try:
     from fastapi import FastAPI, HTTPException  # type: ignore
-    from fastapi.responses import JSONResponse  # type: ignore
+    from fastapi.responses import JSONResponse, StreamingResponse  # type: ignore
     FASTAPI_AVAILABLE = True
 except ImportError:  # Fallback stubs so Pylance no marque errores si falta fastapi
     FASTAPI_AVAILABLE = False
@@ -29,6 +34,7 @@ except ImportError:  # Fallback stubs so Pylance no marque errores si falta fast
     class _StubJSONResponse(dict):  # simple container
         pass
     JSONResponse = _StubJSONResponse  # type: ignore
+    StreamingResponse = _StubJSONResponse  # type: ignore
     class _StubApp:
         def __init__(self, *_, **__): ...
         def get(self, *_, **__):  # decorator stub
@@ -37,43 +43,283 @@ except ImportError:  # Fallback stubs so Pylance no marque errores si falta fast
     def FastAPI(*_, **__):  # type: ignore
         return _StubApp()
 from pathlib import Path
-from typing import Dict, Any, Protocol, runtime_checkable, cast, Optional
+from typing import Dict, Any, Protocol, runtime_checkable, cast, Optional, List, Tuple, AsyncIterator
+from threading import RLock
+import asyncio
 import json
 import os
 import sys
+import time
 
 METRICS_DIR = Path(os.environ.get('ICT_METRICS_DIR', Path(__file__).parent.parent / '04-DATA' / 'metrics'))
+STREAM_INTERVAL_SEC = max(0.1, float(os.environ.get('ICT_METRICS_STREAM_INTERVAL', '1.0')))
+STREAM_FILES = ['metrics_live.json', 'metrics_summary.json', 'metrics_cumulative.json']
 
 app = FastAPI(title="ICT Engine Metrics API", version="1.0.0")
 
 
+class MetricsSnapshotCache:
+    """Caché de snapshots por nombre de fuente.
+
+    Las fuentes de archivo se revalidan con os.stat (mtime_ns + tamaño): mientras el
+    archivo no cambie no se vuelve a abrir ni parsear. Las fuentes en memoria (p.ej.
+    'aggregator') se publican con publish() desde el hook del agregador.
+    """
+
+    def __init__(self) -> None:
+        self._lock = RLock()
+        self._entries: Dict[str, Tuple[Optional[Tuple[int, int]], Dict[str, Any]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_file(self, path: Path) -> Dict[str, Any]:
+        """Devuelve el JSON de path; FileNotFoundError si no existe."""
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        key = str(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self.hits += 1
+                return entry[1]
+        data = _parse_json_file(path)
+        with self._lock:
+            self._entries[key] = (stamp, data)
+            self.misses += 1
+        return data
+
+    def publish(self, name: str, data: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[name] = (None, data)
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(name)
+        return entry[1] if entry is not None else None
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(name, None)
+                self._entries.pop(str(METRICS_DIR / name), None)
+
+
+_snapshot_cache = MetricsSnapshotCache()
+_attached_aggregator: Any = None
+
+
+def _load_jsonl_reader() -> Any:
+    """utils.jsonl_reader de 01-CORE (09-DASHBOARD tiene su propio paquete utils)."""
+    import importlib.util
+    path = Path(__file__).parent.parent / '01-CORE' / 'utils' / 'jsonl_reader.py'
+    spec = importlib.util.spec_from_file_location('ict_jsonl_reader', path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"jsonl_reader not found at {path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+_jsonl_reader = _load_jsonl_reader()
+
+
+def _parse_json_file(path: Path) -> Dict[str, Any]:
+    # JSON normal o JSON-lines: se lee la última línea desde el final del archivo
+    data = _jsonl_reader.read_last_json(path)
+    return data if isinstance(data, dict) else {}
+
+
 def _read_json(name: str) -> Dict[str, Any]:
     path = METRICS_DIR / name
-    if not path.exists():
-        raise HTTPException(status_code=404, detail=f"File {name} not found")
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                # Support JSON-lines by reading the last non-empty line
-                f.seek(0)
-                lines = [ln.strip() for ln in f.readlines() if ln.strip()]
-                if not lines:
-                    return {}
-                # Try parse last valid JSON object
-                for ln in reversed(lines):
-                    try:
-                        return json.loads(ln)
-                    except Exception:
-                        continue
-                return {}
-    except HTTPException:
-        raise
+        return _snapshot_cache.get_file(path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"File {name} not found")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error reading {name}: {e}")
 
 
+def attach_aggregator(aggregator: Any) -> bool:
+    """Conecta el agregador para que cada snapshot se publique en la caché en memoria."""
+    global _attached_aggregator
+    if aggregator is None or not hasattr(aggregator, 'add_snapshot_listener'):
+        return False
+    if _attached_aggregator is aggregator:
+        return True
+    aggregator.add_snapshot_listener(lambda snap: _snapshot_cache.publish('aggregator', snap))
+    _attached_aggregator = aggregator
+    return True
+
+
+def _try_attach_aggregator() -> None:
+    if _attached_aggregator is not None:
+        return
+    try:
+        sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+        from main import get_performance_metrics_instance
+        attach_aggregator(get_performance_metrics_instance())
+    except Exception:
+        pass
+
+
+def flatten_numeric(data: Any, prefix: str = '') -> Dict[str, float]:
+    """Aplana dicts anidados a {'a.b.c': valor} conservando solo hojas numéricas."""
+    out: Dict[str, float] = {}
+    if isinstance(data, dict):
+        for k, v in data.items():
+            key = f"{prefix}.{k}" if prefix else str(k)
+            if isinstance(v, dict):
+                out.update(flatten_numeric(v, key))
+            elif isinstance(v, (int, float)) and not isinstance(v, bool):
+                out[key] = v
+    return out
+
+
+def compute_metrics_delta(previous: Dict[str, float], current: Dict[str, float]) -> Dict[str, Any]:
+    """Delta entre dos vistas aplanadas: {'changed': {k: v}, 'removed': [k]}."""
+    changed = {k: v for k, v in current.items() if k not in previous or previous[k] != v}
+    removed = [k for k in previous if k not in current]
+    return {'changed': changed, 'removed': removed}
+
+
+def collect_stream_state() -> Dict[str, float]:
+    """Vista aplanada de counters/gauges de todas las fuentes (caché, sin re-parsear)."""
+    state: Dict[str, float] = {}
+    for name in STREAM_FILES:
+        try:
+            data = _snapshot_cache.get_file(METRICS_DIR / name)
+        except Exception:
+            continue
+        state.update(flatten_numeric(data, name.replace('.json', '')))
+    state.update(flatten_numeric(_aggregator_stream_view(), 'aggregator'))
+    return state
+
+
+def _aggregator_stream_view() -> Dict[str, Any]:
+    """Counters/gauges actuales del agregador conectado, sin esperar a un snapshot()."""
+    aggregator = _attached_aggregator
+    if aggregator is not None:
+        try:
+            if hasattr(aggregator, 'counters_and_gauges'):
+                return aggregator.counters_and_gauges()
+            return aggregator.snapshot()  # versiones sin lectura directa
+        except Exception:
+            pass
+    agg = _snapshot_cache.get('aggregator') or {}
+    return {k: agg.get(k, {}) for k in ('counters', 'gauges')}
+
+
+class MetricsBroadcaster:
+    """Productor único de deltas para todos los suscriptores de /metrics/stream.
+
+    Cada tick recolecta el estado una sola vez (archivos vía caché y counters/gauges
+    leídos directamente del agregador conectado), calcula el delta contra el tick
+    anterior y lo encola en cada suscriptor. Los suscriptores nuevos reciben
+    primero el estado completo.
+    """
+
+    def __init__(self, interval_sec: float = STREAM_INTERVAL_SEC, queue_size: int = 256):
+        self.interval = max(0.1, float(interval_sec))
+        self.queue_size = queue_size
+        self._subscribers: List[asyncio.Queue] = []
+        self._state: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def tick(self) -> Optional[Dict[str, Any]]:
+        """Recolecta y difunde; retorna el delta publicado o None si no hubo cambios."""
+        current = collect_stream_state()
+        delta = compute_metrics_delta(self._state, current)
+        self._state = current
+        if not delta['changed'] and not delta['removed']:
+            return None
+        delta['timestamp'] = time.time()
+        for queue in list(self._subscribers):
+            event = delta
+            if queue.full():
+                # Cliente lento: reemplazar su cola por el estado completo
+                while not queue.empty():
+                    queue.get_nowait()
+                event = {'changed': dict(current), 'removed': [], 'timestamp': delta['timestamp'], 'full': True}
+            queue.put_nowait(event)
+        return delta
+
+    async def _run(self) -> None:
+        while self._subscribers:
+            try:
+                self.tick()
+            except Exception:
+                pass
+            await asyncio.sleep(self.interval)
+        self._task = None
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        if not self._subscribers:
+            self._state = collect_stream_state()
+        queue.put_nowait({'changed': dict(self._state), 'removed': [], 'timestamp': time.time(), 'full': True})
+        self._subscribers.append(queue)
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+
+_broadcaster = MetricsBroadcaster()
+
+
+def _merge_deltas(deltas: List[Dict[str, Any]]) -> Dict[str, Any]:
+    changed: Dict[str, float] = {}
+    removed: set = set()
+    for d in deltas:
+        for k in d.get('removed', []):
+            changed.pop(k, None)
+            removed.add(k)
+        for k, v in d.get('changed', {}).items():
+            changed[k] = v
+            removed.discard(k)
+    merged: Dict[str, Any] = {'changed': changed, 'removed': sorted(removed), 'timestamp': deltas[-1].get('timestamp')}
+    if any(d.get('full') or d.get('resync') for d in deltas):
+        merged['full'] = any(d.get('full') for d in deltas)
+        merged['resync'] = any(d.get('resync') for d in deltas)
+    return merged
+
+
+async def _sse_events(interval: Optional[float]) -> AsyncIterator[str]:
+    queue = _broadcaster.subscribe()
+    client_interval = max(_broadcaster.interval, float(interval or 0.0))
+    try:
+        while True:
+            deltas = [await queue.get()]
+            if client_interval > _broadcaster.interval:
+                # Coalescer lo acumulado durante el intervalo propio del cliente
+                await asyncio.sleep(client_interval - _broadcaster.interval)
+            while not queue.empty():
+                deltas.append(queue.get_nowait())
+            yield f"data: {json.dumps(_merge_deltas(deltas), ensure_ascii=False)}\n\n"
+    finally:
+        _broadcaster.unsubscribe(queue)
+
+
+@app.get('/metrics/stream')
+async def get_stream(interval: Optional[float] = None):  # pragma: no cover - runtime
+    """📡 Server-sent events con los counters/gauges que cambiaron (primer evento: estado completo)"""
+    _try_attach_aggregator()
+    return StreamingResponse(
+        _sse_events(interval),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
 @app.get('/metrics/live')
 async def get_live():  # pragma: no cover - runtime
     return JSONResponse(_read_json('metrics_live.json'))
@@ -121,6 +367,7 @@ async def get_aggregator_metrics():  # pragma: no cover - runtime
         aggregator = cast(_AggregatorLike | None, get_performance_metrics_instance())
         if aggregator is None:
             raise HTTPException(status_code=503, detail="PerformanceMetricsAggregator not initialized")
+        attach_aggregator(aggregator)
             
         # Export current metrics from aggregator
         metrics_data = {
@@ -138,6 +385,41 @@ async def get_aggregator_metrics():  # pragma: no cover - runtime
         raise HTTPException(status_code=500, detail=f"Error getting aggregator metrics: {e}")
 
 
+def get_latency_histograms(name: Optional[str] = None) -> Dict[str, Any]:
+    """Histogramas de latencia del PerformanceMetricsAggregator en vivo.
+
+    Cada entrada: {'window': {count, avg, p50, p90, p99, max, window_seconds},
+    'total': {...}}. `name` filtra por prefijo (p.ej. 'latency.analysis').
+    """
+    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+    from main import get_performance_metrics_instance
+
+    aggregator = get_performance_metrics_instance()
+    if aggregator is None or not hasattr(aggregator, 'histogram_snapshot'):
+        raise HTTPException(status_code=503, detail="PerformanceMetricsAggregator not initialized")
+    histograms = aggregator.histogram_snapshot()
+    if name:
+        histograms = {k: v for k, v in histograms.items() if k.startswith(name)}
+    return histograms
+
+
+@app.get('/metrics/latency')
+async def get_latency(name: Optional[str] = None):  # pragma: no cover - runtime
+    """⏱️ Percentiles de latencia (p50/p90/p99/max) por ventana y acumulados"""
+    try:
+        from datetime import datetime
+        return JSONResponse({
+            'histograms': get_latency_histograms(name),
+            'timestamp': datetime.now().isoformat()
+        })
+    except HTTPException:
+        raise
+    except ImportError as e:
+        raise HTTPException(status_code=503, detail=f"PerformanceMetricsAggregator not available: {e}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting latency histograms: {e}")
+
+
 @app.get('/dashboard/coordinator/state')
 async def get_coordinator_state():  # pragma: no cover - runtime
     """📊 Obtener estado completo del TabCoordinator"""
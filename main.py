@@ -481,6 +481,11 @@ class ICTEnterpriseManager:
                     self.realtime_data_processor = RealTimeDataProcessor(symbols, processor_config)
                     self.logger.info("✅ RealtimeDataProcessor initialized")
                     
+                    # Correlaciones rolling del RiskManager alimentadas por cierre de vela
+                    risk_manager = getattr(self.risk_pipeline, 'risk_manager', None)
+                    if risk_manager is not None and hasattr(risk_manager, 'attach_bar_feed'):
+                        risk_manager.attach_bar_feed(self.realtime_data_processor)
+                    
                     # Start processing
                     self.realtime_data_processor.start()
                     self.logger.info("✅ RealtimeDataProcessor started")
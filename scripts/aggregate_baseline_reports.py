@@ -4,7 +4,9 @@ Aggregate Baseline Reports
 ==========================
 
 Reads JSON files generated by `scripts/baseline_pattern_scan.py` (pattern: baseline_*_*.json)
-under `04-DATA/reports/` and produces a consolidated summary JSON:
+under `04-DATA/reports/` and produces a consolidated summary JSON. Appended JSON-lines
+reports (baseline_*_*.jsonl) are also accepted; only their newest record is used and it
+is read from the end of the file.
 
 - Per symbol + timeframe + detector: count of files, total signals, average/max confidence
 - Global summary across all symbols/timeframes
@@ -16,9 +18,17 @@ python -X utf8 .\\scripts\\aggregate_baseline_reports.py -i .\\04-DATA\\reports
 from __future__ import annotations
 import argparse
 import json
+import sys
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CORE_DIR = REPO_ROOT / "01-CORE"
+if str(CORE_DIR) not in sys.path:
+    sys.path.insert(0, str(CORE_DIR))
+
+from utils.jsonl_reader import read_last_json  # noqa: E402
+
 
 def _get_detector_stats(detectors_obj: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
     out: Dict[str, Dict[str, float]] = {}
@@ -43,7 +53,7 @@ def _get_detector_stats(detectors_obj: Dict[str, Any]) -> Dict[str, Dict[str, fl
 
 
 def aggregate_reports(in_dir: Path) -> Dict[str, Any]:
-    files = sorted(in_dir.glob('baseline_*_*.json'))
+    files = sorted(list(in_dir.glob('baseline_*_*.json')) + list(in_dir.glob('baseline_*_*.jsonl')))
     summary: Dict[str, Any] = {
         'meta': {
             'reports_dir': str(in_dir),
@@ -64,8 +74,9 @@ def aggregate_reports(in_dir: Path) -> Dict[str, Any]:
 
     for fp in files:
         try:
-            with fp.open('r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = read_last_json(fp)
+            if not isinstance(data, dict):
+                raise ValueError('no valid JSON document')
         except Exception as e:
             error_files.append({'file': str(fp), 'error': f'load_error: {e}'})
             continue
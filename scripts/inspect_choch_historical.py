@@ -20,7 +20,7 @@ def main():
     args = parser.parse_args()
 
     mem = get_choch_historical_memory()
-    recs = mem._db.get('records', [])
+    recs = mem.all_records()
     print(f"Total CHoCH records: {len(recs)}")
 
     # Summaries
@@ -0,0 +1,101 @@
+"""PatternMemoryIndex: bisect range queries vs. the legacy full scan, and the memory-system query on top."""
+from datetime import datetime, timedelta, timezone
+import random
+
+from analysis.pattern_memory_index import PatternMemoryIndex, pattern_epoch
+
+
+def _legacy_scan(patterns, cutoff, pattern_type=None, timeframe=None, symbol=None):
+    out = []
+    for p in patterns:
+        epoch = pattern_epoch(p.get('timestamp'))
+        if epoch is None or epoch < cutoff:
+            continue
+        if pattern_type and p.get('pattern_type') != pattern_type:
+            continue
+        if timeframe and p.get('timeframe') != timeframe:
+            continue
+        if symbol and p.get('symbol') != symbol:
+            continue
+        out.append(p)
+    return sorted(out, key=lambda p: pattern_epoch(p['timestamp']))
+
+
+def _patterns(n, seed=0):
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    patterns = []
+    for _ in range(n):
+        ts = now - timedelta(minutes=rng.randint(0, 60 * 24 * 60))
+        fmt = rng.choice(['iso', 'z', 'plain', 'bad'])
+        if fmt == 'iso':
+            stamp = ts.isoformat()
+        elif fmt == 'z':
+            stamp = ts.strftime('%Y-%m-%dT%H:%M:%SZ')
+        elif fmt == 'plain':
+            stamp = ts.astimezone().replace(tzinfo=None).strftime('%Y-%m-%d %H:%M:%S')
+        else:
+            stamp = rng.choice(['', 'not-a-date'])
+        patterns.append({
+            'timestamp': stamp,
+            'symbol': rng.choice(['EURUSD', 'GBPUSD', 'XAUUSD']),
+            'timeframe': rng.choice(['M5', 'M15', 'H1']),
+            'pattern_type': rng.choice(['FVG', 'order_block', 'institutional_flow']),
+        })
+    return patterns
+
+
+def test_query_matches_full_scan():
+    patterns = _patterns(1500)
+    index = PatternMemoryIndex()
+    for p in patterns:
+        index.add(p)
+    now = datetime.now(timezone.utc).timestamp()
+
+    for days in (1, 7, 30, 90):
+        cutoff = now - days * 86400
+        for filters in ({}, {'symbol': 'EURUSD'}, {'timeframe': 'H1', 'pattern_type': 'FVG'},
+                        {'symbol': 'XAUUSD', 'timeframe': 'M5', 'pattern_type': 'order_block'},
+                        {'symbol': 'USDJPY'}):
+            got = index.query(start=cutoff, **filters)
+            assert [id(p) for p in got] == [id(p) for p in _legacy_scan(patterns, cutoff, **filters)]
+
+
+def test_remove_and_latest_keep_time_order():
+    patterns = _patterns(300, seed=1)
+    index = PatternMemoryIndex()
+    indexed = [p for p in patterns if index.add(p)]
+    for p in indexed[:100]:
+        assert index.remove(p)
+    remaining = sorted(indexed[100:], key=lambda p: pattern_epoch(p['timestamp']))
+
+    assert len(index) == len(remaining)
+    assert index.query() == remaining
+    assert index.latest(10) == remaining[-10:]
+    assert index.query(symbol='EURUSD') == [p for p in remaining if p['symbol'] == 'EURUSD']
+
+
+def test_memory_system_historical_patterns_use_index():
+    from analysis.unified_memory_system import TraderConfidenceEvaluator, UnifiedMemorySystem
+
+    system = UnifiedMemorySystem()
+    old = (datetime.now(timezone.utc) - timedelta(days=45)).isoformat()
+    system.store_pattern_memory('EURUSD', {'pattern_type': 'institutional_flow', 'session': 'London',
+                                           'confidence': 65, 'timeframe': 'M15'})
+    system.store_pattern_memory('EURUSD', {'pattern_type': 'institutional_flow', 'session': 'new_york',
+                                           'confidence': 0.9})
+    system.store_pattern_memory('GBPUSD', {'pattern_type': 'institutional_flow', 'session': 'london',
+                                           'confidence': 0.2})
+    system.store_pattern_memory('EURUSD', {'pattern_type': 'institutional_flow', 'session': 'london',
+                                           'confidence': 0.8, 'timestamp': old})
+
+    flows = system.get_historical_patterns(pattern_type='institutional_flow', session='london', min_confidence=0.3)
+    assert [(p['symbol'], p['confidence']) for p in flows] == [('EURUSD', 65)]
+    assert len(system.get_historical_patterns(symbol='EURUSD', lookback_days=60)) == 3
+    assert system.get_historical_patterns(pattern_type='market_maker') == []
+
+    evaluator = TraderConfidenceEvaluator(system)
+    result = evaluator.get_historical_patterns(pattern_type='institutional_flow', symbol='EURUSD')
+    assert result['status'] == 'success'
+    assert result['patterns'] == system.get_historical_patterns(pattern_type='institutional_flow', symbol='EURUSD')
+    assert result['count'] == 2
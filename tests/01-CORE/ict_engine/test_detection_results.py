@@ -0,0 +1,24 @@
+"""Shared detection results: the pool publishes per symbol/timeframe, readers see the latest."""
+import pandas as pd
+
+from ict_engine.detection_results import bar_key, get_detection_result_cache
+from optimization.detector_pool_manager import AnalysisTask, EnhancedDetectorPoolManager
+
+
+def _frame(n):
+    index = pd.date_range('2026-01-05 06:00', periods=n, freq='15min')
+    return pd.DataFrame({'open': 1.1, 'high': 1.2, 'low': 1.0, 'close': 1.1}, index=index)
+
+
+def test_pool_publishes_latest_result_per_symbol():
+    cache = get_detection_result_cache()
+    cache.clear()
+    pool = EnhancedDetectorPoolManager(pool_size=1)
+    pool._publish_result(AnalysisTask('t1', _frame(50), 'm15', symbol='EURUSD'), ['a'])
+    pool._publish_result(AnalysisTask('t2', _frame(51), 'M15', symbol='EURUSD'), ['a', 'b'])
+
+    entry = cache.latest('EURUSD', 'M15')
+    assert entry.count == 2 and entry.source == 'engine'
+    assert entry.bar_key == bar_key(_frame(51))
+    assert cache.latest('GBPUSD', 'M15') is None
+    assert cache.latest('EURUSD', 'M15', max_age=-1.0) is None
@@ -0,0 +1,76 @@
+"""Parity: rolling displacement kernel vs. the legacy per-window iloc analysis."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ict_engine.displacement_detector_enterprise import DisplacementDetectorEnterprise
+
+
+@pytest.fixture(scope='module')
+def detector():
+    det = DisplacementDetectorEnterprise()
+    det.min_displacement_pips = 20.0
+    det.momentum_threshold = 0.5
+    return det
+
+
+def _candles(seed, n, volume_nan=False, tick_volume=False):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.002, n))
+    open_ = np.r_[close[0], close[:-1]] + rng.normal(0, 0.0005, n)
+    data = {
+        'open': open_,
+        'high': np.maximum(open_, close) + np.abs(rng.normal(0, 0.001, n)),
+        'low': np.minimum(open_, close) - np.abs(rng.normal(0, 0.001, n)),
+        'close': close,
+        'volume': rng.integers(100, 2000, n).astype(float),
+    }
+    if volume_nan:
+        data['volume'][rng.integers(0, n, 10)] = np.nan
+    if tick_volume:
+        data['tick_volume'] = rng.integers(100, 2000, n).astype(float)
+    return pd.DataFrame(data, index=pd.date_range('2025-01-01', periods=n, freq='15min'))
+
+
+def _legacy_candidates(det, data, window_size):
+    out = []
+    for i in range(window_size, len(data) - 1):
+        signal = det._analyze_displacement_window(data.iloc[i - window_size:i + 1], 'EURUSD', 'M15', i)
+        if signal:
+            out.append((i, signal))
+    return out
+
+
+@pytest.mark.parametrize('seed,volume_nan,tick_volume', [
+    (0, False, False), (1, True, False), (2, False, True),
+])
+def test_scan_matches_legacy_windows(detector, seed, volume_nan, tick_volume):
+    data = _candles(seed, 400, volume_nan, tick_volume)
+    window_size = min(16, len(data) // 4)
+    expected = _legacy_candidates(detector, data, window_size)
+    got = detector._scan_displacement_candidates(data, 'EURUSD', 'M15', window_size)
+
+    assert expected
+    assert [i for i, _ in got] == [i for i, _ in expected]
+    for (_, new), (_, old) in zip(got, expected):
+        assert new.displacement_type == old.displacement_type
+        assert new.timestamp == old.timestamp
+        assert new.start_price == old.start_price and new.end_price == old.end_price
+        assert new.displacement_pips == pytest.approx(old.displacement_pips)
+        assert new.momentum_score == pytest.approx(old.momentum_score)
+        assert new.institutional_signature == old.institutional_signature
+        assert new.target_estimation == pytest.approx(old.target_estimation)
+        assert new.confluence_factors == old.confluence_factors
+
+
+def test_detection_keeps_one_signal_per_move(detector):
+    data = _candles(3, 400)
+    window_size = min(16, len(data) // 4)
+    candidates = detector._scan_displacement_candidates(data, 'EURUSD', 'M15', window_size)
+    signals = detector.detect_displacement(data, 'EURUSD', 'M15')
+
+    assert 0 < len(signals) < len(candidates)
+    for prev, curr in zip(signals, signals[1:]):
+        adjacent = curr.timestamp - prev.timestamp == pd.Timedelta('15min')
+        assert not (adjacent and prev.displacement_type == curr.displacement_type)
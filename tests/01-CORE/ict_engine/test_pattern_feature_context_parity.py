@@ -0,0 +1,107 @@
+"""Parity: detectors with feature_context=None vs. the shared PatternFeatureContext."""
+from dataclasses import asdict, is_dataclass
+from enum import Enum
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ict_engine.advanced_patterns import (
+    JudasSwingDetectorEnterprise,
+    LiquidityGrabDetectorEnterprise,
+    OrderBlockMitigationDetectorEnterprise,
+    SilverBulletDetectorEnterprise,
+)
+from ict_engine.advanced_patterns.pattern_feature_context import PatternFeatureContext
+from ict_engine.advanced_patterns.silver_bullet_enterprise import TradingDirection
+
+SEEDS = (0, 1, 7, 42)
+VOLATILE_FIELDS = {'timestamp', 'expiry_time', 'analysis_id'}
+
+
+def _candles(seed, n=200, with_volume=True):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0008, n))
+    open_ = np.r_[close[0], close[:-1]]
+    data = {
+        'open': open_,
+        'high': np.maximum(open_, close) + rng.random(n) * 0.0006,
+        'low': np.minimum(open_, close) - rng.random(n) * 0.0006,
+        'close': close,
+    }
+    if with_volume:
+        data['volume'] = rng.integers(100, 2000, n).astype(float)
+    index = pd.date_range('2026-01-05 06:00', periods=n, freq='15min')
+    return pd.DataFrame(data, index=index)
+
+
+def _normalize(value, approx=False):
+    if is_dataclass(value) and not isinstance(value, type):
+        value = asdict(value)
+    if isinstance(value, dict):
+        return {k: _normalize(v, approx) for k, v in value.items() if k not in VOLATILE_FIELDS}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v, approx) for v in value]
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return pytest.approx(float(value), rel=1e-12, abs=1e-12) if approx else float(value)
+    return value
+
+
+def _assert_same(legacy, shared):
+    assert _normalize(shared) == _normalize(legacy, approx=True)
+
+
+@pytest.fixture(scope='module')
+def detectors():
+    return {
+        'silver_bullet': SilverBulletDetectorEnterprise(),
+        'judas': JudasSwingDetectorEnterprise(),
+        'liquidity_grab': LiquidityGrabDetectorEnterprise(),
+        'ob_mitigation': OrderBlockMitigationDetectorEnterprise(),
+    }
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+@pytest.mark.parametrize('with_volume', (True, False))
+def test_helpers_match_pandas_path(detectors, seed, with_volume):
+    data = _candles(seed, with_volume=with_volume)
+    ctx = PatternFeatureContext.build(data, 'EURUSD', 'M15')
+
+    silver = detectors['silver_bullet']
+    _assert_same(silver._analyze_market_structure_enterprise(data),
+                 silver._analyze_market_structure_enterprise(data, None, ctx))
+    for direction in (TradingDirection.BUY, TradingDirection.SELL):
+        _assert_same(silver._estimate_choch_break_level(data, direction),
+                     silver._estimate_choch_break_level(data, direction, ctx))
+
+    judas = detectors['judas']
+    _assert_same(judas._identify_swing_levels_enterprise(data, lookback=20),
+                 judas._identify_swing_levels_enterprise(data, lookback=20, feature_context=ctx))
+    _assert_same(judas._analyze_volume_spike_enterprise(data),
+                 judas._analyze_volume_spike_enterprise(data, ctx))
+
+    grab = detectors['liquidity_grab']
+    _assert_same(grab._map_liquidity_levels_enterprise(data),
+                 grab._map_liquidity_levels_enterprise(data, ctx))
+    _assert_same(grab._analyze_volume_spike_enterprise(data),
+                 grab._analyze_volume_spike_enterprise(data, ctx))
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_detectors_match_pandas_path(detectors, seed):
+    data = _candles(seed)
+    ctx = PatternFeatureContext.build(data, 'EURUSD', 'M15')
+    calls = (
+        ('silver_bullet', 'detect_silver_bullet_patterns'),
+        ('judas', 'detect_judas_swing_patterns'),
+        ('liquidity_grab', 'detect_liquidity_grab_patterns'),
+        ('ob_mitigation', 'detect_order_block_mitigation_patterns'),
+    )
+    for name, method in calls:
+        detect = getattr(detectors[name], method)
+        _assert_same(detect(data, 'EURUSD', 'M15'),
+                     detect(data, 'EURUSD', 'M15', feature_context=ctx))
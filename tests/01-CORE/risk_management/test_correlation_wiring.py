@@ -0,0 +1,78 @@
+"""RiskManager.on_bar_close wired to RealTimeDataProcessor bar callbacks."""
+from datetime import datetime, timedelta, timezone
+import math
+
+from production.realtime_data_processor import CandleData, RealTimeDataProcessor
+from risk_management.risk_manager import RiskManager
+
+
+def _publish(processor, symbol, timeframe, when, close):
+    candle = CandleData(symbol, timeframe, when, close, close, close, close, 1)
+    processor._publish_closed_candles(symbol, [candle])
+
+
+def test_closed_bars_feed_correlation_engine():
+    processor = RealTimeDataProcessor(['EURUSD', 'GBPUSD'])
+    risk_manager = RiskManager(mode='test')
+    assert risk_manager.attach_bar_feed(processor)
+    assert risk_manager._on_processor_bar in processor.bar_callbacks
+
+    start = datetime(2026, 1, 5, tzinfo=timezone.utc)
+    for i in range(40):
+        drift = 0.001 * math.sin(i) + 0.0001 * i
+        _publish(processor, 'EURUSD', 'H1', start + timedelta(hours=i), 1.10 * (1 + drift))
+        _publish(processor, 'GBPUSD', 'H1', start + timedelta(hours=i), 1.30 * (1 + drift))
+
+    engine = risk_manager.get_correlation_engine('H1')
+    assert engine.is_ready('EURUSD') and engine.is_ready('GBPUSD')
+    assert engine.correlation('EURUSD', 'GBPUSD') > 0.99
+
+
+def test_other_timeframes_do_not_create_engines():
+    processor = RealTimeDataProcessor(['EURUSD'])
+    risk_manager = RiskManager(mode='test')
+    risk_manager.attach_bar_feed(processor)
+
+    start = datetime(2026, 1, 5, tzinfo=timezone.utc)
+    for i in range(5):
+        _publish(processor, 'EURUSD', 'M5', start + timedelta(minutes=5 * i), 1.10)
+
+    assert 'M5' not in risk_manager._correlation_engines
+
+
+def test_late_symbol_correlates_on_pairwise_overlap():
+    processor = RealTimeDataProcessor(['EURUSD', 'GBPUSD'])
+    risk_manager = RiskManager(mode='test')
+    risk_manager.attach_bar_feed(processor)
+
+    start = datetime(2026, 1, 5, tzinfo=timezone.utc)
+    for i in range(100):
+        drift = 0.001 * math.sin(i) + 0.0001 * i
+        _publish(processor, 'EURUSD', 'H1', start + timedelta(hours=i), 1.10 * (1 + drift))
+        if i >= 70 and i % 5:
+            _publish(processor, 'GBPUSD', 'H1', start + timedelta(hours=i), 1.30 * (1 + drift))
+
+    engine = risk_manager.get_correlation_engine('H1')
+    overlap = engine.observations('GBPUSD')
+    assert engine.min_periods <= overlap < 30
+    # Solo las filas con ambos presentes cuentan: los huecos no diluyen ρ
+    assert engine.correlation('EURUSD', 'GBPUSD') > 0.9
+
+
+def test_symbols_are_warmed_up_once(monkeypatch):
+    import data_management.candle_store as candle_store
+
+    reads = []
+
+    class _EmptyStore:
+        def read_arrays(self, symbol, timeframe, count=None):
+            reads.append(symbol)
+            raise KeyError(symbol)
+
+    monkeypatch.setattr(candle_store, 'get_candle_store', lambda: _EmptyStore())
+    risk_manager = RiskManager(mode='test')
+    positions = [{'symbol': 'GBPUSD'}]
+    for _ in range(3):
+        risk_manager.calculate_correlation_risk(positions, 'EURUSD')
+
+    assert sorted(reads) == ['EURUSD', 'GBPUSD']
@@ -0,0 +1,64 @@
+"""Parity: vectorized FVG kernel vs. the legacy row-by-row iloc scan."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.fvg_kernel import find_fair_value_gaps
+from smart_money_concepts.fair_value_gaps import FairValueGapDetector, FVGDirection
+
+
+def _legacy_scan(candles, min_gap_pips):
+    """Legacy loop from detect_fair_value_gaps (before vectorization)."""
+    out = []
+    for i in range(1, len(candles) - 1):
+        prev_candle = candles.iloc[i - 1]
+        next_candle = candles.iloc[i + 1]
+        if next_candle['low'] > prev_candle['high']:
+            gap_size = next_candle['low'] - prev_candle['high']
+            if gap_size * 10000 >= min_gap_pips:
+                out.append(('bullish', i, next_candle['low'], prev_candle['high'], gap_size))
+        elif next_candle['high'] < prev_candle['low']:
+            gap_size = prev_candle['low'] - next_candle['high']
+            if gap_size * 10000 >= min_gap_pips:
+                out.append(('bearish', i, prev_candle['low'], next_candle['high'], gap_size))
+    return out
+
+
+def _candles(seed, n):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0006, n))
+    high = close + np.abs(rng.normal(0, 0.0003, n))
+    low = close - np.abs(rng.normal(0, 0.0003, n))
+    high[rng.integers(0, n, 3)] = np.nan
+    return pd.DataFrame({'open': close, 'high': high, 'low': low, 'close': close,
+                         'volume': rng.integers(10, 500, n)})
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2, 3])
+def test_kernel_matches_legacy_scan(seed):
+    candles = _candles(seed, 2000)
+    expected = _legacy_scan(candles, 3.0)
+    gaps = find_fair_value_gaps(candles['high'].to_numpy(), candles['low'].to_numpy(), min_gap_pips=3.0)
+    got = [('bullish' if gaps.bullish[k] else 'bearish', int(gaps.indices[k]), gaps.high_prices[k],
+            gaps.low_prices[k], gaps.gap_sizes[k]) for k in range(len(gaps))]
+    assert expected
+    assert got == expected
+    np.testing.assert_allclose(gaps.midpoints, (gaps.high_prices + gaps.low_prices) / 2.0)
+
+
+def test_detector_output_matches_legacy_scan(monkeypatch):
+    candles = _candles(7, 1500)
+    detector = FairValueGapDetector()
+    # Post-detection enhancements are unchanged; compare the raw scan output
+    monkeypatch.setattr(detector, '_apply_enterprise_enhancements', lambda fvgs, *_: fvgs)
+    monkeypatch.setattr(detector, '_validate_fvg_multi_timeframe', lambda fvgs, *_: fvgs)
+    expected = _legacy_scan(candles, detector.config['min_gap_size_pips'])
+    fvgs = detector.detect_fair_value_gaps(candles, 'EURUSD', 'M5')
+    assert len(fvgs) == len(expected)
+    for fvg, (direction, idx, high, low, gap_size) in zip(fvgs, expected):
+        assert fvg.direction == (FVGDirection.BULLISH if direction == 'bullish' else FVGDirection.BEARISH)
+        assert (fvg.candle_index, fvg.high_price, fvg.low_price, fvg.gap_size) == (idx, high, low, gap_size)
+        gap_pips = gap_size * 10000
+        assert fvg.score == int(55 + min(gap_pips * 2, 25))
+        assert fvg.confidence == min(0.4 + min(gap_pips * 0.05, 0.4), 0.9)
@@ -0,0 +1,202 @@
+"""Intrabar zone mitigation: tracker vs. brute-force per-zone reference, FVG/OB wiring."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.mitigation_tracker import ZoneMitigationTracker
+from smart_money_concepts.fair_value_gaps import (
+    FairValueGap, FairValueGapDetector, FVGDirection, FVGStatus,
+)
+from smart_money_concepts.order_blocks import (
+    EnhancedOrderBlock, EnhancedOrderBlockDetector, OrderBlockType,
+)
+
+
+def _reference(zones, bars):
+    """Per-zone loop: fill from the bar extreme, touch per bar, close-through invalidates."""
+    state = {z[0]: {'fill': 0.0, 'touches': 0, 'mitigated': False, 'invalidated': False, 'open': True}
+             for z in zones}
+    for high, low, close in bars:
+        for zone_id, z_low, z_high, bullish in zones:
+            s = state[zone_id]
+            if not s['open']:
+                continue
+            reached = z_high > low if bullish else z_low < high
+            if not reached:
+                continue
+            depth = (z_high - low) if bullish else (high - z_low)
+            size = z_high - z_low
+            fill = min(1.0, max(0.0, depth / size)) * 100.0 if size > 0 else 100.0
+            s['fill'] = max(s['fill'], fill)
+            s['touches'] += 1
+            s['mitigated'] = s['fill'] >= 100.0
+            s['invalidated'] = close < z_low if bullish else close > z_high
+            s['open'] = not (s['mitigated'] or s['invalidated'])
+    return state
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_tracker_matches_reference(seed):
+    rng = np.random.default_rng(seed)
+    zones = []
+    for k in range(300):
+        low = 1.1 + rng.normal(0, 0.01)
+        zones.append((f'Z{k}', low, low + abs(rng.normal(0, 0.002)), bool(rng.integers(0, 2))))
+    close = 1.1 + np.cumsum(rng.normal(0, 0.001, 200))
+    bars = [(c + abs(rng.normal(0, 0.001)), c - abs(rng.normal(0, 0.001)), c) for c in close]
+
+    tracker = ZoneMitigationTracker()
+    assert tracker.add_zones('EURUSD', zones) == len(zones)
+    latest = tracker.update_bars('EURUSD', *zip(*bars))
+    expected = _reference(zones, bars)
+
+    for zone_id, ref in expected.items():
+        if ref['touches'] == 0:
+            assert zone_id not in latest
+            continue
+        got = latest[zone_id]
+        assert got.fill_percentage == pytest.approx(ref['fill'])
+        assert got.touch_count == ref['touches']
+        assert got.mitigated == ref['mitigated']
+        assert got.invalidated == ref['invalidated']
+    assert tracker.open_zones('EURUSD') == sum(1 for s in expected.values() if s['open'])
+
+
+def test_forming_candle_counts_one_touch():
+    tracker = ZoneMitigationTracker()
+    tracker.add_zone('EURUSD', 'A', 1.1000, 1.1010, bullish=True)
+    ts = pd.Timestamp('2025-01-01 10:00')
+    tracker.update('EURUSD', 1.1020, 1.1008, 1.1015, bar_time=ts)
+    states = tracker.update('EURUSD', 1.1020, 1.1004, 1.1015, bar_time=ts)
+    assert states[0].touch_count == 1
+    assert states[0].fill_percentage == pytest.approx(60.0)
+
+
+def _fvg(direction, low, high):
+    return FairValueGap(
+        fvg_id=f'FVG_{direction.value}', direction=direction, high_price=high, low_price=low,
+        gap_size=high - low, gap_pips=(high - low) * 10000, score=60, confidence=0.5,
+        timestamp=pd.Timestamp('2025-01-01 09:00').to_pydatetime(), symbol='EURUSD',
+        timeframe='M15', candle_index=0,
+    )
+
+
+def test_fvg_wick_through_is_mitigated_without_invalidation():
+    detector = FairValueGapDetector()
+    bullish = _fvg(FVGDirection.BULLISH, 1.1000, 1.1010)
+    bearish = _fvg(FVGDirection.BEARISH, 1.1050, 1.1060)
+    # Wick below the bullish gap, close back above it: the close-only check missed this
+    candles = pd.DataFrame({'open': [1.1030], 'high': [1.1040], 'low': [1.0995], 'close': [1.1030]},
+                           index=pd.DatetimeIndex([pd.Timestamp('2025-01-01 10:00')]))
+
+    detector.update_fvg_mitigation([bullish, bearish], candles)
+
+    assert bullish.status == FVGStatus.FULLY_MITIGATED
+    assert bullish.fill_percentage == 100.0 and bullish.touch_count == 1
+    assert not bullish.invalidated
+    assert bearish.status == FVGStatus.ACTIVE and bearish.touch_count == 0
+
+
+def test_books_are_keyed_by_timeframe():
+    tracker = ZoneMitigationTracker()
+    tracker.add_zone('EURUSD', 'A', 1.1000, 1.1010, bullish=True, timeframe='M15')
+    tracker.add_zone('EURUSD', 'B', 1.1000, 1.1010, bullish=True, timeframe='H1')
+    states = tracker.update('EURUSD', 1.1020, 1.0990, 1.1015, timeframe='H1')
+    assert [s.zone_id for s in states] == ['B']
+    assert tracker.is_tracking('EURUSD', 'A', timeframe='M15')
+    assert tracker.open_zones('EURUSD', timeframe='H1') == 0
+
+
+def _bars(lows, start='2025-01-01 10:00'):
+    index = pd.date_range(start, periods=len(lows), freq='15min')
+    lows = np.asarray(lows, dtype=float)
+    return pd.DataFrame({'open': lows + 0.0020, 'high': lows + 0.0030, 'low': lows, 'close': lows + 0.0025},
+                        index=index)
+
+
+def test_fvg_mitigation_replays_candles_since_last_call():
+    detector = FairValueGapDetector()
+    gap = _fvg(FVGDirection.BULLISH, 1.1000, 1.1010)
+    candles = _bars([1.1040, 1.1035, 1.1030, 1.0995, 1.1030, 1.1040])
+
+    detector.update_fvg_mitigation([gap], candles.iloc[:3])
+    assert gap.status == FVGStatus.ACTIVE
+    # The wick through the gap is neither the first nor the last new candle
+    detector.update_fvg_mitigation([gap], candles)
+
+    assert gap.status == FVGStatus.FULLY_MITIGATED
+    assert gap.touch_count == 1 and not gap.invalidated
+
+
+def _order_block(kind, low, high, timeframe='M15'):
+    demand = kind == OrderBlockType.DEMAND_ZONE
+    return EnhancedOrderBlock(
+        type=kind, price=low if demand else high, entry_price=high if demand else low,
+        stop_loss=low - 0.0010 if demand else high + 0.0010, take_profit=high + 0.0030 if demand else low - 0.0030,
+        confidence=70.0, distance_pips=10.0, risk_reward=2.0, symbol='EURUSD', timeframe=timeframe,
+    )
+
+
+def test_order_block_mitigation_tracks_wicks_and_closes():
+    detector = EnhancedOrderBlockDetector()
+    demand = _order_block(OrderBlockType.DEMAND_ZONE, 1.1000, 1.1010)
+    supply = _order_block(OrderBlockType.SUPPLY_ZONE, 1.1100, 1.1110)
+    other_tf = _order_block(OrderBlockType.DEMAND_ZONE, 1.1000, 1.1010, timeframe='H1')
+
+    detector.update_order_block_mitigation([demand, supply], _bars([1.1005]))
+    assert demand.fill_percentage == pytest.approx(50.0) and demand.touch_count == 1
+    assert not demand.mitigated and supply.touch_count == 0
+
+    # Re-detected block (new object, same zone) keeps its tracked state
+    redetected = _order_block(OrderBlockType.DEMAND_ZONE, 1.1000, 1.1010)
+    detector.update_order_block_mitigation([redetected, other_tf], _bars([1.1050, 1.0960], start='2025-01-01 10:15'))
+    assert redetected.mitigated and redetected.invalidated
+    assert redetected.touch_count == 2
+    assert other_tf.touch_count == 1
+
+
+def _walk(seed, n):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0008, n))
+    open_ = np.r_[close[0], close[:-1]] + rng.normal(0, 0.0005, n)
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) + np.abs(rng.normal(0, 0.0004, n)),
+        'low': np.minimum(open_, close) - np.abs(rng.normal(0, 0.0004, n)),
+        'close': close,
+        'volume': rng.integers(100, 2000, n).astype(float),
+    }, index=pd.date_range('2025-01-01', periods=n, freq='15min'))
+
+
+def test_detection_applies_order_block_mitigation():
+    detector = EnhancedOrderBlockDetector()
+    data = _walk(0, 120)
+    blocks = detector.detect_enhanced_order_blocks(data, float(data['close'].iloc[-1]), 'EURUSD', 'M15')
+
+    assert blocks
+    assert not any(b.invalidated for b in blocks)
+    assert any(b.touch_count for b in blocks)
+    assert all(detector.mitigation_tracker.is_tracking('EURUSD', b.zone_id, timeframe='M15')
+               for b in blocks if not b.mitigated)
+
+
+def test_new_zones_replay_candles_after_their_formation():
+    detector = FairValueGapDetector()
+    candles = _bars([1.1040, 1.1035, 1.1030, 1.0995, 1.1030, 1.1040])
+    wicked = _fvg(FVGDirection.BULLISH, 1.1000, 1.1010)
+    wicked.formed_at = candles.index[1]
+    later = _fvg(FVGDirection.BULLISH, 1.0990, 1.0998)
+    later.fvg_id = 'FVG_LATER'
+    later.formed_at = candles.index[4]  # formed after the wick: untouched
+
+    # First call for the book: the wick at bar 3 is neither the formation bar nor the last one
+    detector.update_fvg_mitigation([wicked, later], candles)
+
+    assert wicked.status == FVGStatus.FULLY_MITIGATED and wicked.touch_count == 1
+    assert later.status == FVGStatus.ACTIVE and later.touch_count == 0
+
+    block = _order_block(OrderBlockType.DEMAND_ZONE, 1.1000, 1.1010)
+    block.formed_at = candles.index[0]
+    EnhancedOrderBlockDetector().update_order_block_mitigation([block], _bars([1.1040, 1.0960, 1.1040]))
+    assert block.mitigated and block.invalidated
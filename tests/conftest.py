@@ -1,6 +1,17 @@
 import os
+import sys
+from pathlib import Path
+
 import pytest
 
+# Los módulos de 01-CORE se importan como paquetes de primer nivel
+CORE = Path(__file__).resolve().parents[1] / '01-CORE'
+if str(CORE) not in sys.path:
+    sys.path.insert(0, str(CORE))
+
+os.environ.setdefault('ICT_QUICK_TEST_MODE', '1')
+os.environ.setdefault('ICT_DISABLE_HEAVY_INIT', '1')
+
 def pytest_configure(config):
     """Set test env before importing application modules."""
     os.environ["ICT_DISABLE_LOG_ROTATION"] = "1"